@@ -3,6 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django.utils.html import format_html
 
+from .bulk import TaskBulkExecutor
 from .models import UserProfile, LoginHistory, Task
 
 
@@ -240,16 +241,35 @@ class TaskAdmin(admin.ModelAdmin):
     time_remaining.short_description = '剩余时间'
 
     # 批量操作
+    def _set_status(self, request, queryset, status):
+        """
+        批量修改任务状态，经 TaskBulkExecutor 写入以同步维护任务事件、
+        用户任务计数器、每日汇总与统计缓存（QuerySet.update 会跳过这些）
+
+        Returns:
+            int: 实际修改的任务数
+        """
+        tasks = [task for task in queryset if task.status != status]
+        fields = {'status'}
+        for task in tasks:
+            task.status = status
+            if status == 'COMPLETED':
+                task.progress = 100
+                fields.add('progress')
+            fields.update(task.sync_completion_fields())
+        TaskBulkExecutor(request.user).save(tasks, fields)
+        return len(tasks)
+
     def mark_as_completed(self, request, queryset):
         """标记为已完成"""
-        updated = queryset.update(status='COMPLETED', progress=100)
+        updated = self._set_status(request, queryset, 'COMPLETED')
         self.message_user(request, f"已将 {updated} 个任务标记为完成。")
 
     mark_as_completed.short_description = "标记选中任务为已完成"
 
     def mark_as_pending(self, request, queryset):
         """标记为待处理"""
-        updated = queryset.update(status='PENDING')
+        updated = self._set_status(request, queryset, 'PENDING')
         self.message_user(request, f"已将 {updated} 个任务标记为待处理。")
 
     mark_as_pending.short_description = "标记选中任务为待处理"
@@ -0,0 +1,751 @@
+"""
+LingTaskFlow 统计分析引擎
+基于条件聚合 (Count/Sum with filter) 的单次查询统计计算
+"""
+import zoneinfo
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from itertools import combinations, groupby
+
+from django.conf import settings
+from django.db.models import (
+    Q, F, Count, Avg, Sum, Min, Max, DateField, DateTimeField, DurationField, ExpressionWrapper, OuterRef,
+    Subquery, Value
+)
+from django.db.models.functions import (
+    Coalesce, ExtractHour, ExtractIsoWeekDay, ExtractMonth, Trunc, TruncDate, TruncHour, TruncMonth, TruncWeek
+)
+from django.utils import timezone
+
+from .models import Task, TaskDailyRollup, TaskEvent, TaskTag
+
+# 视为"未完成"的任务状态（用于逾期与即将到期判断）
+OPEN_STATUSES = ['PENDING', 'IN_PROGRESS', 'ON_HOLD']
+
+# 进度区间 (最小值, 最大值, 标签)
+PROGRESS_RANGES = [
+    (0, 0, '未开始'),
+    (1, 25, '刚开始'),
+    (26, 50, '进行中'),
+    (51, 75, '大部分完成'),
+    (76, 99, '接近完成'),
+    (100, 100, '已完成')
+]
+
+# 逾期时长区间 (天数, 标签)，None 表示超过一年
+OVERDUE_DURATIONS = [
+    (1, '1天内'),
+    (7, '1周内'),
+    (30, '1月内'),
+    (90, '3月内'),
+    (365, '1年内'),
+    (None, '1年以上')
+]
+
+
+def _percentage(count, total):
+    """计算百分比，保留两位小数"""
+    return round((count / total * 100) if total > 0 else 0.0, 2)
+
+
+class TaskStatsEngine:
+    """
+    任务统计引擎
+
+    将基础统计、状态/优先级分布、工作负载、进度分析与逾期分析
+    合并为一条条件聚合查询，再在 Python 中组装为原有的响应结构。
+
+    用法:
+        engine = TaskStatsEngine(queryset, user)
+        engine.basic_stats()
+        engine.status_distribution()
+    """
+
+    def __init__(self, queryset, user=None, now=None):
+        self.queryset = queryset
+        self.user = user
+        self.now = now or timezone.now()
+        self._aggregates = None
+
+    # ==================== 聚合查询 ====================
+
+    def _build_aggregates(self):
+        """构建全部条件聚合表达式"""
+        now = self.now
+        overdue_q = Q(due_date__lt=now, status__in=OPEN_STATUSES)
+
+        aggregates = {
+            'total': Count('id'),
+            'completed': Count('id', filter=Q(status='COMPLETED')),
+            'overdue': Count('id', filter=overdue_q),
+            'upcoming_due': Count('id', filter=Q(
+                due_date__gte=now,
+                due_date__lte=now + timezone.timedelta(days=3),
+                status__in=OPEN_STATUSES
+            )),
+            'avg_progress': Avg('progress'),
+            'total_estimated': Sum('estimated_hours'),
+            'total_actual': Sum('actual_hours'),
+            'progress_active': Count('id', filter=Q(progress__gt=0, progress__lt=100)),
+        }
+
+        for code, _ in Task.STATUS_CHOICES:
+            aggregates[f'status_{code}'] = Count('id', filter=Q(status=code))
+
+        for code, _ in Task.PRIORITY_CHOICES:
+            aggregates[f'priority_{code}'] = Count('id', filter=Q(priority=code))
+
+        for index, (min_progress, max_progress, _) in enumerate(PROGRESS_RANGES):
+            aggregates[f'progress_range_{index}'] = Count('id', filter=Q(
+                progress__gte=min_progress,
+                progress__lte=max_progress
+            ))
+
+        for index, (days, _) in enumerate(OVERDUE_DURATIONS):
+            if days is None:
+                duration_q = Q(due_date__lt=now - timezone.timedelta(days=365))
+            else:
+                duration_q = Q(due_date__gte=now - timezone.timedelta(days=days), due_date__lt=now)
+            aggregates[f'overdue_duration_{index}'] = Count('id', filter=overdue_q & duration_q)
+
+        if self.user is not None:
+            user = self.user
+            involved_q = Q(owner=user) | Q(assigned_to=user)
+            aggregates.update({
+                'owned': Count('id', filter=Q(owner=user)),
+                'owned_completed': Count('id', filter=Q(owner=user, status='COMPLETED')),
+                'assigned': Count('id', filter=Q(assigned_to=user)),
+                'assigned_completed': Count('id', filter=Q(assigned_to=user, status='COMPLETED')),
+                'involved_active': Count('id', filter=involved_q & Q(status__in=['PENDING', 'IN_PROGRESS'])),
+            })
+            for code, _ in Task.STATUS_CHOICES:
+                aggregates[f'workload_{code}'] = Count('id', filter=involved_q & Q(status=code))
+
+        return aggregates
+
+    @property
+    def aggregates(self):
+        """执行（并缓存）单次条件聚合查询的结果"""
+        if self._aggregates is None:
+            self._aggregates = self.queryset.aggregate(**self._build_aggregates())
+        return self._aggregates
+
+    @property
+    def total(self):
+        """统计范围内的任务总数"""
+        return self.aggregates['total']
+
+    # ==================== 结果组装 ====================
+
+    def basic_stats(self):
+        """基础统计数据"""
+        data = self.aggregates
+        total_count = data['total']
+
+        if total_count == 0:
+            return {
+                'total_tasks': 0,
+                'completed_tasks': 0,
+                'completion_rate': 0.0,
+                'overdue_tasks': 0,
+                'overdue_rate': 0.0,
+                'average_progress': 0.0,
+                'total_estimated_hours': 0.0,
+                'total_actual_hours': 0.0
+            }
+
+        total_estimated = data['total_estimated'] or 0.0
+        total_actual = data['total_actual'] or 0.0
+
+        return {
+            'total_tasks': total_count,
+            'completed_tasks': data['completed'],
+            'completion_rate': _percentage(data['completed'], total_count),
+            'overdue_tasks': data['overdue'],
+            'overdue_rate': _percentage(data['overdue'], total_count),
+            'average_progress': round(data['avg_progress'] or 0.0, 2),
+            'total_estimated_hours': float(total_estimated),
+            'total_actual_hours': float(total_actual),
+            'efficiency_rate': round(
+                (float(total_actual) / float(total_estimated) * 100) if total_estimated > 0 else 0.0, 2)
+        }
+
+    def _choice_distribution(self, choices, prefix):
+        """按选项生成分布统计（仅包含数量大于0的项）"""
+        total_count = self.total
+        if total_count == 0:
+            return {}
+
+        distribution = {}
+        for code, name in choices:
+            count = self.aggregates[f'{prefix}_{code}']
+            if count > 0:
+                distribution[code] = {
+                    'name': name,
+                    'count': count,
+                    'percentage': _percentage(count, total_count)
+                }
+        return distribution
+
+    def status_distribution(self):
+        """状态分布统计"""
+        return self._choice_distribution(Task.STATUS_CHOICES, 'status')
+
+    def priority_distribution(self):
+        """优先级分布统计"""
+        return self._choice_distribution(Task.PRIORITY_CHOICES, 'priority')
+
+    def workload_stats(self):
+        """工作负载统计（需要在构造时传入 user）"""
+        if self.user is None:
+            raise ValueError('计算工作负载统计需要指定用户')
+
+        data = self.aggregates
+        status_workload = {}
+        for code, _ in Task.STATUS_CHOICES:
+            count = data[f'workload_{code}']
+            if count > 0:
+                status_workload[code] = count
+
+        return {
+            'owned_tasks': {
+                'total': data['owned'],
+                'completed': data['owned_completed'],
+                'completion_rate': _percentage(data['owned_completed'], data['owned'])
+            },
+            'assigned_tasks': {
+                'total': data['assigned'],
+                'completed': data['assigned_completed'],
+                'completion_rate': _percentage(data['assigned_completed'], data['assigned'])
+            },
+            'status_workload': status_workload,
+            'total_active_tasks': data['involved_active']
+        }
+
+    def progress_analysis(self):
+        """进度分析"""
+        data = self.aggregates
+        total_count = data['total']
+
+        progress_distribution = []
+        for index, (min_progress, max_progress, label) in enumerate(PROGRESS_RANGES):
+            count = data[f'progress_range_{index}']
+            if count > 0:
+                progress_distribution.append({
+                    'range': f'{min_progress}-{max_progress}%',
+                    'label': label,
+                    'count': count,
+                    'percentage': _percentage(count, total_count)
+                })
+
+        return {
+            'distribution': progress_distribution,
+            'average_progress': round(data['avg_progress'] or 0.0, 2),
+            'tasks_in_progress': data['progress_active'],
+            'tasks_completed': data[f'progress_range_{len(PROGRESS_RANGES) - 1}'],
+            'tasks_not_started': data['progress_range_0']
+        }
+
+    def overdue_analysis(self):
+        """逾期分析"""
+        data = self.aggregates
+        overdue_count = data['overdue']
+
+        overdue_by_duration = []
+        for index, (_, label) in enumerate(OVERDUE_DURATIONS):
+            count = data[f'overdue_duration_{index}']
+            if count > 0:
+                overdue_by_duration.append({
+                    'duration': label,
+                    'count': count,
+                    'percentage': _percentage(count, overdue_count)
+                })
+
+        return {
+            'total_overdue': overdue_count,
+            'overdue_rate': _percentage(overdue_count, data['total']),
+            'upcoming_due': data['upcoming_due'],
+            'overdue_by_duration': overdue_by_duration,
+            'most_overdue_task': self._most_overdue_task() if overdue_count > 0 else None
+        }
+
+    def _most_overdue_task(self):
+        """获取最逾期的任务信息"""
+        most_overdue = self.queryset.filter(
+            due_date__lt=self.now,
+            status__in=OPEN_STATUSES
+        ).order_by('due_date').only(
+            'id', 'title', 'due_date', 'priority', 'status'
+        ).first()
+
+        if most_overdue is None:
+            return None
+
+        if hasattr(most_overdue.due_date, 'date'):
+            due_date = most_overdue.due_date.date()
+        else:
+            due_date = most_overdue.due_date
+
+        return {
+            'id': str(most_overdue.id),
+            'title': most_overdue.title,
+            'due_date': most_overdue.due_date.isoformat() if hasattr(most_overdue.due_date, 'isoformat') else str(
+                most_overdue.due_date),
+            'overdue_days': (self.now.date() - due_date).days,
+            'priority': most_overdue.priority,
+            'status': most_overdue.status
+        }
+
+
+# 任务列表统计级别: none 不计算，summary 仅汇总数，full 含状态/优先级分布
+LIST_STATS_LEVELS = ('none', 'summary', 'full')
+
+# 任务列表统计缓存时间（秒）
+LIST_STATS_CACHE_TIMEOUT = getattr(settings, 'TASK_LIST_STATS_CACHE_TIMEOUT', 60)
+
+
+def compute_list_stats(queryset, level='full', now=None):
+    """
+    以一条条件聚合查询计算任务列表统计
+
+    Args:
+        queryset: 已过滤的任务查询集
+        level: 统计级别（summary / full）
+        now: 判断逾期的当前时间
+
+    Returns:
+        dict: 列表统计信息
+    """
+    now = now or timezone.now()
+    aggregates = {
+        'total': Count('id'),
+        'overdue_count': Count('id', filter=Q(due_date__lt=now, status__in=OPEN_STATUSES)),
+        'completed_count': Count('id', filter=Q(status='COMPLETED')),
+    }
+    if level == 'full':
+        for code, _ in Task.STATUS_CHOICES:
+            aggregates[f'status_{code}'] = Count('id', filter=Q(status=code))
+        for code, _ in Task.PRIORITY_CHOICES:
+            aggregates[f'priority_{code}'] = Count('id', filter=Q(priority=code))
+
+    data = queryset.order_by().aggregate(**aggregates)
+    stats = {'total': data['total']}
+    if level == 'full':
+        stats['by_status'] = {
+            code: data[f'status_{code}'] for code, _ in Task.STATUS_CHOICES if data[f'status_{code}']
+        }
+        stats['by_priority'] = {
+            code: data[f'priority_{code}'] for code, _ in Task.PRIORITY_CHOICES if data[f'priority_{code}']
+        }
+    stats['overdue_count'] = data['overdue_count']
+    stats['completed_count'] = data['completed_count']
+    return stats
+
+
+class TagStatsEngine:
+    """
+    标签统计引擎
+
+    基于 TaskTag 关联表的 GROUP BY 聚合计算标签分布，共现统计按任务顺序
+    单次流式遍历 (task_id, 标签名)，查询数量与任务数量无关，内存只与标签种类相关。
+
+    用法:
+        engine = TagStatsEngine(queryset)
+        engine.distribution(min_frequency=1, top_n=50)
+        engine.tag_aggregates(['前端', '后端'])
+        engine.co_occurrence(['前端', '后端'])
+    """
+
+    # 共现流式遍历每次读取的行数
+    STREAM_CHUNK_SIZE = 2000
+
+    def __init__(self, queryset, now=None):
+        self.queryset = queryset
+        self.now = now or timezone.now()
+        self._tag_aggregates = {}
+
+    def _links(self, names=None):
+        """统计范围内任务的标签关联"""
+        links = TaskTag.objects.filter(task__in=self.queryset.order_by().values('pk'))
+        if names is not None:
+            links = links.filter(tag__name__in=names)
+        return links
+
+    def distribution(self, min_frequency=1, top_n=50):
+        """
+        基础标签分布
+
+        Returns:
+            dict: total_tasks / tagged_tasks / tag_assignments / total_tags /
+                  unique_tags / tags（前 top_n 个 {'name', 'count'}，按数量降序）
+        """
+        summary = self._links().aggregate(
+            tag_assignments=Count('id'),
+            tagged_tasks=Count('task_id', distinct=True)
+        )
+
+        total_tags, unique_tags, tags = 0, 0, []
+        for row in TaskTag.tag_counts(self.queryset).iterator():
+            total_tags += 1
+            if row['count'] >= min_frequency:
+                unique_tags += 1
+                if len(tags) < top_n:
+                    tags.append(row)
+
+        return {
+            'total_tasks': self.queryset.count(),
+            'tagged_tasks': summary['tagged_tasks'],
+            'tag_assignments': summary['tag_assignments'],
+            'total_tags': total_tags,
+            'unique_tags': unique_tags,
+            'tags': tags,
+        }
+
+    def tag_aggregates(self, names):
+        """
+        指定标签的任务聚合（状态/优先级分布、完成、进度、工时、逾期与平均完成耗时）
+
+        Returns:
+            dict: {标签名: 聚合结果}
+        """
+        missing = [name for name in names if name not in self._tag_aggregates]
+        if missing:
+            now = self.now
+            aggregates = {
+                'task_count': Count('task_id'),
+                'completed': Count('task_id', filter=Q(task__status='COMPLETED')),
+                'overdue': Count('task_id', filter=Q(task__due_date__lt=now, task__status__in=OPEN_STATUSES)),
+                'avg_progress': Avg('task__progress'),
+                'estimated_hours': Sum('task__estimated_hours'),
+                'actual_hours': Sum('task__actual_hours'),
+                'avg_completion_time': Avg(
+                    ExpressionWrapper(F('task__updated_at') - F('task__created_at'), output_field=DurationField()),
+                    filter=Q(task__status='COMPLETED')
+                ),
+            }
+            for code, _ in Task.STATUS_CHOICES:
+                aggregates[f'status_{code}'] = Count('task_id', filter=Q(task__status=code))
+            for code, _ in Task.PRIORITY_CHOICES:
+                aggregates[f'priority_{code}'] = Count('task_id', filter=Q(task__priority=code))
+
+            rows = self._links(missing).values(name=F('tag__name')).annotate(**aggregates).order_by()
+            for row in rows:
+                self._tag_aggregates[row.pop('name')] = row
+        return {name: self._tag_aggregates[name] for name in names if name in self._tag_aggregates}
+
+    def category_counts(self, names):
+        """
+        指定标签下的任务分类分布
+
+        Returns:
+            dict: {标签名: [(分类, 任务数), ...]}，按数量降序
+        """
+        rows = self._links(names).exclude(task__category='').values(
+            name=F('tag__name'), category=F('task__category')
+        ).annotate(count=Count('task_id')).order_by('name', '-count', 'category')
+
+        result = {}
+        for row in rows:
+            result.setdefault(row['name'], []).append((row['category'], row['count']))
+        return result
+
+    def co_occurrence(self, names, min_pattern_size=3):
+        """
+        标签共现统计
+
+        按 task_id 排序单次流式读取关联行，逐任务累加两两组合与多标签模式
+
+        Returns:
+            tuple: ({(标签1, 标签2): 共现任务数}, {(标签, ...): 任务数})
+        """
+        pairs, patterns = {}, {}
+        rows = self._links(names).values_list('task_id', 'tag__name').order_by('task_id')
+        for _, task_rows in groupby(rows.iterator(chunk_size=self.STREAM_CHUNK_SIZE), key=lambda row: row[0]):
+            task_tags = sorted(name for _, name in task_rows)
+            for pair in combinations(task_tags, 2):
+                pairs[pair] = pairs.get(pair, 0) + 1
+            if len(task_tags) >= min_pattern_size:
+                pattern = tuple(task_tags)
+                patterns[pattern] = patterns.get(pattern, 0) + 1
+        return pairs, patterns
+
+
+# 时间分桶维度: 名称 -> 数据库函数（Extract* 取时间分量，Trunc* 截断到时间段起点）
+TIME_BUCKETS = {
+    'hour': ExtractHour,
+    'iso_week_day': ExtractIsoWeekDay,
+    'month': ExtractMonth,
+    'hour_start': TruncHour,
+    'date': TruncDate,
+    'week_start': TruncWeek,
+    'month_start': TruncMonth,
+}
+
+
+def resolve_timezone(name):
+    """解析时区名称，无效时回退为 UTC"""
+    try:
+        return zoneinfo.ZoneInfo(name)
+    except (zoneinfo.ZoneInfoNotFoundError, TypeError, ValueError):
+        return dt_timezone.utc
+
+
+def completion_duration():
+    """任务完成耗时表达式（updated_at - created_at）"""
+    return ExpressionWrapper(F('updated_at') - F('created_at'), output_field=DurationField())
+
+
+def time_buckets(queryset, date_field, bucket, tzinfo, dimensions=(), **aggregates):
+    """
+    在数据库中按时间分桶分组聚合（一条 GROUP BY 查询）
+
+    Args:
+        queryset: 任务查询集
+        date_field: 分桶使用的时间字段（为空的任务不参与统计）
+        bucket: TIME_BUCKETS 中的维度名称
+        tzinfo: 分桶使用的时区
+        dimensions: 额外的分组字段，如 ('status',)
+        aggregates: 聚合表达式，默认统计任务数 count
+
+    Returns:
+        list: [{'bucket': 分桶值, 维度字段..., 聚合名: 值}, ...]，按分桶排序
+    """
+    aggregates = aggregates or {'count': Count('id')}
+    fields = ['bucket', *dimensions]
+    return list(
+        queryset.exclude(**{f'{date_field}__isnull': True}).order_by().annotate(
+            bucket=TIME_BUCKETS[bucket](date_field, tzinfo=tzinfo)
+        ).values(*fields).annotate(**aggregates).order_by(*fields)
+    )
+
+
+# 时间序列粒度: hour / day / month
+TIME_SERIES_UNITS = ('hour', 'day', 'month')
+
+# 每日汇总支持的维度字段
+ROLLUP_DIMENSIONS = ('status', 'priority', 'category')
+
+
+def truncate_datetime(value, unit, tzinfo):
+    """在 Python 中把时间截断到所在时间段的起点（与数据库 Trunc 结果一致）"""
+    value = value.astimezone(tzinfo)
+    if unit == 'hour':
+        return value.replace(minute=0, second=0, microsecond=0)
+    if unit == 'day':
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_bucket(value, unit):
+    """下一个时间段的起点"""
+    if unit == 'hour':
+        return value + timedelta(hours=1)
+    if unit == 'day':
+        return value + timedelta(days=1)
+    if value.month == 12:
+        return value.replace(year=value.year + 1, month=1)
+    return value.replace(month=value.month + 1)
+
+
+def time_series(queryset, date_field, unit, tzinfo, start=None, end=None, dimension=None, dimension_values=None):
+    """
+    按时间段（及维度）统计任务数与完成数，一条 Trunc + GROUP BY 查询，在 Python 中补零
+
+    Args:
+        queryset: 任务查询集
+        date_field: 时间字段
+        unit: 时间粒度（hour / day / month）
+        tzinfo: 分段使用的时区
+        start: 统计起始时间（含），为空时从最早的数据开始
+        end: 统计结束时间（不含），为空时到最晚的数据为止
+        dimension: 维度字段，如 'status'、'priority'、'task_tags__tag__name'
+        dimension_values: 维度取值列表（同时作为过滤条件与补零范围）
+
+    Returns:
+        list: [{'bucket': 时间段起点, 'dimension': 维度值, 'count': 任务数, 'completed': 已完成数}, ...]，
+              按时间段、维度值排序；未指定维度时 dimension 为 None
+    """
+    queryset = queryset.exclude(**{f'{date_field}__isnull': True})
+    if start is not None:
+        queryset = queryset.filter(**{f'{date_field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{date_field}__lt': end})
+    if dimension and dimension_values is not None:
+        queryset = queryset.filter(**{f'{dimension}__in': dimension_values})
+
+    fields = ['bucket', dimension] if dimension else ['bucket']
+    rows = queryset.order_by().annotate(
+        bucket=Trunc(date_field, unit, tzinfo=tzinfo)
+    ).values(*fields).annotate(
+        count=Count('id'),
+        completed=Count('id', filter=Q(status='COMPLETED'))
+    ).order_by()
+
+    counts = {}
+    for row in rows:
+        counts[(row['bucket'], row[dimension] if dimension else None)] = (row['count'], row['completed'])
+    return _fill_series(counts, unit, tzinfo, start, end, dimension, dimension_values)
+
+
+def _fill_series(counts, unit, tzinfo, start, end, dimension, dimension_values):
+    """把 {(时间段起点, 维度值): (任务数, 已完成数)} 展开为按时间段、维度值补零的序列"""
+    if start is None and end is None and not counts:
+        return []
+
+    buckets = sorted({bucket for bucket, _ in counts})
+    first = truncate_datetime(start, unit, tzinfo) if start is not None else buckets[0]
+    last = truncate_datetime(end - timedelta(microseconds=1), unit, tzinfo) if end is not None else buckets[-1]
+
+    if not dimension:
+        values = [None]
+    elif dimension_values is not None:
+        values = list(dimension_values)
+    else:
+        values = sorted({value for _, value in counts}, key=str)
+
+    series = []
+    bucket = first
+    while bucket <= last:
+        for value in values:
+            count, completed = counts.get((bucket, value), (0, 0))
+            series.append({'bucket': bucket, 'dimension': value, 'count': count, 'completed': completed})
+        bucket = next_bucket(bucket, unit)
+    return series
+
+
+def uses_rollup_timezone(tzinfo):
+    """时区是否与每日汇总的日期划分（UTC）一致"""
+    return str(tzinfo) in ('UTC', 'Etc/UTC')
+
+
+def rollup_time_series(user, unit, start=None, end=None, dimension=None, dimension_values=None):
+    """
+    从 TaskDailyRollup 读取按时间段（及维度）统计的任务数与完成数，返回格式与 time_series 相同
+
+    汇总按 UTC 创建日期预聚合，只覆盖 Task.objects.visible_to(user) 中 created_at 的统计；
+    start/end 按所在的整天计算，不支持 hour 粒度
+
+    Args:
+        user: 用户
+        unit: 时间粒度（day / month）
+        start: 统计起始时间（含），为空时从最早的数据开始
+        end: 统计结束时间（不含），为空时到最晚的数据为止
+        dimension: 维度字段，限 ROLLUP_DIMENSIONS
+        dimension_values: 维度取值列表（同时作为过滤条件与补零范围）
+    """
+    tzinfo = TaskDailyRollup.TIMEZONE
+    queryset = TaskDailyRollup.objects.filter(user=user)
+    if start is not None:
+        queryset = queryset.filter(day__gte=truncate_datetime(start, 'day', tzinfo).date())
+    if end is not None:
+        queryset = queryset.filter(day__lte=truncate_datetime(end - timedelta(microseconds=1), 'day', tzinfo).date())
+    if dimension and dimension_values is not None:
+        queryset = queryset.filter(**{f'{dimension}__in': dimension_values})
+
+    fields = ['bucket', dimension] if dimension else ['bucket']
+    rows = queryset.order_by().annotate(
+        bucket=Trunc('day', unit, output_field=DateField())
+    ).values(*fields).annotate(
+        count=Sum('task_count'),
+        completed=Sum('task_count', filter=Q(status='COMPLETED'))
+    ).order_by()
+
+    counts = {}
+    for row in rows:
+        bucket = datetime.combine(row['bucket'], time.min, tzinfo=tzinfo)
+        counts[(bucket, row[dimension] if dimension else None)] = (row['count'], row['completed'] or 0)
+    return _fill_series(counts, unit, tzinfo, start, end, dimension, dimension_values)
+
+
+# 终态：任务进入后不再离开，停留时长按创建到进入终态的耗时统计
+TERMINAL_STATUSES = ('COMPLETED', 'CANCELLED')
+
+
+def task_events(queryset, event_type=None):
+    """任务查询集对应的任务事件"""
+    events = TaskEvent.objects.filter(task__in=queryset.order_by().values('pk'))
+    if event_type is not None:
+        events = events.filter(event_type=event_type)
+    return events
+
+
+def status_transition_counts(events):
+    """
+    按 (原状态, 新状态) 分组统计状态转换次数（一条 GROUP BY 查询）
+
+    Args:
+        events: 状态变更事件查询集
+
+    Returns:
+        dict: {(原状态, 新状态): 次数}
+    """
+    rows = events.filter(event_type=TaskEvent.STATUS_CHANGED).order_by().values(
+        'from_value', 'to_value'
+    ).annotate(count=Count('id'))
+    return {(row['from_value'], row['to_value']): row['count'] for row in rows}
+
+
+def _status_entered_at(task_ref, before_id=None):
+    """任务进入当前状态的时间：上一条状态变更事件的时间，没有事件时为任务创建时间"""
+    previous = TaskEvent.objects.filter(task=OuterRef(task_ref), event_type=TaskEvent.STATUS_CHANGED)
+    if before_id is not None:
+        previous = previous.filter(id__lt=OuterRef(before_id))
+    return Subquery(previous.order_by('-id').values('created_at')[:1], output_field=DateTimeField())
+
+
+def status_durations(queryset, now=None):
+    """
+    计算各状态的停留时长（三条 GROUP BY 查询）
+
+    非终态：已结束的停留来自状态变更事件（离开时间 - 进入时间），当前仍停留的任务
+    按 now - 进入时间计入；进入时间取同一任务的上一条状态变更事件，没有时为任务创建时间。
+    终态：当前处于该状态的任务按进入时间 - 创建时间计入（即完成/取消耗时），
+    没有状态变更事件时进入时间取完成时间或最后更新时间
+
+    Args:
+        queryset: 任务查询集
+
+    Returns:
+        dict: {状态: {'stay_count', 'open_count', 'avg', 'min', 'max'}}，时长为 timedelta，
+        open_count 为当前处于该状态的任务数
+    """
+    now = now or timezone.now()
+    aggregates = {'count': Count('id'), 'avg': Avg('duration'), 'minimum': Min('duration'),
+                  'maximum': Max('duration')}
+
+    closed = task_events(queryset, TaskEvent.STATUS_CHANGED).exclude(
+        from_value__in=TERMINAL_STATUSES
+    ).order_by().annotate(
+        entered_at=Coalesce(_status_entered_at('task', before_id='id'), F('task__created_at'))
+    ).annotate(
+        duration=ExpressionWrapper(F('created_at') - F('entered_at'), output_field=DurationField())
+    ).values(status=F('from_value')).annotate(**aggregates)
+
+    current = queryset.exclude(status__in=TERMINAL_STATUSES).order_by().annotate(
+        entered_at=Coalesce(_status_entered_at('pk'), F('created_at'))
+    ).annotate(
+        duration=ExpressionWrapper(Value(now, output_field=DateTimeField()) - F('entered_at'),
+                                   output_field=DurationField())
+    ).values('status').annotate(**aggregates)
+
+    finished = queryset.filter(status__in=TERMINAL_STATUSES).order_by().annotate(
+        entered_at=Coalesce(_status_entered_at('pk'), F('completed_at'), F('updated_at'))
+    ).annotate(
+        duration=ExpressionWrapper(F('entered_at') - F('created_at'), output_field=DurationField())
+    ).values('status').annotate(**aggregates)
+
+    stats = {}
+    for rows, is_open in ((closed, False), (current, True), (finished, True)):
+        for row in rows:
+            entry = stats.setdefault(row['status'], {
+                'stay_count': 0, 'open_count': 0, 'total': timedelta(0),
+                'min': row['minimum'], 'max': row['maximum']
+            })
+            entry['stay_count'] += row['count']
+            entry['open_count'] += row['count'] if is_open else 0
+            entry['total'] += row['avg'] * row['count']
+            entry['min'] = min(entry['min'], row['minimum'])
+            entry['max'] = max(entry['max'], row['maximum'])
+
+    for entry in stats.values():
+        entry['avg'] = entry.pop('total') / entry['stay_count']
+    return stats
@@ -0,0 +1,125 @@
+"""
+LingTaskFlow 登录历史缓冲写入
+登录事件先进入进程内队列，由后台线程按批 bulk_create 写入 LoginHistory，
+登录与 Token 刷新请求不再等待每条审计记录的 INSERT。
+
+LOGIN_HISTORY_ASYNC 为 False（测试运行器中）时同步写入，写入后可立即查询到记录。
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class LoginHistoryWriter:
+    """
+    登录历史缓冲写入器
+
+    - 后台线程在首次写入时按进程惰性启动（兼容 Gunicorn 预加载后 fork）
+    - 收到第一条记录后攒满 batch_size 条或等待 flush_interval 秒即批量写入
+    - 队列已满时退化为同步写入，宁可变慢也不丢弃审计记录
+    - 进程退出时写入队列中剩余的记录
+
+    注意：login_time 为 auto_now_add 字段，取值为批量写入的时间，
+    最多比实际登录晚 flush_interval 秒
+    """
+
+    def __init__(self, asynchronous=None, batch_size=None, flush_interval=None, max_queue_size=None):
+        self._asynchronous = asynchronous
+        self.batch_size = batch_size or getattr(settings, 'LOGIN_HISTORY_BATCH_SIZE', 200)
+        self.flush_interval = flush_interval or getattr(settings, 'LOGIN_HISTORY_FLUSH_INTERVAL', 1.0)
+        self.queue = queue.Queue(maxsize=max_queue_size or getattr(settings, 'LOGIN_HISTORY_MAX_QUEUE', 10000))
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+
+    @property
+    def asynchronous(self):
+        if self._asynchronous is not None:
+            return self._asynchronous
+        return getattr(settings, 'LOGIN_HISTORY_ASYNC', True)
+
+    def write(self, entry):
+        """写入一条未保存的 LoginHistory 记录"""
+        if not self.asynchronous:
+            entry.save()
+            return
+
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            logger.warning('登录历史队列已满，改为同步写入')
+            entry.save()
+
+    def flush(self):
+        """
+        在当前线程写入队列中的全部记录
+
+        Returns:
+            int: 写入的记录数
+        """
+        written = 0
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return written
+            self._save(batch)
+            written += len(batch)
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _save(self, batch):
+        from .models import LoginHistory
+
+        try:
+            LoginHistory.objects.bulk_create(batch, batch_size=self.batch_size)
+        except Exception:
+            logger.exception(f'登录历史批量写入失败，丢弃 {len(batch)} 条记录')
+
+    def _ensure_worker(self):
+        pid = os.getpid()
+        if self._worker_pid == pid and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker_pid == pid and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name='login-history-writer', daemon=True)
+            self._worker.start()
+            self._worker_pid = pid
+
+    def _run(self):
+        """后台线程：收到第一条记录后继续攒批，直到满 batch_size 条或等待超过 flush_interval 秒"""
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._save(batch)
+            # 后台线程持有独立的数据库连接，按 CONN_MAX_AGE 回收失效连接
+            close_old_connections()
+
+
+login_history_writer = LoginHistoryWriter()
+atexit.register(login_history_writer.flush)
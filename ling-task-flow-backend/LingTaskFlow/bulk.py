@@ -0,0 +1,223 @@
+"""
+LingTaskFlow 批量操作执行器
+基于集合的任务批量更新、删除与恢复：一次 id__in 查询取出全部目标任务，
+在内存中校验权限，再在单个事务内通过 QuerySet.update()/bulk_update() 写入，
+并批量插入对应的任务事件
+"""
+import uuid
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Task, TaskDailyRollup, TaskEvent, TaskTag, UserTaskCounter, invalidate_task_analytics
+from .search import SEARCH_FIELDS, get_search_backend
+
+# 单次请求允许的最大任务数
+BULK_MAX_ITEMS = getattr(settings, 'TASK_BULK_MAX_ITEMS', 5000)
+
+# 单次请求允许批量创建的最大任务数
+BULK_CREATE_MAX_ITEMS = getattr(settings, 'TASK_BULK_CREATE_MAX_ITEMS', 10000)
+
+# 每批写入的任务数
+BULK_BATCH_SIZE = getattr(settings, 'TASK_BULK_BATCH_SIZE', 500)
+
+
+def parse_task_id(task_id):
+    """解析任务ID，无效时返回None"""
+    try:
+        return task_id if isinstance(task_id, uuid.UUID) else uuid.UUID(str(task_id))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _chunked(items, size):
+    """按指定大小切分列表"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class TaskBulkExecutor:
+    """
+    任务批量操作执行器
+
+    用法:
+        executor = TaskBulkExecutor(request.user)
+        targets, failures = executor.resolve(task_ids)
+        executor.soft_delete([task for _, task in targets])
+    """
+
+    def __init__(self, user, batch_size=None):
+        self.user = user
+        self.batch_size = batch_size or BULK_BATCH_SIZE
+
+    # ==================== 读取与校验 ====================
+
+    def fetch(self, task_ids, is_deleted=False):
+        """
+        通过 id__in 查询取出目标任务（仅在数据库参数数量受限时分批）
+
+        Returns:
+            dict: {任务UUID: 任务实例}
+        """
+        queryset = Task.all_objects.select_related('owner', 'assigned_to')
+        if is_deleted is not None:
+            queryset = queryset.filter(is_deleted=is_deleted)
+
+        task_ids = list(task_ids)
+        max_params = connection.features.max_query_params or len(task_ids) or 1
+
+        tasks = {}
+        for chunk in _chunked(task_ids, max_params):
+            for task in queryset.filter(id__in=chunk):
+                tasks[task.id] = task
+        return tasks
+
+    def resolve(self, raw_ids, is_deleted=False, missing_error='任务不存在或无权限访问',
+                permission_check=None, permission_error='没有权限编辑此任务'):
+        """
+        解析请求中的任务ID并在内存中完成存在性与权限校验
+
+        Args:
+            raw_ids: 请求中的任务ID列表（字符串或UUID）
+            is_deleted: 目标任务的删除状态，None 表示不限
+            missing_error: 任务不存在（或不属于当前用户）时的错误信息
+            permission_check: 额外的权限检查函数 (task, user) -> bool
+            permission_error: 权限检查失败时的错误信息
+
+        Returns:
+            tuple: ([(原始ID, 任务实例), ...], [{'id': 原始ID, 'error': 错误信息}, ...])
+        """
+        parsed = [(raw_id, parse_task_id(raw_id)) for raw_id in raw_ids]
+        failures = []
+
+        tasks = self.fetch({task_id for _, task_id in parsed if task_id is not None}, is_deleted=is_deleted)
+
+        targets = []
+        seen = set()
+        for raw_id, task_id in parsed:
+            if task_id is None:
+                failures.append({'id': raw_id, 'error': '无效的任务ID'})
+                continue
+
+            task = tasks.get(task_id)
+            if task is None or task.owner_id != self.user.id or task_id in seen:
+                failures.append({'id': raw_id, 'error': missing_error})
+                continue
+
+            if permission_check is not None and not permission_check(task, self.user):
+                failures.append({'id': raw_id, 'error': permission_error})
+                continue
+
+            seen.add(task_id)
+            targets.append((raw_id, task))
+
+        return targets, failures
+
+    # ==================== 写入 ====================
+
+    def save(self, tasks, fields):
+        """
+        在单个事务内通过 bulk_update() 写入已在内存中修改的任务，并增量更新用户任务计数器
+
+        Args:
+            tasks: 已修改的任务实例列表
+            fields: 需要写入的字段名
+        """
+        if not tasks:
+            return
+
+        now = timezone.now()
+        fields = set(fields) | {'updated_at'}
+        for task in tasks:
+            task.updated_at = now
+
+        with transaction.atomic():
+            previous_states = self._lock_counter_states(tasks)
+            transitions = [
+                (previous_states.get(task.pk),
+                 task._get_counter_state(update_fields=fields, previous_state=previous_states.get(task.pk)))
+                for task in tasks
+            ]
+            Task.all_objects.bulk_update(tasks, sorted(fields), batch_size=self.batch_size)
+            TaskEvent.record(tasks, transitions, actor=self.user)
+            self._apply_counter_transitions(tasks, transitions)
+            # bulk_update 不触发 post_save 信号，显式同步标签关联与搜索索引
+            if 'tags' in fields:
+                TaskTag.sync(tasks)
+            if fields & set(SEARCH_FIELDS):
+                get_search_backend().index_tasks(tasks)
+
+    def update(self, tasks, **values):
+        """
+        在单个事务内通过 QuerySet.update() 对任务写入相同的字段值
+
+        Args:
+            tasks: 目标任务实例列表
+            values: 字段值
+        """
+        if not tasks:
+            return
+
+        for task in tasks:
+            for field, value in values.items():
+                setattr(task, field, value)
+
+        with transaction.atomic():
+            previous_states = self._lock_counter_states(tasks)
+            transitions = [
+                (previous_states.get(task.pk),
+                 task._get_counter_state(update_fields=values, previous_state=previous_states.get(task.pk)))
+                for task in tasks
+            ]
+            for chunk in _chunked([task.id for task in tasks], self.batch_size):
+                Task.all_objects.filter(id__in=chunk).update(**values)
+            TaskEvent.record(tasks, transitions, actor=self.user)
+            self._apply_counter_transitions(tasks, transitions)
+            if 'tags' in values:
+                TaskTag.sync(tasks)
+            if set(values) & set(SEARCH_FIELDS):
+                get_search_backend().index_tasks(tasks)
+
+    def soft_delete(self, tasks):
+        """批量软删除"""
+        self.update(tasks, is_deleted=True, deleted_at=timezone.now(), deleted_by=self.user)
+
+    def restore(self, tasks):
+        """批量恢复"""
+        self.update(tasks, is_deleted=False, deleted_at=None, deleted_by=None)
+
+    def _lock_counter_states(self, tasks):
+        """
+        锁定目标任务行并读取写入前的计数相关字段
+
+        增量以数据库中的当前值为准，不使用任务加载时的快照（可能已被并发写入覆盖）
+
+        Returns:
+            dict: {任务ID: 计数状态元组}
+        """
+        task_ids = [task.pk for task in tasks]
+        max_params = connection.features.max_query_params or len(task_ids)
+        states = {}
+        for chunk in _chunked(task_ids, max_params):
+            states.update(Task.lock_counter_states(chunk))
+        return states
+
+    def _apply_counter_transitions(self, tasks, transitions):
+        """增量更新用户任务计数器与每日汇总，使相关用户的统计缓存失效，并刷新任务上的计数快照"""
+        missing = {task.owner_id for task, (previous_state, _) in zip(tasks, transitions) if previous_state is None}
+        known_transitions = [transition for transition in transitions if transition[0] is not None]
+        UserTaskCounter.apply_transitions(known_transitions)
+        TaskDailyRollup.apply_transitions(known_transitions)
+        if missing:
+            # 写入前已不存在的任务（并发硬删除），回退为全量重建
+            UserTaskCounter.rebuild(user_ids=list(missing))
+            missing_assignees = {
+                task.assigned_to_id for task, (previous_state, _) in zip(tasks, transitions)
+                if previous_state is None and task.assigned_to_id
+            }
+            TaskDailyRollup.rebuild(user_ids=list(missing | missing_assignees))
+        invalidate_task_analytics(transitions, [task.owner_id for task in tasks])
+
+        for task, (_, current_state) in zip(tasks, transitions):
+            task._counter_state = current_state
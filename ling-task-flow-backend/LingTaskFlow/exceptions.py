@@ -45,12 +45,16 @@ def custom_exception_handler(exc, context):
         # 处理不同类型的异常
         custom_response_data = _get_custom_response_data(exc, response)
 
-        return StandardAPIResponse.error(
+        custom_response = StandardAPIResponse.error(
             message=custom_response_data['message'],
             error_details=custom_response_data['error_details'],
             status_code=response.status_code,
             error_code=custom_response_data.get('error_code')
         )
+        # 保留节流异常的 Retry-After 响应头
+        if 'Retry-After' in response:
+            custom_response['Retry-After'] = response['Retry-After']
+        return custom_response
 
     # 处理未被DRF处理的异常
     return _handle_unhandled_exceptions(exc)
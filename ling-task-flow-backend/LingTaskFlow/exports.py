@@ -0,0 +1,110 @@
+"""
+LingTaskFlow 任务导出
+以 values() 投影 + iterator() 分块读取任务，流式生成 CSV / NDJSON，内存占用与任务数量无关
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.negotiation import DefaultContentNegotiation
+
+# 导出字段: (列名, values() 字段)
+EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('title', 'title'),
+    ('description', 'description'),
+    ('status', 'status'),
+    ('priority', 'priority'),
+    ('progress', 'progress'),
+    ('due_date', 'due_date'),
+    ('start_date', 'start_date'),
+    ('completed_at', 'completed_at'),
+    ('estimated_hours', 'estimated_hours'),
+    ('actual_hours', 'actual_hours'),
+    ('category', 'category'),
+    ('tags', 'tags'),
+    ('notes', 'notes'),
+    ('order', 'order'),
+    ('owner', 'owner__username'),
+    ('assigned_to', 'assigned_to__username'),
+    ('is_deleted', 'is_deleted'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+# 支持的导出格式: 格式 -> (Content-Type, 文件扩展名)
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson; charset=utf-8', 'ndjson'),
+}
+
+# 每次从数据库读取的行数
+EXPORT_CHUNK_SIZE = 2000
+
+
+class ExportContentNegotiation(DefaultContentNegotiation):
+    """
+    导出接口的内容协商
+    ?format= 用于选择导出格式而非 DRF 渲染器，错误响应统一使用第一个渲染器（JSON）
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        renderer = renderers[0]
+        return renderer, renderer.media_type
+
+
+class _Echo:
+    """csv.writer 使用的伪文件对象，write() 直接返回写入内容"""
+
+    def write(self, value):
+        return value
+
+
+def _format_value(value):
+    """将单元格值转换为 CSV 文本"""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """以 values() 投影分块迭代任务行，返回 {列名: 值} 字典"""
+    fields = [field for _, field in EXPORT_COLUMNS]
+    for row in queryset.values(*fields).iterator(chunk_size=chunk_size):
+        yield {column: row[field] for column, field in EXPORT_COLUMNS}
+
+
+def stream_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """流式生成 CSV（带 BOM，便于 Excel 正确识别中文）"""
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow([column for column, _ in EXPORT_COLUMNS])
+    for row in iter_rows(queryset, chunk_size):
+        yield writer.writerow([_format_value(value) for value in row.values()])
+
+
+def stream_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """流式生成 NDJSON（每行一个 JSON 对象）"""
+    for row in iter_rows(queryset, chunk_size):
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+def build_export_response(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    构建流式导出响应
+
+    Args:
+        queryset: 已过滤的任务查询集
+        export_format: 导出格式（csv / ndjson）
+    """
+    content_type, extension = EXPORT_FORMATS[export_format]
+    stream = stream_csv if export_format == 'csv' else stream_ndjson
+
+    response = StreamingHttpResponse(stream(queryset, chunk_size), content_type=content_type)
+    filename = f"tasks-{timezone.now().strftime('%Y%m%d-%H%M%S')}.{extension}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -5,7 +5,8 @@ LingTaskFlow 过滤器
 import django_filters
 from django.db.models import Q
 
-from .models import Task
+from .models import Task, Tag
+from .search import get_search_backend
 
 
 class TaskFilter(django_filters.FilterSet):
@@ -78,17 +79,12 @@ class TaskFilter(django_filters.FilterSet):
     def filter_search(self, queryset, name, value):
         """
         全文搜索功能
-        搜索标题、描述、分类和标签
+        通过搜索后端匹配标题、描述、分类和标签（多个关键词以空格分隔，需全部匹配）
         """
         if not value:
             return queryset
 
-        return queryset.filter(
-            Q(title__icontains=value) |
-            Q(description__icontains=value) |
-            Q(category__icontains=value) |
-            Q(tags__icontains=value)
-        )
+        return get_search_backend().search(queryset, value)
 
     def filter_is_assigned(self, queryset, name, value):
         """过滤是否已分配任务"""
@@ -133,15 +129,11 @@ class TaskFilter(django_filters.FilterSet):
         if not value:
             return queryset
 
-        # 支持多个标签搜索，用逗号分隔
-        tags = [tag.strip() for tag in value.split(',')]
-        q_objects = Q()
-
-        for tag in tags:
-            if tag:
-                q_objects |= Q(tags__icontains=tag)
-
-        return queryset.filter(q_objects)
+        # 支持多个标签（逗号分隔），匹配任一标签，通过标签关联表索引查询
+        tags = Tag.parse(value)
+        if not tags:
+            return queryset
+        return queryset.tagged(tags)
 
     def filter_include_deleted(self, queryset, name, value):
         """
@@ -150,9 +142,7 @@ class TaskFilter(django_filters.FilterSet):
         """
         if value is True and self.request.user.is_authenticated:
             # 返回包含软删除的查询集，但仍然限制为用户相关的任务
-            return Task.all_objects.filter(
-                Q(owner=self.request.user) | Q(assigned_to=self.request.user)
-            )
+            return Task.all_objects.visible_to(self.request.user)
         return queryset
 
     @property
@@ -167,6 +157,4 @@ class TaskFilter(django_filters.FilterSet):
             return parent.none()
 
         # 用户只能看到自己拥有或被分配的任务
-        return parent.filter(
-            Q(owner=user) | Q(assigned_to=user)
-        ).distinct()
+        return parent.visible_to(user)
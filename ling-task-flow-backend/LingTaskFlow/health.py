@@ -0,0 +1,157 @@
+"""
+LingTaskFlow 就绪检查
+并发探测数据库、缓存与媒体存储，每项在超时内完成才算可用，并报告各自的往返耗时。
+
+探测结果在进程内缓存 HEALTH_READY_CACHE_TTL 秒：负载均衡器高频检查时只有过期后的
+第一个请求执行探测，其余请求直接返回缓存结果。结果缓存在进程内存而不是 Django 缓存中，
+因为缓存本身就是被探测的依赖，并且每个 worker 应报告自己的连接状态。
+
+每个探测在独立的守护线程中执行，卡住的探测不会阻塞进程退出；上一次探测仍未结束时
+直接报告超时而不再启动新线程，依赖长时间不可用也不会累积探测线程。
+"""
+import concurrent.futures
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def probe_database():
+    """在每个数据库上执行 SELECT 1（探测线程使用独立连接，结束后关闭）"""
+    try:
+        for alias in connections:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+    finally:
+        connections.close_all()
+
+
+def probe_cache():
+    """写入、读回并删除一个随机键"""
+    key = f'health:ready:{uuid.uuid4().hex}'
+    value = uuid.uuid4().hex
+    cache.set(key, value, 30)
+    try:
+        if cache.get(key) != value:
+            raise RuntimeError('缓存读回的值与写入的值不一致')
+    finally:
+        cache.delete(key)
+
+
+def probe_storage():
+    """在媒体存储中写入并删除一个临时文件"""
+    name = default_storage.save(f'.health/{uuid.uuid4().hex}.txt', ContentFile(b'ok'))
+    default_storage.delete(name)
+
+
+READINESS_PROBES = {
+    'database': probe_database,
+    'cache': probe_cache,
+    'storage': probe_storage,
+}
+
+
+class ReadinessChecker:
+    """
+    就绪检查器
+
+    Args:
+        probes: 名称 -> 探测函数（抛出异常表示不可用）
+        timeout: 单次检查的超时时间（秒），所有探测并发执行
+        ttl: 结果缓存时间（秒），为 0 时每次都探测
+    """
+
+    def __init__(self, probes=None, timeout=None, ttl=None):
+        self.probes = probes if probes is not None else READINESS_PROBES
+        self.timeout = timeout if timeout is not None else getattr(settings, 'HEALTH_PROBE_TIMEOUT', 2.0)
+        self.ttl = ttl if ttl is not None else getattr(settings, 'HEALTH_READY_CACHE_TTL', 5)
+        self._lock = threading.Lock()
+        self._result = None
+        self._expires_at = 0.0
+        # 名称 -> 最近一次启动的探测 Future
+        self._pending = {}
+
+    def check(self, force=False):
+        """
+        返回就绪检查结果
+
+        Returns:
+            tuple: (是否全部可用, 结果字典)，结果字典中 cached 表示是否为缓存结果
+        """
+        with self._lock:
+            if not force and self._result is not None and time.monotonic() < self._expires_at:
+                ready, result = self._result
+                return ready, {**result, 'cached': True}
+
+            ready, result = self._run_probes()
+            self._result = (ready, result)
+            self._expires_at = time.monotonic() + self.ttl
+            return ready, {**result, 'cached': False}
+
+    def reset(self):
+        with self._lock:
+            self._result = None
+            self._expires_at = 0.0
+
+    def _run_probes(self):
+        started = time.perf_counter()
+        checks = {}
+        futures = {}
+        for name, probe in self.probes.items():
+            previous = self._pending.get(name)
+            if previous is not None and not previous.done():
+                checks[name] = {'status': 'timeout', 'latency_ms': round(self.timeout * 1000, 2),
+                                'error': '上一次探测仍未完成'}
+                continue
+            futures[name] = self._pending[name] = self._start(probe)
+        deadline = started + self.timeout
+
+        for name, future in futures.items():
+            try:
+                latency, error = future.result(timeout=max(0.0, deadline - time.perf_counter()))
+            except concurrent.futures.TimeoutError:
+                checks[name] = {'status': 'timeout', 'latency_ms': round(self.timeout * 1000, 2),
+                                'error': f'探测超过 {self.timeout} 秒未完成'}
+                continue
+            checks[name] = {'status': 'error' if error else 'ok', 'latency_ms': round(latency * 1000, 2)}
+            if error:
+                checks[name]['error'] = error
+
+        checks = {name: checks[name] for name in self.probes}  # 按探测定义顺序输出
+        ready = all(check['status'] == 'ok' for check in checks.values())
+        if not ready:
+            failed = {name: check['status'] for name, check in checks.items() if check['status'] != 'ok'}
+            logger.warning(f'就绪检查失败: {failed}')
+        return ready, {'checks': checks, 'checked_at': timezone.now().isoformat()}
+
+    def _start(self, probe):
+        """在守护线程中执行探测，返回结果为 (耗时, 错误信息) 的 Future"""
+        future = concurrent.futures.Future()
+        threading.Thread(
+            target=lambda: future.set_result(self._timed(probe)), name='readiness-probe', daemon=True
+        ).start()
+        return future
+
+    @staticmethod
+    def _timed(probe):
+        """执行探测，返回 (耗时, 错误信息)"""
+        started = time.perf_counter()
+        try:
+            probe()
+            error = None
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+        return time.perf_counter() - started, error
+
+
+readiness_checker = ReadinessChecker()
@@ -0,0 +1,295 @@
+"""
+LingTaskFlow 任务导入
+从上传文件增量解析 CSV / NDJSON，按 TaskCreateSerializer 规则逐行验证，
+分块 bulk_create 写入并记录作业进度
+
+作业默认在 Web 进程的后台线程中执行；设置 TASK_IMPORT_WORKER 后改由
+`python manage.py run_import_jobs` 领取执行。执行进程被回收或强制终止时作业会停留在
+导入中，超过 TASK_IMPORT_STALE_TIMEOUT 秒没有进度的作业在查询状态或 worker 轮询时标记为失败
+"""
+import csv
+import io
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import TaskImportJob
+from .serializers import TaskCreateSerializer
+
+logger = logging.getLogger(__name__)
+
+# 每个事务写入的行数
+IMPORT_CHUNK_SIZE = getattr(settings, 'TASK_IMPORT_CHUNK_SIZE', 500)
+
+# 作业中保留的行错误数量上限
+IMPORT_MAX_ERRORS = getattr(settings, 'TASK_IMPORT_MAX_ERRORS', 100)
+
+# 导入中作业超过该秒数没有进度即视为执行进程已中断
+IMPORT_STALE_TIMEOUT = getattr(settings, 'TASK_IMPORT_STALE_TIMEOUT', 300)
+
+# 可导入的列（与 TaskCreateSerializer 字段一致，attachment 除外）
+IMPORT_FIELDS = (
+    'title', 'description', 'status', 'priority', 'progress',
+    'due_date', 'start_date', 'estimated_hours', 'category',
+    'tags', 'notes', 'assigned_to'
+)
+
+
+def detect_format(file_name, requested_format=None):
+    """根据请求参数或文件扩展名确定导入格式，无法识别时返回None"""
+    if requested_format:
+        requested_format = requested_format.lower()
+        return requested_format if requested_format in dict(TaskImportJob.FORMAT_CHOICES) else None
+
+    extension = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+    if extension == 'csv':
+        return 'csv'
+    if extension in ('ndjson', 'jsonl'):
+        return 'ndjson'
+    return None
+
+
+def iter_raw_rows(fileobj, file_format):
+    """
+    增量读取上传文件中的行，不把整个文件读入内存
+
+    Yields:
+        tuple: (行号, 行数据字典或None, 解析错误或None)
+    """
+    if file_format == 'csv':
+        text = io.TextIOWrapper(getattr(fileobj, 'file', fileobj), encoding='utf-8-sig', newline='')
+        reader = csv.DictReader(text)
+        for row_number, row in enumerate(reader, start=2):  # 第1行为表头
+            yield row_number, row, None
+        return
+
+    for row_number, line in enumerate(fileobj, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except (UnicodeDecodeError, ValueError) as e:
+            yield row_number, None, f'JSON解析失败: {e}'
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, '每行必须是一个JSON对象'
+            continue
+        yield row_number, row, None
+
+
+class TaskImporter:
+    """
+    任务导入执行器
+
+    用法:
+        TaskImporter(job).run()
+    """
+
+    def __init__(self, job, chunk_size=None):
+        self.job = job
+        self.chunk_size = chunk_size or IMPORT_CHUNK_SIZE
+        self.child = TaskCreateSerializer()
+        self.list_serializer = TaskCreateSerializer(many=True)
+        self._user_ids = {}
+
+    def _clean_row(self, row):
+        """只保留可导入的列，空值视为未提供以便应用智能默认值"""
+        data = {}
+        for field in IMPORT_FIELDS:
+            value = row.get(field)
+            if isinstance(value, str):
+                value = value.strip()
+            if value in (None, ''):
+                continue
+            data[field] = value
+
+        # 导出文件中的执行者为用户名，这里转换为用户ID（找不到时保留原值，由验证报告错误）
+        assigned_to = data.get('assigned_to')
+        if isinstance(assigned_to, str) and not assigned_to.isdigit():
+            if assigned_to not in self._user_ids:
+                self._user_ids[assigned_to] = User.objects.filter(
+                    username=assigned_to
+                ).values_list('id', flat=True).first()
+            data['assigned_to'] = self._user_ids[assigned_to] or assigned_to
+        return data
+
+    def claim(self):
+        """
+        领取作业：只有等待中的作业可以开始执行，多个进程同时领取时只有一个成功
+
+        Returns:
+            bool: 是否领取成功
+        """
+        now = timezone.now()
+        return bool(TaskImportJob.objects.filter(pk=self.job.pk, status='PENDING').update(
+            status='RUNNING', started_at=now, progress_at=now
+        ))
+
+    def run(self):
+        """领取并执行导入；作业已被其他进程领取或已结束时直接返回作业的当前状态"""
+        if self.claim():
+            self.execute()
+        self.job.refresh_from_db()
+        return self.job
+
+    def execute(self):
+        """执行已领取的作业，逐块写入并更新作业进度，结束后删除上传的导入文件"""
+        job = self.job
+        try:
+            with job.file.open('rb') as fileobj:
+                chunk, errors, processed = [], [], 0
+                for row_number, row, parse_error in iter_raw_rows(fileobj, job.file_format):
+                    processed += 1
+                    if parse_error:
+                        errors.append({'row': row_number, 'error': parse_error})
+                    else:
+                        try:
+                            validated = self.child.run_validation(self._clean_row(row))
+                        except serializers.ValidationError as e:
+                            errors.append({'row': row_number, 'error': e.detail})
+                        else:
+                            validated['owner'] = job.user
+                            chunk.append(validated)
+
+                    if processed % self.chunk_size == 0:
+                        self._flush(chunk, errors, processed)
+                        chunk, errors, processed = [], [], 0
+
+                self._flush(chunk, errors, processed)
+
+            # 只结束仍在导入中的作业，已因超时被标记为失败的作业保持失败
+            finish_import_job(job, TaskImportJob.objects.filter(pk=job.pk, status='RUNNING'), status='COMPLETED')
+        except Exception as e:
+            logger.error(f"任务导入作业 {job.pk} 失败: {str(e)}", exc_info=True)
+            finish_import_job(job, status='FAILED', error_message=str(e))
+
+    def _flush(self, chunk, errors, processed):
+        """在单个事务中写入一块有效行并累加作业进度"""
+        if not processed:
+            return
+
+        with transaction.atomic():
+            if chunk:
+                self.list_serializer.create(chunk)
+
+            updates = {
+                'rows_processed': F('rows_processed') + processed,
+                'rows_created': F('rows_created') + len(chunk),
+                'rows_failed': F('rows_failed') + len(errors),
+                'progress_at': timezone.now(),
+            }
+            if errors:
+                stored_errors = TaskImportJob.objects.filter(pk=self.job.pk).values_list('errors', flat=True).first()
+                remaining = IMPORT_MAX_ERRORS - len(stored_errors or [])
+                if remaining > 0:
+                    updates['errors'] = (stored_errors or []) + json.loads(
+                        json.dumps(errors[:remaining], ensure_ascii=False, default=str)
+                    )
+            TaskImportJob.objects.filter(pk=self.job.pk).update(**updates)
+
+
+def finish_import_job(job, queryset=None, **updates):
+    """
+    记录作业的结束状态并删除上传的导入文件
+
+    Args:
+        queryset: 限定更新条件的查询集，默认只按作业ID
+        updates: 需要写入的字段（status、error_message 等）
+
+    Returns:
+        bool: 是否写入了结束状态
+    """
+    queryset = TaskImportJob.objects.filter(pk=job.pk) if queryset is None else queryset
+    if not queryset.update(finished_at=timezone.now(), file='', **updates):
+        return False
+    if job.file:
+        try:
+            job.file.delete(save=False)
+        except OSError:
+            logger.warning(f'删除导入文件失败: {job.file.name}', exc_info=True)
+    return True
+
+
+def fail_stale_import_jobs(queryset=None):
+    """
+    把超过 IMPORT_STALE_TIMEOUT 秒没有进度的导入中作业标记为失败
+
+    执行进程中断前已提交的分块保留，rows_created 为实际创建的任务数
+
+    Args:
+        queryset: 限定检查范围的作业查询集，默认检查全部作业
+
+    Returns:
+        int: 标记为失败的作业数
+    """
+    queryset = TaskImportJob.objects.all() if queryset is None else queryset
+    cutoff = timezone.now() - timedelta(seconds=IMPORT_STALE_TIMEOUT)
+    stale = Q(status='RUNNING') & (Q(progress_at__lt=cutoff) | Q(progress_at__isnull=True, started_at__lt=cutoff))
+
+    count = 0
+    for job in queryset.filter(stale):
+        # 带条件更新，执行进程恰好写入了新的进度时不标记
+        if finish_import_job(job, TaskImportJob.objects.filter(stale, pk=job.pk), status='FAILED',
+                             error_message=f'导入进程中断，超过 {IMPORT_STALE_TIMEOUT} 秒没有进度'):
+            logger.warning(f'任务导入作业 {job.pk} 长时间没有进度，已标记为失败')
+            count += 1
+    return count
+
+
+def run_pending_import_jobs(limit=None):
+    """
+    领取并依次执行等待中的导入作业（供 run_import_jobs 命令调用）
+
+    Returns:
+        int: 本次执行的作业数
+    """
+    fail_stale_import_jobs()
+    job_ids = TaskImportJob.objects.filter(status='PENDING').order_by('created_at').values_list('pk', flat=True)
+    if limit:
+        job_ids = job_ids[:limit]
+
+    count = 0
+    for job_id in list(job_ids):
+        importer = TaskImporter(TaskImportJob.objects.select_related('user').get(pk=job_id))
+        if importer.claim():
+            importer.execute()
+            count += 1
+    return count
+
+
+def _run_in_thread(job_id):
+    """后台线程入口：使用独立的数据库连接执行导入"""
+    close_old_connections()
+    try:
+        TaskImporter(TaskImportJob.objects.select_related('user').get(pk=job_id)).run()
+    finally:
+        close_old_connections()
+
+
+def start_import_job(job):
+    """
+    启动导入作业
+
+    TASK_IMPORT_WORKER 为 True 时保持等待中，由 run_import_jobs 命令领取执行；
+    否则 TASK_IMPORT_ASYNC 为 True（默认）时在事务提交后于后台线程执行，请求立即返回；
+    为 False 时在当前请求中同步执行（用于测试或命令行）
+    """
+    if getattr(settings, 'TASK_IMPORT_WORKER', False):
+        return job
+
+    if not getattr(settings, 'TASK_IMPORT_ASYNC', True):
+        return TaskImporter(job).run()
+
+    transaction.on_commit(
+        lambda: threading.Thread(target=_run_in_thread, args=(job.pk,), daemon=True).start()
+    )
+    return job
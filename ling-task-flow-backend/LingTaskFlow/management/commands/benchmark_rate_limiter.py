@@ -0,0 +1,87 @@
+"""
+速率限制微基准命令
+在多线程并发下测量每次限流检查的开销，并核对计数是否有丢失
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from LingTaskFlow.rate_limiter import RATE_LIMIT_ALGORITHMS, get_rate_limiter
+
+
+class Command(BaseCommand):
+    help = '多线程并发下测量限流检查开销（使用当前配置的缓存后端）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='并发线程数（默认 8）'
+        )
+        parser.add_argument(
+            '--checks',
+            type=int,
+            default=2000,
+            help='每个线程执行的检查次数（默认 2000）'
+        )
+        parser.add_argument(
+            '--algorithm',
+            action='append',
+            dest='algorithms',
+            choices=sorted(RATE_LIMIT_ALGORITHMS),
+            help='只测量指定算法，可重复指定（默认全部）'
+        )
+        parser.add_argument(
+            '--per-thread-keys',
+            action='store_true',
+            help='每个线程使用独立的限流键（默认所有线程竞争同一个键）'
+        )
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        checks = options['checks']
+        algorithms = options.get('algorithms') or sorted(RATE_LIMIT_ALGORITHMS)
+        total = threads * checks
+
+        self.stdout.write(f"缓存后端: {settings.CACHES['default']['BACKEND']}，{threads} 线程 × {checks} 次检查")
+        for algorithm in algorithms:
+            # 限额大于总检查次数，保证每次检查都放行并计数
+            limiter = get_rate_limiter(total + 1, 3600, algorithm, prefix=f'benchmark:{uuid.uuid4().hex}')
+            elapsed, counted = self._run(limiter, threads, checks, options['per_thread_keys'])
+            self.stdout.write(
+                f'{algorithm:<8} 每次检查 {elapsed / total * 1e6:8.1f} µs，'
+                f'吞吐 {total / elapsed:10.0f} 次/秒，计数 {counted}/{total}'
+            )
+            if counted != total:
+                self.stdout.write(self.style.WARNING(f'{algorithm} 计数丢失 {total - counted} 次'))
+
+    def _run(self, limiter, threads, checks, per_thread_keys):
+        barrier = threading.Barrier(threads + 1)
+        results = [None] * threads
+
+        def worker(index):
+            key = f'thread-{index}' if per_thread_keys else 'shared'
+            barrier.wait()
+            last = None
+            for _ in range(checks):
+                last = limiter.hit(key)
+            results[index] = last
+
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        for thread in workers:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        if per_thread_keys:
+            counted = sum(limiter.limit - result.remaining for result in results)
+        else:
+            counted = limiter.limit - min(result.remaining for result in results)
+        return elapsed, counted
@@ -0,0 +1,92 @@
+"""
+任务列表序列化基准命令
+在回滚的事务中生成测试任务，对比 TaskListSerializer 与 values() 快速路径的吞吐
+"""
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from LingTaskFlow.models import Task
+from LingTaskFlow.serializers import TaskListSerializer
+
+
+class Command(BaseCommand):
+    help = '对比任务列表序列化器与 values() 快速路径的每秒渲染行数（测试数据在事务中回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-sizes',
+            default='20,100,1000',
+            help='逗号分隔的每页数量（默认 20,100,1000）'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='每种页大小重复测量的次数，取最快一次（默认 5）'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            page_sizes = [int(size) for size in options['page_sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--page-sizes 必须是逗号分隔的整数')
+        if not page_sizes or min(page_sizes) < 1:
+            raise CommandError('--page-sizes 必须是正整数')
+
+        with transaction.atomic():
+            queryset = self._create_tasks(max(page_sizes))
+            for page_size in page_sizes:
+                page = queryset[:page_size]
+                serializer_time, serializer_queries = self._measure(
+                    lambda: TaskListSerializer(page.all(), many=True).data, options['repeat']
+                )
+                values_time, values_queries = self._measure(
+                    lambda: TaskListSerializer.render_values(TaskListSerializer.values_queryset(page)),
+                    options['repeat']
+                )
+                self.stdout.write(
+                    f'每页 {page_size:>5}: '
+                    f'序列化器 {page_size / serializer_time:10.0f} 行/秒（{serializer_queries} 次查询），'
+                    f'values() {page_size / values_time:10.0f} 行/秒（{values_queries} 次查询），'
+                    f'加速 {serializer_time / values_time:.1f}x'
+                )
+            transaction.set_rollback(True)
+
+    def _create_tasks(self, count):
+        suffix = uuid.uuid4().hex[:8]
+        owner = User.objects.create_user(username=f'benchmark_owner_{suffix}')
+        assignee = User.objects.create_user(username=f'benchmark_assignee_{suffix}')
+        now = timezone.now()
+        statuses = [value for value, _ in Task.STATUS_CHOICES]
+        priorities = [value for value, _ in Task.PRIORITY_CHOICES]
+        Task.objects.bulk_create([
+            Task(
+                title=f'基准任务{index}',
+                description='基准测试任务描述',
+                owner=owner,
+                assigned_to=assignee if index % 2 else None,
+                status=statuses[index % len(statuses)],
+                priority=priorities[index % len(priorities)],
+                due_date=now + timedelta(hours=index % 200 - 100) if index % 3 else None,
+                tags='基准, 测试',
+            )
+            for index in range(count)
+        ])
+        return Task.objects.visible_to(owner).order_by('-created_at')
+
+    def _measure(self, render, repeat):
+        best = None
+        for _ in range(max(1, repeat)):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                render()
+                elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, len(queries)
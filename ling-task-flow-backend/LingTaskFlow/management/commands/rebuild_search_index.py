@@ -0,0 +1,21 @@
+"""
+任务全文搜索索引重建命令
+清空并从任务表重新导入搜索影子表（仅 SQLite FTS5 后端需要）
+"""
+from django.core.management.base import BaseCommand
+
+from LingTaskFlow.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = '重建任务全文搜索索引'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        count = backend.rebuild()
+
+        if count == 0 and backend.name != 'sqlite_fts':
+            self.stdout.write(self.style.SUCCESS(f'搜索后端 {backend.name} 无需重建索引'))
+            return
+
+        self.stdout.write(self.style.SUCCESS(f'已重建搜索索引（{backend.name}），共 {count} 个任务'))
@@ -0,0 +1,34 @@
+"""
+任务每日汇总重建命令
+从任务表全量重建 TaskDailyRollup，用于初始化或修复增量维护产生的偏差
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from LingTaskFlow.models import TaskDailyRollup
+
+
+class Command(BaseCommand):
+    help = '从任务表重建任务每日汇总'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='只重建指定用户名的汇总，可重复指定'
+        )
+
+    def handle(self, *args, **options):
+        usernames = options.get('usernames')
+
+        user_ids = None
+        if usernames:
+            users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+            missing = sorted(set(usernames) - set(users))
+            if missing:
+                raise CommandError(f"用户不存在: {', '.join(missing)}")
+            user_ids = list(users.values())
+
+        count = TaskDailyRollup.rebuild(user_ids=user_ids)
+        self.stdout.write(self.style.SUCCESS(f'已重建 {count} 条任务每日汇总'))
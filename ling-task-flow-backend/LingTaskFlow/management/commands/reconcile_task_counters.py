@@ -0,0 +1,53 @@
+"""
+用户任务计数器对账命令
+从任务表全量重建 UserTaskCounter 并报告与存储值之间的偏差
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from LingTaskFlow.models import UserTaskCounter
+
+
+class Command(BaseCommand):
+    help = '从任务表重建用户任务计数器，并报告计数偏差'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='只对指定用户名对账，可重复指定'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='只报告偏差，不写入数据库'
+        )
+
+    def handle(self, *args, **options):
+        usernames = options.get('usernames')
+        dry_run = options['dry_run']
+
+        user_ids = None
+        if usernames:
+            users = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+            missing = sorted(set(usernames) - set(users))
+            if missing:
+                raise CommandError(f"用户不存在: {', '.join(missing)}")
+            user_ids = list(users.values())
+
+        drift = UserTaskCounter.rebuild(user_ids=user_ids, dry_run=dry_run)
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('计数器与任务表一致，无偏差'))
+            return
+
+        usernames_by_id = dict(User.objects.filter(id__in=drift).values_list('id', 'username'))
+        for user_id, fields in drift.items():
+            details = ', '.join(
+                f'{field}: {stored} -> {actual}' for field, (stored, actual) in fields.items()
+            )
+            self.stdout.write(self.style.WARNING(f'[{usernames_by_id.get(user_id, user_id)}] {details}'))
+
+        action = '发现' if dry_run else '已修复'
+        self.stdout.write(self.style.SUCCESS(f'{action} {len(drift)} 个用户的计数偏差'))
@@ -0,0 +1,39 @@
+"""
+任务导入作业执行命令
+领取并执行等待中的导入作业，同时把长时间没有进度的导入中作业标记为失败。
+设置 TASK_IMPORT_WORKER = True 后由本命令（而不是 Web 进程的后台线程）执行导入
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from LingTaskFlow.imports import run_pending_import_jobs
+
+
+class Command(BaseCommand):
+    help = '领取并执行等待中的任务导入作业'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='处理完当前等待中的作业后退出，默认持续轮询'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='没有等待中的作业时的轮询间隔（秒）'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = run_pending_import_jobs()
+            if count:
+                self.stdout.write(self.style.SUCCESS(f'已执行 {count} 个导入作业'))
+            if options['once']:
+                if not count:
+                    self.stdout.write('没有等待中的导入作业')
+                break
+            if not count:
+                time.sleep(options['interval'])
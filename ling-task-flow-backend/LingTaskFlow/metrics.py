@@ -0,0 +1,300 @@
+"""
+LingTaskFlow 指标导出
+进程内的计数器与直方图，以 Prometheus 文本格式（0.0.4）从 /api/metrics/ 导出。
+
+多 worker 部署（Gunicorn）时设置 METRICS_MULTIPROC_DIR：每个进程处理第一个请求时启动
+定时写入线程，每 METRICS_FLUSH_INTERVAL 秒把自己的计数快照写入 <目录>/<pid>-<随机串>.json
+（正常退出时再写一次），worker 空闲或被强制终止时最多丢失最后一个间隔内的计数。
+导出时合并目录中所有进程的快照，任一 worker 响应抓取都能得到全部 worker 的总和。
+已退出进程的快照保留（计数器单调递增），文件名中的随机串保证复用进程号的新进程不会
+覆盖旧进程的快照；部署启动前应清空该目录。
+"""
+import atexit
+import bisect
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 请求耗时（秒）直方图的默认分桶
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f'{{{pairs}}}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class _Metric:
+    """指标基类：按标签值元组保存样本，写操作由注册表的锁保护"""
+
+    type = None
+
+    def __init__(self, registry, name, documentation, labelnames):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels):
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError as e:
+            raise ValueError(f'指标 {self.name} 缺少标签: {e.args[0]}')
+
+    def _merge(self, values, key, value):
+        raise NotImplementedError
+
+    def _render(self, values):
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _merge(self, values, key, value):
+        values[key] = values.get(key, 0.0) + value
+
+    def _render(self, values):
+        for key, value in sorted(values.items()):
+            yield f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}'
+
+
+class Histogram(_Metric):
+    """
+    直方图
+    每组标签保存各分桶的（非累计）计数与观测值总和，导出时转换为累计分桶
+    """
+
+    type = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames, buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bucket) for bucket in buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.registry._lock:
+            state = self._values.get(key)
+            if state is None:
+                # 末尾两项：+Inf 分桶计数、观测值总和
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def _merge(self, values, key, value):
+        if len(value) != len(self.buckets) + 2:
+            return  # 分桶定义已变更的旧快照
+        state = values.get(key)
+        if state is None:
+            values[key] = list(value)
+        else:
+            values[key] = [a + b for a, b in zip(state, value)]
+
+    def _render(self, values):
+        bucket_labels = self.labelnames + ('le',)
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state):
+                cumulative += count
+                labels = _format_labels(bucket_labels, key + (_format_value(bound),))
+                yield f'{self.name}_bucket{labels} {_format_value(cumulative)}'
+            labels = _format_labels(self.labelnames, key)
+            yield f'{self.name}_sum{labels} {_format_value(state[-1])}'
+            yield f'{self.name}_count{labels} {_format_value(cumulative)}'
+
+
+class MetricsRegistry:
+    """
+    指标注册表
+
+    Args:
+        multiprocess_dir: 多进程快照目录，None 表示只导出当前进程
+        flush_interval: 定时写入快照的间隔（秒）
+    """
+
+    def __init__(self, multiprocess_dir=None, flush_interval=1.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._init_process()
+
+    def _init_process(self):
+        """初始化进程相关的状态：进程号、快照文件随机串、锁与定时写入线程标记"""
+        self.pid = os.getpid()
+        self.nonce = uuid.uuid4().hex[:12]
+        # fork 时其他线程可能正持有锁，子进程中只剩当前线程，直接换用新锁
+        self._lock = threading.Lock()
+        # 串行化快照写入，保证后写入的快照不会被先开始的写入覆盖
+        self._flush_lock = threading.Lock()
+        self._flusher = None
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'指标已注册: {metric.name}')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def reset(self):
+        """清空当前进程的样本（fork 出的子进程从零开始计数，使用新的快照文件）"""
+        self._init_process()
+        for metric in self._metrics.values():
+            metric._values.clear()
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                name: {key: list(value) if isinstance(value, list) else value
+                       for key, value in metric._values.items()}
+                for name, metric in self._metrics.items()
+            }
+
+    def _snapshot_path(self):
+        return os.path.join(self.multiprocess_dir, f'{self.pid}-{self.nonce}.json')
+
+    def start_flusher(self):
+        """
+        启动当前进程的定时写入线程（已启动时直接返回）
+
+        在请求处理中调用而不是在导入时启动：预加载应用的 Gunicorn 主进程不处理请求，
+        fork 出的 worker 中线程不会被继承，由各 worker 自己启动
+        """
+        if not self.multiprocess_dir or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(target=self._flush_loop, args=(self.nonce,),
+                                             name='metrics-flush', daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self, nonce):
+        # reset() 更换随机串后旧线程退出
+        while self.nonce == nonce:
+            time.sleep(self.flush_interval)
+            if self.nonce == nonce:
+                self.flush()
+
+    def flush(self):
+        """把当前进程的快照写入多进程目录（先写临时文件再原子替换）"""
+        if not self.multiprocess_dir:
+            return
+        path = self._snapshot_path()
+        tmp_path = f'{path}.tmp'
+        with self._flush_lock:
+            data = {name: [[list(key), value] for key, value in values.items()]
+                    for name, values in self._snapshot().items()}
+            try:
+                os.makedirs(self.multiprocess_dir, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, path)
+            except OSError:
+                logger.exception(f'指标快照写入失败: {path}')
+
+    def collect(self):
+        """
+        合并当前进程与其他进程快照中的样本
+
+        Returns:
+            dict: 指标名称 -> {标签值元组: 样本}
+        """
+        merged = self._snapshot()
+        if not self.multiprocess_dir:
+            return merged
+
+        own_path = self._snapshot_path()
+        for path in glob.glob(os.path.join(self.multiprocess_dir, '*.json')):
+            if path == own_path:
+                continue
+            try:
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                logger.warning(f'跳过无法读取的指标快照: {path}')
+                continue
+            for name, samples in data.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in samples:
+                    metric._merge(merged[name], tuple(key), value)
+        return merged
+
+    def render(self):
+        """以 Prometheus 文本格式导出全部指标"""
+        collected = self.collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f'# HELP {name} {metric.documentation}')
+            lines.append(f'# TYPE {name} {metric.type}')
+            lines.extend(metric._render(collected[name]))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry(
+    multiprocess_dir=getattr(settings, 'METRICS_MULTIPROC_DIR', None),
+    flush_interval=getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0),
+)
+os.register_at_fork(after_in_child=registry.reset)
+atexit.register(registry.flush)
+
+HTTP_REQUESTS = registry.counter(
+    'lingtaskflow_http_requests_total', 'HTTP 请求数', ('view', 'action', 'method', 'status')
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    'lingtaskflow_http_request_duration_seconds', 'HTTP 请求处理耗时（秒）', ('view', 'action', 'method')
+)
+DB_QUERIES = registry.histogram(
+    'lingtaskflow_db_queries_per_request', '每个请求执行的 SQL 查询数', ('view', 'action'),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+)
+DB_DURATION = registry.histogram(
+    'lingtaskflow_db_duration_seconds', '每个请求的 SQL 执行总耗时（秒）', ('view', 'action')
+)
+CACHE_REQUESTS = registry.counter(
+    'lingtaskflow_cache_requests_total', '业务缓存查找次数（result 为 hit 或 miss）', ('cache', 'result')
+)
+LOGIN_ATTEMPTS = registry.counter(
+    'lingtaskflow_login_attempts_total', '登录与 Token 刷新尝试次数', ('type', 'status')
+)
+BULK_OPERATION_SIZE = registry.histogram(
+    'lingtaskflow_bulk_operation_size', '批量操作请求的任务数', ('operation',),
+    buckets=(1, 10, 50, 100, 500, 1000, 5000, 10000)
+)
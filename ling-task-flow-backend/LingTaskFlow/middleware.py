@@ -0,0 +1,359 @@
+"""
+LingTaskFlow 中间件
+安全响应头、全局速率限制、设备追踪、审计日志，以及请求性能采集（Server-Timing）
+"""
+import json
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from . import metrics
+from .rate_limiter import get_rate_limiter, ip_key, rate_limit_exceeded_response
+from .utils import generate_device_fingerprint, get_client_ip
+
+logger = logging.getLogger(__name__)
+
+# 不做限流与审计的路径前缀（静态资源、媒体文件、健康检查、指标抓取）
+EXEMPT_PATH_PREFIXES = ('/static/', '/media/', '/favicon.ico', '/api/health/', '/api/metrics/')
+
+# 审计日志中需要脱敏的字段（按子串匹配，不区分大小写）
+SENSITIVE_FIELDS = ('password', 'token', 'secret', 'credit_card', 'card_number', 'cvv', 'ssn')
+
+# 常见自动化客户端的 User-Agent 特征
+SUSPICIOUS_USER_AGENT_PATTERN = re.compile(
+    r'bot|crawler|spider|scrapy|curl|wget|python-requests|httpclient|sqlmap|nikto', re.IGNORECASE
+)
+
+
+def _is_exempt(path):
+    return path.startswith(EXEMPT_PATH_PREFIXES)
+
+
+class SecurityHeadersMiddleware:
+    """
+    安全响应头中间件
+    使用 setdefault 写入，视图或其他中间件已设置的同名响应头保持不变
+    """
+
+    HEADERS = {
+        'X-Content-Type-Options': 'nosniff',
+        'X-Frame-Options': 'DENY',
+        'X-XSS-Protection': '1; mode=block',
+        'Referrer-Policy': 'strict-origin-when-cross-origin',
+    }
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.content_security_policy = getattr(
+            settings, 'SECURITY_CONTENT_SECURITY_POLICY', "default-src 'self'"
+        )
+        self.hsts_seconds = getattr(settings, 'SECURITY_HSTS_SECONDS', 31536000)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        for header, value in self.HEADERS.items():
+            response.setdefault(header, value)
+        response.setdefault('Content-Security-Policy', self.content_security_policy)
+
+        # HSTS 只对 HTTPS 请求下发（包括反向代理终止 TLS 的情况）
+        if request.is_secure() or request.META.get('HTTP_X_FORWARDED_PROTO') == 'https':
+            response.setdefault(
+                'Strict-Transport-Security', f'max-age={self.hsts_seconds}; includeSubDomains'
+            )
+        return response
+
+
+class RateLimitMiddleware:
+    """
+    全局速率限制中间件
+    按客户端IP使用滑动窗口计数，超出限额时返回 429；所有受限请求都附带
+    X-RateLimit-Limit / X-RateLimit-Remaining / X-RateLimit-Reset 响应头
+    """
+
+    window = 60
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.max_requests_per_minute = getattr(settings, 'RATE_LIMIT_REQUESTS_PER_MINUTE', 120)
+
+    def __call__(self, request):
+        if _is_exempt(request.path):
+            return self.get_response(request)
+
+        # 每次按当前限额创建限流器（只是普通对象，计数保存在缓存中）
+        limiter = get_rate_limiter(self.max_requests_per_minute, self.window, prefix='ratelimit:global')
+        result = limiter.hit(ip_key(request))
+
+        if result.allowed:
+            response = self.get_response(request)
+        else:
+            logger.warning(f'全局速率限制触发: IP {get_client_ip(request)} {request.method} {request.path}')
+            response = rate_limit_exceeded_response(result)
+
+        response['X-RateLimit-Limit'] = str(result.limit)
+        response['X-RateLimit-Remaining'] = str(result.remaining)
+        response['X-RateLimit-Reset'] = str(math.ceil(time.time() / self.window) * self.window)
+        return response
+
+
+class DeviceTrackingMiddleware:
+    """
+    设备追踪中间件
+    为请求附加 device_fingerprint 与 is_suspicious_device 属性；
+    已认证用户从未登录过的设备访问时记录日志（每个用户与设备组合每天最多查询一次）
+    """
+
+    SEEN_CACHE_TIMEOUT = 60 * 60 * 24
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        fingerprint = generate_device_fingerprint(request)
+        request.device_fingerprint = fingerprint
+
+        user_agent = request.META.get('HTTP_USER_AGENT', '')
+        request.is_suspicious_device = not user_agent or bool(SUSPICIOUS_USER_AGENT_PATTERN.search(user_agent))
+
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated and not _is_exempt(request.path):
+            self._track_device(request, user, fingerprint)
+
+        return self.get_response(request)
+
+    def _track_device(self, request, user, fingerprint):
+        from .models import LoginHistory
+
+        seen_key = f'device_seen:{user.pk}:{fingerprint}'
+        if cache.get(seen_key):
+            return
+        if LoginHistory.is_new_device(user, fingerprint):
+            logger.info(
+                f'新设备访问: 用户 {user.username} IP {get_client_ip(request)} '
+                f'设备 {request.META.get("HTTP_USER_AGENT", "")[:100]}'
+            )
+        cache.set(seen_key, True, self.SEEN_CACHE_TIMEOUT)
+
+
+class AuditLogMiddleware:
+    """
+    审计日志中间件
+    记录 API 请求的方法、路径、状态码、用户、IP 与耗时，表单与 JSON 参数中的敏感字段替换为 ***；
+    401/403 响应记录为警告
+    """
+
+    MAX_BODY_LOG_SIZE = 10 * 1024
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        path = request.path
+        if _is_exempt(path) or not path.startswith('/api/'):
+            return self.get_response(request)
+
+        # 先读取参数：视图可能消费请求流，之后无法再读取
+        params = self._request_params(request) if logger.isEnabledFor(logging.INFO) else None
+        started = time.perf_counter()
+        response = self.get_response(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        user = getattr(request, 'user', None)
+        username = user.username if user is not None and user.is_authenticated else 'anonymous'
+        message = (
+            f'{request.method} {path} {response.status_code} 用户 {username} '
+            f'IP {get_client_ip(request)} 耗时 {elapsed_ms:.1f}ms'
+        )
+        if params:
+            message += f' 参数 {json.dumps(params, ensure_ascii=False, default=str)}'
+
+        if response.status_code in (401, 403):
+            logger.warning(f'访问被拒绝: {message}')
+        else:
+            logger.info(message)
+        return response
+
+    def _request_params(self, request):
+        if request.method not in ('POST', 'PUT', 'PATCH', 'DELETE'):
+            return None
+
+        content_type = request.content_type or ''
+        if content_type in ('application/x-www-form-urlencoded', 'multipart/form-data'):
+            # 文件上传只记录普通字段，不记录文件内容
+            return self._mask(request.POST.dict())
+        if content_type == 'application/json':
+            try:
+                if int(request.META.get('CONTENT_LENGTH') or 0) > self.MAX_BODY_LOG_SIZE:
+                    return {'_truncated': True}
+                return self._mask(json.loads(request.body or b'null'))
+            except (ValueError, UnicodeDecodeError):
+                return None
+        return None
+
+    def _mask(self, data):
+        if isinstance(data, dict):
+            return {
+                key: '***' if any(field in str(key).lower() for field in SENSITIVE_FIELDS) else self._mask(value)
+                for key, value in data.items()
+            }
+        if isinstance(data, list):
+            return [self._mask(item) for item in data]
+        return data
+
+
+class _QueryTimer:
+    """数据库执行包装器：累计当前请求的查询次数与耗时"""
+
+    __slots__ = ('queries', 'db_time', 'render_started', 'render_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def rendered(self, response):
+        if self.render_started is not None:
+            self.render_time = time.perf_counter() - self.render_started
+
+
+class RouteMetrics:
+    """
+    按路由聚合的请求性能样本（进程内）
+    每个路由保留最近 sample_size 个样本用于计算分位数，记录操作为 O(1)；
+    多 worker 部署时每个进程各自统计
+    """
+
+    PERCENTILES = (50, 90, 95, 99)
+
+    def __init__(self, sample_size=None):
+        self.sample_size = sample_size or getattr(settings, 'PERFORMANCE_METRICS_SAMPLE_SIZE', 1000)
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, status_code, total_ms, db_ms, queries, serialize_ms):
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {'count': 0, 'errors': 0, 'samples': deque(maxlen=self.sample_size)}
+            entry['count'] += 1
+            if status_code >= 500:
+                entry['errors'] += 1
+            entry['samples'].append((total_ms, db_ms, queries, serialize_ms))
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    def snapshot(self):
+        """
+        计算各路由的统计结果
+
+        Returns:
+            dict: 路由 -> 请求数、错误数、总耗时分位数，以及数据库与序列化耗时、查询数的均值和 p95
+        """
+        with self._lock:
+            routes = {route: (entry['count'], entry['errors'], list(entry['samples']))
+                      for route, entry in self._routes.items()}
+
+        result = {}
+        for route, (count, errors, samples) in sorted(routes.items()):
+            total, db, queries, serialize = (sorted(column) for column in zip(*samples))
+            stats = {'count': count, 'errors': errors, 'samples': len(samples)}
+            stats.update({f'p{p}_ms': round(self._percentile(total, p), 2) for p in self.PERCENTILES})
+            stats['max_ms'] = round(total[-1], 2)
+            for name, values in (('db_ms', db), ('queries', queries), ('serialize_ms', serialize)):
+                stats[f'avg_{name}'] = round(sum(values) / len(values), 2)
+                stats[f'p95_{name}'] = round(self._percentile(values, 95), 2)
+            result[route] = stats
+        return result
+
+    @staticmethod
+    def _percentile(sorted_values, percentile):
+        # 最近秩法
+        rank = max(1, math.ceil(percentile / 100 * len(sorted_values)))
+        return sorted_values[rank - 1]
+
+
+route_metrics = RouteMetrics()
+
+
+class PerformanceMiddleware:
+    """
+    请求性能采集中间件
+    - 通过数据库执行包装器统计查询次数与 SQL 耗时（不依赖 DEBUG）
+    - 序列化耗时为 DRF 响应渲染（JSON 编码）耗时
+    - 通过 Server-Timing 响应头返回 db / serialize / app / total 耗时，浏览器开发者工具可直接查看
+    - 按 "方法 + 路由名称" 聚合样本，供 /api/health/metrics/ 输出分位数
+    - 按视图与 DRF 操作（list / stats / bulk_action ...）记录 Prometheus 指标，由 /api/metrics/ 导出
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = _QueryTimer()
+        request._performance_timer = timer
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(timer))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        total_ms = total * 1000
+        db_ms = timer.db_time * 1000
+        serialize_ms = timer.render_time * 1000
+        app_ms = max(0.0, total_ms - db_ms - serialize_ms)
+        response['Server-Timing'] = (
+            f'db;dur={db_ms:.2f};desc="{timer.queries} queries", '
+            f'serialize;dur={serialize_ms:.2f}, app;dur={app_ms:.2f}, total;dur={total_ms:.2f}'
+        )
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None:
+            route_metrics.record(
+                f'{request.method} {match.view_name}', response.status_code,
+                total_ms, db_ms, timer.queries, serialize_ms
+            )
+
+        view, action = getattr(request, '_metrics_view', ('unmatched', ''))
+        metrics.HTTP_REQUESTS.inc(view=view, action=action, method=request.method, status=response.status_code)
+        metrics.HTTP_REQUEST_DURATION.observe(total, view=view, action=action, method=request.method)
+        metrics.DB_QUERIES.observe(timer.queries, view=view, action=action)
+        metrics.DB_DURATION.observe(timer.db_time, view=view, action=action)
+        metrics.registry.start_flusher()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # ViewSet 的视图函数带有 HTTP 方法到操作名的映射；函数视图只有视图名
+        actions = getattr(view_func, 'actions', None) or {}
+        request._metrics_view = (
+            getattr(view_func, '__name__', 'unknown'), actions.get(request.method.lower(), '')
+        )
+        return None
+
+    def process_template_response(self, request, response):
+        # 在渲染前记录起点，渲染完成后由回调记录耗时
+        timer = getattr(request, '_performance_timer', None)
+        if timer is not None:
+            timer.render_started = time.perf_counter()
+            response.add_post_render_callback(timer.rendered)
+        return response
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.utils import timezone
+
+STATUS_FIELDS = {
+    "PENDING": "pending_count",
+    "IN_PROGRESS": "in_progress_count",
+    "COMPLETED": "completed_count",
+    "CANCELLED": "cancelled_count",
+    "ON_HOLD": "on_hold_count",
+}
+
+PRIORITY_FIELDS = {
+    "LOW": "low_priority_count",
+    "MEDIUM": "medium_priority_count",
+    "HIGH": "high_priority_count",
+    "URGENT": "urgent_priority_count",
+}
+
+
+def populate_user_task_counters(apps, schema_editor):
+    """根据现有任务为所有用户初始化任务计数器"""
+    User = apps.get_model("auth", "User")
+    Task = apps.get_model("LingTaskFlow", "Task")
+    UserTaskCounter = apps.get_model("LingTaskFlow", "UserTaskCounter")
+
+    aggregates = {"total_count": Count("id")}
+    for status, field in STATUS_FIELDS.items():
+        aggregates[field] = Count("id", filter=Q(status=status))
+    for priority, field in PRIORITY_FIELDS.items():
+        aggregates[field] = Count("id", filter=Q(priority=priority))
+    aggregates["overdue_count"] = Count(
+        "id",
+        filter=Q(due_date__lt=timezone.now(), status__in=["PENDING", "IN_PROGRESS", "ON_HOLD"]),
+    )
+
+    counts = {
+        row.pop("owner_id"): row
+        for row in Task.objects.filter(is_deleted=False)
+        .order_by()
+        .values("owner_id")
+        .annotate(**aggregates)
+    }
+
+    UserTaskCounter.objects.bulk_create(
+        [
+            UserTaskCounter(user_id=user_id, **counts.get(user_id, {}))
+            for user_id in User.objects.values_list("id", flat=True)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0008_task_overdue_count'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserTaskCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+                ('total_count', models.IntegerField(default=0, verbose_name='任务总数')),
+                ('pending_count', models.IntegerField(default=0, verbose_name='待处理数')),
+                ('in_progress_count', models.IntegerField(default=0, verbose_name='进行中数')),
+                ('completed_count', models.IntegerField(default=0, verbose_name='已完成数')),
+                ('cancelled_count', models.IntegerField(default=0, verbose_name='已取消数')),
+                ('on_hold_count', models.IntegerField(default=0, verbose_name='暂停数')),
+                ('low_priority_count', models.IntegerField(default=0, verbose_name='低优先级数')),
+                ('medium_priority_count', models.IntegerField(default=0, verbose_name='中优先级数')),
+                ('high_priority_count', models.IntegerField(default=0, verbose_name='高优先级数')),
+                ('urgent_priority_count', models.IntegerField(default=0, verbose_name='紧急优先级数')),
+                ('overdue_count', models.IntegerField(default=0, help_text='写入时判定的逾期任务数，由对账命令定期校正', verbose_name='逾期数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '用户任务计数器',
+                'verbose_name_plural': '用户任务计数器',
+                'db_table': 'user_task_counters',
+            },
+        ),
+        migrations.RunPython(populate_user_task_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0009_user_task_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskImportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, verbose_name='作业ID')),
+                ('file', models.FileField(upload_to='imports/%Y/%m/', verbose_name='导入文件')),
+                ('file_name', models.CharField(blank=True, max_length=255, verbose_name='原始文件名')),
+                ('file_format', models.CharField(choices=[('csv', 'CSV'), ('ndjson', 'NDJSON')], max_length=10, verbose_name='文件格式')),
+                ('status', models.CharField(choices=[('PENDING', '等待中'), ('RUNNING', '导入中'), ('COMPLETED', '已完成'), ('FAILED', '失败')], default='PENDING', max_length=20, verbose_name='作业状态')),
+                ('rows_processed', models.PositiveIntegerField(default=0, verbose_name='已处理行数')),
+                ('rows_created', models.PositiveIntegerField(default=0, verbose_name='已创建任务数')),
+                ('rows_failed', models.PositiveIntegerField(default=0, verbose_name='失败行数')),
+                ('errors', models.JSONField(blank=True, default=list, help_text='逐行错误信息，最多保留前若干条', verbose_name='行错误')),
+                ('error_message', models.TextField(blank=True, help_text='导入整体失败时的错误信息', verbose_name='作业错误')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='结束时间')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_import_jobs', to=settings.AUTH_USER_MODEL, verbose_name='导入用户')),
+            ],
+            options={
+                'verbose_name': '任务导入作业',
+                'verbose_name_plural': '任务导入作业',
+                'db_table': 'task_import_jobs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='import_user_created_idx')],
+            },
+        ),
+    ]
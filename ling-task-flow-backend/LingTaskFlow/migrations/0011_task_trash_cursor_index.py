@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0010_task_import_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'is_deleted', '-deleted_at'], name='task_own_del_deleted_idx'),
+        ),
+    ]
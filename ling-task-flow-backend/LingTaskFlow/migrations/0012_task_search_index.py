@@ -0,0 +1,70 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:05
+
+from django.db import migrations
+
+FTS_TABLE = "task_search_fts"
+GIN_INDEX = "task_search_vector_idx"
+
+
+def create_search_index(apps, schema_editor):
+    """
+    创建全文搜索索引
+    PostgreSQL: 基于加权 SearchVector 的 GIN 表达式索引
+    SQLite: FTS5（trigram 分词）影子表，并导入现有任务
+    """
+    connection = schema_editor.connection
+    Task = apps.get_model("LingTaskFlow", "Task")
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        # 必须与 search.PostgresSearchBackend.build_search_vector() 保持一致
+        vector = (
+            SearchVector("title", weight="A", config="simple")
+            + SearchVector("category", "tags", weight="B", config="simple")
+            + SearchVector("description", weight="C", config="simple")
+        )
+        schema_editor.add_index(Task, GinIndex(vector, name=GIN_INDEX))
+
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA compile_options")
+            has_fts5 = "ENABLE_FTS5" in {row[0] for row in cursor.fetchall()}
+            # 未编译 FTS5 或版本过低（trigram 分词需要 3.34+）时搜索回退为 icontains
+            if not has_fts5 or connection.Database.sqlite_version_info < (3, 34, 0):
+                return
+
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"task_id UNINDEXED, title, description, category, tags, tokenize='trigram')"
+            )
+            rows = Task.objects.values_list("id", "title", "description", "category", "tags")
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (task_id, title, description, category, tags) VALUES (%s, %s, %s, %s, %s)",
+                [
+                    (task_id.hex, title or "", description or "", category or "", tags or "")
+                    for task_id, title, description, category, tags in rows.iterator()
+                ],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    """删除全文搜索索引"""
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+        elif connection.vendor == "sqlite":
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LingTaskFlow", "0011_task_trash_cursor_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+TAG_NAME_MAX_LENGTH = 100
+BATCH_SIZE = 500
+
+
+def parse_tags(value):
+    """解析逗号分隔的标签字符串（与 Tag.parse 一致）"""
+    names = []
+    for name in (value or "").split(","):
+        name = name.strip()[:TAG_NAME_MAX_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def populate_task_tags(apps, schema_editor):
+    """根据现有任务的标签字符串建立规范化标签与关联"""
+    Task = apps.get_model("LingTaskFlow", "Task")
+    Tag = apps.get_model("LingTaskFlow", "Tag")
+    TaskTag = apps.get_model("LingTaskFlow", "TaskTag")
+
+    task_tags = {}
+    for task_id, tags in Task.objects.exclude(tags="").values_list("id", "tags").iterator():
+        names = parse_tags(tags)
+        if names:
+            task_tags[task_id] = names
+
+    all_names = {name for names in task_tags.values() for name in names}
+    Tag.objects.bulk_create([Tag(name=name) for name in all_names], batch_size=BATCH_SIZE, ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.values_list("name", "id"))
+
+    TaskTag.objects.bulk_create(
+        [
+            TaskTag(task_id=task_id, tag_id=tag_ids[name])
+            for task_id, names in task_tags.items()
+            for name in names
+        ],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0012_task_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='标签名称')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+            ],
+            options={
+                'verbose_name': '标签',
+                'verbose_name_plural': '标签',
+                'db_table': 'tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tags', to='LingTaskFlow.tag', verbose_name='标签')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tags', to='LingTaskFlow.task', verbose_name='任务')),
+            ],
+            options={
+                'verbose_name': '任务标签',
+                'verbose_name_plural': '任务标签',
+                'db_table': 'task_tags',
+            },
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='tasks', through='LingTaskFlow.TaskTag', to='LingTaskFlow.tag', verbose_name='标签集合'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktag',
+            index=models.Index(fields=['tag', 'task'], name='task_tag_tag_task_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='tasktag',
+            constraint=models.UniqueConstraint(fields=('task', 'tag'), name='task_tag_unique'),
+        ),
+        migrations.RunPython(populate_task_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:35
+
+from datetime import timezone as dt_timezone
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+
+def populate_task_rollups(apps, schema_editor):
+    """根据现有任务初始化每日汇总（任务同时计入所有者与执行者）"""
+    Task = apps.get_model("LingTaskFlow", "Task")
+    TaskDailyRollup = apps.get_model("LingTaskFlow", "TaskDailyRollup")
+
+    queryset = Task.objects.filter(is_deleted=False).order_by().annotate(
+        day=TruncDate("created_at", tzinfo=dt_timezone.utc)
+    )
+    sources = (
+        ("owner_id", queryset),
+        ("assigned_to_id", queryset.filter(assigned_to__isnull=False).exclude(assigned_to=F("owner"))),
+    )
+
+    rows = {}
+    for user_field, tasks in sources:
+        grouped = tasks.values(user_field, "day", "status", "priority", "category").annotate(
+            task_count=Count("id"), estimated=Sum("estimated_hours"), actual=Sum("actual_hours")
+        )
+        for row in grouped:
+            key = (row[user_field], row["day"], row["status"], row["priority"], row["category"] or "")
+            values = rows.setdefault(key, [0, 0, 0])
+            values[0] += row["task_count"]
+            values[1] += row["estimated"] or 0
+            values[2] += row["actual"] or 0
+
+    TaskDailyRollup.objects.bulk_create(
+        [
+            TaskDailyRollup(
+                user_id=user_id, day=day, status=status, priority=priority, category=category,
+                task_count=values[0], estimated_hours=values[1], actual_hours=values[2],
+            )
+            for (user_id, day, status, priority, category), values in rows.items()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0013_task_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='创建日期')),
+                ('status', models.CharField(max_length=20, verbose_name='任务状态')),
+                ('priority', models.CharField(max_length=10, verbose_name='优先级')),
+                ('category', models.CharField(blank=True, max_length=50, verbose_name='任务分类')),
+                ('task_count', models.IntegerField(default=0, verbose_name='任务数')),
+                ('estimated_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='预估工时合计')),
+                ('actual_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='实际工时合计')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_rollups', to=settings.AUTH_USER_MODEL, verbose_name='用户')),
+            ],
+            options={
+                'verbose_name': '任务每日汇总',
+                'verbose_name_plural': '任务每日汇总',
+                'db_table': 'task_daily_rollups',
+                'constraints': [models.UniqueConstraint(fields=('user', 'day', 'status', 'priority', 'category'), name='task_rollup_unique')],
+            },
+        ),
+        migrations.RunPython(populate_task_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:50
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0014_task_daily_rollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('STATUS', '状态变更'), ('PRIORITY', '优先级变更'), ('ASSIGN', '分配变更'), ('DELETE', '删除'), ('RESTORE', '恢复')], max_length=10, verbose_name='事件类型')),
+                ('from_value', models.CharField(blank=True, default='', max_length=64, verbose_name='变更前')),
+                ('to_value', models.CharField(blank=True, default='', max_length=64, verbose_name='变更后')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='发生时间')),
+                ('actor', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='操作者')),
+                ('task', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='events', to='LingTaskFlow.task', verbose_name='任务')),
+            ],
+            options={
+                'verbose_name': '任务事件',
+                'verbose_name_plural': '任务事件',
+                'db_table': 'task_events',
+                'indexes': [models.Index(fields=['task', 'created_at'], name='task_event_task_idx'), models.Index(fields=['event_type', 'created_at'], name='task_event_type_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0015_task_event'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usertaskcounter',
+            name='overdue_count',
+            field=models.IntegerField(default=0, help_text='对账命令重建时按当前时间计算的逾期任务数', verbose_name='逾期数'),
+        ),
+    ]
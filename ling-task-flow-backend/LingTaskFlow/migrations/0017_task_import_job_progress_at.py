@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 21:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0016_user_task_counter_overdue_help'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskimportjob',
+            name='progress_at',
+            field=models.DateTimeField(blank=True, help_text='开始执行与每写入一块时更新，长时间未更新的导入中作业视为已中断', null=True, verbose_name='最近进度时间'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 20:50
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('LingTaskFlow', '0017_task_import_job_progress_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='tag_name_lower_idx'),
+        ),
+    ]
@@ -3,14 +3,20 @@ LingTaskFlow 数据模型
 定义用户扩展信息和任务管理相关的数据模型
 """
 import uuid
+from datetime import timezone as dt_timezone
+from decimal import Decimal
 
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
-from django.db.models.signals import post_save
+from django.db import models, transaction
+from django.db.models import Q, F, Count, Sum
+from django.db.models.functions import Lower, TruncDate
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 
+from .response_cache import bump_user_generations
+
 
 class UserProfile(models.Model):
     """
@@ -172,6 +178,10 @@ def create_user_profile(sender, instance, created, **kwargs):
     if created:
         # 创建用户扩展信息并将昵称默认设置为用户名
         UserProfile.objects.create(user=instance, nickname=instance.username or '新用户')
+        # 创建用户任务计数器
+        UserTaskCounter.objects.create(user=instance)
+        # 新用户的统计缓存从新的数据版本开始（用户ID可能被复用）
+        bump_user_generations([instance.pk])
 
 
 @receiver(post_save, sender=User)
@@ -303,18 +313,27 @@ class LoginHistory(models.Model):
         """
         # 检查是否来自新设备
         if self.user and self.device_fingerprint:
-            recent_logins = LoginHistory.objects.filter(
-                user=self.user,
-                status='success',
-                login_time__gte=timezone.now() - timezone.timedelta(days=30)
-            ).exclude(id=self.id)
-
-            known_devices = recent_logins.values_list('device_fingerprint', flat=True)
-            if self.device_fingerprint not in known_devices:
-                return True
+            return self.is_new_device(self.user, self.device_fingerprint, exclude_id=self.id)
 
         return False
 
+    @classmethod
+    def is_new_device(cls, user, device_fingerprint, exclude_id=None):
+        """
+        判断设备在最近30天内是否没有成功登录过该用户
+
+        只执行一次 EXISTS 查询，可在写入本次登录记录之前调用
+        """
+        recent_logins = cls.objects.filter(
+            user=user,
+            status='success',
+            device_fingerprint=device_fingerprint,
+            login_time__gte=timezone.now() - timezone.timedelta(days=30)
+        )
+        if exclude_id is not None:
+            recent_logins = recent_logins.exclude(id=exclude_id)
+        return not recent_logins.exists()
+
 
 class SoftDeleteQuerySet(models.QuerySet):
     """
@@ -489,6 +508,60 @@ class SoftDeleteModel(models.Model):
         }
 
 
+class TaskQuerySet(SoftDeleteQuerySet):
+    """
+    任务查询集
+    在软删除查询集基础上提供按用户可见性过滤
+    """
+
+    def tagged(self, names):
+        """
+        带有任一指定标签的任务（通过标签关联表的索引子查询）
+
+        标签名不区分大小写匹配，按 LOWER(name) 函数索引查找标签
+        """
+        return self.filter(
+            pk__in=TaskTag.objects.filter(tag__in=Tag.matching(names)).values('task_id')
+        )
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """批量创建任务，并使所有者与执行者的统计缓存失效"""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bump_user_generations({task.owner_id for task in objs} | {task.assigned_to_id for task in objs})
+        return objs
+
+    def visible_to(self, user):
+        """
+        用户可见的任务（拥有或被分配）
+
+        以 "owner_id = ? UNION assigned_to_id = ?" 子查询解析可见任务ID，
+        两个分支分别走 owner / assigned_to 前缀索引；跨两个外键的 OR 条件
+        无法使用这些索引，且无需再用 DISTINCT 去重
+        """
+        owned = self.filter(owner=user).order_by().values('pk')
+        assigned = self.filter(assigned_to=user).order_by().values('pk')
+        return self.filter(pk__in=owned.union(assigned))
+
+
+class TaskManager(SoftDeleteManager):
+    """
+    任务管理器
+    默认排除已删除的任务，并提供可见性与标签过滤
+    """
+
+    def get_queryset(self):
+        """返回使用任务查询集的未删除记录"""
+        return TaskQuerySet(self.model, using=self._db).active()
+
+    def visible_to(self, user):
+        """用户可见的未删除任务"""
+        return self.get_queryset().visible_to(user)
+
+    def tagged(self, names):
+        """带有任一指定标签的未删除任务"""
+        return self.get_queryset().tagged(names)
+
+
 class Task(SoftDeleteModel):
     """
     任务模型
@@ -512,6 +585,17 @@ class Task(SoftDeleteModel):
         ('URGENT', '紧急'),
     ]
 
+    # 影响用户任务计数器与每日汇总的字段（前5项为计数器使用的字段）
+    COUNTER_FIELDS = (
+        'owner_id', 'status', 'priority', 'due_date', 'is_deleted',
+        'assigned_to_id', 'created_at', 'category', 'estimated_hours', 'actual_hours'
+    )
+
+    # 默认管理器（排除已删除的任务）
+    objects = TaskManager()
+    # 包含所有任务的管理器
+    all_objects = models.Manager.from_queryset(TaskQuerySet)()
+
     # 基础字段
     id = models.UUIDField(
         primary_key=True,
@@ -628,6 +712,15 @@ class Task(SoftDeleteModel):
         help_text='用逗号分隔的标签列表'
     )
 
+    # 规范化标签（由 tags 字符串同步维护，用于索引查询与分组统计）
+    tag_set = models.ManyToManyField(
+        'Tag',
+        through='TaskTag',
+        related_name='tasks',
+        blank=True,
+        verbose_name='标签集合'
+    )
+
     # 附件和备注
     attachment = models.FileField(
         upload_to='task_attachments/%Y/%m/',
@@ -714,6 +807,9 @@ class Task(SoftDeleteModel):
             # 更新时间索引 - 针对最近更新查询
             models.Index(fields=['-updated_at'], name='task_updated_idx'),
             models.Index(fields=['owner', '-updated_at'], name='task_owner_updated_idx'),
+
+            # 回收站索引 - 针对按删除时间的游标分页
+            models.Index(fields=['owner', 'is_deleted', '-deleted_at'], name='task_own_del_deleted_idx'),
         ]
 
     def __str__(self):
@@ -723,20 +819,127 @@ class Task(SoftDeleteModel):
         """
         重写save方法，处理状态变更时的自动更新
         """
+        self.sync_completion_fields()
+
+        using = kwargs.get('using')
+        # 在同一事务中保存任务并增量更新用户任务计数器与每日汇总
+        with transaction.atomic(using=using):
+            # 保存前的状态从数据库锁定读取，而不是使用加载时的快照：
+            # 快照可能已被其他请求的写入覆盖，以旧快照计算增量会使计数器漂移
+            previous_state = None
+            if not self._state.adding:
+                previous_state = Task.lock_counter_states([self.pk], using=using).get(self.pk)
+            super().save(*args, **kwargs)
+
+            # 保存后再取状态，新建任务的 created_at 已由 auto_now_add 填充
+            current_state = self._get_counter_state(
+                update_fields=kwargs.get('update_fields'),
+                previous_state=previous_state
+            )
+            UserTaskCounter.apply_transition(previous_state, current_state)
+            TaskDailyRollup.apply_transition(previous_state, current_state)
+            invalidate_task_analytics([(previous_state, current_state)], [self.owner_id, self.assigned_to_id])
+
+        self._counter_state = current_state
+        self._saved_transition = (previous_state, current_state)
+        self._refresh_cached_owner_profile()
+
+    @classmethod
+    def lock_counter_states(cls, pks, using=None):
+        """
+        在当前事务内锁定任务行（SELECT ... FOR UPDATE）并读取计数相关字段
+
+        Returns:
+            dict: {任务ID: 计数状态元组}，不存在的任务不包含在内
+        """
+        rows = cls.all_objects.db_manager(using).select_for_update().filter(pk__in=pks).order_by('pk').values_list(
+            'pk', *cls.COUNTER_FIELDS
+        )
+        return {row[0]: tuple(row[1:]) for row in rows}
+
+    def _refresh_cached_owner_profile(self):
+        """计数器通过 F() 更新后，刷新已缓存的所有者扩展信息，避免后续以旧值覆盖"""
+        if Task.owner.is_cached(self) and User.profile.is_cached(self.owner):
+            self.owner.profile.refresh_from_db(fields=['task_count', 'completed_task_count'])
+
+    def sync_completion_fields(self):
+        """
+        根据状态同步完成时间和进度（不保存）
+
+        Returns:
+            list: 被修改的字段名
+        """
         # 如果状态变为已完成，自动设置完成时间和进度
         if self.status == 'COMPLETED' and not self.completed_at:
             self.completed_at = timezone.now()
             self.progress = 100
+            return ['completed_at', 'progress']
 
         # 如果状态不是已完成，清除完成时间
-        elif self.status != 'COMPLETED' and self.completed_at:
+        if self.status != 'COMPLETED' and self.completed_at:
             self.completed_at = None
+            return ['completed_at']
+
+        return []
 
-        super().save(*args, **kwargs)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """从数据库加载时记录计数相关字段与标签的快照"""
+        instance = super().from_db(db, field_names, values)
+        instance._take_snapshot()
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        """重新加载后同步刷新快照"""
+        super().refresh_from_db(*args, **kwargs)
+        self._take_snapshot()
+
+    def _take_snapshot(self):
+        deferred_fields = self.get_deferred_fields()
+        if not any(field in deferred_fields for field in self.COUNTER_FIELDS):
+            self._counter_state = self._get_counter_state()
+        if 'tags' not in deferred_fields:
+            self._synced_tags = self.tags
+
+    def _get_counter_state(self, update_fields=None, previous_state=None):
+        """
+        获取影响用户任务计数器的字段状态
 
-        # 更新用户的任务统计
-        if self.owner and hasattr(self.owner, 'profile'):
-            self.owner.profile.update_task_count()
+        指定 update_fields 时，未被保存的字段沿用保存前的状态
+        """
+        if update_fields is None or previous_state is None:
+            return tuple(getattr(self, field) for field in self.COUNTER_FIELDS)
+
+        update_fields = set(update_fields)
+        return tuple(
+            getattr(self, field) if field in update_fields or field.removesuffix('_id') in update_fields
+            else previous_value
+            for field, previous_value in zip(self.COUNTER_FIELDS, previous_state)
+        )
+
+    def soft_delete(self, user=None):
+        """软删除，并记录删除事件"""
+        with transaction.atomic():
+            super().soft_delete(user=user)
+            TaskEvent.record([self], [self._saved_transition], actor=user)
+
+    def restore(self, user=None):
+        """恢复删除，并记录恢复事件"""
+        with transaction.atomic():
+            super().restore(user=user)
+            TaskEvent.record([self], [self._saved_transition], actor=user)
+
+    def hard_delete(self):
+        """硬删除（永久删除），同时扣减用户任务计数器"""
+        with transaction.atomic():
+            previous_state = Task.lock_counter_states([self.pk]).get(self.pk)
+            super().hard_delete()
+            if previous_state is not None:
+                UserTaskCounter.apply_transition(previous_state, None)
+                TaskDailyRollup.apply_transition(previous_state, None)
+                invalidate_task_analytics([(previous_state, None)])
+        self._counter_state = None
+        self._refresh_cached_owner_profile()
 
     @property
     def is_overdue(self):
@@ -801,26 +1004,22 @@ class Task(SoftDeleteModel):
         return colors.get(self.status, '#6c757d')
 
     def can_edit(self, user):
-        """检查用户是否可以编辑此任务"""
-        return user == self.owner or user == self.assigned_to
+        """检查用户是否可以编辑此任务（比较外键ID，不加载关联用户）"""
+        return user.pk is not None and user.pk in (self.owner_id, self.assigned_to_id)
 
     def can_delete(self, user):
         """检查用户是否可以删除此任务"""
-        return user == self.owner
+        return user.pk is not None and user.pk == self.owner_id
 
     @classmethod
     def get_tasks_by_status(cls, user, status):
         """根据状态获取用户任务"""
-        return cls.objects.filter(
-            models.Q(owner=user) | models.Q(assigned_to=user),
-            status=status
-        )
+        return cls.objects.visible_to(user).filter(status=status)
 
     @classmethod
     def get_overdue_tasks(cls, user):
         """获取用户的过期任务"""
-        return cls.objects.filter(
-            models.Q(owner=user) | models.Q(assigned_to=user),
+        return cls.objects.visible_to(user).filter(
             due_date__lt=timezone.now(),
             status__in=['PENDING', 'IN_PROGRESS', 'ON_HOLD']
         )
@@ -829,8 +1028,7 @@ class Task(SoftDeleteModel):
     def get_tasks_due_soon(cls, user, days=7):
         """获取即将到期的任务"""
         soon = timezone.now() + timezone.timedelta(days=days)
-        return cls.objects.filter(
-            models.Q(owner=user) | models.Q(assigned_to=user),
+        return cls.objects.visible_to(user).filter(
             due_date__gte=timezone.now(),
             due_date__lte=soon,
             status__in=['PENDING', 'IN_PROGRESS', 'ON_HOLD']
@@ -838,33 +1036,7 @@ class Task(SoftDeleteModel):
 
     # ==================== 软删除和恢复相关方法 ====================
 
-    def soft_delete(self, user=None):
-        """
-        软删除任务
-        
-        Args:
-            user: 执行删除操作的用户
-        """
-        # 调用父类的软删除方法
-        super().soft_delete(user)
-
-        # 更新用户的任务统计
-        if self.owner and hasattr(self.owner, 'profile'):
-            self.owner.profile.update_task_count()
-
-    def restore(self, user=None):
-        """
-        恢复已删除的任务
-        
-        Args:
-            user: 执行恢复操作的用户
-        """
-        # 调用父类的恢复方法
-        super().restore(user)
-
-        # 更新用户的任务统计
-        if self.owner and hasattr(self.owner, 'profile'):
-            self.owner.profile.update_task_count()
+    # 软删除与恢复均通过 save() 完成，用户任务计数器在 save() 中增量维护
 
     def can_restore(self, user):
         """
@@ -880,7 +1052,7 @@ class Task(SoftDeleteModel):
             return False
 
         # 只有任务所有者可以恢复任务
-        return user == self.owner
+        return user.pk is not None and user.pk == self.owner_id
 
     def get_trash_info(self):
         """
@@ -1037,3 +1209,922 @@ class Task(SoftDeleteModel):
                 deleted_at__lt=now - timezone.timedelta(days=30)
             ).count()
         }
+
+
+class Tag(models.Model):
+    """
+    标签模型
+    Task.tags 字符串中的标签规范化存储，名称唯一
+    """
+
+    # 标签名称最大长度（超出部分截断）
+    NAME_MAX_LENGTH = 100
+
+    name = models.CharField(
+        max_length=NAME_MAX_LENGTH,
+        unique=True,
+        verbose_name='标签名称'
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='创建时间'
+    )
+
+    class Meta:
+        db_table = 'tags'
+        verbose_name = '标签'
+        verbose_name_plural = '标签'
+        ordering = ['name']
+        indexes = [
+            # 支持不区分大小写的标签过滤
+            models.Index(Lower('name'), name='tag_name_lower_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def parse(cls, value):
+        """将逗号分隔的标签字符串解析为去重后的标签名列表（保持原有顺序）"""
+        names = []
+        for name in (value or '').split(','):
+            name = name.strip()[:cls.NAME_MAX_LENGTH]
+            if name and name not in names:
+                names.append(name)
+        return names
+
+    @classmethod
+    def matching(cls, names):
+        """
+        名称与任一给定标签名不区分大小写相同的标签
+
+        Returns:
+            QuerySet: 标签ID子查询
+        """
+        return cls.objects.alias(lower_name=Lower('name')).filter(
+            lower_name__in={name.lower() for name in names}
+        ).values('pk')
+
+    @classmethod
+    def ensure(cls, names):
+        """
+        确保标签存在
+
+        Returns:
+            dict: {标签名: 标签ID}
+        """
+        names = set(names)
+        if not names:
+            return {}
+
+        tag_ids = dict(cls.objects.filter(name__in=names).values_list('name', 'id'))
+        missing = names - set(tag_ids)
+        if missing:
+            cls.objects.bulk_create([cls(name=name) for name in missing], ignore_conflicts=True)
+            tag_ids.update(cls.objects.filter(name__in=missing).values_list('name', 'id'))
+        return tag_ids
+
+
+class TaskTag(models.Model):
+    """
+    任务-标签关联
+    按标签过滤走 (tag, task) 索引，标签统计为 GROUP BY 查询
+    """
+
+    # 每批同步的任务数
+    SYNC_BATCH_SIZE = 500
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='task_tags',
+        verbose_name='任务'
+    )
+
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='task_tags',
+        verbose_name='标签'
+    )
+
+    class Meta:
+        db_table = 'task_tags'
+        verbose_name = '任务标签'
+        verbose_name_plural = '任务标签'
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'tag'], name='task_tag_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'task'], name='task_tag_tag_task_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} - {self.tag_id}"
+
+    @classmethod
+    def sync(cls, tasks):
+        """
+        按任务的 tags 字符串同步标签关联
+
+        每批任务只执行固定数量的查询（读取现有关联、补建标签、删除多余、批量插入）
+        """
+        tasks = list(tasks)
+        for start in range(0, len(tasks), cls.SYNC_BATCH_SIZE):
+            cls._sync_batch(tasks[start:start + cls.SYNC_BATCH_SIZE])
+
+    @classmethod
+    def _sync_batch(cls, tasks):
+        desired = {task.pk: Tag.parse(task.tags) for task in tasks}
+        tag_ids = Tag.ensure(name for names in desired.values() for name in names)
+
+        wanted = {(task_id, tag_ids[name]) for task_id, names in desired.items() for name in names}
+        existing = set(cls.objects.filter(task_id__in=desired).values_list('task_id', 'tag_id'))
+
+        stale = existing - wanted
+        if stale:
+            stale_by_task = {}
+            for task_id, tag_id in stale:
+                stale_by_task.setdefault(task_id, []).append(tag_id)
+            condition = Q()
+            for task_id, stale_tag_ids in stale_by_task.items():
+                condition |= Q(task_id=task_id, tag_id__in=stale_tag_ids)
+            cls.objects.filter(condition).delete()
+
+        missing = wanted - existing
+        if missing:
+            cls.objects.bulk_create(
+                [cls(task_id=task_id, tag_id=tag_id) for task_id, tag_id in missing],
+                ignore_conflicts=True
+            )
+
+        for task in tasks:
+            task._synced_tags = task.tags
+
+    @classmethod
+    def tag_counts(cls, tasks):
+        """
+        按标签分组统计任务数
+
+        Args:
+            tasks: 任务查询集
+
+        Returns:
+            QuerySet: [{'name': 标签名, 'count': 任务数}, ...]，按数量降序
+        """
+        return cls.objects.filter(
+            task__in=tasks.order_by().values('pk')
+        ).values(name=F('tag__name')).annotate(
+            count=Count('task_id')
+        ).order_by('-count', 'name')
+
+
+def invalidate_task_analytics(transitions, user_ids=()):
+    """
+    任务写入后使相关用户的统计缓存失效
+
+    Args:
+        transitions: [(写入前状态, 写入后状态), ...]，取两者中的所有者与执行者
+        user_ids: 额外需要失效的用户ID
+    """
+    owner_index = Task.COUNTER_FIELDS.index('owner_id')
+    assignee_index = Task.COUNTER_FIELDS.index('assigned_to_id')
+    affected = set(user_ids)
+    for transition in transitions:
+        for state in transition:
+            if state is not None:
+                affected.update((state[owner_index], state[assignee_index]))
+    bump_user_generations(affected)
+
+
+@receiver(post_save, sender=Task)
+def sync_task_tags(sender, instance, created, update_fields=None, **kwargs):
+    """
+    任务保存后同步规范化标签
+    tags 未变化时跳过（批量写入路径由调用方显式调用 TaskTag.sync）
+    """
+    if update_fields is not None and 'tags' not in update_fields:
+        return
+    if created and not instance.tags:
+        instance._synced_tags = instance.tags
+        return
+    if not created and getattr(instance, '_synced_tags', None) == instance.tags:
+        return
+    TaskTag.sync([instance])
+
+
+@receiver(post_save, sender=Task)
+def sync_task_search_index(sender, instance, update_fields=None, **kwargs):
+    """
+    任务保存后同步全文搜索索引
+    仅更新非搜索字段时跳过（批量写入路径由调用方显式同步）
+    """
+    from .search import SEARCH_FIELDS, get_search_backend
+
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    get_search_backend().index_tasks([instance])
+
+
+@receiver(post_delete, sender=Task)
+def remove_task_search_index(sender, instance, **kwargs):
+    """任务永久删除后移除全文搜索索引"""
+    from .search import get_search_backend
+
+    get_search_backend().remove_tasks([instance.pk])
+
+
+@receiver(post_delete, sender=Task)
+def invalidate_deleted_task_analytics(sender, instance, **kwargs):
+    """任务永久删除（含 QuerySet.delete() 清空回收站）后使相关用户的统计缓存失效"""
+    bump_user_generations([instance.owner_id, instance.assigned_to_id])
+
+
+class TaskEvent(models.Model):
+    """
+    任务事件
+    追加写入的状态、优先级、分配变更与删除/恢复记录，由任务的计数快照
+    (Task.COUNTER_FIELDS) 在写入前后的差异生成；状态转换矩阵与状态停留时间
+    均为基于 task / event_type 前缀索引的分组查询
+    """
+
+    STATUS_CHANGED = 'STATUS'
+    PRIORITY_CHANGED = 'PRIORITY'
+    ASSIGNED = 'ASSIGN'
+    DELETED = 'DELETE'
+    RESTORED = 'RESTORE'
+
+    EVENT_TYPE_CHOICES = [
+        (STATUS_CHANGED, '状态变更'),
+        (PRIORITY_CHANGED, '优先级变更'),
+        (ASSIGNED, '分配变更'),
+        (DELETED, '删除'),
+        (RESTORED, '恢复'),
+    ]
+
+    # 记录变更的快照字段与对应的事件类型
+    TRACKED_FIELDS = (
+        ('status', STATUS_CHANGED),
+        ('priority', PRIORITY_CHANGED),
+        ('assigned_to_id', ASSIGNED),
+    )
+
+    # 每条 INSERT ... SELECT 写入的最大任务数
+    BATCH_SIZE = 500
+
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name='events',
+        db_index=False,
+        verbose_name='任务'
+    )
+
+    # 只追加写入，不按操作者查询，因此不单独建索引
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        db_index=False,
+        verbose_name='操作者'
+    )
+
+    event_type = models.CharField(
+        max_length=10,
+        choices=EVENT_TYPE_CHOICES,
+        verbose_name='事件类型'
+    )
+
+    from_value = models.CharField(max_length=64, blank=True, default='', verbose_name='变更前')
+
+    to_value = models.CharField(max_length=64, blank=True, default='', verbose_name='变更后')
+
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='发生时间')
+
+    class Meta:
+        db_table = 'task_events'
+        verbose_name = '任务事件'
+        verbose_name_plural = '任务事件'
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='task_event_task_idx'),
+            models.Index(fields=['event_type', 'created_at'], name='task_event_type_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} {self.event_type}: {self.from_value} -> {self.to_value}"
+
+    @classmethod
+    def changes(cls, previous_state, current_state):
+        """
+        比较任务写入前后的快照，得到需要记录的变更
+
+        Args:
+            previous_state: 写入前的 Task.COUNTER_FIELDS 状态元组，None 表示未知（不记录）
+            current_state: 写入后的状态元组
+
+        Returns:
+            list: [(事件类型, 变更前, 变更后), ...]
+        """
+        if previous_state is None or current_state is None:
+            return []
+
+        previous = dict(zip(Task.COUNTER_FIELDS, previous_state))
+        current = dict(zip(Task.COUNTER_FIELDS, current_state))
+
+        changes = []
+        for field, event_type in cls.TRACKED_FIELDS:
+            if previous[field] != current[field]:
+                changes.append((
+                    event_type,
+                    '' if previous[field] is None else str(previous[field]),
+                    '' if current[field] is None else str(current[field])
+                ))
+        if previous['is_deleted'] != current['is_deleted']:
+            changes.append((cls.DELETED if current['is_deleted'] else cls.RESTORED, '', ''))
+        return changes
+
+    @classmethod
+    def record(cls, tasks, transitions, actor=None):
+        """
+        批量写入任务事件
+
+        通过 bulk_create 按 BATCH_SIZE 分批插入，查询数量只与事件数 / BATCH_SIZE 有关
+
+        Args:
+            tasks: 任务实例列表
+            transitions: 与 tasks 一一对应的 [(写入前状态, 写入后状态), ...]
+            actor: 操作者
+
+        Returns:
+            int: 写入的事件数
+        """
+        actor_id = actor.pk if actor is not None and actor.is_authenticated else None
+        now = timezone.now()
+        events = [
+            cls(task_id=task.pk, actor_id=actor_id, event_type=event_type,
+                from_value=from_value, to_value=to_value, created_at=now)
+            for task, (previous_state, current_state) in zip(tasks, transitions)
+            for event_type, from_value, to_value in cls.changes(previous_state, current_state)
+        ]
+        if events:
+            cls.objects.bulk_create(events, batch_size=cls.BATCH_SIZE)
+        return len(events)
+
+
+class UserTaskCounter(models.Model):
+    """
+    用户任务计数器
+    按用户增量维护的任务统计（总数、各状态、各优先级、逾期数），
+    在任务状态变更时于同一事务内通过 F() 表达式增减，避免每次保存都执行 COUNT 查询。
+
+    注意: 逾期数随时间变化（任务自然逾期不会触发写入），不在写入时增量维护，
+    只在重建时按当前时间重新计算，需要定期执行 `python manage.py reconcile_task_counters`。
+    """
+
+    # 状态 -> 计数字段
+    STATUS_FIELDS = {
+        'PENDING': 'pending_count',
+        'IN_PROGRESS': 'in_progress_count',
+        'COMPLETED': 'completed_count',
+        'CANCELLED': 'cancelled_count',
+        'ON_HOLD': 'on_hold_count',
+    }
+
+    # 优先级 -> 计数字段
+    PRIORITY_FIELDS = {
+        'LOW': 'low_priority_count',
+        'MEDIUM': 'medium_priority_count',
+        'HIGH': 'high_priority_count',
+        'URGENT': 'urgent_priority_count',
+    }
+
+    # 计入逾期的未完成状态
+    OPEN_STATUSES = ('PENDING', 'IN_PROGRESS', 'ON_HOLD')
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='task_counter',
+        verbose_name='用户'
+    )
+
+    total_count = models.IntegerField(default=0, verbose_name='任务总数')
+
+    pending_count = models.IntegerField(default=0, verbose_name='待处理数')
+    in_progress_count = models.IntegerField(default=0, verbose_name='进行中数')
+    completed_count = models.IntegerField(default=0, verbose_name='已完成数')
+    cancelled_count = models.IntegerField(default=0, verbose_name='已取消数')
+    on_hold_count = models.IntegerField(default=0, verbose_name='暂停数')
+
+    low_priority_count = models.IntegerField(default=0, verbose_name='低优先级数')
+    medium_priority_count = models.IntegerField(default=0, verbose_name='中优先级数')
+    high_priority_count = models.IntegerField(default=0, verbose_name='高优先级数')
+    urgent_priority_count = models.IntegerField(default=0, verbose_name='紧急优先级数')
+
+    overdue_count = models.IntegerField(
+        default=0,
+        verbose_name='逾期数',
+        help_text='对账命令重建时按当前时间计算的逾期任务数'
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='更新时间'
+    )
+
+    class Meta:
+        db_table = 'user_task_counters'
+        verbose_name = '用户任务计数器'
+        verbose_name_plural = '用户任务计数器'
+
+    def __str__(self):
+        return f"{self.user.username} 的任务计数器"
+
+    @classmethod
+    def counter_fields(cls):
+        """所有计数字段名"""
+        return ['total_count', *cls.STATUS_FIELDS.values(), *cls.PRIORITY_FIELDS.values(), 'overdue_count']
+
+    @classmethod
+    def contribution(cls, state):
+        """
+        计算单个任务状态对计数器的贡献（不含逾期数）
+
+        逾期与否取决于计算时间：变更前状态若按当前时间判断为逾期，
+        而写入时并未计入，扣减后计数会变为负数，因此逾期数只由重建计算
+
+        Args:
+            state: Task.COUNTER_FIELDS 对应的状态元组，None 表示任务不存在
+
+        Returns:
+            tuple: (用户ID, {计数字段: 1})，不计数时用户ID为 None
+        """
+        if state is None:
+            return None, {}
+
+        owner_id, status, priority, _, is_deleted = state[:5]
+        if is_deleted or owner_id is None:
+            return None, {}
+
+        fields = {'total_count': 1}
+        if status in cls.STATUS_FIELDS:
+            fields[cls.STATUS_FIELDS[status]] = 1
+        if priority in cls.PRIORITY_FIELDS:
+            fields[cls.PRIORITY_FIELDS[priority]] = 1
+        return owner_id, fields
+
+    @classmethod
+    def apply_transition(cls, previous_state, current_state):
+        """
+        根据单个任务的状态变化增量更新计数器
+
+        Args:
+            previous_state: 变更前状态（新建任务为 None）
+            current_state: 变更后状态（硬删除为 None）
+        """
+        cls.apply_transitions([(previous_state, current_state)])
+
+    @classmethod
+    def apply_transitions(cls, transitions):
+        """
+        批量增量更新计数器，同一用户的变化合并为一条 UPDATE
+
+        Args:
+            transitions: [(变更前状态, 变更后状态), ...]
+        """
+        deltas = {}
+
+        for previous_state, current_state in transitions:
+            for state, sign in ((previous_state, -1), (current_state, 1)):
+                user_id, fields = cls.contribution(state)
+                if user_id is None:
+                    continue
+                user_deltas = deltas.setdefault(user_id, {})
+                for field in fields:
+                    user_deltas[field] = user_deltas.get(field, 0) + sign
+
+        cls.apply_deltas(deltas)
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """
+        使用 F() 表达式将增量写入计数器与用户扩展信息
+
+        Args:
+            deltas: {用户ID: {计数字段: 增量}}
+        """
+        for user_id, fields in deltas.items():
+            fields = {field: delta for field, delta in fields.items() if delta}
+            if not fields:
+                continue
+
+            updated = cls.objects.filter(user_id=user_id).update(
+                updated_at=timezone.now(),
+                **{field: F(field) + delta for field, delta in fields.items()}
+            )
+            if not updated:
+                # 计数器尚未建立，从头重建（结果已包含本次变更）
+                cls.rebuild(user_ids=[user_id])
+                continue
+
+            # 同步 UserProfile 上的汇总字段
+            profile_updates = {}
+            if fields.get('total_count'):
+                profile_updates['task_count'] = F('task_count') + fields['total_count']
+            if fields.get('completed_count'):
+                profile_updates['completed_task_count'] = F('completed_task_count') + fields['completed_count']
+            if profile_updates:
+                UserProfile.objects.filter(user_id=user_id).update(**profile_updates)
+
+    @classmethod
+    def compute_counts(cls, user_ids=None, now=None):
+        """
+        通过一条分组条件聚合查询从任务表重新计算计数
+
+        Args:
+            user_ids: 限定的用户ID列表，None 表示全部用户
+
+        Returns:
+            dict: {用户ID: {计数字段: 数量}}
+        """
+        now = now or timezone.now()
+        aggregates = {'total_count': Count('id')}
+        for status, field in cls.STATUS_FIELDS.items():
+            aggregates[field] = Count('id', filter=Q(status=status))
+        for priority, field in cls.PRIORITY_FIELDS.items():
+            aggregates[field] = Count('id', filter=Q(priority=priority))
+        aggregates['overdue_count'] = Count('id', filter=Q(
+            due_date__lt=now,
+            status__in=cls.OPEN_STATUSES
+        ))
+
+        queryset = Task.all_objects.filter(is_deleted=False)
+        if user_ids is not None:
+            queryset = queryset.filter(owner_id__in=user_ids)
+
+        rows = queryset.order_by().values('owner_id').annotate(**aggregates)
+        return {row.pop('owner_id'): row for row in rows}
+
+    @classmethod
+    def rebuild(cls, user_ids=None, dry_run=False, now=None):
+        """
+        从任务表全量重建计数器并报告偏差
+
+        Args:
+            user_ids: 限定的用户ID列表，None 表示全部用户
+            dry_run: 为 True 时只报告偏差，不写入
+
+        Returns:
+            dict: {用户ID: {计数字段: (存储值, 实际值)}}，只包含存在偏差的用户
+        """
+        fields = cls.counter_fields()
+        actual_counts = cls.compute_counts(user_ids=user_ids, now=now)
+
+        users = User.objects.all()
+        if user_ids is not None:
+            users = users.filter(id__in=user_ids)
+        user_ids = list(users.values_list('id', flat=True))
+
+        stored = {counter.user_id: counter for counter in cls.objects.filter(user_id__in=user_ids)}
+        profiles = {
+            profile.user_id: profile
+            for profile in UserProfile.objects.filter(user_id__in=user_ids)
+        }
+
+        drift = {}
+        with transaction.atomic():
+            for user_id in user_ids:
+                actual = actual_counts.get(user_id, {})
+                counter = stored.get(user_id)
+                user_drift = {}
+
+                for field in fields:
+                    stored_value = getattr(counter, field) if counter else None
+                    actual_value = actual.get(field, 0)
+                    if stored_value != actual_value:
+                        user_drift[field] = (stored_value, actual_value)
+
+                profile = profiles.get(user_id)
+                if profile is not None:
+                    for profile_field, counter_field in (('task_count', 'total_count'),
+                                                         ('completed_task_count', 'completed_count')):
+                        actual_value = actual.get(counter_field, 0)
+                        if getattr(profile, profile_field) != actual_value:
+                            user_drift[f'profile.{profile_field}'] = (getattr(profile, profile_field), actual_value)
+
+                if not user_drift:
+                    continue
+
+                drift[user_id] = user_drift
+                if dry_run:
+                    continue
+
+                values = {field: actual.get(field, 0) for field in fields}
+                cls.objects.update_or_create(user_id=user_id, defaults=values)
+                if profile is not None:
+                    UserProfile.objects.filter(user_id=user_id).update(
+                        task_count=values['total_count'],
+                        completed_task_count=values['completed_count']
+                    )
+
+        return drift
+
+
+class TaskDailyRollup(models.Model):
+    """
+    任务每日汇总
+    按 用户 × 创建日期(UTC) × 状态 × 优先级 × 分类 预聚合的任务数与工时，
+    任务写入时在同一事务内随用户任务计数器一起增量维护。
+
+    任务同时计入所有者与执行者的汇总，因此按用户求和的结果与
+    Task.objects.visible_to(user) 的统计一致（不含已删除任务）。
+    可通过 `python manage.py rebuild_task_rollups` 全量重建。
+    """
+
+    # 汇总日期使用的时区
+    TIMEZONE = dt_timezone.utc
+
+    # 汇总维度与汇总值字段
+    DIMENSION_FIELDS = ('day', 'status', 'priority', 'category')
+    VALUE_FIELDS = ('task_count', 'estimated_hours', 'actual_hours')
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='task_rollups',
+        verbose_name='用户'
+    )
+
+    day = models.DateField(verbose_name='创建日期')
+
+    status = models.CharField(max_length=20, verbose_name='任务状态')
+
+    priority = models.CharField(max_length=10, verbose_name='优先级')
+
+    category = models.CharField(max_length=50, blank=True, verbose_name='任务分类')
+
+    task_count = models.IntegerField(default=0, verbose_name='任务数')
+
+    estimated_hours = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='预估工时合计'
+    )
+
+    actual_hours = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name='实际工时合计'
+    )
+
+    class Meta:
+        db_table = 'task_daily_rollups'
+        verbose_name = '任务每日汇总'
+        verbose_name_plural = '任务每日汇总'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'day', 'status', 'priority', 'category'],
+                name='task_rollup_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.status}/{self.priority}: {self.task_count}"
+
+    @classmethod
+    def contribution(cls, state):
+        """
+        计算单个任务状态对每日汇总的贡献
+
+        Args:
+            state: Task.COUNTER_FIELDS 对应的状态元组，None 表示任务不存在
+
+        Returns:
+            list: [((用户ID, 日期, 状态, 优先级, 分类), (任务数, 预估工时, 实际工时)), ...]
+        """
+        if state is None:
+            return []
+
+        owner_id, status, priority, _, is_deleted, assigned_to_id, created_at, category, estimated, actual = state
+        if is_deleted or owner_id is None or created_at is None:
+            return []
+
+        day = created_at.astimezone(cls.TIMEZONE).date()
+        values = (1, Decimal(estimated or 0), Decimal(actual or 0))
+        user_ids = {owner_id, assigned_to_id} - {None}
+        return [((user_id, day, status, priority, category or ''), values) for user_id in user_ids]
+
+    @classmethod
+    def apply_transition(cls, previous_state, current_state):
+        """根据单个任务的状态变化增量更新每日汇总"""
+        cls.apply_transitions([(previous_state, current_state)])
+
+    @classmethod
+    def apply_transitions(cls, transitions):
+        """
+        批量增量更新每日汇总，同一汇总行的变化合并为一条 UPDATE
+
+        需要增加任务数的汇总行先以 bulk_create(ignore_conflicts=True) 插入零值行，再统一执行
+        F() 更新：并发写入同时创建同一汇总行时不会因唯一约束冲突而失败。
+        扣减时汇总行不存在说明汇总已与任务表不一致，重建相关用户的汇总
+
+        Args:
+            transitions: [(变更前状态, 变更后状态), ...]
+        """
+        deltas = {}
+        for previous_state, current_state in transitions:
+            for state, sign in ((previous_state, -1), (current_state, 1)):
+                for key, values in cls.contribution(state):
+                    row = deltas.setdefault(key, [0, Decimal(0), Decimal(0)])
+                    for index, value in enumerate(values):
+                        row[index] += sign * value
+
+        deltas = {key: values for key, values in deltas.items() if any(values)}
+        if not deltas:
+            return
+
+        cls.objects.bulk_create([
+            cls(user_id=user_id, day=day, status=status, priority=priority, category=category)
+            for (user_id, day, status, priority, category), values in deltas.items() if values[0] > 0
+        ], ignore_conflicts=True)
+
+        emptied = Q()
+        drifted = set()
+        for (user_id, day, status, priority, category), values in deltas.items():
+            row_q = Q(user_id=user_id, day=day, status=status, priority=priority, category=category)
+            updated = cls.objects.filter(row_q).update(
+                **{field: F(field) + value for field, value in zip(cls.VALUE_FIELDS, values)}
+            )
+            if not updated:
+                drifted.add(user_id)
+            elif values[0] < 0:
+                emptied |= row_q
+
+        # 清理任务数归零的汇总行
+        if emptied:
+            cls.objects.filter(emptied, task_count__lte=0).delete()
+        if drifted:
+            # 待扣减的汇总行不存在，从任务表重建这些用户的汇总（结果已包含本次变更）
+            cls.rebuild(user_ids=list(drifted))
+
+    @classmethod
+    def compute_rows(cls, user_ids=None):
+        """
+        从任务表按所有者与执行者分组计算汇总行
+
+        Args:
+            user_ids: 限定的用户ID列表，None 表示全部用户
+
+        Returns:
+            dict: {(用户ID, 日期, 状态, 优先级, 分类): [任务数, 预估工时, 实际工时]}
+        """
+        queryset = Task.all_objects.filter(is_deleted=False).order_by().annotate(
+            day=TruncDate('created_at', tzinfo=cls.TIMEZONE)
+        )
+        aggregates = {
+            'task_count': Count('id'),
+            'estimated': Sum('estimated_hours'),
+            'actual': Sum('actual_hours'),
+        }
+
+        owned = queryset
+        assigned = queryset.filter(assigned_to__isnull=False).exclude(assigned_to=F('owner'))
+        if user_ids is not None:
+            owned = owned.filter(owner_id__in=user_ids)
+            assigned = assigned.filter(assigned_to_id__in=user_ids)
+
+        rows = {}
+        for user_field, tasks in (('owner_id', owned), ('assigned_to_id', assigned)):
+            for row in tasks.values(user_field, 'day', 'status', 'priority', 'category').annotate(**aggregates):
+                key = (row[user_field], row['day'], row['status'], row['priority'], row['category'] or '')
+                values = rows.setdefault(key, [0, Decimal(0), Decimal(0)])
+                values[0] += row['task_count']
+                values[1] += row['estimated'] or 0
+                values[2] += row['actual'] or 0
+        return rows
+
+    @classmethod
+    def rebuild(cls, user_ids=None):
+        """
+        从任务表全量重建每日汇总
+
+        Args:
+            user_ids: 限定的用户ID列表，None 表示全部用户
+
+        Returns:
+            int: 写入的汇总行数
+        """
+        rows = cls.compute_rows(user_ids=user_ids)
+        with transaction.atomic():
+            existing = cls.objects.all()
+            if user_ids is not None:
+                existing = existing.filter(user_id__in=user_ids)
+            existing.delete()
+            cls.objects.bulk_create([
+                cls(user_id=user_id, day=day, status=status, priority=priority, category=category,
+                    **dict(zip(cls.VALUE_FIELDS, values)))
+                for (user_id, day, status, priority, category), values in rows.items()
+            ], batch_size=500)
+        return len(rows)
+
+
+class TaskImportJob(models.Model):
+    """
+    任务导入作业
+    记录 CSV / NDJSON 批量导入的文件、进度与逐行错误，供客户端轮询导入状态
+    """
+
+    STATUS_CHOICES = [
+        ('PENDING', '等待中'),
+        ('RUNNING', '导入中'),
+        ('COMPLETED', '已完成'),
+        ('FAILED', '失败'),
+    ]
+
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('ndjson', 'NDJSON'),
+    ]
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+        verbose_name='作业ID'
+    )
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='task_import_jobs',
+        verbose_name='导入用户'
+    )
+
+    file = models.FileField(
+        upload_to='imports/%Y/%m/',
+        verbose_name='导入文件'
+    )
+
+    file_name = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name='原始文件名'
+    )
+
+    file_format = models.CharField(
+        max_length=10,
+        choices=FORMAT_CHOICES,
+        verbose_name='文件格式'
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='PENDING',
+        verbose_name='作业状态'
+    )
+
+    rows_processed = models.PositiveIntegerField(default=0, verbose_name='已处理行数')
+    rows_created = models.PositiveIntegerField(default=0, verbose_name='已创建任务数')
+    rows_failed = models.PositiveIntegerField(default=0, verbose_name='失败行数')
+
+    errors = models.JSONField(
+        default=list,
+        blank=True,
+        verbose_name='行错误',
+        help_text='逐行错误信息，最多保留前若干条'
+    )
+
+    error_message = models.TextField(
+        blank=True,
+        verbose_name='作业错误',
+        help_text='导入整体失败时的错误信息'
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='开始时间')
+    progress_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='最近进度时间',
+        help_text='开始执行与每写入一块时更新，长时间未更新的导入中作业视为已中断'
+    )
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='结束时间')
+
+    class Meta:
+        db_table = 'task_import_jobs'
+        verbose_name = '任务导入作业'
+        verbose_name_plural = '任务导入作业'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='import_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} 导入 {self.file_name} ({self.get_status_display()})"
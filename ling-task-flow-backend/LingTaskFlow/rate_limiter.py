@@ -0,0 +1,247 @@
+"""
+LingTaskFlow 速率限制
+提供固定窗口与滑动窗口两种限流算法，计数基于缓存的原子递增（add + incr），
+多个 worker 共享 Redis 时计数在进程之间一致且不会丢失。
+
+同一个限流器既可用作视图装饰器（rate_limited），也可用作 DRF 节流类
+（SlidingWindowThrottle / FixedWindowThrottle）。
+"""
+import functools
+import math
+import time
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.http import JsonResponse
+from rest_framework import status
+from rest_framework.throttling import SimpleRateThrottle
+
+from .utils import get_client_ip, increment_counter
+
+# 限流检查结果：是否放行、限额、剩余次数、建议重试等待秒数
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'retry_after'])
+
+
+def ip_key(request):
+    """按客户端IP生成限流键"""
+    return f'ip:{get_client_ip(request)}'
+
+
+def user_or_ip_key(request):
+    """已认证用户按用户ID限流，匿名请求按IP限流"""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return ip_key(request)
+
+
+class FixedWindowRateLimiter:
+    """
+    固定窗口限流器
+
+    每个窗口一个计数键，窗口编号写入键名，过期时间只在窗口内第一次计数时设置。
+    实现最简单，但窗口边界前后可能放行接近两倍限额的突发请求
+    """
+
+    def __init__(self, limit, window, prefix='ratelimit'):
+        self.limit = limit
+        self.window = window
+        self.prefix = prefix
+
+    def _window_key(self, key, index):
+        return f'{self.prefix}:fixed:{key}:{index}'
+
+    def _result(self, count, now, allowed):
+        retry_after = 0 if allowed else max(1, math.ceil(self.window - now % self.window))
+        return RateLimitResult(allowed, self.limit, max(0, self.limit - count), retry_after)
+
+    def hit(self, key, now=None):
+        """计数一次并返回检查结果（超出限额的请求同样计数）"""
+        now = time.time() if now is None else now
+        count = increment_counter(self._window_key(key, int(now // self.window)), self.window)
+        return self._result(count, now, count <= self.limit)
+
+    def peek(self, key, now=None):
+        """只读取当前计数，不计数；已达到限额时返回不放行"""
+        now = time.time() if now is None else now
+        count = cache.get(self._window_key(key, int(now // self.window)), 0)
+        return self._result(count, now, count < self.limit)
+
+    def refund(self, key, now):
+        """撤销 hit() 在 now 所在窗口计入的一次计数（now 须与 hit() 使用的时间相同）"""
+        try:
+            cache.decr(self._window_key(key, int(now // self.window)))
+        except ValueError:
+            pass  # 计数键已过期
+
+    def reset(self, key, now=None):
+        """清除当前窗口的计数"""
+        now = time.time() if now is None else now
+        cache.delete(self._window_key(key, int(now // self.window)))
+
+
+class SlidingWindowRateLimiter(FixedWindowRateLimiter):
+    """
+    滑动窗口限流器（滑动窗口计数法）
+
+    以 "上一窗口计数 × 上一窗口仍落在滑动窗口内的比例 + 当前窗口计数" 估算
+    最近 window 秒内的请求数，只需两个计数键，避免固定窗口边界处的突发
+    """
+
+    def _window_key(self, key, index):
+        return f'{self.prefix}:sliding:{key}:{index}'
+
+    def _estimate(self, key, now, current=None):
+        index = int(now // self.window)
+        weight = 1 - (now % self.window) / self.window
+        if current is None:
+            counts = cache.get_many([self._window_key(key, index), self._window_key(key, index - 1)])
+            current = counts.get(self._window_key(key, index), 0)
+            previous = counts.get(self._window_key(key, index - 1), 0)
+        else:
+            previous = cache.get(self._window_key(key, index - 1), 0)
+        return current, previous, previous * weight + current
+
+    def _sliding_result(self, current, previous, estimated, now, allowed):
+        retry_after = 0
+        if not allowed:
+            elapsed = now % self.window
+            if current >= self.limit or not previous:
+                # 需等到当前窗口结束（下一窗口中当前计数仍会按比例计入）
+                retry_after = self.window - elapsed
+            else:
+                # 上一窗口的权重衰减到估算值低于限额所需的时间
+                retry_after = (1 - (self.limit - current) / previous) * self.window - elapsed
+            retry_after = max(1, math.ceil(retry_after))
+        remaining = max(0, math.floor(self.limit - estimated))
+        return RateLimitResult(allowed, self.limit, remaining, retry_after)
+
+    def hit(self, key, now=None):
+        """计数一次并返回检查结果（超出限额的请求同样计数）"""
+        now = time.time() if now is None else now
+        # 计数键保留两个窗口，供下一窗口计算加权计数
+        current = increment_counter(self._window_key(key, int(now // self.window)), self.window * 2)
+        current, previous, estimated = self._estimate(key, now, current)
+        return self._sliding_result(current, previous, estimated, now, estimated <= self.limit)
+
+    def peek(self, key, now=None):
+        """只读取当前估算值，不计数；已达到限额时返回不放行"""
+        now = time.time() if now is None else now
+        current, previous, estimated = self._estimate(key, now)
+        return self._sliding_result(current, previous, estimated, now, estimated < self.limit)
+
+
+RATE_LIMIT_ALGORITHMS = {
+    'fixed': FixedWindowRateLimiter,
+    'sliding': SlidingWindowRateLimiter,
+}
+
+
+def get_rate_limiter(limit, window, algorithm='sliding', prefix='ratelimit'):
+    """按算法名称创建限流器"""
+    try:
+        limiter_class = RATE_LIMIT_ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f'不支持的限流算法: {algorithm}，可选值: {", ".join(RATE_LIMIT_ALGORITHMS)}')
+    return limiter_class(limit, window, prefix=prefix)
+
+
+def rate_limit_exceeded_response(result, message=None):
+    """限流响应：429 状态码并附带 Retry-After 响应头"""
+    response = JsonResponse({
+        'success': False,
+        'message': message or f'请求过于频繁，请{result.retry_after}秒后再试',
+        'error': 'rate_limit_exceeded'
+    }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+    response['Retry-After'] = str(result.retry_after)
+    return response
+
+
+def rate_limited(limit, window, key_func=user_or_ip_key, algorithm='sliding', failures_only=False,
+                 scope=None, message=None):
+    """
+    视图限流装饰器
+
+    Args:
+        limit: 时间窗口内允许的次数
+        window: 时间窗口（秒）
+        key_func: 根据请求生成限流键的函数，默认已认证用户按用户、匿名按IP
+        algorithm: 限流算法（'fixed' 或 'sliding'）
+        failures_only: 为 True 时只对状态码 >= 400 的响应计数（用于登录、注册等防暴力尝试）
+        scope: 限流键的作用域，默认使用视图函数名
+        message: 自定义限流提示
+    """
+    limiter = get_rate_limiter(limit, window, algorithm)
+
+    def decorator(view_func):
+        view_scope = scope or view_func.__name__
+
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            key = f'{view_scope}:{key_func(request)}'
+
+            if failures_only:
+                # 先原子计数再判断：并发请求不会在任何一个计入之前全部通过检查；
+                # 被拒绝的请求与成功的响应再撤销计数，只保留失败响应的计数
+                now = time.time()
+                result = limiter.hit(key, now)
+                if not result.allowed:
+                    limiter.refund(key, now)
+                    return rate_limit_exceeded_response(result, message)
+                response = view_func(request, *args, **kwargs)
+                if getattr(response, 'status_code', 200) < 400:
+                    limiter.refund(key, now)
+                return response
+
+            result = limiter.hit(key)
+            if not result.allowed:
+                return rate_limit_exceeded_response(result, message)
+            return view_func(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    滑动窗口 DRF 节流类
+
+    速率沿用 DRF 的 "次数/周期" 写法，可在子类设置 rate，或通过 scope 从
+    REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] 读取。已认证用户按用户ID、
+    匿名请求按IP限流
+
+    用法:
+        class BulkActionThrottle(SlidingWindowThrottle):
+            scope = 'bulk_action'
+            rate = '30/min'
+    """
+    algorithm = 'sliding'
+
+    def __init__(self):
+        super().__init__()
+        self.limiter = get_rate_limiter(self.num_requests, self.duration, self.algorithm,
+                                        prefix=f'throttle:{self.scope}')
+        self.result = None
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        self.result = self.limiter.hit(key)
+        return self.result.allowed
+
+    def wait(self):
+        return self.result.retry_after if self.result else None
+
+
+class FixedWindowThrottle(SlidingWindowThrottle):
+    """固定窗口 DRF 节流类"""
+    algorithm = 'fixed'
@@ -0,0 +1,115 @@
+"""
+LingTaskFlow 统计响应缓存
+按 (用户, 接口, 规范化查询参数, 用户数据版本号) 缓存统计接口的响应数据。
+任务写入时递增相关用户的版本号，旧版本的缓存条目随之失效，无需逐个删除。
+"""
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from rest_framework.response import Response
+
+from .metrics import CACHE_REQUESTS
+
+# 统计响应缓存时间（秒），为 0 时不缓存
+ANALYTICS_CACHE_TIMEOUT = getattr(settings, 'TASK_ANALYTICS_CACHE_TIMEOUT', 300)
+
+# 标记缓存命中情况的响应头
+ANALYTICS_CACHE_HEADER = 'X-Analytics-Cache'
+
+# 不影响统计结果的查询参数
+ANALYTICS_IGNORED_PARAMS = {'format'}
+
+
+def _generation_key(user_id):
+    return f'task_analytics_generation:{user_id}'
+
+
+def get_user_generation(user_id):
+    """
+    获取用户数据版本号
+
+    版本号缺失（首次访问或被缓存淘汰）时以当前纳秒时间初始化，
+    保证不会与淘汰前的版本号重复而命中过期的缓存条目
+    """
+    key = _generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _bump(user_ids):
+    for user_id in user_ids:
+        try:
+            cache.incr(_generation_key(user_id))
+        except ValueError:
+            cache.add(_generation_key(user_id), time.time_ns(), timeout=None)
+
+
+def bump_user_generations(user_ids):
+    """
+    递增用户数据版本号，使其统计缓存失效
+
+    立即递增一次；处于事务中时提交后再递增一次，避免提交前读到旧数据的
+    并发请求把结果写入新版本号的缓存
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    _bump(user_ids)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(user_ids))
+
+
+def analytics_cache_key(user_id, endpoint, params):
+    """以用户、接口、规范化查询参数与用户数据版本号生成缓存键"""
+    normalized = sorted(
+        (key, sorted(params.getlist(key)))
+        for key in params.keys() if key not in ANALYTICS_IGNORED_PARAMS
+    )
+    digest = hashlib.md5(json.dumps(normalized, ensure_ascii=False).encode('utf-8')).hexdigest()
+    return f'task_analytics:{user_id}:{get_user_generation(user_id)}:{endpoint}:{digest}'
+
+
+def cached_analytics(endpoint):
+    """
+    统计接口响应缓存装饰器
+
+    只缓存已认证用户的成功响应，并通过 X-Analytics-Cache 响应头标记 HIT / MISS
+
+    用法:
+        @action(detail=False, methods=['get'])
+        @cached_analytics('stats')
+        def stats(self, request):
+            ...
+    """
+
+    def decorator(view_method):
+        @functools.wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            if not ANALYTICS_CACHE_TIMEOUT or not request.user.is_authenticated:
+                return view_method(self, request, *args, **kwargs)
+
+            cache_key = analytics_cache_key(request.user.pk, endpoint, request.query_params)
+            data = cache.get(cache_key)
+            CACHE_REQUESTS.inc(cache='analytics', result='miss' if data is None else 'hit')
+            if data is not None:
+                response = Response(data)
+                response[ANALYTICS_CACHE_HEADER] = 'HIT'
+                return response
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(cache_key, response.data, ANALYTICS_CACHE_TIMEOUT)
+            response[ANALYTICS_CACHE_HEADER] = 'MISS'
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,360 @@
+"""
+LingTaskFlow 任务全文搜索
+按数据库选择搜索后端：PostgreSQL 使用 SearchVector + GIN 表达式索引，
+SQLite 使用 FTS5（trigram 分词）影子表，其他数据库回退为 icontains 匹配。
+各后端统一返回带 search_rank 注解的查询集，以及标题/描述的高亮片段。
+"""
+import html
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Task
+
+# 参与全文搜索的字段
+SEARCH_FIELDS = ('title', 'description', 'category', 'tags')
+
+# 高亮标记：数据库侧先使用控制字符标记，转义HTML后再替换为 <mark>
+_HIGHLIGHT_START = '\x02'
+_HIGHLIGHT_STOP = '\x03'
+HIGHLIGHT_TAGS = ('<mark>', '</mark>')
+
+# 描述摘要的最大长度（字符）
+SNIPPET_LENGTH = 80
+
+
+def split_terms(query):
+    """将搜索关键词按空白拆分为词项"""
+    return [term for term in (query or '').split() if term]
+
+
+def render_highlight(text):
+    """转义HTML并将高亮标记替换为 <mark> 标签"""
+    if not text:
+        return text
+    escaped = html.escape(text)
+    return escaped.replace(_HIGHLIGHT_START, HIGHLIGHT_TAGS[0]).replace(_HIGHLIGHT_STOP, HIGHLIGHT_TAGS[1])
+
+
+def mark_terms(text, terms, snippet_length=None):
+    """
+    在 Python 中标记文本中出现的词项（不区分大小写）
+
+    Args:
+        text: 原始文本
+        terms: 词项列表
+        snippet_length: 指定时截取首个命中位置附近的片段
+    """
+    if not text:
+        return text
+
+    lowered = text.lower()
+    spans = []
+    for term in terms:
+        term_lower = term.lower()
+        start = lowered.find(term_lower)
+        while start != -1:
+            spans.append((start, start + len(term)))
+            start = lowered.find(term_lower, start + len(term))
+
+    window_start, window_end = 0, len(text)
+    if snippet_length and len(text) > snippet_length:
+        first_hit = min((start for start, _ in spans), default=0)
+        window_start = max(0, first_hit - snippet_length // 4)
+        window_end = min(len(text), window_start + snippet_length)
+
+    parts, position = [], window_start
+    for start, end in sorted(spans):
+        if start < position or end > window_end:
+            continue
+        parts.append(text[position:start])
+        parts.append(_HIGHLIGHT_START + text[start:end] + _HIGHLIGHT_STOP)
+        position = end
+    parts.append(text[position:window_end])
+
+    snippet = ''.join(parts)
+    if window_start > 0:
+        snippet = '…' + snippet
+    if window_end < len(text):
+        snippet += '…'
+    return render_highlight(snippet)
+
+
+class BaseSearchBackend:
+    """
+    搜索后端基类（icontains 匹配）
+
+    用法:
+        backend = get_search_backend()
+        queryset = backend.search(queryset, '关键词')
+        highlights = backend.highlights(page_tasks, '关键词')
+    """
+    name = 'basic'
+
+    def search(self, queryset, query):
+        """过滤匹配关键词的任务，并注解相关度 search_rank"""
+        for term in split_terms(query):
+            queryset = queryset.filter(self._term_q(term))
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    @staticmethod
+    def _term_q(term):
+        """单个词项在任一搜索字段中出现"""
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': term})
+        return condition
+
+    def highlights(self, tasks, query):
+        """
+        生成高亮片段
+
+        Returns:
+            dict: {任务ID字符串: {'title': 高亮标题, 'description': 描述片段}}
+        """
+        terms = split_terms(query)
+        return {
+            str(task.pk): {
+                'title': mark_terms(task.title, terms),
+                'description': mark_terms(task.description, terms, SNIPPET_LENGTH)
+            }
+            for task in tasks
+        }
+
+    def index_tasks(self, tasks):
+        """同步任务到搜索索引（无影子表的后端无需处理）"""
+
+    def remove_tasks(self, task_ids):
+        """从搜索索引中移除任务"""
+
+    def rebuild(self):
+        """重建搜索索引，返回索引的任务数"""
+        return 0
+
+
+class SqliteFTSSearchBackend(BaseSearchBackend):
+    """
+    SQLite FTS5 搜索后端
+
+    影子表 task_search_fts 以 trigram 分词保存任务的搜索字段，通过信号与
+    批量写入路径保持同步；trigram 至少需要3个字符，更短的词项回退为 icontains
+    """
+    name = 'sqlite_fts'
+    table = 'task_search_fts'
+    min_term_length = 3
+
+    # bm25 列权重: task_id, title, description, category, tags
+    column_weights = (0.0, 10.0, 1.0, 5.0, 5.0)
+
+    @classmethod
+    def is_available(cls):
+        """影子表是否已由迁移创建"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [cls.table])
+            return cursor.fetchone() is not None
+
+    def _match_expression(self, terms):
+        """将词项转换为 FTS5 MATCH 表达式（短语引用，AND 组合）"""
+        quoted = ['"{}"'.format(term.replace('"', '""')) for term in terms]
+        return ' AND '.join(quoted)
+
+    def _split(self, query):
+        """拆分为可用 FTS 匹配的词项与需回退为 icontains 的短词项"""
+        terms = split_terms(query)
+        fts_terms = [term for term in terms if len(term) >= self.min_term_length]
+        short_terms = [term for term in terms if len(term) < self.min_term_length]
+        return fts_terms, short_terms
+
+    def search(self, queryset, query):
+        fts_terms, short_terms = self._split(query)
+        for term in short_terms:
+            queryset = queryset.filter(self._term_q(term))
+
+        if not fts_terms:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        match = self._match_expression(fts_terms)
+        weights = ', '.join(str(weight) for weight in self.column_weights)
+        queryset = queryset.filter(
+            pk__in=RawSQL(f'SELECT task_id FROM {self.table} WHERE {self.table} MATCH %s', [match])
+        )
+        # bm25 越小越相关，取负值使 search_rank 越大越相关
+        rank = RawSQL(
+            f'SELECT -bm25({self.table}, {weights}) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND {self.table}.task_id = "{Task._meta.db_table}"."id"',
+            [match],
+            output_field=FloatField()
+        )
+        return queryset.annotate(search_rank=rank)
+
+    def highlights(self, tasks, query):
+        fts_terms, short_terms = self._split(query)
+        tasks = list(tasks)
+        if not fts_terms or short_terms or not tasks:
+            # 含短词项时 FTS 无法标记全部词项，统一在 Python 中标记
+            return super().highlights(tasks, query)
+
+        task_ids = [task.pk.hex for task in tasks]
+        placeholders = ', '.join(['%s'] * len(task_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT task_id, '
+                f'highlight({self.table}, 1, %s, %s), '
+                f'snippet({self.table}, 2, %s, %s, %s, 24) '
+                f'FROM {self.table} WHERE {self.table} MATCH %s AND task_id IN ({placeholders})',
+                [_HIGHLIGHT_START, _HIGHLIGHT_STOP, _HIGHLIGHT_START, _HIGHLIGHT_STOP, '…',
+                 self._match_expression(fts_terms), *task_ids]
+            )
+            rows = {task_id: (title, snippet) for task_id, title, snippet in cursor.fetchall()}
+
+        results = {}
+        for task in tasks:
+            title, snippet = rows.get(task.pk.hex, (None, None))
+            results[str(task.pk)] = {
+                'title': render_highlight(title) if title is not None else html.escape(task.title),
+                'description': render_highlight(snippet) if snippet else mark_terms(
+                    task.description, fts_terms, SNIPPET_LENGTH)
+            }
+        return results
+
+    def _rows(self, tasks):
+        for task in tasks:
+            yield (
+                task.pk.hex,
+                task.title or '',
+                task.description or '',
+                task.category or '',
+                task.tags or ''
+            )
+
+    def index_tasks(self, tasks):
+        tasks = list(tasks)
+        if not tasks:
+            return
+        self.remove_tasks([task.pk for task in tasks])
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {self.table} (task_id, title, description, category, tags) '
+                f'VALUES (%s, %s, %s, %s, %s)',
+                list(self._rows(tasks))
+            )
+
+    def remove_tasks(self, task_ids):
+        task_ids = [task_id.hex for task_id in task_ids]
+        if not task_ids:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {self.table} WHERE task_id = %s', [[task_id] for task_id in task_ids])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+        count = 0
+        queryset = Task.all_objects.only('id', *SEARCH_FIELDS).order_by()
+        batch = []
+        for task in queryset.iterator(chunk_size=1000):
+            batch.append(task)
+            if len(batch) >= 1000:
+                self.index_tasks(batch)
+                count += len(batch)
+                batch = []
+        self.index_tasks(batch)
+        return count + len(batch)
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    PostgreSQL 全文搜索后端
+
+    查询使用与 GIN 表达式索引 task_search_vector_idx 完全相同的 SearchVector，
+    以 SearchRank 排序、SearchHeadline 生成高亮片段；使用 simple 配置以兼容中文
+    """
+    name = 'postgres'
+    config = 'simple'
+
+    @classmethod
+    def build_search_vector(cls):
+        """构建带权重的任务搜索向量（与迁移中的 GIN 索引表达式一致）"""
+        from django.contrib.postgres.search import SearchVector
+
+        return (
+            SearchVector('title', weight='A', config=cls.config)
+            + SearchVector('category', 'tags', weight='B', config=cls.config)
+            + SearchVector('description', weight='C', config=cls.config)
+        )
+
+    def _search_query(self, query):
+        from django.contrib.postgres.search import SearchQuery
+
+        return SearchQuery(query, config=self.config, search_type='websearch')
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import SearchRank
+
+        vector = self.build_search_vector()
+        search_query = self._search_query(query)
+        return queryset.annotate(search_vector=vector).filter(
+            search_vector=search_query
+        ).annotate(search_rank=SearchRank(vector, search_query))
+
+    def highlights(self, tasks, query):
+        from django.contrib.postgres.search import SearchHeadline
+
+        tasks = list(tasks)
+        if not tasks:
+            return {}
+
+        search_query = self._search_query(query)
+        options = {
+            'config': self.config,
+            'start_sel': _HIGHLIGHT_START,
+            'stop_sel': _HIGHLIGHT_STOP,
+        }
+        rows = Task.all_objects.filter(pk__in=[task.pk for task in tasks]).annotate(
+            title_highlight=SearchHeadline('title', search_query, highlight_all=True, **options),
+            description_snippet=SearchHeadline('description', search_query, max_words=24, min_words=8, **options)
+        ).values_list('pk', 'title_highlight', 'description_snippet')
+
+        return {
+            str(pk): {
+                'title': render_highlight(title),
+                'description': render_highlight(snippet)
+            }
+            for pk, title, snippet in rows
+        }
+
+
+SEARCH_BACKENDS = {
+    BaseSearchBackend.name: BaseSearchBackend,
+    SqliteFTSSearchBackend.name: SqliteFTSSearchBackend,
+    PostgresSearchBackend.name: PostgresSearchBackend,
+}
+
+_backend_cache = {}
+
+
+def get_search_backend():
+    """
+    获取当前数据库对应的搜索后端
+
+    TASK_SEARCH_BACKEND 可指定 basic / sqlite_fts / postgres，
+    为 None（默认）时按数据库类型自动选择
+    """
+    name = getattr(settings, 'TASK_SEARCH_BACKEND', None)
+    if name is None:
+        if connection.vendor == 'postgresql':
+            name = PostgresSearchBackend.name
+        elif connection.vendor == 'sqlite':
+            name = SqliteFTSSearchBackend.name
+        else:
+            name = BaseSearchBackend.name
+
+    cache_key = (connection.alias, connection.settings_dict.get('NAME'), name)
+    if cache_key not in _backend_cache:
+        backend_class = SEARCH_BACKENDS[name]
+        if backend_class is SqliteFTSSearchBackend and not backend_class.is_available():
+            backend_class = BaseSearchBackend
+        _backend_cache[cache_key] = backend_class()
+    return _backend_cache[cache_key]
@@ -4,11 +4,13 @@ LingTaskFlow 序列化器
 """
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import UserProfile, Task
+from .models import UserProfile, Task, TaskEvent, TaskImportJob
+from .utils import increment_counter
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -199,17 +201,19 @@ class UserLoginSerializer(serializers.Serializer):
         attempt_key = f"login_attempts_{hashlib.md5(username.encode()).hexdigest()}"
         lock_key = f"account_locked_{hashlib.md5(username.encode()).hexdigest()}"
 
-        # 检查账户是否被锁定
-        if cache.get(lock_key):
-            lock_time = cache.get(f"{lock_key}_time", 0)
-            remaining_time = max(0, 1800 - (timezone.now().timestamp() - lock_time))  # 30分钟锁定
+        lock_timeout = 1800  # 30分钟锁定
+        max_attempts = 5  # 最大尝试次数
+
+        # 检查账户是否被锁定（锁定键的值为锁定时间戳）
+        lock_time = cache.get(lock_key)
+        if lock_time:
+            remaining_time = max(0, lock_timeout - (timezone.now().timestamp() - lock_time))
             raise serializers.ValidationError(
                 f'账户已被暂时锁定，请{int(remaining_time // 60)}分钟后再试'
             )
 
         # 获取当前失败尝试次数
         failed_attempts = cache.get(attempt_key, 0)
-        max_attempts = 5  # 最大尝试次数
 
         # 尝试用户名登录
         user = authenticate(username=username, password=password)
@@ -223,14 +227,12 @@ class UserLoginSerializer(serializers.Serializer):
                 pass
 
         if not user:
-            # 登录失败，增加失败计数
-            failed_attempts += 1
-            cache.set(attempt_key, failed_attempts, 1800)  # 30分钟过期
+            # 登录失败，原子递增失败计数（窗口从第一次失败开始计算）
+            failed_attempts = increment_counter(attempt_key, lock_timeout)
 
             if failed_attempts >= max_attempts:
-                # 锁定账户
-                cache.set(lock_key, True, 1800)  # 锁定30分钟
-                cache.set(f"{lock_key}_time", timezone.now().timestamp(), 1800)
+                # 锁定账户，add 保证并发失败时只记录第一次锁定的时间
+                cache.add(lock_key, timezone.now().timestamp(), lock_timeout)
                 raise serializers.ValidationError(
                     f'登录失败次数过多，账户已被锁定30分钟'
                 )
@@ -245,9 +247,7 @@ class UserLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError('用户账户已被禁用，请联系管理员')
 
         # 登录成功，清除失败记录
-        cache.delete(attempt_key)
-        cache.delete(lock_key)
-        cache.delete(f"{lock_key}_time")
+        cache.delete_many([attempt_key, lock_key])
 
         attrs['user'] = user
         attrs['failed_attempts'] = failed_attempts  # 传递给视图用于日志记录
@@ -327,6 +327,21 @@ class UserWithProfileSerializer(serializers.ModelSerializer):
 # 任务相关序列化器
 # ========================================================================
 
+def format_time_remaining(remaining):
+    """剩余时间的友好显示"""
+    if remaining:
+        days = remaining.days
+        hours = remaining.seconds // 3600
+        if days > 0:
+            return f"{days}天{hours}小时"
+        elif hours > 0:
+            return f"{hours}小时"
+        else:
+            minutes = (remaining.seconds % 3600) // 60
+            return f"{minutes}分钟"
+    return "无限制"
+
+
 class TaskListSerializer(serializers.ModelSerializer):
     """任务列表序列化器（简化版，用于列表展示）"""
     owner_username = serializers.CharField(source='owner.username', read_only=True)
@@ -337,6 +352,17 @@ class TaskListSerializer(serializers.ModelSerializer):
     is_high_priority = serializers.BooleanField(read_only=True)
     time_remaining_display = serializers.SerializerMethodField()
 
+    # values() 快速路径直接读取的列（外键列返回ID，与 PrimaryKeyRelatedField 输出一致）
+    VALUES_FIELDS = (
+        'id', 'title', 'description', 'status', 'priority', 'progress', 'due_date',
+        'owner', 'assigned_to', 'category', 'tags', 'created_at', 'updated_at',
+        'is_deleted', 'deleted_at'
+    )
+    STATUS_DISPLAY = dict(Task.STATUS_CHOICES)
+    PRIORITY_DISPLAY = dict(Task.PRIORITY_CHOICES)
+    CLOSED_STATUSES = ('COMPLETED', 'CANCELLED')
+    HIGH_PRIORITIES = ('HIGH', 'URGENT')
+
     class Meta:
         model = Task
         fields = (
@@ -350,18 +376,71 @@ class TaskListSerializer(serializers.ModelSerializer):
 
     def get_time_remaining_display(self, obj):
         """获取剩余时间的友好显示"""
-        remaining = obj.time_remaining
-        if remaining:
-            days = remaining.days
-            hours = remaining.seconds // 3600
-            if days > 0:
-                return f"{days}天{hours}小时"
-            elif hours > 0:
-                return f"{hours}小时"
-            else:
-                minutes = (remaining.seconds % 3600) // 60
-                return f"{minutes}分钟"
-        return "无限制"
+        return format_time_remaining(obj.time_remaining)
+
+    @classmethod
+    def values_queryset(cls, queryset):
+        """
+        列表快速路径的 values() 投影
+
+        所有者与执行者用户名通过 JOIN 在同一条查询中取出，不创建模型实例
+        """
+        return queryset.values(
+            *cls.VALUES_FIELDS,
+            owner_username=models.F('owner__username'),
+            assigned_to_username=models.F('assigned_to__username'),
+        )
+
+    @classmethod
+    def render_values(cls, rows):
+        """
+        将 values_queryset 的行渲染为与序列化器输出相同的数据
+
+        日期时间与UUID复用序列化器字段的 to_representation（时区与格式一致），
+        显示名称使用预先构建的选项映射，计算属性按行内联计算
+        """
+        fields = cls().fields
+        to_datetime = fields['created_at'].to_representation
+        to_uuid = fields['id'].to_representation
+        status_display = cls.STATUS_DISPLAY
+        priority_display = cls.PRIORITY_DISPLAY
+        now = timezone.now()
+
+        data = []
+        for row in rows:
+            due_date = row['due_date']
+            remaining = due_date - now if due_date else None
+            item = {
+                'id': to_uuid(row['id']),
+                'title': row['title'],
+                'description': row['description'],
+                'status': row['status'],
+                'status_display': status_display.get(row['status'], row['status']),
+                'priority': row['priority'],
+                'priority_display': priority_display.get(row['priority'], row['priority']),
+                'progress': row['progress'],
+                'due_date': to_datetime(due_date) if due_date else None,
+                'owner': row['owner'],
+                'owner_username': row['owner_username'],
+                'assigned_to': row['assigned_to'],
+                'assigned_to_username': row['assigned_to_username'],
+                'category': row['category'],
+                'tags': row['tags'],
+                'is_overdue': bool(due_date) and due_date < now and row['status'] not in cls.CLOSED_STATUSES,
+                'is_high_priority': row['priority'] in cls.HIGH_PRIORITIES,
+                'created_at': to_datetime(row['created_at']),
+                'updated_at': to_datetime(row['updated_at']),
+                'time_remaining_display': format_time_remaining(
+                    remaining if remaining and remaining.total_seconds() > 0 else None
+                ),
+                'is_deleted': row['is_deleted'],
+                'deleted_at': to_datetime(row['deleted_at']) if row['deleted_at'] else None,
+            }
+            if row['assigned_to'] is None:
+                # 与序列化器一致：未分配时 assigned_to.username 无法取值，字段被跳过
+                del item['assigned_to_username']
+            data.append(item)
+        return data
 
 
 class TaskDetailSerializer(serializers.ModelSerializer):
@@ -446,6 +525,80 @@ class TaskDetailSerializer(serializers.ModelSerializer):
         return False
 
 
+class TaskBulkCreateSerializer(serializers.ListSerializer):
+    """
+    任务批量创建序列化器（TaskCreateSerializer(many=True) 时使用）
+
+    一次性计算智能默认值，每个所有者只查询一次 Max('order')，
+    使用 bulk_create 分批插入，并一次性更新用户任务计数器
+    """
+
+    def validate_items(self):
+        """
+        逐项验证 initial_data，允许部分成功
+
+        Returns:
+            tuple: ([(索引, 验证后数据), ...], [(索引, 错误详情), ...])
+        """
+        valid_items = []
+        invalid_items = []
+        for index, item in enumerate(self.initial_data):
+            try:
+                valid_items.append((index, self.child.run_validation(item)))
+            except serializers.ValidationError as e:
+                invalid_items.append((index, e.detail))
+        return valid_items, invalid_items
+
+    def create(self, validated_data):
+        """批量创建任务"""
+        from django.conf import settings
+        from django.db import transaction
+        from django.utils import timezone
+
+        from .models import TaskDailyRollup, TaskTag, UserTaskCounter
+        from .search import get_search_backend
+
+        request = self.context.get('request')
+        now = timezone.now()
+        batch_size = getattr(settings, 'TASK_BULK_BATCH_SIZE', 500)
+
+        for item in validated_data:
+            if request and request.user.is_authenticated:
+                item['owner'] = request.user
+            self.child.apply_smart_defaults(item, now=now)
+
+        # 每个所有者只查询一次当前最大顺序号，新任务依次递增
+        owner_ids = {item['owner'].id for item in validated_data if item.get('owner') and not item.get('order')}
+        next_order = {
+            row['owner_id']: row['max_order'] or 0
+            for row in Task.objects.filter(owner_id__in=owner_ids).order_by().values('owner_id').annotate(
+                max_order=models.Max('order')
+            )
+        }
+        for item in validated_data:
+            owner = item.get('owner')
+            if owner and not item.get('order'):
+                next_order[owner.id] = next_order.get(owner.id, 0) + 1
+                item['order'] = next_order[owner.id]
+
+        tasks = [Task(**item) for item in validated_data]
+        for task in tasks:
+            task.sync_completion_fields()
+
+        with transaction.atomic():
+            Task.objects.bulk_create(tasks, batch_size=batch_size)
+            transitions = [(None, task._get_counter_state()) for task in tasks]
+            UserTaskCounter.apply_transitions(transitions)
+            TaskDailyRollup.apply_transitions(transitions)
+            # bulk_create 不触发 post_save 信号，显式同步标签关联与搜索索引
+            TaskTag.sync(tasks)
+            get_search_backend().index_tasks(tasks)
+
+        for task in tasks:
+            task._counter_state = task._get_counter_state()
+        return tasks
+
+
 class TaskCreateSerializer(serializers.ModelSerializer):
     """任务创建序列化器"""
     tags = serializers.CharField(
@@ -461,6 +614,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             'due_date', 'start_date', 'estimated_hours', 'category',
             'tags', 'notes', 'attachment', 'assigned_to'
         )
+        list_serializer_class = TaskBulkCreateSerializer
         extra_kwargs = {
             'title': {'required': True},
             'status': {'default': 'PENDING'},
@@ -517,20 +671,44 @@ class TaskCreateSerializer(serializers.ModelSerializer):
         - 自动计算优先级
         - 任务模板支持
         """
-        from django.utils import timezone
-
         # 自动设置任务所有者为当前用户
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             validated_data['owner'] = request.user
 
+        self.apply_smart_defaults(validated_data)
+
+        # 设置任务顺序（新任务排在最前面）
+        if not validated_data.get('order'):
+            owner = validated_data.get('owner')
+            if owner:
+                max_order = Task.objects.filter(owner=owner).aggregate(
+                    max_order=models.Max('order')
+                )['max_order'] or 0
+                validated_data['order'] = max_order + 1
+
+        return super().create(validated_data)
+
+    @staticmethod
+    def apply_smart_defaults(validated_data, now=None):
+        """
+        为验证后的数据填充智能默认值（开始时间、优先级、分类、工时预估、标签），不访问数据库
+
+        Args:
+            validated_data: 验证后的任务数据（原地修改）
+            now: 参考时间，批量创建时共用同一时间
+        """
+        from django.utils import timezone
+
+        now = now or timezone.now()
+
         # 智能默认值设置
         if not validated_data.get('created_at'):
-            validated_data['created_at'] = timezone.now()
+            validated_data['created_at'] = now
 
         # 如果没有设置开始时间，默认为今天的开始时间
         if not validated_data.get('start_date'):
-            validated_data['start_date'] = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            validated_data['start_date'] = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
         # 智能优先级推荐
         if not validated_data.get('priority'):
@@ -543,7 +721,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                     due_date_only = due_date
 
                 # 计算剩余天数
-                days_until_due = due_date_only - timezone.now().date()
+                days_until_due = due_date_only - now.date()
                 if days_until_due.days <= 1:
                     validated_data['priority'] = 'URGENT'
                 elif days_until_due.days <= 3:
@@ -602,7 +780,7 @@ class TaskCreateSerializer(serializers.ModelSerializer):
                     due_date_only = due_date
 
                 # 计算剩余天数
-                days_until_due = due_date_only - timezone.now().date()
+                days_until_due = due_date_only - now.date()
                 if days_until_due.days <= 1:
                     auto_tags.append('紧急')
                 elif days_until_due.days <= 3:
@@ -616,19 +794,22 @@ class TaskCreateSerializer(serializers.ModelSerializer):
             if auto_tags:
                 validated_data['tags'] = ', '.join(auto_tags)
 
-        # 设置任务顺序（新任务排在最前面）
-        if not validated_data.get('order'):
-            owner = validated_data.get('owner')
-            if owner:
-                max_order = Task.objects.filter(owner=owner).aggregate(
-                    max_order=models.Max('order')
-                )['max_order'] or 0
-                validated_data['order'] = max_order + 1
+        return validated_data
 
-        return super().create(validated_data)
 
+class TaskEventRecordingMixin:
+    """任务更新类序列化器共用：保存任务并在同一事务内记录任务事件"""
+
+    def save_task(self, instance):
+        """保存任务，按保存前后的状态记录状态、优先级、分配变更事件"""
+        request = self.context.get('request')
+        with transaction.atomic():
+            instance.save()
+            TaskEvent.record([instance], [instance._saved_transition], actor=request.user if request else None)
+        return instance
 
-class TaskUpdateSerializer(serializers.ModelSerializer):
+
+class TaskUpdateSerializer(TaskEventRecordingMixin, serializers.ModelSerializer):
     """任务更新序列化器（增强版）"""
     tags = serializers.CharField(
         required=False,
@@ -750,6 +931,16 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
 
     def update(self, instance, validated_data):
         """增强的更新方法"""
+        self.apply_to_instance(instance, validated_data)
+        return self.save_task(instance)
+
+    def apply_to_instance(self, instance, validated_data):
+        """
+        将验证后的数据应用到任务实例（不保存），供单个更新与批量更新共用
+
+        Returns:
+            list: 被修改的字段名
+        """
         from django.utils import timezone
 
         # 记录更新前的状态（用于历史记录）
@@ -779,18 +970,14 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
                 # 这里可以添加自动完成的逻辑
                 pass
 
-        # 更新实际工时（如果提供）
-        actual_hours = validated_data.get('actual_hours')
-        if actual_hours is not None:
-            instance.actual_hours = actual_hours
-
-        # 执行更新
-        updated_instance = super().update(instance, validated_data)
+        # 应用字段变更
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
 
         # 记录更新历史（可以扩展为独立的历史记录模型）
-        self._log_update_history(updated_instance, old_data, validated_data)
+        self._log_update_history(instance, old_data, validated_data)
 
-        return updated_instance
+        return list(validated_data)
 
     def _log_update_history(self, instance, old_data, new_data):
         """记录更新历史"""
@@ -817,7 +1004,7 @@ class TaskUpdateSerializer(serializers.ModelSerializer):
         return changes
 
 
-class TaskStatusUpdateSerializer(serializers.ModelSerializer):
+class TaskStatusUpdateSerializer(TaskEventRecordingMixin, serializers.ModelSerializer):
     """任务状态更新序列化器（用于快速状态变更）"""
 
     class Meta:
@@ -868,6 +1055,12 @@ class TaskStatusUpdateSerializer(serializers.ModelSerializer):
 
         return attrs
 
+    def update(self, instance, validated_data):
+        """更新状态并记录任务事件"""
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        return self.save_task(instance)
+
 
 class TaskStatisticsSerializer(serializers.Serializer):
     """任务统计序列化器"""
@@ -937,3 +1130,17 @@ class TaskBulkActionSerializer(serializers.Serializer):
             raise serializers.ValidationError("优先级更新操作需要指定新优先级")
 
         return attrs
+
+
+class TaskImportJobSerializer(serializers.ModelSerializer):
+    """任务导入作业序列化器"""
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = TaskImportJob
+        fields = (
+            'id', 'file_name', 'file_format', 'status', 'status_display',
+            'rows_processed', 'rows_created', 'rows_failed', 'errors', 'error_message',
+            'created_at', 'started_at', 'finished_at'
+        )
+        read_only_fields = fields
@@ -0,0 +1,40 @@
+"""
+LingTaskFlow 测试运行器
+在测试期间覆盖面向生产的设置：关闭全局速率限制（测试请求共用同一IP配额）
+与登录历史异步写入（写入后需立即查询到记录）。
+
+`python manage.py test` 经 TEST_RUNNER 使用本运行器；pytest 由 tests/conftest.py
+应用同一组覆盖设置。
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+RATE_LIMIT_MIDDLEWARE = 'LingTaskFlow.middleware.RateLimitMiddleware'
+
+
+def build_test_settings():
+    """
+    测试期间的覆盖设置
+
+    Returns:
+        dict: 可直接传给 override_settings 的设置
+    """
+    return {
+        'LOGIN_HISTORY_ASYNC': False,
+        'RATE_LIMIT_ENABLED': False,
+        'MIDDLEWARE': [name for name in settings.MIDDLEWARE if name != RATE_LIMIT_MIDDLEWARE],
+    }
+
+
+class LingTaskFlowTestRunner(DiscoverRunner):
+    """在测试环境建立后应用 build_test_settings() 覆盖设置的测试运行器"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._settings_override = override_settings(**build_test_settings())
+        self._settings_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._settings_override.disable()
+        super().teardown_test_environment(**kwargs)
@@ -27,6 +27,11 @@ urlpatterns = [
 
     # 健康检查端点
     path('health/', health_check, name='health_check'),
+    path('health/ready/', views.readiness_view, name='readiness_check'),
+    path('health/metrics/', views.performance_metrics_view, name='performance_metrics'),
+
+    # Prometheus 指标抓取端点
+    path('metrics/', views.prometheus_metrics_view, name='prometheus_metrics'),
 
     # 认证相关端点
     path('auth/register/', views.register_view, name='register'),
@@ -2,56 +2,56 @@
 LingTaskFlow 工具函数和装饰器
 """
 import hashlib
-from functools import wraps
 
 from django.core.cache import cache
-from django.http import JsonResponse
 from rest_framework import status
 
+from .metrics import LOGIN_ATTEMPTS
+
+
+def increment_counter(cache_key, timeout):
+    """
+    原子递增缓存计数器
+
+    键不存在时先以 add 初始化为 0 并设置过期时间，再以 incr 原子递增；
+    过期时间只在首次创建时设置，递增不会延长窗口。多进程共享 Redis 时
+    并发递增不会像 get 后 set 那样丢失计数
+
+    Returns:
+        int: 递增后的计数
+    """
+    cache.add(cache_key, 0, timeout)
+    try:
+        return cache.incr(cache_key)
+    except ValueError:
+        # 键恰好在 add 与 incr 之间过期
+        cache.add(cache_key, 0, timeout)
+        return cache.incr(cache_key)
+
 
 def rate_limit(max_attempts=5, time_window=300, key_func=None):
     """
     简单的速率限制装饰器
-    
+
+    只对失败响应（状态码 >= 400）计数，计数由 rate_limiter 中的滑动窗口
+    限流器原子递增完成
+
     Args:
         max_attempts: 最大尝试次数
         time_window: 时间窗口（秒）
         key_func: 生成缓存键的函数
     """
-
-    def decorator(view_func):
-        @wraps(view_func)
-        def wrapper(request, *args, **kwargs):
-            # 生成缓存键
-            if key_func:
-                cache_key = key_func(request)
-            else:
-                # 默认使用IP地址作为键
-                ip = get_client_ip(request)
-                cache_key = f"rate_limit_{view_func.__name__}_{ip}"
-
-            # 获取当前尝试次数
-            attempts = cache.get(cache_key, 0)
-
-            if attempts >= max_attempts:
-                return JsonResponse({
-                    'success': False,
-                    'message': f'请求过于频繁，请{time_window // 60}分钟后再试',
-                    'error': 'rate_limit_exceeded'
-                }, status=status.HTTP_429_TOO_MANY_REQUESTS)
-
-            # 执行原始视图
-            response = view_func(request, *args, **kwargs)
-
-            # 如果请求失败，增加尝试计数
-            if hasattr(response, 'status_code') and response.status_code >= 400:
-                cache.set(cache_key, attempts + 1, time_window)
-
-            return response
-
-        return wrapper
-
-    return decorator
+    from .rate_limiter import ip_key, rate_limited
+
+    return rate_limited(
+        max_attempts,
+        time_window,
+        # 未指定键函数时按视图函数名 + IP限流
+        key_func=key_func or ip_key,
+        failures_only=True,
+        scope='rate_limit' if key_func else None,
+        message=f'请求过于频繁，请{time_window // 60}分钟后再试'
+    )
 
 
 def get_client_ip(request):
@@ -171,6 +171,7 @@ def log_login_attempt(user, username_attempted, status, request, failure_reason=
         login_type: 登录类型 ('login', 'token_refresh') 默认为'login'
         **kwargs: 其他参数（向后兼容）
     """
+    from .audit import login_history_writer
     from .models import LoginHistory
 
     # 处理kwargs中的参数（向后兼容旧的调用方式）
@@ -194,7 +195,8 @@ def log_login_attempt(user, username_attempted, status, request, failure_reason=
         else:
             failure_reason = f"Token刷新失败 - {failure_reason}" if failure_reason else "Token刷新失败"
 
-    LoginHistory.objects.create(
+    # 经缓冲写入器写入，异步模式下不在请求中执行 INSERT
+    login_history_writer.write(LoginHistory(
         user=user,
         username_attempted=username_attempted,
         status=status,
@@ -203,7 +205,8 @@ def log_login_attempt(user, username_attempted, status, request, failure_reason=
         device_fingerprint=device_fingerprint,
         location=location,
         failure_reason=failure_reason
-    )
+    ))
+    LOGIN_ATTEMPTS.inc(type=login_type, status=status)
 
 
 def get_enhanced_tokens_for_user(user, remember_me=False):
@@ -242,9 +245,11 @@ def get_enhanced_tokens_for_user(user, remember_me=False):
 # =============================================================================
 
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from typing import Any, Dict, Optional
 from datetime import datetime
+from urllib.parse import urlparse, parse_qs
 
 
 class StandardAPIResponse:
@@ -361,6 +366,31 @@ class StandardAPIResponse:
             meta=meta
         )
 
+    @staticmethod
+    def cursor_paginated_success(
+            data: Any,
+            paginator: 'StandardCursorPagination',
+            message: str = "获取数据成功"
+    ) -> Response:
+        """
+        创建游标分页成功响应
+
+        游标分页不统计总数，只返回不透明的前后游标
+
+        Args:
+            data: 序列化后的数据
+            paginator: 游标分页器对象
+            message: 成功消息
+
+        Returns:
+            Response: DRF Response对象
+        """
+        return StandardAPIResponse.success(
+            data=data,
+            message=message,
+            meta={"pagination": paginator.get_pagination_meta()}
+        )
+
 
 class StandardPagination(PageNumberPagination):
     """
@@ -381,6 +411,81 @@ class StandardPagination(PageNumberPagination):
         )
 
 
+def use_cursor_pagination(request) -> bool:
+    """请求是否选择了游标分页模式（?pagination=cursor 或携带 cursor 参数）"""
+    params = request.query_params
+    return params.get('pagination', '').lower() == 'cursor' or 'cursor' in params
+
+
+class StandardCursorPagination(CursorPagination):
+    """
+    标准化游标分页类（Keyset 分页）
+
+    以 "排序列 < 上一页末尾值" 定位下一页，不执行 COUNT(*) 与 OFFSET，
+    深翻页的开销与页码无关。排序只允许使用有索引支持的列。
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    ordering_param = 'ordering'
+
+    def __init__(self, ordering='-created_at', ordering_fields=('created_at', 'updated_at')):
+        self.default_ordering = ordering
+        self.ordering_fields = tuple(ordering_fields)
+        # 由视图显式指定的排序（优先于 ordering 查询参数）
+        self.requested_ordering = None
+
+    def get_ordering(self, request, queryset, view):
+        """
+        解析排序字段，仅允许索引列；以主键作为次级排序保证顺序稳定
+        """
+        ordering = self.requested_ordering or request.query_params.get(self.ordering_param) or self.default_ordering
+        ordering = ordering.split(',')[0].strip()
+        field = ordering.lstrip('-')
+
+        if field not in self.ordering_fields:
+            raise ValidationError({
+                self.ordering_param: [
+                    f'游标分页模式仅支持按以下字段排序: {", ".join(self.ordering_fields)}'
+                ]
+            })
+
+        tiebreaker = '-pk' if ordering.startswith('-') else 'pk'
+        return (ordering, tiebreaker)
+
+    def _get_cursor_token(self, link):
+        """从分页链接中提取不透明的游标值"""
+        if not link:
+            return None
+        return parse_qs(urlparse(link).query).get(self.cursor_query_param, [None])[0]
+
+    def get_pagination_meta(self) -> Dict:
+        """游标分页元数据"""
+        next_link = self.get_next_link()
+        previous_link = self.get_previous_link()
+        return {
+            "mode": "cursor",
+            "page_size": self.page_size,
+            "ordering": self.ordering[0],
+            "has_next": self.has_next,
+            "has_previous": self.has_previous,
+            "next_cursor": self._get_cursor_token(next_link),
+            "previous_cursor": self._get_cursor_token(previous_link),
+            "next": next_link,
+            "previous": previous_link,
+        }
+
+    def get_paginated_response(self, data):
+        """
+        返回标准化的游标分页响应
+        """
+        return StandardAPIResponse.cursor_paginated_success(
+            data=data,
+            paginator=self
+        )
+
+
 def format_validation_errors(errors: Dict) -> Dict:
     """
     格式化序列化器验证错误
@@ -2,21 +2,42 @@
 LingTaskFlow 视图
 处理用户认证和任务管理相关的API请求
 """
+import hashlib
+import json
+import os
+
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import models, transaction
-from django.db.models import Q, Count, Avg, Min, Sum
+from django.db.models import Count, Avg, Min, Sum
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
+from django.views.decorators.http import require_GET
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets, filters
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
+from .analytics import (
+    TaskStatsEngine, TagStatsEngine, LIST_STATS_LEVELS, LIST_STATS_CACHE_TIMEOUT, compute_list_stats,
+    completion_duration, resolve_timezone, rollup_time_series, status_durations, status_transition_counts,
+    task_events, time_buckets, time_series, truncate_datetime, uses_rollup_timezone
+)
+from .bulk import TaskBulkExecutor, BULK_MAX_ITEMS, BULK_CREATE_MAX_ITEMS, parse_task_id
+from .exports import ExportContentNegotiation, EXPORT_FORMATS, build_export_response
 from .filters import TaskFilter
-from .models import UserProfile, Task
+from .health import readiness_checker
+from .imports import detect_format, fail_stale_import_jobs, start_import_job
+from .metrics import BULK_OPERATION_SIZE, CACHE_REQUESTS, CONTENT_TYPE as METRICS_CONTENT_TYPE, registry as metrics_registry
+from .middleware import route_metrics
+from .models import UserProfile, Task, Tag, TaskTag, TaskEvent, UserTaskCounter, TaskImportJob
 from .permissions import IsOwnerOrReadOnly
+from .response_cache import cached_analytics, get_user_generation
+from .search import get_search_backend
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
@@ -28,6 +49,7 @@ from .serializers import (
     TaskCreateSerializer,
     TaskUpdateSerializer,
     TaskStatusUpdateSerializer,
+    TaskImportJobSerializer,
     get_tokens_for_user
 )
 from .utils import (
@@ -35,8 +57,11 @@ from .utils import (
     registration_rate_limit_key,
     sanitize_user_input,
     log_login_attempt,
+    generate_device_fingerprint,
     get_enhanced_tokens_for_user,
-    get_client_ip
+    get_client_ip,
+    use_cursor_pagination,
+    StandardCursorPagination
 )
 
 
@@ -215,6 +240,10 @@ def login_view(request):
                     context={'request': request}
                 )
 
+                # 检查是否为可疑登录（在记录本次登录之前判断设备是否出现过）
+                from .models import LoginHistory
+                suspicious = LoginHistory.is_new_device(user, generate_device_fingerprint(request))
+
                 # 记录成功登录
                 log_login_attempt(
                     user=user,
@@ -223,15 +252,8 @@ def login_view(request):
                     request=request
                 )
 
-                # 检查是否为可疑登录
-                from .models import LoginHistory
-                recent_login = LoginHistory.objects.filter(
-                    user=user,
-                    status='success'
-                ).first()
-
                 security_info = {}
-                if recent_login and recent_login.is_suspicious:
+                if suspicious:
                     security_info['suspicious_login'] = True
                     security_info['message'] = '检测到来自新设备的登录，如果不是您本人操作，请立即修改密码'
 
@@ -802,6 +824,58 @@ def token_refresh_view(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def performance_metrics_view(request):
+    """
+    请求性能指标API（仅管理员）
+
+    返回当前进程按路由聚合的请求数、总耗时分位数、SQL 查询数与耗时、序列化耗时。
+    样本保存在进程内存中，多 worker 部署时每次请求只反映处理该请求的进程
+    """
+    return Response({
+        'success': True,
+        'data': {
+            'pid': os.getpid(),
+            'sample_size': route_metrics.sample_size,
+            'routes': route_metrics.snapshot(),
+        }
+    }, status=status.HTTP_200_OK)
+
+
+@require_GET
+def readiness_view(request):
+    """
+    就绪检查API（供负载均衡器使用）
+
+    探测数据库、缓存与媒体存储，全部可用时返回 200，否则返回 503；
+    结果缓存 HEALTH_READY_CACHE_TTL 秒
+    """
+    ready, result = readiness_checker.check()
+    return JsonResponse({
+        'status': 'ok' if ready else 'unavailable',
+        'message': '所有依赖可用' if ready else '部分依赖不可用',
+        **result
+    }, status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@require_GET
+def prometheus_metrics_view(request):
+    """
+    Prometheus 指标导出（文本格式）
+
+    只允许 METRICS_ALLOWED_IPS 中的地址抓取；按 REMOTE_ADDR 判断，
+    不信任可伪造的 X-Forwarded-For。配置 METRICS_MULTIPROC_DIR 时输出所有 worker 的合计
+    """
+    if request.META.get('REMOTE_ADDR') not in getattr(settings, 'METRICS_ALLOWED_IPS', ()):
+        return JsonResponse({
+            'success': False,
+            'message': '不允许从该地址抓取指标'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    return HttpResponse(metrics_registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+
 class TaskViewSet(viewsets.ModelViewSet):
     """
     任务管理ViewSet
@@ -818,18 +892,68 @@ class TaskViewSet(viewsets.ModelViewSet):
     - 永久删除: DELETE /api/tasks/{id}/permanent/
     - 批量操作: POST /api/tasks/bulk_action/
     - 任务统计: GET /api/tasks/stats/
+    - 流式导出: GET /api/tasks/export/?format=csv|ndjson
+    - 流式导入: POST /api/tasks/import/，进度查询: GET /api/tasks/import/{job_id}/
+
+    列表、回收站与高级搜索支持 ?pagination=cursor 游标分页（不统计总数，无 OFFSET）
     """
 
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_class = TaskFilter
-    search_fields = ['title', 'description', 'category', 'tags']
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = TaskFilter  # search 参数由 TaskFilter 通过全文搜索后端处理
     ordering_fields = [
         'created_at', 'updated_at', 'due_date', 'start_date',
         'priority', 'status', 'progress', 'title'
     ]
     ordering = ['-created_at']  # 默认按创建时间倒序
 
+    # 游标分页模式下各操作的默认排序与允许的排序字段（均有索引支持）
+    cursor_orderings = {
+        'trash': ('-deleted_at', ('deleted_at',)),
+    }
+    default_cursor_ordering = ('-created_at', ('created_at', 'updated_at'))
+
+    # 各操作的查询集优化策略，按所用序列化器实际访问的关联对象与字段调整：
+    # - TaskDetailSerializer 读取 owner / assigned_to 的用户信息，权限检查比较 owner
+    # - TaskListSerializer 只读取两者的用户名，不输出 notes / attachment
+    # list 与 export 使用 values() 投影，不需要 select_related
+    DETAIL_QUERYSET_POLICY = {'select_related': ('owner', 'assigned_to')}
+    LIST_QUERYSET_POLICY = {'select_related': ('owner', 'assigned_to'), 'defer': ('notes', 'attachment')}
+    queryset_policies = {
+        'retrieve': DETAIL_QUERYSET_POLICY,
+        'update': DETAIL_QUERYSET_POLICY,
+        'partial_update': DETAIL_QUERYSET_POLICY,
+        'update_status': DETAIL_QUERYSET_POLICY,
+        'destroy': DETAIL_QUERYSET_POLICY,
+        'restore': DETAIL_QUERYSET_POLICY,
+        'trash': LIST_QUERYSET_POLICY,
+        'advanced_search': LIST_QUERYSET_POLICY,
+    }
+
+    def optimize_queryset(self, queryset, action=None):
+        """按操作对应的策略为查询集添加 select_related / defer"""
+        policy = self.queryset_policies.get(action or self.action)
+        if not policy:
+            return queryset
+        if policy.get('select_related'):
+            queryset = queryset.select_related(*policy['select_related'])
+        if policy.get('defer'):
+            queryset = queryset.defer(*policy['defer'])
+        return queryset
+
+    @property
+    def paginator(self):
+        """根据请求选择页码分页或游标分页"""
+        if not hasattr(self, '_paginator'):
+            if use_cursor_pagination(self.request):
+                ordering, ordering_fields = self.cursor_orderings.get(self.action, self.default_cursor_ordering)
+                self._paginator = StandardCursorPagination(ordering=ordering, ordering_fields=ordering_fields)
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
     def get_queryset(self):
         """
         获取查询集
@@ -840,19 +964,15 @@ class TaskViewSet(viewsets.ModelViewSet):
             return Task.objects.none()
 
         # 基础查询：用户拥有或被分配的任务
-        queryset = Task.objects.filter(
-            Q(owner=user) | Q(assigned_to=user)
-        ).distinct()
+        queryset = Task.objects.visible_to(user)
 
         # 处理软删除显示
         include_deleted = self.request.query_params.get('include_deleted', 'false').lower()
         if include_deleted == 'true':
             # 只有任务所有者可以查看自己的软删除任务
-            queryset = Task.all_objects.filter(
-                Q(owner=user) | Q(assigned_to=user)
-            ).distinct()
+            queryset = Task.all_objects.visible_to(user)
 
-        return queryset
+        return self.optimize_queryset(queryset)
 
     def get_serializer_class(self):
         """根据操作类型选择合适的序列化器"""
@@ -881,74 +1001,88 @@ class TaskViewSet(viewsets.ModelViewSet):
         - is_overdue: 是否逾期
         - due_soon: 即将到期天数
         - include_deleted: 是否包含软删除任务
-        - ordering: 排序字段
+        - ordering: 排序字段（游标分页模式下仅支持 created_at / updated_at）
         - page: 页码
         - page_size: 每页数量
+        - pagination: 设为 cursor 时使用游标分页，配合 cursor 参数翻页
+        - stats: 统计级别 none / summary / full（默认 full）
         """
+        # 统计级别
+        stats_level = request.query_params.get('stats', 'full').lower()
+        if stats_level not in LIST_STATS_LEVELS:
+            return Response({
+                'success': False,
+                'message': f'不支持的统计级别，可选值: {", ".join(LIST_STATS_LEVELS)}',
+                'error': 'invalid_stats'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         # 应用过滤器
         queryset = self.filter_queryset(self.get_queryset())
 
+        # 列表读取走 values() 快速路径：单条查询取出字段与关联用户名，
+        # 由 TaskListSerializer.render_values 渲染出与序列化器相同的数据
+        rows = TaskListSerializer.values_queryset(queryset)
+
         # 分页
-        page = self.paginate_queryset(queryset)
+        page = self.paginate_queryset(rows)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(TaskListSerializer.render_values(page))
 
             # 添加额外的统计信息
-            stats = self._get_list_stats(queryset)
-
-            response = self.get_paginated_response(serializer.data)
-            response.data['stats'] = stats
+            if stats_level != 'none':
+                response.data['stats'] = self._get_list_stats(queryset, stats_level)
             return response
 
-        serializer = self.get_serializer(queryset, many=True)
-        stats = self._get_list_stats(queryset)
+        results = TaskListSerializer.render_values(rows)
+        data = {
+            'results': results,
+            'count': len(results)
+        }
+        if stats_level != 'none':
+            data['stats'] = self._get_list_stats(queryset, stats_level)
 
-        return Response({
-            'results': serializer.data,
-            'stats': stats,
-            'count': len(serializer.data)
-        })
+        return Response(data)
 
-    def _get_list_stats(self, queryset):
-        """获取任务列表统计信息"""
-        total_count = queryset.count()
+    # 不影响统计结果的列表查询参数（分页、排序与输出控制）
+    LIST_STATS_IGNORED_PARAMS = {'page', 'page_size', 'cursor', 'pagination', 'ordering', 'stats', 'format'}
 
-        if total_count == 0:
-            return {
-                'total': 0,
-                'by_status': {},
-                'by_priority': {},
-                'overdue_count': 0,
-                'completed_count': 0
-            }
+    def _list_stats_cache_key(self, level):
+        """
+        以用户、用户数据版本号与规范化后的过滤条件生成列表统计缓存键
 
-        # 状态统计
-        status_stats = queryset.values('status').annotate(
-            count=Count('id')
-        ).order_by('status')
+        任务写入会递增所有者与执行者的数据版本号，翻页不会复用写入前的统计
+        """
+        params = self.request.query_params
+        filters_key = sorted(
+            (key, sorted(params.getlist(key)))
+            for key in params.keys() if key not in self.LIST_STATS_IGNORED_PARAMS
+        )
+        digest = hashlib.md5(
+            json.dumps(filters_key, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+        user_id = self.request.user.pk
+        return f'task_list_stats:{user_id}:{get_user_generation(user_id)}:{level}:{digest}'
 
-        # 优先级统计
-        priority_stats = queryset.values('priority').annotate(
-            count=Count('id')
-        ).order_by('priority')
+    def _get_list_stats(self, queryset, level='full'):
+        """
+        获取任务列表统计信息
 
-        # 逾期任务统计
-        from django.utils import timezone
-        overdue_count = queryset.filter(
-            due_date__lt=timezone.now(),
-            status__in=['PENDING', 'IN_PROGRESS', 'ON_HOLD']
-        ).count()
+        第一页总是重新计算并写入缓存；同一过滤条件的后续翻页
+        （page > 1 或携带 cursor）直接复用第一页的统计结果
+        """
+        cache_key = self._list_stats_cache_key(level)
+        params = self.request.query_params
+        is_first_page = 'cursor' not in params and params.get('page', '1') in ('', '1')
 
-        # 已完成任务统计
-        completed_count = queryset.filter(status='COMPLETED').count()
+        if not is_first_page:
+            stats = cache.get(cache_key)
+            CACHE_REQUESTS.inc(cache='list_stats', result='miss' if stats is None else 'hit')
+            if stats is not None:
+                return stats
 
-        return {
-            'total': total_count,
-            'by_status': {item['status']: item['count'] for item in status_stats},
-            'by_priority': {item['priority']: item['count'] for item in priority_stats},
-            'overdue_count': overdue_count,
-            'completed_count': completed_count
-        }
+        stats = compute_list_stats(queryset, level)
+        cache.set(cache_key, stats, LIST_STATS_CACHE_TIMEOUT)
+        return stats
 
     def create(self, request, *args, **kwargs):
         """
@@ -1021,35 +1155,48 @@ class TaskViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def _bulk_create_tasks(self, request):
-        """批量创建任务"""
-        if len(request.data) > 50:  # 限制批量创建数量
+        """
+        批量创建任务
+
+        使用 TaskCreateSerializer(many=True) 逐项验证（允许部分成功），
+        有效项通过 bulk_create 分批插入，用户任务计数器只更新一次
+        """
+        if len(request.data) > BULK_CREATE_MAX_ITEMS:  # 限制批量创建数量
             return Response({
                 'success': False,
-                'message': '批量创建任务数量不能超过50个',
+                'message': f'批量创建任务数量不能超过{BULK_CREATE_MAX_ITEMS}个',
                 'error_code': 'bulk_limit_exceeded'
             }, status=status.HTTP_400_BAD_REQUEST)
+        BULK_OPERATION_SIZE.observe(len(request.data), operation='create')
+
+        serializer = self.get_serializer(data=request.data, many=True)
+        valid_items, invalid_items = serializer.validate_items()
 
-        created_tasks = []
         failed_tasks = []
+        for index, errors in invalid_items:
+            task_data = request.data[index]
+            failed_tasks.append({
+                'index': index,
+                'data': task_data.get('title', f'任务{index + 1}') if isinstance(task_data, dict) else f'任务{index + 1}',
+                'error': str(errors)
+            })
 
-        for i, task_data in enumerate(request.data):
-            try:
-                serializer = self.get_serializer(data=task_data)
-                serializer.is_valid(raise_exception=True)
-                task = serializer.save(owner=request.user)
+        created_tasks = []
+        try:
+            tasks = serializer.create([item for _, item in valid_items])
 
-                # 执行创建后操作
+            # 执行创建后操作
+            for task in tasks:
                 self._post_create_actions(task, request)
 
-                detail_serializer = TaskDetailSerializer(task, context={'request': request})
-                created_tasks.append(detail_serializer.data)
-
-            except Exception as e:
-                failed_tasks.append({
-                    'index': i,
-                    'data': task_data.get('title', f'任务{i + 1}'),
-                    'error': str(e)
-                })
+            created_tasks = TaskDetailSerializer(tasks, many=True, context={'request': request}).data
+        except Exception as e:
+            failed_tasks.extend({
+                'index': index,
+                'data': item.get('title', f'任务{index + 1}'),
+                'error': str(e)
+            } for index, item in valid_items)
+            failed_tasks.sort(key=lambda item: item['index'])
 
         # 获取用户的任务统计更新
         user_stats = self._get_user_task_stats(request.user)
@@ -1085,10 +1232,7 @@ class TaskViewSet(viewsets.ModelViewSet):
     def _post_create_actions(self, task, request):
         """任务创建后的操作"""
         try:
-            # 更新用户统计
-            user_profile = request.user.profile
-            user_profile.task_count = Task.objects.filter(owner=request.user).count()
-            user_profile.save(update_fields=['task_count'])
+            # 用户任务统计已在 Task.save() 中通过计数器增量维护
 
             # 记录创建日志
             import logging
@@ -1112,15 +1256,20 @@ class TaskViewSet(viewsets.ModelViewSet):
         pass
 
     def _get_user_task_stats(self, user):
-        """获取用户任务统计"""
-        user_tasks = Task.objects.filter(owner=user)
+        """获取用户任务统计（读取增量维护的用户任务计数器）"""
+        counter = UserTaskCounter.objects.filter(user=user).first()
+        if counter is None:
+            UserTaskCounter.rebuild(user_ids=[user.id])
+            counter = UserTaskCounter.objects.get(user=user)
 
         return {
-            'total_tasks': user_tasks.count(),
-            'pending_tasks': user_tasks.filter(status='PENDING').count(),
-            'in_progress_tasks': user_tasks.filter(status='IN_PROGRESS').count(),
-            'completed_tasks': user_tasks.filter(status='COMPLETED').count(),
-            'overdue_tasks': user_tasks.filter(
+            'total_tasks': counter.total_count,
+            'pending_tasks': counter.pending_count,
+            'in_progress_tasks': counter.in_progress_count,
+            'completed_tasks': counter.completed_count,
+            # 逾期随时间变化，计数器仅在写入时判定，这里仍实时统计
+            'overdue_tasks': Task.objects.filter(
+                owner=user,
                 due_date__lt=timezone.now(),
                 status__in=['PENDING', 'IN_PROGRESS', 'ON_HOLD']
             ).count()
@@ -1149,25 +1298,12 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         # 标签推荐
         if task.category:
-            popular_tags = Task.objects.filter(
-                owner=task.owner,
-                category=task.category
-            ).exclude(
-                tags__isnull=True
-            ).exclude(
-                tags__exact=''
-            ).values_list('tags', flat=True)
-
-            tag_counts = {}
-            for tags_str in popular_tags:
-                for tag in tags_str.split(','):
-                    tag = tag.strip()
-                    if tag:
-                        tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
-            if tag_counts:
-                sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
-                recommendations['suggested_tags'] = [tag for tag, count in sorted_tags[:5]]
+            popular_tags = TaskTag.tag_counts(
+                Task.objects.filter(owner=task.owner, category=task.category)
+            )[:5]
+
+            if popular_tags:
+                recommendations['suggested_tags'] = [item['name'] for item in popular_tags]
 
         return recommendations
 
@@ -1186,14 +1322,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             if task.assigned_to != old_assigned_to:
                 self._handle_assignment_change(task, old_assigned_to, request.user)
 
-            # 更新用户统计
-            user_profile = request.user.profile
-            if task.status == 'COMPLETED' and old_status != 'COMPLETED':
-                user_profile.completed_task_count += 1
-            elif old_status == 'COMPLETED' and task.status != 'COMPLETED':
-                user_profile.completed_task_count = max(0, user_profile.completed_task_count - 1)
-
-            user_profile.save(update_fields=['completed_task_count'])
+            # 用户任务统计已在 Task.save() 中通过计数器增量维护
 
             # 记录更新日志
             import logging
@@ -1293,10 +1422,14 @@ class TaskViewSet(viewsets.ModelViewSet):
         # 获取合适的序列化器
         if request.path.endswith('/status/'):
             # 如果是状态快速更新
-            serializer = TaskStatusUpdateSerializer(instance, data=request.data, partial=partial)
+            serializer = TaskStatusUpdateSerializer(
+                instance, data=request.data, partial=partial, context={'request': request}
+            )
         else:
             # 使用完整的更新序列化器
-            serializer = TaskUpdateSerializer(instance, data=request.data, partial=partial)
+            serializer = TaskUpdateSerializer(
+                instance, data=request.data, partial=partial, context={'request': request}
+            )
 
         try:
             serializer.is_valid(raise_exception=True)
@@ -1336,7 +1469,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['patch'])
     def bulk_update(self, request):
-        """批量更新任务"""
+        """批量更新任务（基于集合：一次查询取出任务，内存校验后单事务 bulk_update 写入）"""
         task_updates = request.data.get('updates', [])
 
         if not task_updates:
@@ -1346,30 +1479,41 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'error_code': 'no_updates'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        if len(task_updates) > 50:  # 限制批量更新数量
+        if len(task_updates) > BULK_MAX_ITEMS:  # 限制批量更新数量
             return Response({
                 'success': False,
-                'message': '批量更新任务数量不能超过50个',
+                'message': f'批量更新任务数量不能超过{BULK_MAX_ITEMS}个',
                 'error_code': 'bulk_limit_exceeded'
             }, status=status.HTTP_400_BAD_REQUEST)
+        BULK_OPERATION_SIZE.observe(len(task_updates), operation='update')
 
-        updated_tasks = []
+        executor = TaskBulkExecutor(request.user)
         failed_updates = []
 
+        # 一次查询取出全部目标任务
+        valid_updates = []
         for update_data in task_updates:
-            try:
-                task_id = update_data.get('id')
-                if not task_id:
-                    failed_updates.append({
-                        'data': update_data,
-                        'error': '缺少任务ID'
-                    })
-                    continue
+            if not isinstance(update_data, dict) or not update_data.get('id'):
+                failed_updates.append({
+                    'data': update_data,
+                    'error': '缺少任务ID'
+                })
+                continue
+            valid_updates.append(update_data)
 
-                # 获取任务实例
-                try:
-                    task = Task.objects.get(id=task_id, owner=request.user)
-                except Task.DoesNotExist:
+        tasks = executor.fetch(
+            {task_id for task_id in (parse_task_id(item['id']) for item in valid_updates) if task_id}
+        )
+
+        # 在内存中校验并应用变更
+        changed_tasks = {}
+        changed_fields = set()
+        updated_items = []
+        for update_data in valid_updates:
+            task_id = update_data['id']
+            try:
+                task = tasks.get(parse_task_id(task_id))
+                if task is None or task.owner_id != request.user.id:
                     failed_updates.append({
                         'id': task_id,
                         'error': '任务不存在或无权限访问'
@@ -1384,16 +1528,14 @@ class TaskViewSet(viewsets.ModelViewSet):
                     })
                     continue
 
-                # 执行更新
                 update_fields = {k: v for k, v in update_data.items() if k != 'id'}
                 serializer = TaskUpdateSerializer(task, data=update_fields, partial=True)
 
                 if serializer.is_valid():
-                    updated_task = serializer.save()
-
-                    # 使用详细序列化器
-                    detail_serializer = TaskDetailSerializer(updated_task, context={'request': request})
-                    updated_tasks.append(detail_serializer.data)
+                    changed_fields.update(serializer.apply_to_instance(task, serializer.validated_data))
+                    changed_fields.update(task.sync_completion_fields())
+                    changed_tasks[task.id] = task
+                    updated_items.append(task)
                 else:
                     failed_updates.append({
                         'id': task_id,
@@ -1402,10 +1544,18 @@ class TaskViewSet(viewsets.ModelViewSet):
 
             except Exception as e:
                 failed_updates.append({
-                    'id': update_data.get('id', 'unknown'),
+                    'id': task_id,
                     'error': str(e)
                 })
 
+        # 单事务批量写入
+        try:
+            executor.save(list(changed_tasks.values()), changed_fields)
+            updated_tasks = TaskDetailSerializer(updated_items, many=True, context={'request': request}).data
+        except Exception as e:
+            failed_updates.extend({'id': str(task.id), 'error': str(e)} for task in updated_items)
+            updated_tasks = []
+
         # 获取批量更新统计
         bulk_stats = {
             'total_attempted': len(task_updates),
@@ -1437,7 +1587,9 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'error': 'permission_denied'
             }, status=status.HTTP_403_FORBIDDEN)
 
-        serializer = TaskStatusUpdateSerializer(instance, data=request.data, partial=True)
+        serializer = TaskStatusUpdateSerializer(
+            instance, data=request.data, partial=True, context={'request': request}
+        )
         serializer.is_valid(raise_exception=True)
 
         task = serializer.save()
@@ -1453,7 +1605,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_action(self, request):
-        """批量操作统一入口: 支持 assign / update_status / update_priority"""
+        """批量操作统一入口: 支持 complete / delete / restore / assign / update_status / update_priority"""
         from .serializers import TaskBulkActionSerializer
 
         serializer = TaskBulkActionSerializer(data=request.data)
@@ -1471,61 +1623,106 @@ class TaskViewSet(viewsets.ModelViewSet):
         action_type = data['action']
         task_ids = data['task_ids']
 
-        if len(task_ids) > 50:
+        if len(task_ids) > BULK_MAX_ITEMS:
             return Response({
                 'success': False,
-                'message': '批量操作最多支持50个任务',
+                'message': f'批量操作最多支持{BULK_MAX_ITEMS}个任务',
                 'error': 'too_many_tasks'
             }, status=status.HTTP_400_BAD_REQUEST)
+        BULK_OPERATION_SIZE.observe(len(task_ids), operation=action_type)
 
+        executor = TaskBulkExecutor(request.user)
         successes = []
-        failures = []
 
-        for tid in task_ids:
-            try:
-                try:
-                    task = Task.objects.get(id=tid, owner=request.user)
-                except Task.DoesNotExist:
-                    failures.append({'id': tid, 'error': '任务不存在或无权限访问'})
-                    continue
-
-                if not task.can_edit(request.user):
-                    failures.append({'id': tid, 'error': '没有权限编辑此任务'})
-                    continue
-
-                if action_type == 'assign':
-                    assigned_to_id = data.get('assigned_to')
-                    try:
-                        user = User.objects.get(id=assigned_to_id)
-                    except User.DoesNotExist:
-                        failures.append({'id': tid, 'error': '分配的用户不存在'})
-                        continue
-                    task.assigned_to = user
-                    task.save(update_fields=['assigned_to', 'updated_at'])
-                    successes.append({'id': tid, 'title': task.title, 'action': 'assign', 'assigned_to': user.username})
+        if action_type == 'restore':
+            targets, failures = executor.resolve(
+                task_ids, is_deleted=True,
+                permission_check=lambda task, user: task.can_restore(user),
+                permission_error='没有权限恢复此任务'
+            )
+        elif action_type == 'delete':
+            # 与单个任务删除一致，使用删除权限而不是编辑权限
+            targets, failures = executor.resolve(
+                task_ids,
+                permission_check=lambda task, user: task.can_delete(user),
+                permission_error='没有权限删除此任务'
+            )
+        else:
+            targets, failures = executor.resolve(
+                task_ids,
+                permission_check=lambda task, user: task.can_edit(user)
+            )
 
-                elif action_type == 'update_status':
-                    status_payload = {'status': data.get('status')}
-                    status_ser = TaskStatusUpdateSerializer(task, data=status_payload, partial=True)
+        try:
+            if action_type == 'assign':
+                try:
+                    user = User.objects.get(id=data.get('assigned_to'))
+                except User.DoesNotExist:
+                    failures.extend({'id': tid, 'error': '分配的用户不存在'} for tid, _ in targets)
+                    targets = []
+                else:
+                    executor.update([task for _, task in targets], assigned_to=user, updated_at=timezone.now())
+                    successes = [
+                        {'id': tid, 'title': task.title, 'action': 'assign', 'assigned_to': user.username}
+                        for tid, task in targets
+                    ]
+
+            elif action_type in ('update_status', 'complete'):
+                new_status = 'COMPLETED' if action_type == 'complete' else data.get('status')
+                changed = []
+                changed_fields = set()
+                for tid, task in targets:
+                    status_ser = TaskStatusUpdateSerializer(task, data={'status': new_status}, partial=True)
                     try:
                         status_ser.is_valid(raise_exception=True)
-                        updated_task = status_ser.save()
-                        detail = TaskDetailSerializer(updated_task, context={'request': request}).data
-                        successes.append({'id': tid, 'title': task.title, 'action': 'update_status', 'data': detail})
                     except ValidationError as ve:
                         failures.append({'id': tid, 'error': ve.detail})
+                        continue
+                    for field, value in status_ser.validated_data.items():
+                        setattr(task, field, value)
+                        changed_fields.add(field)
+                    changed_fields.update(task.sync_completion_fields())
+                    changed.append((tid, task))
+
+                executor.save([task for _, task in changed], changed_fields)
+                details = TaskDetailSerializer(
+                    [task for _, task in changed], many=True, context={'request': request}
+                ).data
+                successes = [
+                    {'id': tid, 'title': task.title, 'action': action_type, 'data': detail}
+                    for (tid, task), detail in zip(changed, details)
+                ]
+
+            elif action_type == 'update_priority':
+                executor.update([task for _, task in targets], priority=data.get('priority'),
+                                updated_at=timezone.now())
+                successes = [
+                    {'id': tid, 'title': task.title, 'action': 'update_priority', 'priority': task.priority}
+                    for tid, task in targets
+                ]
+
+            elif action_type == 'delete':
+                executor.soft_delete([task for _, task in targets])
+                successes = [
+                    {'id': tid, 'title': task.title, 'action': 'delete', 'deleted_at': task.deleted_at}
+                    for tid, task in targets
+                ]
+
+            elif action_type == 'restore':
+                executor.restore([task for _, task in targets])
+                successes = [
+                    {'id': tid, 'title': task.title, 'action': 'restore'}
+                    for tid, task in targets
+                ]
 
-                elif action_type == 'update_priority':
-                    task.priority = data.get('priority')
-                    task.save(update_fields=['priority', 'updated_at'])
-                    successes.append(
-                        {'id': tid, 'title': task.title, 'action': 'update_priority', 'priority': task.priority})
-
-                else:
-                    failures.append({'id': tid, 'error': '不支持的操作类型'})
+            else:
+                failures.extend({'id': tid, 'error': '不支持的操作类型'} for tid, _ in targets)
 
-            except Exception as e:
-                failures.append({'id': tid, 'error': str(e)})
+        except Exception as e:
+            # 单事务写入失败时整体回滚，尚未记为失败的目标任务全部记为失败
+            failed_ids = {item['id'] for item in failures}
+            failures.extend({'id': tid, 'error': str(e)} for tid, _ in targets if tid not in failed_ids)
+            successes = []
 
         total = len(task_ids)
         successful_count = len(successes)
@@ -1582,7 +1779,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         """恢复软删除的任务"""
         try:
             # 使用all_objects管理器查找包括软删除的任务
-            task = Task.all_objects.get(pk=pk)
+            task = self.optimize_queryset(Task.all_objects.all()).get(pk=pk)
         except Task.DoesNotExist:
             return Response({
                 'success': False,
@@ -1648,7 +1845,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_delete(self, request):
-        """批量软删除任务"""
+        """批量软删除任务（基于集合：一次查询取出任务，单事务 QuerySet.update() 写入）"""
         task_ids = request.data.get('task_ids', [])
 
         if not task_ids:
@@ -1658,62 +1855,44 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'error': 'missing_task_ids'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        if len(task_ids) > 50:
+        if len(task_ids) > BULK_MAX_ITEMS:
             return Response({
                 'success': False,
-                'message': '批量删除最多支持50个任务',
+                'message': f'批量删除最多支持{BULK_MAX_ITEMS}个任务',
                 'error': 'too_many_tasks'
             }, status=status.HTTP_400_BAD_REQUEST)
+        BULK_OPERATION_SIZE.observe(len(task_ids), operation='delete')
 
         # 统计信息
         total_attempted = len(task_ids)
-        successful_deletes = []
-        failed_deletes = []
-
-        for task_id in task_ids:
-            try:
-                # 获取任务
-                task = Task.objects.get(id=task_id, owner=request.user, is_deleted=False)
-
-                # 检查删除权限
-                if not task.can_delete(request.user):
-                    failed_deletes.append({
-                        'id': task_id,
-                        'error': '没有权限删除此任务'
-                    })
-                    continue
+        executor = TaskBulkExecutor(request.user)
+        targets, failed_deletes = executor.resolve(
+            task_ids,
+            missing_error='任务不存在或已被删除',
+            permission_check=lambda task, user: task.can_delete(user),
+            permission_error='没有权限删除此任务'
+        )
 
-                # 执行软删除
-                task.soft_delete(user=request.user)
-                successful_deletes.append({
+        # 执行软删除
+        try:
+            executor.soft_delete([task for _, task in targets])
+            successful_deletes = [
+                {
                     'id': task_id,
                     'title': task.title,
                     'deleted_at': task.deleted_at
-                })
-
-            except Task.DoesNotExist:
-                failed_deletes.append({
-                    'id': task_id,
-                    'error': '任务不存在或已被删除'
-                })
-            except Exception as e:
-                failed_deletes.append({
-                    'id': task_id,
-                    'error': str(e)
-                })
+                }
+                for task_id, task in targets
+            ]
+        except Exception as e:
+            failed_deletes.extend({'id': task_id, 'error': str(e)} for task_id, _ in targets)
+            successful_deletes = []
 
         # 计算统计
         successful_count = len(successful_deletes)
         failed_count = len(failed_deletes)
         success_rate = (successful_count / total_attempted * 100) if total_attempted > 0 else 0
 
-        # 更新用户统计
-        try:
-            profile = request.user.userprofile
-            profile.update_task_stats()
-        except:
-            pass
-
         # 确定响应状态码
         if successful_count == total_attempted:
             response_status = status.HTTP_200_OK
@@ -1739,7 +1918,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def bulk_restore(self, request):
-        """批量恢复任务"""
+        """批量恢复任务（基于集合：一次查询取出任务，单事务 QuerySet.update() 写入）"""
         task_ids = request.data.get('task_ids', [])
 
         if not task_ids:
@@ -1749,62 +1928,46 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'error': 'missing_task_ids'
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        if len(task_ids) > 50:
+        if len(task_ids) > BULK_MAX_ITEMS:
             return Response({
                 'success': False,
-                'message': '批量恢复最多支持50个任务',
+                'message': f'批量恢复最多支持{BULK_MAX_ITEMS}个任务',
                 'error': 'too_many_tasks'
             }, status=status.HTTP_400_BAD_REQUEST)
+        BULK_OPERATION_SIZE.observe(len(task_ids), operation='restore')
 
         # 统计信息
         total_attempted = len(task_ids)
-        successful_restores = []
-        failed_restores = []
-
-        for task_id in task_ids:
-            try:
-                # 使用all_objects管理器获取包括软删除的任务
-                task = Task.all_objects.get(id=task_id, owner=request.user, is_deleted=True)
-
-                # 检查恢复权限
-                if not task.can_restore(request.user):
-                    failed_restores.append({
-                        'id': task_id,
-                        'error': '没有权限恢复此任务'
-                    })
-                    continue
+        executor = TaskBulkExecutor(request.user)
+        targets, failed_restores = executor.resolve(
+            task_ids,
+            is_deleted=True,
+            missing_error='任务不存在或未被删除',
+            permission_check=lambda task, user: task.can_restore(user),
+            permission_error='没有权限恢复此任务'
+        )
 
-                # 执行恢复
-                task.restore(user=request.user)
-                successful_restores.append({
+        # 执行恢复
+        try:
+            executor.restore([task for _, task in targets])
+            restored_at = timezone.now()
+            successful_restores = [
+                {
                     'id': task_id,
                     'title': task.title,
-                    'restored_at': timezone.now()
-                })
-
-            except Task.DoesNotExist:
-                failed_restores.append({
-                    'id': task_id,
-                    'error': '任务不存在或未被删除'
-                })
-            except Exception as e:
-                failed_restores.append({
-                    'id': task_id,
-                    'error': str(e)
-                })
+                    'restored_at': restored_at
+                }
+                for task_id, task in targets
+            ]
+        except Exception as e:
+            failed_restores.extend({'id': task_id, 'error': str(e)} for task_id, _ in targets)
+            successful_restores = []
 
         # 计算统计
         successful_count = len(successful_restores)
         failed_count = len(failed_restores)
         success_rate = (successful_count / total_attempted * 100) if total_attempted > 0 else 0
 
-        # 更新用户统计
-        try:
-            profile = request.user.userprofile
-            profile.update_task_stats()
-        except:
-            pass
-
         # 确定响应状态码
         if successful_count == total_attempted:
             response_status = status.HTTP_200_OK
@@ -1828,14 +1991,103 @@ class TaskViewSet(viewsets.ModelViewSet):
             }
         }, status=response_status)
 
+    @action(detail=False, methods=['get'], url_path='export',
+            content_negotiation_class=ExportContentNegotiation)
+    def export(self, request):
+        """
+        流式导出任务
+
+        GET /api/tasks/export/?format=csv|ndjson
+
+        支持与任务列表相同的过滤、搜索与排序参数；
+        使用 values() 投影和 iterator() 分块读取，不构建序列化器实例，内存占用恒定
+        """
+        export_format = request.query_params.get('format', 'csv').lower()
+        if export_format not in EXPORT_FORMATS:
+            return Response({
+                'success': False,
+                'message': f'不支持的导出格式: {export_format}，可选值: {", ".join(EXPORT_FORMATS)}',
+                'error': 'invalid_format'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return build_export_response(queryset, export_format)
+
+    @action(detail=False, methods=['post'], url_path='import',
+            parser_classes=[MultiPartParser, FormParser])
+    def import_tasks(self, request):
+        """
+        流式导入任务
+
+        POST /api/tasks/import/  (multipart/form-data)
+        - file: CSV（首行为表头）或 NDJSON 文件
+        - format: 可选，csv / ndjson，默认按文件扩展名判断
+
+        文件保存后由导入作业增量解析，按 TaskCreateSerializer 规则逐行验证并分块写入，
+        立即返回作业信息，通过 GET /api/tasks/import/{job_id}/ 查询进度
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({
+                'success': False,
+                'message': '请上传要导入的文件',
+                'error': 'missing_file'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = detect_format(upload.name, request.data.get('format'))
+        if file_format is None:
+            return Response({
+                'success': False,
+                'message': '不支持的导入格式，请上传 CSV 或 NDJSON 文件',
+                'error': 'invalid_format'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        job = TaskImportJob.objects.create(
+            user=request.user,
+            file=upload,
+            file_name=upload.name[:255],
+            file_format=file_format
+        )
+        job = start_import_job(job)
+
+        return Response({
+            'success': True,
+            'message': '导入作业已创建',
+            'data': TaskImportJobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path=r'import/(?P<job_id>[0-9a-f-]+)')
+    def import_status(self, request, job_id=None):
+        """
+        查询任务导入作业状态
+
+        GET /api/tasks/import/{job_id}/
+        """
+        job = TaskImportJob.objects.filter(pk=parse_task_id(job_id), user=request.user).first()
+        if job is None:
+            return Response({
+                'success': False,
+                'message': '导入作业不存在',
+                'error': 'not_found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        # 执行进程已中断的作业不会再有进度，查询时标记为失败
+        if job.status == 'RUNNING' and fail_stale_import_jobs(TaskImportJob.objects.filter(pk=job.pk)):
+            job.refresh_from_db()
+
+        return Response({
+            'success': True,
+            'data': TaskImportJobSerializer(job).data
+        })
+
     @action(detail=False, methods=['get'])
     def trash(self, request):
         """获取回收站中的已删除任务"""
         # 获取已删除的任务
-        deleted_tasks = Task.all_objects.filter(
+        deleted_tasks = self.optimize_queryset(Task.all_objects.filter(
             owner=request.user,
             is_deleted=True
-        ).order_by('-deleted_at')
+        )).order_by('-deleted_at')
 
         # 分页
         page = self.paginate_queryset(deleted_tasks)
@@ -1941,6 +2193,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         })
 
     @action(detail=False, methods=['get'])
+    @cached_analytics('stats')
     def stats(self, request):
         """
         任务统计API
@@ -1966,16 +2219,12 @@ class TaskViewSet(viewsets.ModelViewSet):
         try:
             # 获取基础查询集（用户相关的任务）
             user = request.user
-            base_queryset = Task.objects.filter(
-                Q(owner=user) | Q(assigned_to=user)
-            ).distinct()
+            base_queryset = Task.objects.visible_to(user)
 
             # 处理软删除任务包含
             include_deleted = request.query_params.get('include_deleted', 'false').lower()
             if include_deleted == 'true':
-                base_queryset = Task.all_objects.filter(
-                    Q(owner=user) | Q(assigned_to=user)
-                ).distinct()
+                base_queryset = Task.all_objects.visible_to(user)
 
             # 处理时间周期过滤
             period = request.query_params.get('period', 'all').lower()
@@ -1989,30 +2238,34 @@ class TaskViewSet(viewsets.ModelViewSet):
             # 应用时间周期过滤
             filtered_queryset = self._apply_period_filter(base_queryset, period, date_field)
 
+            # 单次条件聚合计算基础、状态、优先级、工作负载、进度与逾期统计
+            engine = TaskStatsEngine(filtered_queryset, user)
+
             # 1. 基础统计
-            basic_stats = self._calculate_basic_stats(filtered_queryset)
+            basic_stats = engine.basic_stats()
 
             # 2. 状态分布统计
-            status_distribution = self._calculate_status_distribution(filtered_queryset)
+            status_distribution = engine.status_distribution()
 
             # 3. 优先级分布统计
-            priority_distribution = self._calculate_priority_distribution(filtered_queryset)
+            priority_distribution = engine.priority_distribution()
 
             # 4. 分类统计
-            category_stats = self._calculate_category_stats(filtered_queryset)
+            category_stats = self._calculate_category_stats(filtered_queryset, engine.total)
 
             # 5. 时间趋势分析
             timezone_str = request.query_params.get('timezone', 'UTC')
-            time_trends = self._calculate_time_trends(base_queryset, period, date_field, timezone_str)
+            rollup_user = self._get_rollup_user(user, include_deleted == 'true', date_field)
+            time_trends = self._calculate_time_trends(base_queryset, period, date_field, timezone_str, rollup_user)
 
             # 6. 工作负载分析
-            workload_stats = self._calculate_workload_stats(filtered_queryset, user)
+            workload_stats = engine.workload_stats()
 
             # 7. 进度分析
-            progress_analysis = self._calculate_progress_analysis(filtered_queryset)
+            progress_analysis = engine.progress_analysis()
 
             # 8. 逾期分析
-            overdue_analysis = self._calculate_overdue_analysis(filtered_queryset)
+            overdue_analysis = engine.overdue_analysis()
 
             # 9. 热门标签统计
             popular_tags = self._calculate_popular_tags(filtered_queryset)
@@ -2036,7 +2289,7 @@ class TaskViewSet(viewsets.ModelViewSet):
                         'date_field': date_field,
                         'include_deleted': include_deleted == 'true',
                         'generated_at': timezone.now().isoformat(),
-                        'total_tasks_analyzed': filtered_queryset.count(),
+                        'total_tasks_analyzed': engine.total,
                         'user_id': user.id,
                         'username': user.username
                     }
@@ -2088,390 +2341,60 @@ class TaskViewSet(viewsets.ModelViewSet):
             start_date = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
             end_date = start_date.replace(year=start_date.year + 1)
         else:
-            return queryset
-
-        # 应用日期过滤
-        filter_kwargs = {
-            f'{date_field}__gte': start_date,
-            f'{date_field}__lt': end_date
-        }
-
-        return queryset.filter(**filter_kwargs)
-
-    def _calculate_basic_stats(self, queryset):
-        """计算基础统计数据"""
-        total_count = queryset.count()
-
-        if total_count == 0:
-            return {
-                'total_tasks': 0,
-                'completed_tasks': 0,
-                'completion_rate': 0.0,
-                'overdue_tasks': 0,
-                'overdue_rate': 0.0,
-                'average_progress': 0.0,
-                'total_estimated_hours': 0.0,
-                'total_actual_hours': 0.0
-            }
-
-        # 完成任务统计
-        completed_count = queryset.filter(status='COMPLETED').count()
-        completion_rate = (completed_count / total_count) * 100
-
-        # 逾期任务统计
-        overdue_count = queryset.filter(
-            due_date__lt=timezone.now(),
-            status__in=['PENDING', 'IN_PROGRESS', 'ON_HOLD']
-        ).count()
-        overdue_rate = (overdue_count / total_count) * 100
-
-        # 平均进度
-        avg_progress = queryset.aggregate(avg_progress=Avg('progress'))['avg_progress'] or 0.0
-
-        # 工时统计
-        total_estimated = queryset.aggregate(
-            total=Sum('estimated_hours')
-        )['total'] or 0.0
-
-        total_actual = queryset.aggregate(
-            total=Sum('actual_hours')
-        )['total'] or 0.0
-
-        return {
-            'total_tasks': total_count,
-            'completed_tasks': completed_count,
-            'completion_rate': round(completion_rate, 2),
-            'overdue_tasks': overdue_count,
-            'overdue_rate': round(overdue_rate, 2),
-            'average_progress': round(avg_progress, 2),
-            'total_estimated_hours': float(total_estimated),
-            'total_actual_hours': float(total_actual),
-            'efficiency_rate': round(
-                (float(total_actual) / float(total_estimated) * 100) if total_estimated > 0 else 0.0, 2)
-        }
-
-    def _calculate_status_distribution(self, queryset):
-        """计算状态分布统计"""
-        total_count = queryset.count()
-
-        if total_count == 0:
-            return {}
-
-        status_stats = {}
-
-        for status_choice in Task.STATUS_CHOICES:
-            status_code = status_choice[0]
-            status_name = status_choice[1]
-            count = queryset.filter(status=status_code).count()
-
-            if count > 0:
-                status_stats[status_code] = {
-                    'name': status_name,
-                    'count': count,
-                    'percentage': round((count / total_count) * 100, 2)
-                }
-
-        return status_stats
-
-    def _calculate_priority_distribution(self, queryset):
-        """计算优先级分布统计"""
-        total_count = queryset.count()
-
-        if total_count == 0:
-            return {}
-
-        priority_stats = {}
-
-        for priority_choice in Task.PRIORITY_CHOICES:
-            priority_code = priority_choice[0]
-            priority_name = priority_choice[1]
-            count = queryset.filter(priority=priority_code).count()
-
-            if count > 0:
-                priority_stats[priority_code] = {
-                    'name': priority_name,
-                    'count': count,
-                    'percentage': round((count / total_count) * 100, 2)
-                }
-
-        return priority_stats
-
-    def _calculate_category_stats(self, queryset):
-        """计算分类统计"""
-        category_stats = queryset.values('category').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]  # 前10个最常用分类
-
-        total_count = queryset.count()
-
-        result = []
-        for item in category_stats:
-            if item['category']:
-                result.append({
-                    'category': item['category'],
-                    'count': item['count'],
-                    'percentage': round((item['count'] / total_count) * 100, 2) if total_count > 0 else 0.0
-                })
-
-        return result
-
-    def _calculate_time_trends(self, queryset, period, date_field):
-        """计算时间趋势分析"""
-        if period == 'all':
-            # 按月统计最近12个月
-            from datetime import datetime, timedelta
-            end_date = timezone.now()
-            start_date = end_date - timedelta(days=365)
-
-            # 按月分组统计
-            trends = []
-            current_date = start_date.replace(day=1)
-
-            while current_date <= end_date:
-                next_month = current_date.replace(
-                    month=current_date.month + 1) if current_date.month < 12 else current_date.replace(
-                    year=current_date.year + 1, month=1)
-
-                month_tasks = queryset.filter(
-                    **{f'{date_field}__gte': current_date, f'{date_field}__lt': next_month}
-                ).count()
-
-                month_completed = queryset.filter(
-                    **{f'{date_field}__gte': current_date, f'{date_field}__lt': next_month},
-                    status='COMPLETED'
-                ).count()
-
-                trends.append({
-                    'period': current_date.strftime('%Y-%m'),
-                    'total_tasks': month_tasks,
-                    'completed_tasks': month_completed,
-                    'completion_rate': round((month_completed / month_tasks * 100) if month_tasks > 0 else 0.0, 2)
-                })
-
-                current_date = next_month
-
-            return trends
-
-        elif period == 'week':
-            # 按天统计最近7天
-            trends = []
-            for i in range(7):
-                day = timezone.now() - timezone.timedelta(days=i)
-                day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-                day_end = day_start + timezone.timedelta(days=1)
-
-                day_tasks = queryset.filter(
-                    **{f'{date_field}__gte': day_start, f'{date_field}__lt': day_end}
-                ).count()
-
-                day_completed = queryset.filter(
-                    **{f'{date_field}__gte': day_start, f'{date_field}__lt': day_end},
-                    status='COMPLETED'
-                ).count()
-
-                trends.append({
-                    'period': day.strftime('%Y-%m-%d'),
-                    'total_tasks': day_tasks,
-                    'completed_tasks': day_completed,
-                    'completion_rate': round((day_completed / day_tasks * 100) if day_tasks > 0 else 0.0, 2)
-                })
-
-            return list(reversed(trends))  # 按时间正序
-
-        else:
-            # 其他周期的简单统计
-            total_tasks = queryset.count()
-            completed_tasks = queryset.filter(status='COMPLETED').count()
-
-            return [{
-                'period': period,
-                'total_tasks': total_tasks,
-                'completed_tasks': completed_tasks,
-                'completion_rate': round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0, 2)
-            }]
-
-    def _calculate_workload_stats(self, queryset, user):
-        """计算工作负载统计"""
-        # 用户作为所有者的任务
-        owned_tasks = queryset.filter(owner=user).count()
-        owned_completed = queryset.filter(owner=user, status='COMPLETED').count()
-
-        # 用户作为被分配者的任务
-        assigned_tasks = queryset.filter(assigned_to=user).count()
-        assigned_completed = queryset.filter(assigned_to=user, status='COMPLETED').count()
-
-        # 按状态分组的任务数量
-        status_workload = {}
-        for status_choice in Task.STATUS_CHOICES:
-            status_code = status_choice[0]
-            count = queryset.filter(
-                Q(owner=user) | Q(assigned_to=user),
-                status=status_code
-            ).count()
-            if count > 0:
-                status_workload[status_code] = count
-
-        return {
-            'owned_tasks': {
-                'total': owned_tasks,
-                'completed': owned_completed,
-                'completion_rate': round((owned_completed / owned_tasks * 100) if owned_tasks > 0 else 0.0, 2)
-            },
-            'assigned_tasks': {
-                'total': assigned_tasks,
-                'completed': assigned_completed,
-                'completion_rate': round((assigned_completed / assigned_tasks * 100) if assigned_tasks > 0 else 0.0, 2)
-            },
-            'status_workload': status_workload,
-            'total_active_tasks': queryset.filter(
-                Q(owner=user) | Q(assigned_to=user),
-                status__in=['PENDING', 'IN_PROGRESS']
-            ).count()
-        }
-
-    def _calculate_progress_analysis(self, queryset):
-        """计算进度分析"""
-        progress_ranges = [
-            (0, 0, '未开始'),
-            (1, 25, '刚开始'),
-            (26, 50, '进行中'),
-            (51, 75, '大部分完成'),
-            (76, 99, '接近完成'),
-            (100, 100, '已完成')
-        ]
-
-        total_count = queryset.count()
-        progress_distribution = []
-
-        for min_progress, max_progress, label in progress_ranges:
-            count = queryset.filter(
-                progress__gte=min_progress,
-                progress__lte=max_progress
-            ).count()
-
-            if count > 0:
-                progress_distribution.append({
-                    'range': f'{min_progress}-{max_progress}%',
-                    'label': label,
-                    'count': count,
-                    'percentage': round((count / total_count * 100) if total_count > 0 else 0.0, 2)
-                })
-
-        # 平均进度
-        avg_progress = queryset.aggregate(avg_progress=Avg('progress'))['avg_progress'] or 0.0
-
-        return {
-            'distribution': progress_distribution,
-            'average_progress': round(avg_progress, 2),
-            'tasks_in_progress': queryset.filter(progress__gt=0, progress__lt=100).count(),
-            'tasks_completed': queryset.filter(progress=100).count(),
-            'tasks_not_started': queryset.filter(progress=0).count()
-        }
-
-    def _calculate_overdue_analysis(self, queryset):
-        """计算逾期分析"""
-        now = timezone.now()
-
-        # 逾期任务（截止日期已过且未完成）
-        overdue_tasks = queryset.filter(
-            due_date__lt=now,
-            status__in=['PENDING', 'IN_PROGRESS', 'ON_HOLD']
-        )
-
-        overdue_count = overdue_tasks.count()
-        total_count = queryset.count()
-
-        # 即将到期任务（未来3天内到期）
-        upcoming_due = queryset.filter(
-            due_date__gte=now,
-            due_date__lte=now + timezone.timedelta(days=3),
-            status__in=['PENDING', 'IN_PROGRESS', 'ON_HOLD']
-        ).count()
-
-        # 逾期时长分析
-        overdue_by_duration = []
-        durations = [
-            (1, '1天内'),
-            (7, '1周内'),
-            (30, '1月内'),
-            (90, '3月内'),
-            (365, '1年内'),
-            (float('inf'), '1年以上')
-        ]
-
-        for days, label in durations:
-            if days == float('inf'):
-                count = overdue_tasks.filter(
-                    due_date__lt=now - timezone.timedelta(days=365)
-                ).count()
-            else:
-                count = overdue_tasks.filter(
-                    due_date__gte=now - timezone.timedelta(days=days),
-                    due_date__lt=now
-                ).count()
-
-            if count > 0:
-                overdue_by_duration.append({
-                    'duration': label,
-                    'count': count,
-                    'percentage': round((count / overdue_count * 100) if overdue_count > 0 else 0.0, 2)
-                })
+            return queryset
 
-        return {
-            'total_overdue': overdue_count,
-            'overdue_rate': round((overdue_count / total_count * 100) if total_count > 0 else 0.0, 2),
-            'upcoming_due': upcoming_due,
-            'overdue_by_duration': overdue_by_duration,
-            'most_overdue_task': self._get_most_overdue_task(overdue_tasks)
+        # 应用日期过滤
+        filter_kwargs = {
+            f'{date_field}__gte': start_date,
+            f'{date_field}__lt': end_date
         }
 
-    def _get_most_overdue_task(self, overdue_queryset):
-        """获取最逾期的任务信息"""
-        if not overdue_queryset.exists():
+        return queryset.filter(**filter_kwargs)
+
+    def _get_rollup_user(self, user, include_deleted, date_field):
+        """
+        趋势统计可改读每日汇总时返回对应用户，否则返回 None
+
+        汇总只覆盖 visible_to(user) 中未删除任务按 created_at 的统计
+        """
+        if include_deleted or date_field != 'created_at':
             return None
+        return user
 
-        most_overdue = overdue_queryset.order_by('due_date').first()
-        if most_overdue:
-            # 确保正确处理日期比较
-            now = timezone.now()
-            if hasattr(most_overdue.due_date, 'date'):
-                due_date = most_overdue.due_date.date()
-                current_date = now.date()
-            else:
-                due_date = most_overdue.due_date
-                current_date = now.date()
+    def _calculate_category_stats(self, queryset, total_count=None):
+        """计算分类统计"""
+        category_stats = queryset.values('category').annotate(
+            count=Count('id')
+        ).order_by('-count')[:10]  # 前10个最常用分类
 
-            overdue_days = (current_date - due_date).days
-            return {
-                'id': str(most_overdue.id),
-                'title': most_overdue.title,
-                'due_date': most_overdue.due_date.isoformat() if hasattr(most_overdue.due_date, 'isoformat') else str(
-                    most_overdue.due_date),
-                'overdue_days': overdue_days,
-                'priority': most_overdue.priority,
-                'status': most_overdue.status
-            }
-        return None
+        if total_count is None:
+            total_count = queryset.count()
 
-    def _calculate_popular_tags(self, queryset):
-        """计算热门标签统计"""
-        # 收集所有标签
-        tag_counts = {}
+        result = []
+        for item in category_stats:
+            if item['category']:
+                result.append({
+                    'category': item['category'],
+                    'count': item['count'],
+                    'percentage': round((item['count'] / total_count) * 100, 2) if total_count > 0 else 0.0
+                })
 
-        for task in queryset.exclude(tags__isnull=True).exclude(tags=''):
-            tags = [tag.strip() for tag in task.tags.split(',') if tag.strip()]
-            for tag in tags:
-                tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        return result
 
-        # 排序并取前10个
-        sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    def _calculate_popular_tags(self, queryset):
+        """计算热门标签统计（标签关联表 GROUP BY）"""
+        total_tasks_with_tags = TaskTag.objects.filter(
+            task__in=queryset.order_by().values('pk')
+        ).values('task_id').distinct().count()
 
-        total_tasks_with_tags = len([t for t in queryset if t.tags])
+        # 取前10个
+        sorted_tags = TaskTag.tag_counts(queryset)[:10]
 
         result = []
-        for tag, count in sorted_tags:
+        for item in sorted_tags:
+            count = item['count']
             result.append({
-                'tag': tag,
+                'tag': item['name'],
                 'count': count,
                 'percentage': round((count / total_tasks_with_tags * 100) if total_tasks_with_tags > 0 else 0.0, 2)
             })
@@ -2505,22 +2428,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         ).values('id', 'username', 'first_name', 'last_name')[:20]
 
         # 获取用户常用标签
-        user_tags = Task.objects.filter(
-            owner=request.user
-        ).exclude(
-            tags__isnull=True
-        ).exclude(
-            tags__exact=''
-        ).values_list('tags', flat=True)
-
-        tag_counts = {}
-        for tags_str in user_tags:
-            for tag in tags_str.split(','):
-                tag = tag.strip()
-                if tag:
-                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
-
-        popular_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)[:20]
+        popular_tags = TaskTag.tag_counts(Task.objects.filter(owner=request.user))[:20]
 
         return Response({
             'success': True,
@@ -2542,9 +2450,9 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'assignable_users': list(assignable_users),
                 'popular_tags': [
                     {
-                        'tag': tag,
-                        'usage_count': count
-                    } for tag, count in popular_tags
+                        'tag': item['name'],
+                        'usage_count': item['count']
+                    } for item in popular_tags
                 ],
                 'defaults': {
                     'status': 'PENDING',
@@ -2752,12 +2660,15 @@ class TaskViewSet(viewsets.ModelViewSet):
         - start_after: 开始时间起始
         - start_before: 开始时间结束
         - include_deleted: 包含已删除任务（true/false）
-        - sort: 排序字段（created_at, updated_at, due_date, priority, status, progress, title）
+        - sort: 排序字段（relevance, created_at, updated_at, due_date, priority, status, progress, title），
+          有 q 时默认 relevance（按相关度）
         - order: 排序方向（asc/desc）
         - page: 页码
         - page_size: 每页数量
+        - pagination: 设为 cursor 时使用游标分页（sort 仅支持 created_at / updated_at）
         
         高级功能:
+        - 全文搜索后端（PostgreSQL SearchVector / SQLite FTS5），结果附带相关度与高亮片段
         - 支持模糊搜索和精确匹配
         - 支持多字段组合搜索
         - 支持时间范围查询
@@ -2770,16 +2681,13 @@ class TaskViewSet(viewsets.ModelViewSet):
 
             # 处理搜索参数
             search_params = {}
+            cursor_mode = use_cursor_pagination(request)
 
-            # 全文搜索
+            # 全文搜索（按数据库选择搜索后端，结果带相关度 search_rank）
+            search_backend = get_search_backend()
             q = request.query_params.get('q', '').strip()
             if q:
-                queryset = queryset.filter(
-                    Q(title__icontains=q) |
-                    Q(description__icontains=q) |
-                    Q(category__icontains=q) |
-                    Q(tags__icontains=q)
-                )
+                queryset = search_backend.search(queryset, q)
                 search_params['q'] = q
 
             # 标题搜索
@@ -2800,15 +2708,12 @@ class TaskViewSet(viewsets.ModelViewSet):
                 queryset = queryset.filter(category__icontains=category)
                 search_params['category'] = category
 
-            # 标签搜索（支持多个标签）
+            # 标签搜索（支持多个标签，匹配任一标签，通过标签关联表索引查询）
             tags = request.query_params.get('tags', '').strip()
             if tags:
-                tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
+                tag_list = Tag.parse(tags)
                 if tag_list:
-                    q_objects = Q()
-                    for tag in tag_list:
-                        q_objects |= Q(tags__icontains=tag)
-                    queryset = queryset.filter(q_objects)
+                    queryset = queryset.tagged(tag_list)
                     search_params['tags'] = tag_list
 
             # 状态过滤（支持多个状态）
@@ -2970,21 +2875,14 @@ class TaskViewSet(viewsets.ModelViewSet):
                 except ValueError:
                     pass
 
-            # 软删除任务包含
+            # 软删除任务包含（get_queryset 已根据 include_deleted 选择查询集，上面的过滤条件保持有效）
             include_deleted = request.query_params.get('include_deleted', 'false').lower()
             if include_deleted == 'true':
-                # 重新获取包含软删除的查询集
-                user = request.user
-                queryset = Task.all_objects.filter(
-                    Q(owner=user) | Q(assigned_to=user)
-                ).distinct()
-
-                # 重新应用所有过滤条件（这里简化处理，实际可以重构为函数）
-                # 注意：这里应该重新应用上面的所有过滤条件，为了简化这里先跳过
                 search_params['include_deleted'] = True
 
-            # 排序处理
-            sort_field = request.query_params.get('sort', 'created_at').strip()
+            # 排序处理（有关键词时默认按相关度排序，游标分页模式仅支持索引列）
+            default_sort = 'relevance' if q and not cursor_mode else 'created_at'
+            sort_field = request.query_params.get('sort', '').strip() or default_sort
             order_direction = request.query_params.get('order', 'desc').strip().lower()
 
             # 验证排序字段
@@ -2993,7 +2891,10 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'priority', 'status', 'progress', 'title'
             ]
 
-            if sort_field in valid_sort_fields:
+            if sort_field == 'relevance' and q:
+                queryset = queryset.order_by('-search_rank', '-created_at')
+                search_params['sort'] = sort_field
+            elif sort_field in valid_sort_fields:
                 if order_direction == 'asc':
                     queryset = queryset.order_by(sort_field)
                 else:
@@ -3004,32 +2905,36 @@ class TaskViewSet(viewsets.ModelViewSet):
                 # 默认排序
                 queryset = queryset.order_by('-created_at')
 
-            # 计算搜索统计
-            total_count = queryset.count()
+            # 游标分页模式只在首页计算搜索统计，后续翻页不再执行 COUNT(*)
+            if cursor_mode and request.query_params.get('cursor'):
+                search_stats = None
+            else:
+                search_stats = self._calculate_search_stats(queryset)
+
+            if cursor_mode:
+                paginator = self.paginator
+                paginator.requested_ordering = sort_field if order_direction == 'asc' else f'-{sort_field}'
+                page_obj = paginator.paginate_queryset(queryset, request, view=self)
+                serializer = TaskListSerializer(page_obj, many=True)
+                results = self._attach_search_highlights(serializer.data, page_obj, search_backend, q)
+
+                if search_stats is not None:
+                    message = f'搜索完成，找到 {search_stats["total_found"]} 个匹配任务'
+                else:
+                    message = '搜索完成'
+
+                return Response({
+                    'success': True,
+                    'message': message,
+                    'data': {
+                        'results': results,
+                        'pagination': paginator.get_pagination_meta(),
+                        'search_params': search_params,
+                        'stats': search_stats
+                    }
+                })
 
-            # 获取状态分布统计
-            status_stats = {}
-            if total_count > 0:
-                for status_choice in Task.STATUS_CHOICES:
-                    status_code = status_choice[0]
-                    count = queryset.filter(status=status_code).count()
-                    if count > 0:
-                        status_stats[status_code] = {
-                            'count': count,
-                            'percentage': round((count / total_count) * 100, 1)
-                        }
-
-            # 获取优先级分布统计
-            priority_stats = {}
-            if total_count > 0:
-                for priority_choice in Task.PRIORITY_CHOICES:
-                    priority_code = priority_choice[0]
-                    count = queryset.filter(priority=priority_code).count()
-                    if count > 0:
-                        priority_stats[priority_code] = {
-                            'count': count,
-                            'percentage': round((count / total_count) * 100, 1)
-                        }
+            total_count = search_stats['total_found']
 
             # 分页处理
             page = request.query_params.get('page', '1')
@@ -3053,14 +2958,16 @@ class TaskViewSet(viewsets.ModelViewSet):
                 page = 1
 
             # 序列化数据
-            serializer = TaskListSerializer(page_obj.object_list, many=True)
+            page_tasks = list(page_obj.object_list)
+            serializer = TaskListSerializer(page_tasks, many=True)
+            results = self._attach_search_highlights(serializer.data, page_tasks, search_backend, q)
 
             # 构建响应
             response_data = {
                 'success': True,
                 'message': f'搜索完成，找到 {total_count} 个匹配任务',
                 'data': {
-                    'results': serializer.data,
+                    'results': results,
                     'pagination': {
                         'current_page': page,
                         'page_size': page_size,
@@ -3072,17 +2979,14 @@ class TaskViewSet(viewsets.ModelViewSet):
                         'previous_page': page - 1 if page_obj.has_previous() else None
                     },
                     'search_params': search_params,
-                    'stats': {
-                        'total_found': total_count,
-                        'status_distribution': status_stats,
-                        'priority_distribution': priority_stats,
-                        'search_time': timezone.now().isoformat()
-                    }
+                    'stats': search_stats
                 }
             }
 
             return Response(response_data)
 
+        except ValidationError:
+            raise
         except Exception as e:
             return Response({
                 'success': False,
@@ -3093,7 +2997,56 @@ class TaskViewSet(viewsets.ModelViewSet):
                 }
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def _attach_search_highlights(self, results, tasks, search_backend, q):
+        """为搜索结果附加相关度与高亮片段（highlight.title / highlight.description）"""
+        if not q:
+            return results
+
+        highlights = search_backend.highlights(tasks, q)
+        ranks = {str(task.pk): getattr(task, 'search_rank', None) for task in tasks}
+        for item in results:
+            item_id = str(item['id'])
+            item['search_rank'] = ranks.get(item_id)
+            item['highlight'] = highlights.get(item_id)
+        return results
+
+    def _calculate_search_stats(self, queryset):
+        """计算搜索结果统计（总数与状态/优先级分布）"""
+        total_count = queryset.count()
+
+        # 获取状态分布统计
+        status_stats = {}
+        if total_count > 0:
+            for status_choice in Task.STATUS_CHOICES:
+                status_code = status_choice[0]
+                count = queryset.filter(status=status_code).count()
+                if count > 0:
+                    status_stats[status_code] = {
+                        'count': count,
+                        'percentage': round((count / total_count) * 100, 1)
+                    }
+
+        # 获取优先级分布统计
+        priority_stats = {}
+        if total_count > 0:
+            for priority_choice in Task.PRIORITY_CHOICES:
+                priority_code = priority_choice[0]
+                count = queryset.filter(priority=priority_code).count()
+                if count > 0:
+                    priority_stats[priority_code] = {
+                        'count': count,
+                        'percentage': round((count / total_count) * 100, 1)
+                    }
+
+        return {
+            'total_found': total_count,
+            'status_distribution': status_stats,
+            'priority_distribution': priority_stats,
+            'search_time': timezone.now().isoformat()
+        }
+
     @action(detail=False, methods=['get'], url_path='status-distribution')
+    @cached_analytics('status-distribution')
     def status_distribution(self, request):
         """
         详细状态分布统计API
@@ -3117,16 +3070,12 @@ class TaskViewSet(viewsets.ModelViewSet):
         try:
             # 获取基础查询集（用户相关的任务）
             user = request.user
-            base_queryset = Task.objects.filter(
-                Q(owner=user) | Q(assigned_to=user)
-            ).distinct()
+            base_queryset = Task.objects.visible_to(user)
 
             # 处理软删除任务包含
             include_deleted = request.query_params.get('include_deleted', 'false').lower()
             if include_deleted == 'true':
-                base_queryset = Task.all_objects.filter(
-                    Q(owner=user) | Q(assigned_to=user)
-                ).distinct()
+                base_queryset = Task.all_objects.visible_to(user)
 
             # 处理时间周期过滤
             period = request.query_params.get('period', 'all').lower()
@@ -3158,7 +3107,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                 duration_analysis = self._calculate_status_duration(filtered_queryset)
 
             # 4. 状态趋势分析
-            status_trends = self._calculate_status_trends(base_queryset, period, date_field)
+            rollup_user = self._get_rollup_user(user, include_deleted == 'true', date_field)
+            status_trends = self._calculate_status_trends(base_queryset, period, date_field, rollup_user)
 
             # 5. 效率分析
             efficiency_analysis = self._calculate_status_efficiency(filtered_queryset)
@@ -3274,167 +3224,166 @@ class TaskViewSet(viewsets.ModelViewSet):
         }
 
     def _calculate_status_transitions(self, queryset, period):
-        """计算状态转换分析"""
-        # 注意: 这里是简化版本，实际应该有状态变更历史表
-        # 当前基于任务的更新时间和状态来推测转换
-
-        # 按状态分组，计算每个状态的新增任务
-        transitions = {}
-
-        # 获取最近的状态变更模式
-        recent_tasks = queryset.order_by('-updated_at')[:100]  # 最近100个任务
-
-        # 简化的转换分析 - 基于创建状态和当前状态
-        for status_choice in Task.STATUS_CHOICES:
-            status_code = status_choice[0]
-            status_name = status_choice[1]
+        """计算状态转换分析（基于任务事件表的分组统计）"""
+        events = self._apply_period_filter(task_events(queryset, TaskEvent.STATUS_CHANGED), period, 'created_at')
+        transition_counts = status_transition_counts(events)
 
-            current_count = queryset.filter(status=status_code).count()
+        current_counts = {code: 0 for code, _ in Task.STATUS_CHOICES}
+        for row in queryset.order_by().values('status').annotate(count=Count('id')):
+            current_counts[row['status']] = row['count']
 
+        transitions = {}
+        for status_code, status_name in Task.STATUS_CHOICES:
+            inflow = sum(count for (_, to_status), count in transition_counts.items() if to_status == status_code)
+            outflow = sum(count for (from_status, _), count in transition_counts.items()
+                          if from_status == status_code)
             transitions[status_code] = {
                 'name': status_name,
-                'current_count': current_count,
-                'estimated_inflow': self._estimate_status_inflow(queryset, status_code),
-                'estimated_outflow': self._estimate_status_outflow(queryset, status_code),
-                'net_change': current_count  # 简化计算
+                'current_count': current_counts[status_code],
+                'inflow': inflow,
+                'outflow': outflow,
+                # 兼容旧版响应字段（现为基于事件的实际值）
+                'estimated_inflow': inflow,
+                'estimated_outflow': outflow,
+                'net_change': inflow - outflow
             }
 
-        # 计算常见转换路径
+        # 状态转换矩阵与最常见的转换路径
+        transition_matrix = {
+            from_status: {to_status: transition_counts.get((from_status, to_status), 0)
+                          for to_status, _ in Task.STATUS_CHOICES}
+            for from_status, _ in Task.STATUS_CHOICES
+        }
+        total_transitions = sum(transition_counts.values())
         common_paths = [
-            {'from': 'PENDING', 'to': 'IN_PROGRESS', 'description': '开始执行'},
-            {'from': 'IN_PROGRESS', 'to': 'COMPLETED', 'description': '完成任务'},
-            {'from': 'IN_PROGRESS', 'to': 'ON_HOLD', 'description': '暂停执行'},
-            {'from': 'ON_HOLD', 'to': 'IN_PROGRESS', 'description': '恢复执行'},
-            {'from': 'PENDING', 'to': 'CANCELLED', 'description': '取消任务'}
+            {
+                'from': from_status,
+                'to': to_status,
+                'count': count,
+                'percentage': round(count / total_transitions * 100, 2)
+            }
+            for (from_status, to_status), count in sorted(
+                transition_counts.items(), key=lambda item: (-item[1], item[0])
+            )[:5]
         ]
 
         return {
             'status_transitions': transitions,
+            'transition_matrix': transition_matrix,
             'common_transition_paths': common_paths,
             'transition_summary': {
-                'total_active_transitions': sum(
-                    t['estimated_inflow'] + t['estimated_outflow'] for t in transitions.values()),
-                'most_active_status': max(transitions.keys(),
-                                          key=lambda k: transitions[k]['current_count']) if transitions else None
+                'total_transitions': total_transitions,
+                'total_active_transitions': sum(t['inflow'] + t['outflow'] for t in transitions.values()),
+                'most_active_status': max(
+                    transitions, key=lambda k: transitions[k]['inflow'] + transitions[k]['outflow']
+                ) if total_transitions else None
             }
         }
 
-    def _estimate_status_inflow(self, queryset, status):
-        """估算状态流入量（简化版本）"""
-        # 简化计算：基于最近创建的任务中该状态的数量
-        recent_tasks = queryset.filter(
-            created_at__gte=timezone.now() - timezone.timedelta(days=7)
-        )
-        return recent_tasks.filter(status=status).count()
-
-    def _estimate_status_outflow(self, queryset, status):
-        """估算状态流出量（简化版本）"""
-        # 简化计算：基于最近更新且不在该状态的任务数量
-        recent_updated = queryset.filter(
-            updated_at__gte=timezone.now() - timezone.timedelta(days=7)
-        ).exclude(status=status)
-        return min(recent_updated.count(), 10)  # 限制最大值
-
     def _calculate_status_duration(self, queryset):
-        """计算状态停留时间分析"""
-        duration_stats = {}
-
-        for status_choice in Task.STATUS_CHOICES:
-            status_code = status_choice[0]
-            status_name = status_choice[1]
+        """计算状态停留时间分析（基于任务事件表的分组统计）"""
+        durations = status_durations(queryset)
 
-            status_tasks = queryset.filter(status=status_code)
-            if not status_tasks.exists():
+        duration_stats = {}
+        for status_code, status_name in Task.STATUS_CHOICES:
+            stats = durations.get(status_code)
+            if not stats:
                 continue
-
-            # 简化计算：基于任务的创建时间到现在的时间差
-            durations = []
-            for task in status_tasks:
-                if status_code == 'COMPLETED':
-                    # 已完成任务：从创建到更新的时间
-                    duration = (task.updated_at - task.created_at).total_seconds() / 3600  # 小时
-                else:
-                    # 进行中任务：从创建到现在的时间
-                    duration = (timezone.now() - task.created_at).total_seconds() / 3600  # 小时
-                durations.append(duration)
-
-            if durations:
-                duration_stats[status_code] = {
-                    'name': status_name,
-                    'average_duration_hours': round(sum(durations) / len(durations), 2),
-                    'min_duration_hours': round(min(durations), 2),
-                    'max_duration_hours': round(max(durations), 2),
-                    'task_count': len(durations)
-                }
+            duration_stats[status_code] = {
+                'name': status_name,
+                'average_duration_hours': round(stats['avg'].total_seconds() / 3600, 2),
+                'min_duration_hours': round(stats['min'].total_seconds() / 3600, 2),
+                'max_duration_hours': round(stats['max'].total_seconds() / 3600, 2),
+                'stay_count': stats['stay_count'],
+                'open_count': stats['open_count'],
+                # 兼容旧版响应字段：当前处于该状态的任务数
+                'task_count': stats['open_count']
+            }
 
         return duration_stats
 
-    def _calculate_status_trends(self, queryset, period, date_field):
+    def _calculate_status_trends(self, queryset, period, date_field, rollup_user=None):
         """计算状态趋势分析"""
-        if period == 'week':
-            # 按天统计最近7天各状态的任务数量
-            trends = []
-            for i in range(7):
-                day = timezone.now() - timezone.timedelta(days=i)
-                day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-                day_end = day_start + timezone.timedelta(days=1)
-
-                day_stats = {}
-                for status_choice in Task.STATUS_CHOICES:
-                    status_code = status_choice[0]
-                    count = queryset.filter(
-                        **{f'{date_field}__gte': day_start, f'{date_field}__lt': day_end},
-                        status=status_code
-                    ).count()
-                    day_stats[status_code] = count
-
-                trends.append({
-                    'date': day.strftime('%Y-%m-%d'),
-                    'status_counts': day_stats,
-                    'total_tasks': sum(day_stats.values())
-                })
+        return self._calculate_dimension_trends(
+            queryset, period, date_field, 'status', [code for code, _ in Task.STATUS_CHOICES], 'status_counts',
+            rollup_user=rollup_user
+        )
 
-            return list(reversed(trends))  # 按时间正序
+    def _calculate_dimension_trends(self, queryset, period, date_field, dimension, values, counts_key,
+                                    count_all_tasks=False, rollup_user=None):
+        """
+        计算按维度划分的滚动时间趋势（状态、优先级、标签趋势共用）
 
-        elif period == 'month':
-            # 按周统计最近4周
-            trends = []
-            for i in range(4):
-                week_start = timezone.now() - timezone.timedelta(weeks=i + 1)
-                week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-                week_end = week_start + timezone.timedelta(weeks=1)
-
-                week_stats = {}
-                for status_choice in Task.STATUS_CHOICES:
-                    status_code = status_choice[0]
-                    count = queryset.filter(
-                        **{f'{date_field}__gte': week_start, f'{date_field}__lt': week_end},
-                        status=status_code
-                    ).count()
-                    week_stats[status_code] = count
-
-                trends.append({
-                    'period': f'Week {week_start.strftime("%Y-%m-%d")}',
-                    'status_counts': week_stats,
-                    'total_tasks': sum(week_stats.values())
-                })
+        week 统计最近7天（按天），month 统计最近4周（按天分段后合并为7天窗口），
+        其他周期只统计各维度的任务数；均基于 time_series 的单条分组查询
 
-            return list(reversed(trends))
+        Args:
+            dimension: 维度字段
+            values: 维度取值列表
+            counts_key: 响应中维度计数的键名
+            count_all_tasks: total_tasks 是否统计全部任务（否则为各维度计数之和）
+            rollup_user: 指定时 week/month 从该用户的每日汇总读取（维度须为 ROLLUP_DIMENSIONS 之一）
+        """
+        today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
 
-        else:
+        if period not in ('week', 'month'):
             # 简单统计
-            current_stats = {}
-            for status_choice in Task.STATUS_CHOICES:
-                status_code = status_choice[0]
-                count = queryset.filter(status=status_code).count()
-                current_stats[status_code] = count
+            current_counts = {value: 0 for value in values}
+            rows = queryset.filter(**{f'{dimension}__in': values}).order_by().values(dimension).annotate(
+                count=Count('id')
+            )
+            for row in rows:
+                current_counts[row[dimension]] = row['count']
 
             return [{
                 'period': period,
-                'status_counts': current_stats,
-                'total_tasks': sum(current_stats.values())
+                counts_key: current_counts,
+                'total_tasks': queryset.count() if count_all_tasks else sum(current_counts.values())
             }]
 
+        if period == 'week':
+            # 按天统计最近7天
+            start, end, window_days = today - timezone.timedelta(days=6), today + timezone.timedelta(days=1), 1
+        else:
+            # 按周统计最近4周
+            start, end, window_days = today - timezone.timedelta(weeks=4), today, 7
+
+        utc = resolve_timezone('UTC')
+        if rollup_user is not None:
+            series = rollup_time_series(rollup_user, 'day', start, end, dimension, values)
+        else:
+            series = time_series(queryset, date_field, 'day', utc, start, end, dimension, values)
+
+        # 时间段由起止时间生成而不是取自 series：维度取值为空（如尚无标签）时 series 没有任何行，
+        # 仍需输出补零的趋势
+        days = []
+        day = truncate_datetime(start, 'day', utc)
+        while day < end:
+            days.append(day)
+            day += timezone.timedelta(days=1)
+        day_counts = {day: dict.fromkeys(values, 0) for day in days}
+        for row in series:
+            day_counts[row['bucket']][row['dimension']] = row['count']
+
+        day_totals = {}
+        if count_all_tasks:
+            day_totals = {row['bucket']: row['count'] for row in time_series(queryset, date_field, 'day', utc, start, end)}
+
+        trends = []
+        for offset in range(0, len(days), window_days):
+            window = days[offset:offset + window_days]
+            window_counts = {value: sum(day_counts[day][value] for day in window) for value in values}
+            total_tasks = sum(day_totals[day] for day in window) if count_all_tasks else sum(window_counts.values())
+
+            if period == 'week':
+                trends.append({'date': window[0].strftime('%Y-%m-%d'), counts_key: window_counts,
+                               'total_tasks': total_tasks})
+            else:
+                trends.append({'period': f'Week {window[0].strftime("%Y-%m-%d")}', counts_key: window_counts,
+                               'total_tasks': total_tasks})
+
+        return trends  # 按时间正序
+
     def _calculate_status_efficiency(self, queryset):
         """计算状态效率分析"""
         total_tasks = queryset.count()
@@ -3556,6 +3505,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             return "需要改进"
 
     @action(detail=False, methods=['get'], url_path='priority-distribution')
+    @cached_analytics('priority-distribution')
     def priority_distribution(self, request):
         """
         详细优先级分布统计API
@@ -3581,16 +3531,12 @@ class TaskViewSet(viewsets.ModelViewSet):
         try:
             # 获取基础查询集（用户相关的任务）
             user = request.user
-            base_queryset = Task.objects.filter(
-                Q(owner=user) | Q(assigned_to=user)
-            ).distinct()
+            base_queryset = Task.objects.visible_to(user)
 
             # 处理软删除任务包含
             include_deleted = request.query_params.get('include_deleted', 'false').lower()
             if include_deleted == 'true':
-                base_queryset = Task.all_objects.filter(
-                    Q(owner=user) | Q(assigned_to=user)
-                ).distinct()
+                base_queryset = Task.all_objects.visible_to(user)
 
             # 处理时间周期过滤
             period = request.query_params.get('period', 'all').lower()
@@ -3628,7 +3574,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                 efficiency_analysis = self._calculate_priority_efficiency(filtered_queryset)
 
             # 5. 优先级趋势分析
-            priority_trends = self._calculate_priority_trends(base_queryset, period, date_field)
+            rollup_user = self._get_rollup_user(user, include_deleted == 'true', date_field)
+            priority_trends = self._calculate_priority_trends(base_queryset, period, date_field, rollup_user)
 
             # 6. 优先级健康度分析
             health_analysis = self._calculate_priority_health(filtered_queryset)
@@ -4062,71 +4009,12 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         return recommendations
 
-    def _calculate_priority_trends(self, queryset, period, date_field):
+    def _calculate_priority_trends(self, queryset, period, date_field, rollup_user=None):
         """计算优先级趋势分析"""
-        if period == 'week':
-            # 按天统计最近7天各优先级的任务数量
-            trends = []
-            for i in range(7):
-                day = timezone.now() - timezone.timedelta(days=i)
-                day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-                day_end = day_start + timezone.timedelta(days=1)
-
-                day_stats = {}
-                for priority_choice in Task.PRIORITY_CHOICES:
-                    priority_code = priority_choice[0]
-                    count = queryset.filter(
-                        **{f'{date_field}__gte': day_start, f'{date_field}__lt': day_end},
-                        priority=priority_code
-                    ).count()
-                    day_stats[priority_code] = count
-
-                trends.append({
-                    'date': day.strftime('%Y-%m-%d'),
-                    'priority_counts': day_stats,
-                    'total_tasks': sum(day_stats.values())
-                })
-
-            return list(reversed(trends))  # 按时间正序
-
-        elif period == 'month':
-            # 按周统计最近4周
-            trends = []
-            for i in range(4):
-                week_start = timezone.now() - timezone.timedelta(weeks=i + 1)
-                week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-                week_end = week_start + timezone.timedelta(weeks=1)
-
-                week_stats = {}
-                for priority_choice in Task.PRIORITY_CHOICES:
-                    priority_code = priority_choice[0]
-                    count = queryset.filter(
-                        **{f'{date_field}__gte': week_start, f'{date_field}__lt': week_end},
-                        priority=priority_code
-                    ).count()
-                    week_stats[priority_code] = count
-
-                trends.append({
-                    'period': f'Week {week_start.strftime("%Y-%m-%d")}',
-                    'priority_counts': week_stats,
-                    'total_tasks': sum(week_stats.values())
-                })
-
-            return list(reversed(trends))
-
-        else:
-            # 简单统计
-            current_stats = {}
-            for priority_choice in Task.PRIORITY_CHOICES:
-                priority_code = priority_choice[0]
-                count = queryset.filter(priority=priority_code).count()
-                current_stats[priority_code] = count
-
-            return [{
-                'period': period,
-                'priority_counts': current_stats,
-                'total_tasks': sum(current_stats.values())
-            }]
+        return self._calculate_dimension_trends(
+            queryset, period, date_field, 'priority', [code for code, _ in Task.PRIORITY_CHOICES], 'priority_counts',
+            rollup_user=rollup_user
+        )
 
     def _calculate_priority_health(self, queryset):
         """计算优先级健康度分析"""
@@ -4270,6 +4158,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         }
 
     @action(detail=False, methods=['get'], url_path='tag-distribution')
+    @cached_analytics('tag-distribution')
     def tag_distribution(self, request):
         """
         详细标签分布统计API
@@ -4305,16 +4194,12 @@ class TaskViewSet(viewsets.ModelViewSet):
 
             # 获取基础查询集（用户相关的任务）
             user = request.user
-            base_queryset = Task.objects.filter(
-                Q(owner=user) | Q(assigned_to=user)
-            ).distinct()
+            base_queryset = Task.objects.visible_to(user)
 
             # 处理软删除任务包含
             include_deleted = request.query_params.get('include_deleted', 'false').lower()
             if include_deleted == 'true':
-                base_queryset = Task.all_objects.filter(
-                    Q(owner=user) | Q(assigned_to=user)
-                ).distinct()
+                base_queryset = Task.all_objects.visible_to(user)
 
             # 处理时间周期过滤
             period = request.query_params.get('period', 'all').lower()
@@ -4337,24 +4222,27 @@ class TaskViewSet(viewsets.ModelViewSet):
             min_frequency = int(request.query_params.get('min_frequency', '1'))
             top_n = int(request.query_params.get('top_n', '50'))
 
+            # 标签统计基于 TaskTag 聚合查询，查询数量与任务数量无关
+            tag_engine = TagStatsEngine(filtered_queryset)
+
             # 1. 基础标签分布
-            basic_distribution = self._calculate_basic_tag_distribution(filtered_queryset, min_frequency, top_n)
+            basic_distribution = self._calculate_basic_tag_distribution(tag_engine, min_frequency, top_n)
 
             # 2. 标签使用分析
             usage_analysis = {}
             if include_usage:
-                usage_analysis = self._calculate_tag_usage_analysis(filtered_queryset, basic_distribution['tag_list'])
+                usage_analysis = self._calculate_tag_usage_analysis(tag_engine, basic_distribution['tag_list'])
 
             # 3. 标签组合分析
             combination_analysis = {}
             if include_combination:
-                combination_analysis = self._calculate_tag_combination_analysis(filtered_queryset,
+                combination_analysis = self._calculate_tag_combination_analysis(tag_engine,
                                                                                 basic_distribution['tag_list'])
 
             # 4. 标签效率分析
             efficiency_analysis = {}
             if include_efficiency:
-                efficiency_analysis = self._calculate_tag_efficiency_analysis(filtered_queryset,
+                efficiency_analysis = self._calculate_tag_efficiency_analysis(tag_engine,
                                                                               basic_distribution['tag_list'])
 
             # 5. 标签趋势分析
@@ -4385,7 +4273,7 @@ class TaskViewSet(viewsets.ModelViewSet):
                         'min_frequency': min_frequency,
                         'top_n': top_n,
                         'generated_at': timezone.now().isoformat(),
-                        'total_tasks_analyzed': filtered_queryset.count(),
+                        'total_tasks_analyzed': basic_distribution['total_tasks'],
                         'user_id': user.id,
                         'username': user.username
                     }
@@ -4479,6 +4367,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=False, methods=['get'], url_path='time-distribution')
+    @cached_analytics('time-distribution')
     def time_distribution(self, request):
         """
         详细时间分布统计API
@@ -4517,16 +4406,12 @@ class TaskViewSet(viewsets.ModelViewSet):
 
             # 获取基础查询集（用户相关的任务）
             user = request.user
-            base_queryset = Task.objects.filter(
-                Q(owner=user) | Q(assigned_to=user)
-            ).distinct()
+            base_queryset = Task.objects.visible_to(user)
 
             # 处理软删除任务包含
             include_deleted = request.query_params.get('include_deleted', 'false').lower()
             if include_deleted == 'true':
-                base_queryset = Task.all_objects.filter(
-                    Q(owner=user) | Q(assigned_to=user)
-                ).distinct()
+                base_queryset = Task.all_objects.visible_to(user)
 
             # 处理时间周期过滤
             period = request.query_params.get('period', 'all').lower()
@@ -4577,7 +4462,13 @@ class TaskViewSet(viewsets.ModelViewSet):
             # 6. 时间趋势分析
             trend_analysis = {}
             if include_trends:
-                trend_analysis = self._calculate_time_trends(filtered_queryset, period, date_field, timezone_str)
+                # 按周期过滤后的趋势无法由汇总直接得到，只有 period=all 时改读汇总
+                rollup_user = None
+                if period == 'all':
+                    rollup_user = self._get_rollup_user(user, include_deleted == 'true', date_field)
+                trend_analysis = self._calculate_time_trends(
+                    filtered_queryset, period, date_field, timezone_str, rollup_user
+                )
 
             # 7. 工作效率分析
             efficiency_analysis = self._calculate_time_efficiency(filtered_queryset, date_field, timezone_str)
@@ -4610,7 +4501,7 @@ class TaskViewSet(viewsets.ModelViewSet):
                         'include_trends': include_trends,
                         'timezone': timezone_str,
                         'generated_at': timezone.now().isoformat(),
-                        'total_tasks_analyzed': filtered_queryset.count(),
+                        'total_tasks_analyzed': basic_distribution['total_tasks'],
                         'user_id': user.id,
                         'username': user.username
                     }
@@ -4630,46 +4521,35 @@ class TaskViewSet(viewsets.ModelViewSet):
                 }
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    def _calculate_basic_tag_distribution(self, queryset, min_frequency=1, top_n=50):
+    def _calculate_basic_tag_distribution(self, tag_engine, min_frequency=1, top_n=50):
         """计算基础标签分布"""
-        total_tasks = queryset.count()
+        distribution = tag_engine.distribution(min_frequency, top_n)
+        total_tasks = distribution['total_tasks']
+        tagged_tasks = distribution['tagged_tasks']
 
         if total_tasks == 0:
             return {
                 'total_tasks': 0,
+                'tagged_tasks': 0,
+                'untagged_tasks': 0,
                 'total_tags': 0,
                 'unique_tags': 0,
                 'avg_tags_per_task': 0.0,
+                'tagging_rate': 0.0,
                 'tag_list': [],
-                'tag_statistics': {}
+                'tag_statistics': {
+                    'high_frequency': {'count': 0, 'tags': []},
+                    'medium_frequency': {'count': 0, 'tags': []},
+                    'low_frequency': {'count': 0, 'tags': []}
+                }
             }
 
-        # 收集所有标签
-        tag_counter = {}
-        tagged_tasks = 0
-        total_tag_count = 0
-
-        for task in queryset.exclude(tags='').exclude(tags__isnull=True):
-            tagged_tasks += 1
-            tags = task.tags_list
-            total_tag_count += len(tags)
-
-            for tag in tags:
-                if tag:  # 确保标签不为空
-                    tag_counter[tag] = tag_counter.get(tag, 0) + 1
-
-        # 过滤低频标签
-        filtered_tags = {tag: count for tag, count in tag_counter.items() if count >= min_frequency}
-
-        # 按频次排序
-        sorted_tags = sorted(filtered_tags.items(), key=lambda x: x[1], reverse=True)
-        top_tags = sorted_tags[:top_n]
-
         # 计算统计信息
         tag_list = []
-        for tag, count in top_tags:
+        for row in distribution['tags']:
+            count = row['count']
             tag_list.append({
-                'tag': tag,
+                'tag': row['name'],
                 'count': count,
                 'percentage': round((count / total_tasks) * 100, 2),
                 'task_percentage': round((count / tagged_tasks) * 100, 2) if tagged_tasks > 0 else 0
@@ -4699,79 +4579,70 @@ class TaskViewSet(viewsets.ModelViewSet):
             'total_tasks': total_tasks,
             'tagged_tasks': tagged_tasks,
             'untagged_tasks': total_tasks - tagged_tasks,
-            'total_tags': len(tag_counter),
-            'unique_tags': len(filtered_tags),
-            'avg_tags_per_task': round(total_tag_count / total_tasks, 2) if total_tasks > 0 else 0,
-            'tagging_rate': round((tagged_tasks / total_tasks) * 100, 2) if total_tasks > 0 else 0,
+            'total_tags': distribution['total_tags'],
+            'unique_tags': distribution['unique_tags'],
+            'avg_tags_per_task': round(distribution['tag_assignments'] / total_tasks, 2),
+            'tagging_rate': round((tagged_tasks / total_tasks) * 100, 2),
             'tag_list': tag_list,
             'tag_statistics': tag_statistics
         }
 
-    def _calculate_tag_usage_analysis(self, queryset, tag_list):
+    def _calculate_tag_usage_analysis(self, tag_engine, tag_list):
         """计算标签使用分析"""
         usage_analysis = {}
 
-        # 状态分析
-        status_choices = dict(Task.STATUS_CHOICES)
-        priority_choices = dict(Task.PRIORITY_CHOICES)
-
-        for tag_info in tag_list[:20]:  # 分析前20个标签
-            tag = tag_info['tag']
+        # 分析前20个标签
+        top_tags = [t['tag'] for t in tag_list[:20]]
+        aggregates = tag_engine.tag_aggregates(top_tags)
+        categories = tag_engine.category_counts(top_tags)
 
-            # 获取包含此标签的任务
-            tagged_tasks = [t for t in queryset if tag in t.tags_list]
-
-            if not tagged_tasks:
+        for tag in top_tags:
+            data = aggregates.get(tag)
+            if not data or not data['task_count']:
                 continue
+            task_count = data['task_count']
 
             # 状态分布
             status_distribution = {}
-            for status_code, status_name in status_choices.items():
-                count = len([t for t in tagged_tasks if t.status == status_code])
+            for status_code, status_name in Task.STATUS_CHOICES:
+                count = data[f'status_{status_code}']
                 status_distribution[status_code] = {
                     'name': status_name,
                     'count': count,
-                    'percentage': round((count / len(tagged_tasks)) * 100, 2) if tagged_tasks else 0
+                    'percentage': round((count / task_count) * 100, 2)
                 }
 
             # 优先级分布
             priority_distribution = {}
-            for priority_code, priority_name in priority_choices.items():
-                count = len([t for t in tagged_tasks if t.priority == priority_code])
+            for priority_code, priority_name in Task.PRIORITY_CHOICES:
+                count = data[f'priority_{priority_code}']
                 priority_distribution[priority_code] = {
                     'name': priority_name,
                     'count': count,
-                    'percentage': round((count / len(tagged_tasks)) * 100, 2) if tagged_tasks else 0
+                    'percentage': round((count / task_count) * 100, 2)
                 }
 
             # 分类分布
-            categories = {}
-            for task in tagged_tasks:
-                if task.category:
-                    categories[task.category] = categories.get(task.category, 0) + 1
-
             category_distribution = []
-            for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+            for category, count in categories.get(tag, []):
                 category_distribution.append({
                     'category': category,
                     'count': count,
-                    'percentage': round((count / len(tagged_tasks)) * 100, 2)
+                    'percentage': round((count / task_count) * 100, 2)
                 })
 
             usage_analysis[tag] = {
-                'task_count': len(tagged_tasks),
+                'task_count': task_count,
                 'status_distribution': status_distribution,
                 'priority_distribution': priority_distribution,
                 'category_distribution': category_distribution,
-                'completion_rate': round(
-                    (len([t for t in tagged_tasks if t.status == 'COMPLETED']) / len(tagged_tasks)) * 100, 2),
-                'avg_progress': round(sum(t.progress for t in tagged_tasks) / len(tagged_tasks),
-                                      2) if tagged_tasks else 0
+                'completion_rate': round((data['completed'] / task_count) * 100, 2),
+                'avg_progress': round(data['avg_progress'] or 0, 2)
             }
 
         return usage_analysis
 
-    def _calculate_tag_combination_analysis(self, queryset, tag_list):
+    def _calculate_tag_combination_analysis(self, tag_engine, tag_list):
         """计算标签组合分析"""
         if len(tag_list) < 2:
             return {
@@ -4782,31 +4653,13 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         # 获取前15个标签进行组合分析
         top_tags = [t['tag'] for t in tag_list[:15]]
+        tag_counts = {t['tag']: t['count'] for t in tag_list[:15]}
 
-        # 计算标签共现频率
-        combinations = {}
-        correlation_data = {}
-
-        for task in queryset.exclude(tags='').exclude(tags__isnull=True):
-            task_tags = [tag for tag in task.tags_list if tag in top_tags]
-
-            # 两两组合分析
-            for i, tag1 in enumerate(task_tags):
-                for tag2 in task_tags[i + 1:]:
-                    combo_key = tuple(sorted([tag1, tag2]))
-                    combinations[combo_key] = combinations.get(combo_key, 0) + 1
-
-                    # 记录相关性数据
-                    if tag1 not in correlation_data:
-                        correlation_data[tag1] = {}
-                    if tag2 not in correlation_data:
-                        correlation_data[tag2] = {}
-
-                    correlation_data[tag1][tag2] = correlation_data[tag1].get(tag2, 0) + 1
-                    correlation_data[tag2][tag1] = correlation_data[tag2].get(tag1, 0) + 1
+        # 单次流式遍历计算标签共现频率与多标签模式
+        pair_counts, pattern_counts = tag_engine.co_occurrence(top_tags)
 
         # 排序组合
-        sorted_combinations = sorted(combinations.items(), key=lambda x: x[1], reverse=True)
+        sorted_combinations = sorted(pair_counts.items(), key=lambda x: x[1], reverse=True)
 
         combination_list = []
         for combo, count in sorted_combinations[:20]:  # 前20个组合
@@ -4817,18 +4670,18 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'strength': count  # 可以扩展为更复杂的强度计算
             })
 
-        # 计算相关性矩阵
+        # 计算相关性矩阵（标签任务数直接取自基础分布）
         correlation_matrix = {}
         for tag1 in top_tags[:10]:  # 限制矩阵大小
             correlation_matrix[tag1] = {}
-            tag1_count = sum(1 for t in queryset if tag1 in t.tags_list)
+            tag1_count = tag_counts[tag1]
 
             for tag2 in top_tags[:10]:
                 if tag1 == tag2:
                     correlation_matrix[tag1][tag2] = 1.0
                 else:
-                    co_occurrence = correlation_data.get(tag1, {}).get(tag2, 0)
-                    tag2_count = sum(1 for t in queryset if tag2 in t.tags_list)
+                    co_occurrence = pair_counts.get(tuple(sorted([tag1, tag2])), 0)
+                    tag2_count = tag_counts[tag2]
 
                     # 简单的关联强度计算
                     if tag1_count > 0 and tag2_count > 0:
@@ -4840,15 +4693,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         # 频繁模式（3个以上标签的组合）
         frequent_patterns = []
-        pattern_counter = {}
-
-        for task in queryset.exclude(tags='').exclude(tags__isnull=True):
-            task_tags = [tag for tag in task.tags_list if tag in top_tags]
-            if len(task_tags) >= 3:
-                pattern_key = tuple(sorted(task_tags))
-                pattern_counter[pattern_key] = pattern_counter.get(pattern_key, 0) + 1
-
-        for pattern, count in sorted(pattern_counter.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for pattern, count in sorted(pattern_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
             if count >= 2:  # 至少出现2次
                 frequent_patterns.append({
                     'tags': list(pattern),
@@ -4861,45 +4706,37 @@ class TaskViewSet(viewsets.ModelViewSet):
             'frequent_patterns': frequent_patterns
         }
 
-    def _calculate_tag_efficiency_analysis(self, queryset, tag_list):
+    def _calculate_tag_efficiency_analysis(self, tag_engine, tag_list):
         """计算标签效率分析"""
         efficiency_analysis = {}
 
-        for tag_info in tag_list[:15]:  # 分析前15个标签
-            tag = tag_info['tag']
-
-            # 获取包含此标签的任务
-            tagged_tasks = [t for t in queryset if tag in t.tags_list]
+        # 分析前15个标签
+        top_tags = [t['tag'] for t in tag_list[:15]]
+        aggregates = tag_engine.tag_aggregates(top_tags)
 
-            if not tagged_tasks:
+        for tag in top_tags:
+            data = aggregates.get(tag)
+            if not data or not data['task_count']:
                 continue
+            task_count = data['task_count']
 
             # 完成率
-            completed_tasks = [t for t in tagged_tasks if t.status == 'COMPLETED']
-            completion_rate = (len(completed_tasks) / len(tagged_tasks)) * 100
+            completion_rate = (data['completed'] / task_count) * 100
 
             # 平均进度
-            avg_progress = sum(t.progress for t in tagged_tasks) / len(tagged_tasks)
+            avg_progress = float(data['avg_progress'] or 0)
 
-            # 平均完成时间（已完成任务）
-            avg_completion_time = 0.0
-            if completed_tasks:
-                total_time = 0
-                for task in completed_tasks:
-                    completion_time = (task.updated_at - task.created_at).total_seconds() / 3600  # 小时
-                    total_time += completion_time
-                avg_completion_time = total_time / len(completed_tasks)
+            # 平均完成时间（已完成任务，小时）
+            avg_completion_time = data['avg_completion_time'].total_seconds() / 3600 if data[
+                'avg_completion_time'] else 0.0
 
             # 工时效率
-            estimated_hours = sum(float(t.estimated_hours or 0) for t in tagged_tasks)
-            actual_hours = sum(float(t.actual_hours or 0) for t in tagged_tasks)
+            estimated_hours = float(data['estimated_hours'] or 0)
+            actual_hours = float(data['actual_hours'] or 0)
             time_efficiency = (estimated_hours / actual_hours * 100) if actual_hours > 0 else 0
 
             # 逾期率
-            overdue_tasks = [t for t in tagged_tasks if
-                             t.due_date and t.due_date < timezone.now() and t.status in ['PENDING', 'IN_PROGRESS',
-                                                                                         'ON_HOLD']]
-            overdue_rate = (len(overdue_tasks) / len(tagged_tasks)) * 100
+            overdue_rate = (data['overdue'] / task_count) * 100
 
             # 综合效率评分
             efficiency_score = (
@@ -4910,7 +4747,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
 
             efficiency_analysis[tag] = {
-                'task_count': len(tagged_tasks),
+                'task_count': task_count,
                 'completion_rate': round(completion_rate, 2),
                 'avg_progress': round(avg_progress, 2),
                 'avg_completion_time_hours': round(avg_completion_time, 2),
@@ -4946,68 +4783,9 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def _calculate_tag_trends(self, queryset, period, date_field, top_tags):
         """计算标签趋势分析"""
-        if period == 'week':
-            # 按天统计最近7天
-            trends = []
-            for i in range(7):
-                day = timezone.now() - timezone.timedelta(days=i)
-                day_start = day.replace(hour=0, minute=0, second=0, microsecond=0)
-                day_end = day_start + timezone.timedelta(days=1)
-
-                day_tasks = queryset.filter(
-                    **{f'{date_field}__gte': day_start, f'{date_field}__lt': day_end}
-                )
-
-                day_tag_counts = {}
-                for tag in top_tags:
-                    count = sum(1 for t in day_tasks if tag in t.tags_list)
-                    day_tag_counts[tag] = count
-
-                trends.append({
-                    'date': day.strftime('%Y-%m-%d'),
-                    'tag_counts': day_tag_counts,
-                    'total_tasks': day_tasks.count()
-                })
-
-            return list(reversed(trends))  # 按时间正序
-
-        elif period == 'month':
-            # 按周统计最近4周
-            trends = []
-            for i in range(4):
-                week_start = timezone.now() - timezone.timedelta(weeks=i + 1)
-                week_start = week_start.replace(hour=0, minute=0, second=0, microsecond=0)
-                week_end = week_start + timezone.timedelta(weeks=1)
-
-                week_tasks = queryset.filter(
-                    **{f'{date_field}__gte': week_start, f'{date_field}__lt': week_end}
-                )
-
-                week_tag_counts = {}
-                for tag in top_tags:
-                    count = sum(1 for t in week_tasks if tag in t.tags_list)
-                    week_tag_counts[tag] = count
-
-                trends.append({
-                    'period': f'Week {week_start.strftime("%Y-%m-%d")}',
-                    'tag_counts': week_tag_counts,
-                    'total_tasks': week_tasks.count()
-                })
-
-            return list(reversed(trends))
-
-        else:
-            # 简单统计
-            current_tag_counts = {}
-            for tag in top_tags:
-                count = sum(1 for t in queryset if tag in t.tags_list)
-                current_tag_counts[tag] = count
-
-            return [{
-                'period': period,
-                'tag_counts': current_tag_counts,
-                'total_tasks': queryset.count()
-            }]
+        return self._calculate_dimension_trends(
+            queryset, period, date_field, 'task_tags__tag__name', top_tags, 'tag_counts', count_all_tasks=True
+        )
 
     def _calculate_tag_health(self, queryset, basic_distribution):
         """计算标签健康度分析"""
@@ -5118,9 +4896,15 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def _calculate_basic_time_distribution(self, queryset, date_field, timezone_str):
         """计算基础时间分布"""
-        import pytz
+        tz = resolve_timezone(timezone_str)
 
-        total_tasks = queryset.count()
+        summary = queryset.order_by().aggregate(
+            total=Count('id'),
+            valid=Count(date_field),
+            earliest=models.Min(date_field),
+            latest=models.Max(date_field)
+        )
+        total_tasks = summary['total']
 
         if total_tasks == 0:
             return {
@@ -5133,16 +4917,10 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'summary': {}
             }
 
-        # 获取时区
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
-
         # 过滤有效日期的任务
-        valid_tasks = queryset.exclude(**{f'{date_field}__isnull': True})
+        valid_count = summary['valid']
 
-        if not valid_tasks.exists():
+        if not valid_count:
             return {
                 'total_tasks': total_tasks,
                 'valid_date_tasks': 0,
@@ -5154,35 +4932,24 @@ class TaskViewSet(viewsets.ModelViewSet):
             }
 
         # 计算时间范围
-        earliest = valid_tasks.aggregate(earliest=models.Min(date_field))['earliest']
-        latest = valid_tasks.aggregate(latest=models.Max(date_field))['latest']
-
-        if earliest and latest:
-            earliest_local = earliest.astimezone(tz)
-            latest_local = latest.astimezone(tz)
-            date_range_days = (latest_local.date() - earliest_local.date()).days + 1
-            avg_tasks_per_day = valid_tasks.count() / max(date_range_days, 1)
-        else:
-            earliest_local = latest_local = None
-            date_range_days = 0
-            avg_tasks_per_day = 0.0
-
-        # 找出最活跃的日期
-        daily_counts = {}
-        for task in valid_tasks:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_date = date_value.astimezone(tz).date()
-                date_str = local_date.isoformat()  # 转换为字符串
-                daily_counts[date_str] = daily_counts.get(date_str, 0) + 1
+        earliest_local = summary['earliest'].astimezone(tz)
+        latest_local = summary['latest'].astimezone(tz)
+        date_range_days = (latest_local.date() - earliest_local.date()).days + 1
+        avg_tasks_per_day = valid_count / max(date_range_days, 1)
+
+        # 找出最活跃的日期（按本地日期在数据库中分组）
+        daily_counts = {
+            row['bucket'].isoformat(): row['count']
+            for row in time_buckets(queryset, date_field, 'date', tz)
+        }
 
         peak_activity_date = max(daily_counts.items(), key=lambda x: x[1])[0] if daily_counts else None
 
         return {
             'total_tasks': total_tasks,
-            'valid_date_tasks': valid_tasks.count(),
-            'earliest_date': earliest_local.isoformat() if earliest_local else None,
-            'latest_date': latest_local.isoformat() if latest_local else None,
+            'valid_date_tasks': valid_count,
+            'earliest_date': earliest_local.isoformat(),
+            'latest_date': latest_local.isoformat(),
             'date_range_days': date_range_days,
             'avg_tasks_per_day': round(avg_tasks_per_day, 2),
             'peak_activity_date': peak_activity_date,
@@ -5194,29 +4961,25 @@ class TaskViewSet(viewsets.ModelViewSet):
             }
         }
 
-    def _calculate_hourly_distribution(self, queryset, date_field, timezone_str):
-        """计算小时分布"""
-        import pytz
+    def _bucket_status_counts(self, queryset, date_field, bucket, tz, bucket_keys):
+        """按时间分量与状态分组统计，返回 (各分桶任务数, 各分桶状态任务数)"""
+        counts = {key: 0 for key in bucket_keys}
+        status_counts = {key: {code: 0 for code, _ in Task.STATUS_CHOICES} for key in bucket_keys}
 
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
+        for row in time_buckets(queryset, date_field, bucket, tz, dimensions=('status',)):
+            counts[row['bucket']] += row['count']
+            status_counts[row['bucket']][row['status']] += row['count']
 
-        # 24小时分布
-        hourly_counts = {i: 0 for i in range(24)}
-        hourly_status_counts = {i: {'PENDING': 0, 'IN_PROGRESS': 0, 'COMPLETED': 0, 'CANCELLED': 0, 'ON_HOLD': 0} for i
-                                in range(24)}
+        return counts, status_counts
 
-        valid_tasks = queryset.exclude(**{f'{date_field}__isnull': True})
+    def _calculate_hourly_distribution(self, queryset, date_field, timezone_str):
+        """计算小时分布"""
+        tz = resolve_timezone(timezone_str)
 
-        for task in valid_tasks:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_time = date_value.astimezone(tz)
-                hour = local_time.hour
-                hourly_counts[hour] += 1
-                hourly_status_counts[hour][task.status] += 1
+        # 24小时分布
+        hourly_counts, hourly_status_counts = self._bucket_status_counts(
+            queryset, date_field, 'hour', tz, range(24)
+        )
 
         # 计算统计信息
         total_valid = sum(hourly_counts.values())
@@ -5250,28 +5013,15 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def _calculate_daily_distribution(self, queryset, date_field, timezone_str):
         """计算日期分布（星期几）"""
-        import pytz
-
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
+        tz = resolve_timezone(timezone_str)
 
-        # 星期分布 (0=星期一, 6=星期日)
-        weekday_counts = {i: 0 for i in range(7)}
+        # 星期分布 (0=星期一, 6=星期日)；ISO 星期为 1=星期一 ... 7=星期日
         weekday_names = ['星期一', '星期二', '星期三', '星期四', '星期五', '星期六', '星期日']
-        weekday_status_counts = {i: {'PENDING': 0, 'IN_PROGRESS': 0, 'COMPLETED': 0, 'CANCELLED': 0, 'ON_HOLD': 0} for i
-                                 in range(7)}
-
-        valid_tasks = queryset.exclude(**{f'{date_field}__isnull': True})
-
-        for task in valid_tasks:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_time = date_value.astimezone(tz)
-                weekday = local_time.weekday()
-                weekday_counts[weekday] += 1
-                weekday_status_counts[weekday][task.status] += 1
+        iso_counts, iso_status_counts = self._bucket_status_counts(
+            queryset, date_field, 'iso_week_day', tz, range(1, 8)
+        )
+        weekday_counts = {day - 1: count for day, count in iso_counts.items()}
+        weekday_status_counts = {day - 1: counts for day, counts in iso_status_counts.items()}
 
         # 计算统计信息
         total_valid = sum(weekday_counts.values())
@@ -5318,30 +5068,17 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def _calculate_weekly_distribution(self, queryset, date_field, timezone_str):
         """计算周分布"""
-        import pytz
-        from datetime import timedelta
-
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
+        tz = resolve_timezone(timezone_str)
 
-        valid_tasks = queryset.exclude(**{f'{date_field}__isnull': True})
+        # 按周分组（数据库截断到该周星期一）
+        weekly_counts = {}
+        for row in time_buckets(queryset, date_field, 'week_start', tz):
+            week_key = row['bucket'].strftime('%Y-W%U')
+            weekly_counts[week_key] = weekly_counts.get(week_key, 0) + row['count']
 
-        if not valid_tasks.exists():
+        if not weekly_counts:
             return {'weekly_distribution': {}, 'trend_analysis': {}}
 
-        # 按周分组
-        weekly_counts = {}
-        for task in valid_tasks:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_time = date_value.astimezone(tz)
-                # 获取该周的星期一日期
-                week_start = local_time.date() - timedelta(days=local_time.weekday())
-                week_key = week_start.strftime('%Y-W%U')
-                weekly_counts[week_key] = weekly_counts.get(week_key, 0) + 1
-
         # 计算趋势
         sorted_weeks = sorted(weekly_counts.items())
 
@@ -5368,12 +5105,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     def _calculate_monthly_distribution(self, queryset, date_field, timezone_str):
         """计算月份分布"""
-        import pytz
-
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
+        tz = resolve_timezone(timezone_str)
 
         # 12个月分布
         monthly_counts = {i: 0 for i in range(1, 13)}
@@ -5382,14 +5114,8 @@ class TaskViewSet(viewsets.ModelViewSet):
             7: '七月', 8: '八月', 9: '九月', 10: '十月', 11: '十一月', 12: '十二月'
         }
 
-        valid_tasks = queryset.exclude(**{f'{date_field}__isnull': True})
-
-        for task in valid_tasks:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_time = date_value.astimezone(tz)
-                month = local_time.month
-                monthly_counts[month] += 1
+        for row in time_buckets(queryset, date_field, 'month', tz):
+            monthly_counts[row['bucket']] = row['count']
 
         total_valid = sum(monthly_counts.values())
         peak_month = max(monthly_counts, key=monthly_counts.get) if total_valid > 0 else 1
@@ -5426,33 +5152,32 @@ class TaskViewSet(viewsets.ModelViewSet):
             }
         }
 
-    def _calculate_time_trends(self, queryset, period, date_field, timezone_str):
-        """计算时间趋势"""
-        import pytz
-
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
-
-        valid_tasks = queryset.exclude(**{f'{date_field}__isnull': True})
+    def _calculate_time_trends(self, queryset, period, date_field, timezone_str, rollup_user=None):
+        """
+        计算时间趋势
 
-        if not valid_tasks.exists():
-            return {'trend_data': [], 'trend_summary': {}}
+        指定 rollup_user 且时区与汇总一致时，按天/按月的趋势改读每日汇总（当天的小时趋势仍查询任务表）
+        """
+        tz = resolve_timezone(timezone_str)
+        if not uses_rollup_timezone(tz):
+            rollup_user = None
 
         # 根据周期分组数据
         if period == 'today':
             # 小时趋势
-            trends = self._get_hourly_trends(valid_tasks, date_field, tz)
+            trends = self._get_hourly_trends(queryset, date_field, tz)
         elif period == 'week':
             # 日趋势
-            trends = self._get_daily_trends(valid_tasks, date_field, tz, 7)
+            trends = self._get_daily_trends(queryset, date_field, tz, 7, rollup_user)
         elif period == 'month':
             # 日趋势（30天）
-            trends = self._get_daily_trends(valid_tasks, date_field, tz, 30)
+            trends = self._get_daily_trends(queryset, date_field, tz, 30, rollup_user)
         else:
             # 月趋势
-            trends = self._get_monthly_trends(valid_tasks, date_field, tz)
+            trends = self._get_monthly_trends(queryset, date_field, tz, rollup_user)
+
+        if not any(count for _, count in trends['trend_data']):
+            return {'trend_data': [], 'trend_summary': {}}
 
         return trends
 
@@ -5460,7 +5185,12 @@ class TaskViewSet(viewsets.ModelViewSet):
         """计算时间效率分析"""
         completed_tasks = queryset.filter(status='COMPLETED')
 
-        if not completed_tasks.exists():
+        summary = completed_tasks.order_by().aggregate(
+            total=Count('id'),
+            avg_duration=Avg(completion_duration())
+        )
+
+        if not summary['total']:
             return {
                 'avg_completion_time': 0,
                 'efficiency_by_hour': {},
@@ -5468,14 +5198,8 @@ class TaskViewSet(viewsets.ModelViewSet):
                 'recommendations': ['暂无已完成任务数据']
             }
 
-        # 计算平均完成时间
-        completion_times = []
-        for task in completed_tasks:
-            if task.created_at and task.updated_at:
-                duration = (task.updated_at - task.created_at).total_seconds() / 3600  # 小时
-                completion_times.append(duration)
-
-        avg_completion_time = sum(completion_times) / len(completion_times) if completion_times else 0
+        # 计算平均完成时间（小时）
+        avg_completion_time = summary['avg_duration'].total_seconds() / 3600 if summary['avg_duration'] else 0
 
         # 按小时和星期分析效率
         hourly_efficiency = self._calculate_hourly_efficiency(completed_tasks, timezone_str)
@@ -5488,7 +5212,7 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         return {
             'avg_completion_time_hours': round(avg_completion_time, 2),
-            'total_completed_tasks': completed_tasks.count(),
+            'total_completed_tasks': summary['total'],
             'efficiency_by_hour': hourly_efficiency,
             'efficiency_by_day': daily_efficiency,
             'recommendations': recommendations
@@ -5536,96 +5260,63 @@ class TaskViewSet(viewsets.ModelViewSet):
         return max_period[0]
 
     def _get_hourly_trends(self, queryset, date_field, tz):
-        """获取小时趋势"""
-
-        hourly_data = {}
-        for task in queryset:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_time = date_value.astimezone(tz)
-                hour_key = local_time.strftime('%Y-%m-%d %H:00')
-                hourly_data[hour_key] = hourly_data.get(hour_key, 0) + 1
+        """获取小时趋势（今天0点至当前小时，补零）"""
+        now = timezone.now()
+        hourly_data = [
+            (row['bucket'].strftime('%Y-%m-%d %H:00'), row['count'])
+            for row in time_series(queryset, date_field, 'hour', tz, truncate_datetime(now, 'day', tz), now)
+        ]
 
         return {
-            'trend_data': sorted(hourly_data.items()),
+            'trend_data': hourly_data,
             'trend_summary': {'type': 'hourly', 'data_points': len(hourly_data)}
         }
 
-    def _get_daily_trends(self, queryset, date_field, tz, days):
-        """获取日趋势"""
-        daily_data = {}
-        for task in queryset:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_time = date_value.astimezone(tz)
-                day_key = local_time.strftime('%Y-%m-%d')
-                daily_data[day_key] = daily_data.get(day_key, 0) + 1
+    def _get_daily_trends(self, queryset, date_field, tz, days, rollup_user=None):
+        """获取日趋势（最近 days 天，补零）"""
+        now = timezone.now()
+        start = truncate_datetime(now, 'day', tz) - timezone.timedelta(days=days - 1)
+        if rollup_user is not None:
+            series = rollup_time_series(rollup_user, 'day', start, now)
+        else:
+            series = time_series(queryset, date_field, 'day', tz, start, now)
+        daily_data = [(row['bucket'].strftime('%Y-%m-%d'), row['count']) for row in series]
 
         return {
-            'trend_data': sorted(daily_data.items()),
+            'trend_data': daily_data,
             'trend_summary': {'type': 'daily', 'data_points': len(daily_data), 'period_days': days}
         }
 
-    def _get_monthly_trends(self, queryset, date_field, tz):
-        """获取月趋势"""
-        monthly_data = {}
-        for task in queryset:
-            date_value = getattr(task, date_field)
-            if date_value:
-                local_time = date_value.astimezone(tz)
-                month_key = local_time.strftime('%Y-%m')
-                monthly_data[month_key] = monthly_data.get(month_key, 0) + 1
+    def _get_monthly_trends(self, queryset, date_field, tz, rollup_user=None):
+        """获取月趋势（从最早到最晚有数据的月份，补零）"""
+        if rollup_user is not None:
+            series = rollup_time_series(rollup_user, 'month')
+        else:
+            series = time_series(queryset, date_field, 'month', tz)
+        monthly_data = [(row['bucket'].strftime('%Y-%m'), row['count']) for row in series]
 
         return {
-            'trend_data': sorted(monthly_data.items()),
+            'trend_data': monthly_data,
             'trend_summary': {'type': 'monthly', 'data_points': len(monthly_data)}
         }
 
+    def _completion_time_by_bucket(self, completed_tasks, bucket, timezone_str):
+        """按完成时间（updated_at）的时间分量分组计算平均完成耗时（小时）"""
+        tz = resolve_timezone(timezone_str)
+        return {
+            row['bucket']: round(row['avg_duration'].total_seconds() / 3600, 2) if row['avg_duration'] else 0
+            for row in time_buckets(completed_tasks, 'updated_at', bucket, tz, avg_duration=Avg(completion_duration()))
+        }
+
     def _calculate_hourly_efficiency(self, completed_tasks, timezone_str):
         """计算小时效率"""
-        import pytz
-
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
-
-        hourly_completion_times = {i: [] for i in range(24)}
-
-        for task in completed_tasks:
-            if task.created_at and task.updated_at:
-                completion_hour = task.updated_at.astimezone(tz).hour
-                duration = (task.updated_at - task.created_at).total_seconds() / 3600
-                hourly_completion_times[completion_hour].append(duration)
-
-        hourly_avg = {}
-        for hour, times in hourly_completion_times.items():
-            hourly_avg[hour] = round(sum(times) / len(times), 2) if times else 0
-
-        return hourly_avg
+        hourly_avg = self._completion_time_by_bucket(completed_tasks, 'hour', timezone_str)
+        return {hour: hourly_avg.get(hour, 0) for hour in range(24)}
 
     def _calculate_daily_efficiency(self, completed_tasks, timezone_str):
         """计算日效率"""
-        import pytz
-
-        try:
-            tz = pytz.timezone(timezone_str)
-        except:
-            tz = pytz.UTC
-
-        daily_completion_times = {i: [] for i in range(7)}
-
-        for task in completed_tasks:
-            if task.created_at and task.updated_at:
-                completion_day = task.updated_at.astimezone(tz).weekday()
-                duration = (task.updated_at - task.created_at).total_seconds() / 3600
-                daily_completion_times[completion_day].append(duration)
-
-        daily_avg = {}
-        for day, times in daily_completion_times.items():
-            daily_avg[day] = round(sum(times) / len(times), 2) if times else 0
-
-        return daily_avg
+        iso_avg = self._completion_time_by_bucket(completed_tasks, 'iso_week_day', timezone_str)
+        return {day: iso_avg.get(day + 1, 0) for day in range(7)}
 
     def _generate_time_efficiency_recommendations(self, hourly_eff, daily_eff, avg_time):
         """生成时间效率建议"""
@@ -10,12 +10,24 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+
+def env_flag(name, default):
+    """读取布尔型环境变量（1/true/yes/on 为真），未设置时返回默认值"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
@@ -51,6 +63,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'LingTaskFlow.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -59,6 +72,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'LingTaskFlow.middleware.DeviceTrackingMiddleware',
 ]
 
 ROOT_URLCONF = 'ling_task_flow_backend.urls'
@@ -93,17 +107,44 @@ DATABASES = {
 
 # Cache configuration
 # https://docs.djangoproject.com/en/5.2/ref/settings/#caches
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,  # 5分钟超时
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-            'CULL_FREQUENCY': 3,
+#
+# 缓存后端通过环境变量 CACHE_BACKEND 选择：
+#   locmem（默认）：进程内缓存，用于开发与测试（即测试使用的本地替身）
+#   redis（生产）：多个 Gunicorn worker 共享同一 Redis，速率限制计数、
+#                 登录锁定与统计缓存在进程之间保持一致
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem').lower()
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+            'TIMEOUT': 300,  # 5分钟超时
+            'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'lingtaskflow'),
+            'OPTIONS': {
+                # 连接池配置：每个 worker 进程维护一个连接池并复用连接
+                'max_connections': int(os.environ.get('REDIS_MAX_CONNECTIONS', 50)),
+                'socket_connect_timeout': float(os.environ.get('REDIS_CONNECT_TIMEOUT', 2)),
+                'socket_timeout': float(os.environ.get('REDIS_SOCKET_TIMEOUT', 2)),
+                'retry_on_timeout': True,
+                'health_check_interval': 30,
+            }
         }
     }
-}
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'TIMEOUT': 300,  # 5分钟超时
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+                'CULL_FREQUENCY': 3,
+            }
+        }
+    }
+else:
+    raise ImproperlyConfigured(f'不支持的缓存后端 CACHE_BACKEND={CACHE_BACKEND}，可选值: locmem, redis')
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -151,6 +192,9 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# 测试运行器：运行测试时关闭速率限制与登录历史异步写入（见 LingTaskFlow.test_runner）
+TEST_RUNNER = 'LingTaskFlow.test_runner.LingTaskFlowTestRunner'
+
 # =============================================================================
 # Django REST Framework Configuration
 # =============================================================================
@@ -182,6 +226,57 @@ REST_FRAMEWORK = {
     'TEST_REQUEST_DEFAULT_FORMAT': 'json',
 }
 
+# =============================================================================
+# Task Management Configuration
+# =============================================================================
+
+# 批量操作（批量更新/删除/恢复/操作）单次请求允许的最大任务数
+TASK_BULK_MAX_ITEMS = 5000
+
+# 批量创建（导入）单次请求允许的最大任务数
+TASK_BULK_CREATE_MAX_ITEMS = 10000
+
+# 批量写入时每批处理的任务数
+TASK_BULK_BATCH_SIZE = 500
+
+# 任务导入：每个事务写入的行数、保留的行错误数量上限、是否在后台线程执行
+TASK_IMPORT_CHUNK_SIZE = 500
+TASK_IMPORT_MAX_ERRORS = 100
+TASK_IMPORT_ASYNC = True
+# 是否改由 `python manage.py run_import_jobs` 领取执行导入作业（Web 进程不再启动导入线程）
+TASK_IMPORT_WORKER = env_flag('TASK_IMPORT_WORKER', False)
+# 导入中作业超过该秒数没有进度即视为执行进程已中断，标记为失败
+TASK_IMPORT_STALE_TIMEOUT = 300
+
+# 任务列表统计缓存时间（秒），同一过滤条件翻页时复用第一页的统计
+TASK_LIST_STATS_CACHE_TIMEOUT = 60
+
+# 统计接口响应缓存时间（秒），任务写入时按用户失效；为 0 时不缓存
+TASK_ANALYTICS_CACHE_TIMEOUT = 300
+
+# 任务全文搜索后端: basic / sqlite_fts / postgres，None 表示按数据库类型自动选择
+TASK_SEARCH_BACKEND = None
+
+# 登录历史：是否经内存队列由后台线程批量写入（环境变量 LOGIN_HISTORY_ASYNC，测试运行器中关闭）、
+# 每批写入条数、最长攒批等待时间（秒）、队列容量（满时退化为同步写入）
+LOGIN_HISTORY_ASYNC = env_flag('LOGIN_HISTORY_ASYNC', True)
+LOGIN_HISTORY_BATCH_SIZE = 200
+LOGIN_HISTORY_FLUSH_INTERVAL = 1.0
+LOGIN_HISTORY_MAX_QUEUE = 10000
+
+# 请求性能采集：每个路由保留的最近样本数（用于 /api/health/metrics/ 计算分位数）
+PERFORMANCE_METRICS_SAMPLE_SIZE = 1000
+
+# Prometheus 指标：多进程聚合目录（Gunicorn 多 worker 时设置，部署启动前清空）、
+# 进程快照写入间隔（秒）、允许抓取 /api/metrics/ 的客户端地址
+METRICS_MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR') or None
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# 就绪检查（/api/health/ready/）：依赖探测超时时间（秒）、探测结果缓存时间（秒）
+HEALTH_PROBE_TIMEOUT = 2.0
+HEALTH_READY_CACHE_TTL = 5
+
 # =============================================================================
 # JWT Configuration
 # =============================================================================
@@ -241,6 +336,36 @@ CSRF_TRUSTED_ORIGINS = [
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True
 
+# 中间件开关：安全响应头、全局速率限制（环境变量 RATE_LIMIT_ENABLED；测试运行器中关闭，
+# 避免测试请求共用同一IP配额）、API 审计日志
+SECURITY_HEADERS_ENABLED = True
+RATE_LIMIT_ENABLED = env_flag('RATE_LIMIT_ENABLED', True)
+AUDIT_LOG_ENABLED = True
+
+# 全局速率限制：每个IP每分钟允许的请求数
+RATE_LIMIT_REQUESTS_PER_MINUTE = 300
+
+# 内容安全策略（API 文档页面使用内联脚本与样式）与 HSTS 有效期（秒）
+SECURITY_CONTENT_SECURITY_POLICY = (
+    "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline'; "
+    "img-src 'self' data:; frame-ancestors 'none'"
+)
+SECURITY_HSTS_SECONDS = 31536000
+
+# 顺序：安全响应头 -> 速率限制（在会话与认证之前拒绝超额请求）-> ... -> 审计日志（最后）
+if SECURITY_HEADERS_ENABLED:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+        'LingTaskFlow.middleware.SecurityHeadersMiddleware'
+    )
+if RATE_LIMIT_ENABLED:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware'),
+        'LingTaskFlow.middleware.RateLimitMiddleware'
+    )
+if AUDIT_LOG_ENABLED:
+    MIDDLEWARE.append('LingTaskFlow.middleware.AuditLogMiddleware')
+
 # =============================================================================
 # DRF Spectacular Configuration (API Documentation)
 # =============================================================================
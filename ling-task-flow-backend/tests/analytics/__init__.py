@@ -0,0 +1,5 @@
+"""
+统计分析测试模块
+
+包含任务统计引擎与统计API的测试
+"""
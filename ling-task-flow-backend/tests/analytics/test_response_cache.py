@@ -0,0 +1,102 @@
+"""
+统计响应缓存测试
+验证统计接口按 (用户, 接口, 规范化参数) 缓存，以及任务写入后按用户数据版本号失效
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task
+from LingTaskFlow.response_cache import ANALYTICS_CACHE_HEADER
+
+ANALYTICS_URLS = [
+    '/api/tasks/stats/',
+    '/api/tasks/status-distribution/',
+    '/api/tasks/priority-distribution/',
+    '/api/tasks/tag-distribution/',
+    '/api/tasks/time-distribution/',
+]
+
+
+class AnalyticsResponseCacheTestCase(TestCase):
+    """统计响应缓存测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='cacheuser',
+            email='cache@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='cacheother',
+            email='cacheother@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(title='缓存任务', owner=self.user, tags='前端')
+
+    def _get(self, url='/api/tasks/stats/', client=None, **params):
+        response = (client or self.client).get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def _total(self, response):
+        return response.json()['data']['basic_stats']['total_tasks']
+
+    def test_hit_after_miss(self):
+        """测试各统计接口第二次请求命中缓存且不执行查询"""
+        for url in ANALYTICS_URLS:
+            self.assertEqual(self._get(url)[ANALYTICS_CACHE_HEADER], 'MISS', url)
+            with self.assertNumQueries(0):
+                response = self._get(url)
+            self.assertEqual(response[ANALYTICS_CACHE_HEADER], 'HIT', url)
+
+    def test_key_uses_normalized_params(self):
+        """测试参数顺序不影响缓存键，参数值不同则分别缓存"""
+        self._get(period='all', date_field='created_at')
+        response = self.client.get('/api/tasks/stats/?date_field=created_at&period=all')
+        self.assertEqual(response[ANALYTICS_CACHE_HEADER], 'HIT')
+        self.assertEqual(self._get(period='week')[ANALYTICS_CACHE_HEADER], 'MISS')
+
+    def test_task_writes_invalidate(self):
+        """测试创建、更新、删除、恢复与批量操作后缓存失效"""
+        self.assertEqual(self._total(self._get()), 1)
+
+        Task.objects.create(title='新任务', owner=self.user)
+        response = self._get()
+        self.assertEqual(response[ANALYTICS_CACHE_HEADER], 'MISS')
+        self.assertEqual(self._total(response), 2)
+
+        self.client.patch(f'/api/tasks/{self.task.id}/', {'title': '改名'}, format='json')
+        self.assertEqual(self._get()[ANALYTICS_CACHE_HEADER], 'MISS')
+
+        self.client.delete(f'/api/tasks/{self.task.id}/')
+        self.assertEqual(self._total(self._get()), 1)
+
+        self.client.post(f'/api/tasks/{self.task.id}/restore/')
+        self.assertEqual(self._total(self._get()), 2)
+
+        self._get()
+        self.client.post('/api/tasks/bulk_action/', {
+            'action': 'delete', 'task_ids': [str(self.task.id)]
+        }, format='json')
+        response = self._get()
+        self.assertEqual(response[ANALYTICS_CACHE_HEADER], 'MISS')
+        self.assertEqual(self._total(response), 1)
+
+    def test_invalidation_is_per_user(self):
+        """测试只使相关用户（所有者与执行者）的缓存失效"""
+        other_client = APIClient()
+        other_client.force_authenticate(user=self.other)
+        self._get(client=other_client)
+
+        Task.objects.create(title='仅自己的任务', owner=self.user)
+        self.assertEqual(self._get(client=other_client)[ANALYTICS_CACHE_HEADER], 'HIT')
+
+        self.task.assigned_to = self.other
+        self.task.save()
+        response = self._get(client=other_client)
+        self.assertEqual(response[ANALYTICS_CACHE_HEADER], 'MISS')
+        self.assertEqual(self._total(response), 1)
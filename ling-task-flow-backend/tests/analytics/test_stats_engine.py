@@ -0,0 +1,169 @@
+"""
+任务统计引擎测试
+验证条件聚合统计结果的正确性以及统计API的查询数量上限
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.analytics import TaskStatsEngine
+from LingTaskFlow.models import Task
+
+
+class TaskStatsEngineTestCase(TestCase):
+    """统计引擎结果测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='statsuser',
+            email='stats@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+        now = timezone.now()
+
+        Task.objects.create(title='已完成任务', owner=self.user, status='COMPLETED',
+                            priority='HIGH', progress=100, estimated_hours=4, actual_hours=3)
+        Task.objects.create(title='逾期任务', owner=self.user, status='PENDING',
+                            priority='URGENT', progress=0, due_date=now - timedelta(days=3))
+        Task.objects.create(title='进行中任务', owner=self.user, status='IN_PROGRESS',
+                            priority='MEDIUM', progress=40, due_date=now + timedelta(days=1))
+        Task.objects.create(title='分配的任务', owner=self.other, assigned_to=self.user,
+                            status='COMPLETED', priority='LOW', progress=100)
+
+        self.queryset = Task.objects.filter(owner=self.user) | Task.objects.filter(assigned_to=self.user)
+
+    def test_single_aggregate_query(self):
+        """测试全部条件聚合只执行一次查询"""
+        engine = TaskStatsEngine(self.queryset, self.user)
+        with self.assertNumQueries(1):
+            engine.basic_stats()
+            engine.status_distribution()
+            engine.priority_distribution()
+            engine.workload_stats()
+            engine.progress_analysis()
+
+    def test_basic_stats(self):
+        """测试基础统计"""
+        basic = TaskStatsEngine(self.queryset, self.user).basic_stats()
+        self.assertEqual(basic['total_tasks'], 4)
+        self.assertEqual(basic['completed_tasks'], 2)
+        self.assertEqual(basic['completion_rate'], 50.0)
+        self.assertEqual(basic['overdue_tasks'], 1)
+        self.assertEqual(basic['overdue_rate'], 25.0)
+        self.assertEqual(basic['average_progress'], 60.0)
+        self.assertEqual(basic['total_estimated_hours'], 4.0)
+        self.assertEqual(basic['total_actual_hours'], 3.0)
+        self.assertEqual(basic['efficiency_rate'], 75.0)
+
+    def test_distributions(self):
+        """测试状态与优先级分布"""
+        engine = TaskStatsEngine(self.queryset, self.user)
+        status_distribution = engine.status_distribution()
+        self.assertEqual(status_distribution['COMPLETED']['count'], 2)
+        self.assertEqual(status_distribution['COMPLETED']['percentage'], 50.0)
+        self.assertNotIn('CANCELLED', status_distribution)
+
+        priority_distribution = engine.priority_distribution()
+        self.assertEqual(set(priority_distribution), {'LOW', 'MEDIUM', 'HIGH', 'URGENT'})
+        self.assertEqual(priority_distribution['URGENT']['name'], '紧急')
+
+    def test_workload_and_progress(self):
+        """测试工作负载与进度分析"""
+        engine = TaskStatsEngine(self.queryset, self.user)
+        workload = engine.workload_stats()
+        self.assertEqual(workload['owned_tasks']['total'], 3)
+        self.assertEqual(workload['assigned_tasks']['total'], 1)
+        self.assertEqual(workload['assigned_tasks']['completion_rate'], 100.0)
+        self.assertEqual(workload['total_active_tasks'], 2)
+
+        progress = engine.progress_analysis()
+        self.assertEqual(progress['tasks_completed'], 2)
+        self.assertEqual(progress['tasks_not_started'], 1)
+        self.assertEqual(progress['tasks_in_progress'], 1)
+
+    def test_overdue_analysis(self):
+        """测试逾期分析"""
+        overdue = TaskStatsEngine(self.queryset, self.user).overdue_analysis()
+        self.assertEqual(overdue['total_overdue'], 1)
+        self.assertEqual(overdue['upcoming_due'], 1)
+        durations = {item['duration']: item['count'] for item in overdue['overdue_by_duration']}
+        self.assertEqual(durations, {'1周内': 1, '1月内': 1, '3月内': 1, '1年内': 1})
+        self.assertEqual(overdue['most_overdue_task']['title'], '逾期任务')
+        self.assertEqual(overdue['most_overdue_task']['overdue_days'], 3)
+
+    def test_empty_queryset(self):
+        """测试空数据集"""
+        engine = TaskStatsEngine(Task.objects.none(), self.user)
+        self.assertEqual(engine.basic_stats()['total_tasks'], 0)
+        self.assertEqual(engine.status_distribution(), {})
+        self.assertIsNone(engine.overdue_analysis()['most_overdue_task'])
+
+
+class TaskStatsQueryCountTestCase(TestCase):
+    """统计API查询数量回归测试"""
+
+    # 统计API允许的最大查询数
+    MAX_STATS_QUERIES = 8
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='statsapiuser',
+            email='statsapi@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _create_tasks(self, count):
+        """批量创建测试任务"""
+        now = timezone.now()
+        statuses = [code for code, _ in Task.STATUS_CHOICES]
+        priorities = [code for code, _ in Task.PRIORITY_CHOICES]
+        Task.objects.bulk_create([
+            Task(
+                title=f'统计任务{i}',
+                owner=self.user,
+                status=statuses[i % len(statuses)],
+                priority=priorities[i % len(priorities)],
+                progress=(i * 17) % 101,
+                category='开发',
+                tags='后端, 统计',
+                due_date=now + timedelta(days=(i % 20) - 10)
+            )
+            for i in range(count)
+        ])
+
+    def _count_stats_queries(self):
+        """请求统计API并返回执行的查询数"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/tasks/stats/')
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.json()
+
+    def test_stats_query_ceiling(self):
+        """测试统计API的查询数量不超过上限"""
+        self._create_tasks(30)
+        query_count, data = self._count_stats_queries()
+        self.assertLessEqual(query_count, self.MAX_STATS_QUERIES)
+        self.assertEqual(data['data']['basic_stats']['total_tasks'], 30)
+        self.assertEqual(data['data']['metadata']['total_tasks_analyzed'], 30)
+
+    def test_stats_query_count_independent_of_data_size(self):
+        """测试查询数量不随任务数量增长"""
+        self._create_tasks(5)
+        small_count, _ = self._count_stats_queries()
+        self._create_tasks(50)
+        large_count, _ = self._count_stats_queries()
+        self.assertEqual(small_count, large_count)
@@ -0,0 +1,136 @@
+"""
+标签统计引擎测试
+验证基于 TaskTag 聚合的标签分布、共现统计结果，以及标签分布API的查询数量与任务数量无关
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.analytics import TagStatsEngine
+from LingTaskFlow.models import Task
+
+
+class TagStatsEngineTestCase(TestCase):
+    """标签统计引擎结果测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='taguser',
+            email='tag@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='othertaguser',
+            email='othertag@example.com',
+            password='testpass123'
+        )
+        now = timezone.now()
+
+        Task.objects.create(title='任务1', owner=self.user, tags='前端, 后端, 测试',
+                            status='COMPLETED', progress=100, category='开发')
+        Task.objects.create(title='任务2', owner=self.user, tags='前端, 后端, 测试',
+                            status='PENDING', priority='HIGH', due_date=now - timedelta(days=1), category='开发')
+        Task.objects.create(title='任务3', owner=self.user, tags='前端',
+                            status='IN_PROGRESS', progress=50, category='设计')
+        Task.objects.create(title='任务4', owner=self.user)
+        Task.objects.create(title='他人任务', owner=self.other, tags='前端, 后端')
+
+        self.engine = TagStatsEngine(Task.objects.visible_to(self.user))
+
+    def test_distribution(self):
+        """测试标签分布汇总"""
+        distribution = self.engine.distribution(min_frequency=2, top_n=2)
+        self.assertEqual(distribution['total_tasks'], 4)
+        self.assertEqual(distribution['tagged_tasks'], 3)
+        self.assertEqual(distribution['tag_assignments'], 7)
+        self.assertEqual(distribution['total_tags'], 3)
+        self.assertEqual(distribution['unique_tags'], 3)
+        self.assertEqual(distribution['tags'], [
+            {'name': '前端', 'count': 3},
+            {'name': '后端', 'count': 2},
+        ])
+
+    def test_tag_aggregates(self):
+        """测试单个标签的条件聚合"""
+        aggregates = self.engine.tag_aggregates(['前端', '测试'])
+        self.assertEqual(aggregates['前端']['task_count'], 3)
+        self.assertEqual(aggregates['前端']['completed'], 1)
+        self.assertEqual(aggregates['前端']['overdue'], 1)
+        self.assertEqual(aggregates['前端']['status_IN_PROGRESS'], 1)
+        self.assertEqual(aggregates['测试']['priority_HIGH'], 1)
+        self.assertEqual(aggregates['测试']['avg_progress'], 50)
+
+        self.assertEqual(self.engine.category_counts(['前端'])['前端'], [('开发', 2), ('设计', 1)])
+
+    def test_co_occurrence(self):
+        """测试共现组合与多标签模式"""
+        pairs, patterns = self.engine.co_occurrence(['前端', '后端', '测试'])
+        self.assertEqual(pairs, {('前端', '后端'): 2, ('前端', '测试'): 2, ('后端', '测试'): 2})
+        self.assertEqual(patterns, {('前端', '后端', '测试'): 2})
+
+
+class TagDistributionAPITestCase(TestCase):
+    """标签分布API测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='tagapiuser',
+            email='tagapi@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/tasks/tag-distribution/'
+
+    def _create_tasks(self, count):
+        for index in range(count):
+            tags = ['前端', '后端', '测试', '文档'][:index % 4 + 1]
+            Task.objects.create(title=f'任务{index}', owner=self.user, tags=', '.join(tags),
+                                status='COMPLETED' if index % 2 else 'PENDING')
+
+    def test_response(self):
+        """测试响应结构与共现矩阵"""
+        self._create_tasks(8)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()['data']
+        basic = data['basic_distribution']
+        self.assertEqual(basic['total_tasks'], 8)
+        self.assertEqual(basic['tagged_tasks'], 8)
+        self.assertEqual(basic['tag_list'][0], {'tag': '前端', 'count': 8, 'percentage': 100.0,
+                                                'task_percentage': 100.0})
+
+        combination = data['combination_analysis']
+        self.assertEqual(combination['combinations'][0], {'tags': ['前端', '后端'], 'count': 6, 'strength': 6})
+        self.assertEqual(combination['correlation_matrix']['前端']['文档'], 1.0)
+        self.assertEqual(combination['correlation_matrix']['后端']['测试'], 1.0)
+        self.assertEqual(data['usage_analysis']['测试']['task_count'], 4)
+        self.assertEqual(data['efficiency_analysis']['文档']['completion_rate'], 100.0)
+        self.assertEqual(data['trend_analysis'][0]['tag_counts']['前端'], 8)
+
+    def test_empty(self):
+        """测试没有任务时正常返回"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['basic_distribution']['total_tasks'], 0)
+
+    def test_query_count_independent_of_task_count(self):
+        """测试查询数量不随任务数量增长"""
+        self._create_tasks(4)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {'period': 'week'})
+
+        self._create_tasks(40)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url, {'period': 'week'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(large), len(small))
@@ -0,0 +1,87 @@
+"""
+时间分布统计测试
+验证数据库侧按时区分桶的结果，以及时间分布API的查询数量与任务数量无关
+"""
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from LingTaskFlow.analytics import resolve_timezone, time_buckets
+from LingTaskFlow.models import Task
+
+
+class TimeDistributionAPITestCase(TestCase):
+    """时间分布API测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='timeuser',
+            email='time@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/tasks/time-distribution/'
+
+    def _create_task(self, created_at, **kwargs):
+        task = Task.objects.create(title='时间任务', owner=self.user, **kwargs)
+        Task.objects.filter(pk=task.pk).update(created_at=created_at, updated_at=created_at)
+        return task
+
+    def test_buckets_use_requested_timezone(self):
+        """测试按请求时区分桶（UTC 星期一 23:30 为上海时间星期二 07:30）"""
+        self._create_task(datetime(2026, 1, 5, 23, 30, tzinfo=dt_timezone.utc), status='COMPLETED')
+        self._create_task(datetime(2026, 1, 5, 10, 0, tzinfo=dt_timezone.utc))
+
+        response = self.client.get(self.url, {'timezone': 'Asia/Shanghai'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+
+        hourly = data['hourly_analysis']
+        self.assertEqual(hourly['hourly_distribution']['7'], 1)
+        self.assertEqual(hourly['hourly_distribution']['18'], 1)
+        self.assertEqual(hourly['hourly_status_distribution']['7']['COMPLETED'], 1)
+        self.assertEqual(hourly['hourly_efficiency']['7'], 100.0)
+
+        weekday = data['daily_analysis']['weekday_distribution']['counts']
+        self.assertEqual(weekday['0'], 1)
+        self.assertEqual(weekday['1'], 1)
+
+        basic = data['basic_distribution']
+        self.assertEqual(basic['summary']['daily_distribution'], {'2026-01-05': 1, '2026-01-06': 1})
+        self.assertEqual(basic['date_range_days'], 2)
+        self.assertEqual(data['monthly_analysis']['monthly_distribution']['counts']['1'], 2)
+        self.assertEqual(data['trend_analysis']['trend_data'], [['2026-01', 2]])
+
+        response = self.client.get(self.url, {'timezone': 'UTC'})
+        hourly = response.json()['data']['hourly_analysis']
+        self.assertEqual(hourly['hourly_distribution']['23'], 1)
+        self.assertEqual(hourly['hourly_distribution']['10'], 1)
+
+    def test_invalid_timezone_falls_back_to_utc(self):
+        """测试无效时区回退为 UTC"""
+        self.assertEqual(resolve_timezone('Invalid/Zone'), dt_timezone.utc)
+
+        self._create_task(datetime(2026, 3, 1, 1, 0, tzinfo=dt_timezone.utc))
+        rows = time_buckets(Task.objects.all(), 'created_at', 'hour', resolve_timezone('Invalid/Zone'))
+        self.assertEqual(rows, [{'bucket': 1, 'count': 1}])
+
+    def test_query_count_independent_of_task_count(self):
+        """测试查询数量不随任务数量增长"""
+        for day in range(1, 4):
+            self._create_task(datetime(2026, 2, day, 9, tzinfo=dt_timezone.utc), status='COMPLETED')
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+
+        for day in range(1, 28):
+            self._create_task(datetime(2026, 2, day, day % 24, tzinfo=dt_timezone.utc), status='COMPLETED')
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(large), len(small))
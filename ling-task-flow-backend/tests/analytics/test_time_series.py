@@ -0,0 +1,138 @@
+"""
+时间序列统计测试
+验证 time_series 的分组、补零与维度统计，以及各趋势分析的查询数量与时间段数量无关
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.analytics import resolve_timezone, time_series
+from LingTaskFlow.models import Task
+
+
+class TimeSeriesTestCase(TestCase):
+    """time_series 测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='seriesuser',
+            email='series@example.com',
+            password='testpass123'
+        )
+        self.utc = resolve_timezone('UTC')
+
+    def _create_task(self, created_at, **kwargs):
+        task = Task.objects.create(title='序列任务', owner=self.user, **kwargs)
+        Task.objects.filter(pk=task.pk).update(created_at=created_at)
+        return task
+
+    def test_monthly_zero_fill(self):
+        """测试按月分组并补齐中间缺失的月份"""
+        self._create_task(datetime(2026, 1, 10, tzinfo=dt_timezone.utc), status='COMPLETED')
+        self._create_task(datetime(2026, 1, 20, tzinfo=dt_timezone.utc))
+        self._create_task(datetime(2026, 3, 5, tzinfo=dt_timezone.utc))
+
+        with self.assertNumQueries(1):
+            series = time_series(Task.objects.all(), 'created_at', 'month', self.utc)
+
+        self.assertEqual(
+            [(row['bucket'].strftime('%Y-%m'), row['count'], row['completed']) for row in series],
+            [('2026-01', 2, 1), ('2026-02', 0, 0), ('2026-03', 1, 0)]
+        )
+        self.assertEqual(time_series(Task.objects.none(), 'created_at', 'month', self.utc), [])
+
+    def test_daily_range_with_dimension(self):
+        """测试指定范围与维度时按时间段、维度值补零"""
+        self._create_task(datetime(2026, 2, 2, 8, tzinfo=dt_timezone.utc), priority='HIGH')
+        self._create_task(datetime(2026, 2, 2, 9, tzinfo=dt_timezone.utc), priority='HIGH', status='COMPLETED')
+        self._create_task(datetime(2026, 2, 1, 9, tzinfo=dt_timezone.utc), priority='LOW')
+
+        series = time_series(
+            Task.objects.all(), 'created_at', 'day', self.utc,
+            start=datetime(2026, 2, 1, tzinfo=dt_timezone.utc), end=datetime(2026, 2, 4, tzinfo=dt_timezone.utc),
+            dimension='priority', dimension_values=['HIGH', 'LOW']
+        )
+        self.assertEqual(len(series), 6)
+        rows = {(row['bucket'].day, row['dimension']): (row['count'], row['completed']) for row in series}
+        self.assertEqual(rows[(1, 'LOW')], (1, 0))
+        self.assertEqual(rows[(2, 'HIGH')], (2, 1))
+        self.assertEqual(rows[(3, 'HIGH')], (0, 0))
+
+    def test_tag_dimension(self):
+        """测试标签维度只统计指定标签"""
+        created_at = datetime(2026, 2, 2, tzinfo=dt_timezone.utc)
+        self._create_task(created_at, tags='前端, 后端')
+        self._create_task(created_at, tags='前端')
+
+        series = time_series(Task.objects.all(), 'created_at', 'day', self.utc,
+                             dimension='task_tags__tag__name', dimension_values=['前端'])
+        self.assertEqual([(row['dimension'], row['count']) for row in series], [('前端', 2)])
+
+
+class TrendQueryCountTestCase(TestCase):
+    """趋势分析查询数量测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='trenduser',
+            email='trend@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _create_tasks(self, count):
+        now = timezone.now()
+        for index in range(count):
+            task = Task.objects.create(title=f'趋势任务{index}', owner=self.user, tags='前端',
+                                       status='COMPLETED' if index % 2 else 'PENDING')
+            Task.objects.filter(pk=task.pk).update(created_at=now - timedelta(days=index % 30))
+
+    def test_status_trends(self):
+        """测试状态趋势结构"""
+        self._create_tasks(3)
+        response = self.client.get('/api/tasks/status-distribution/', {'period': 'month'})
+        self.assertEqual(response.status_code, 200)
+
+        trends = response.json()['data']['status_trends']
+        self.assertEqual(len(trends), 4)
+        self.assertTrue(trends[0]['period'].startswith('Week '))
+        self.assertEqual(set(trends[0]['status_counts']), {code for code, _ in Task.STATUS_CHOICES})
+
+    def test_tag_trends_zero_filled_without_tags(self):
+        """测试没有标签时标签趋势仍按时间段补零"""
+        Task.objects.create(title='无标签任务', owner=self.user)
+        for period, length in (('week', 7), ('month', 4)):
+            response = self.client.get('/api/tasks/tag-distribution/', {'period': period})
+            self.assertEqual(response.status_code, 200)
+
+            trends = response.json()['data']['trend_analysis']
+            self.assertEqual(len(trends), length, period)
+            self.assertEqual(trends[0]['tag_counts'], {})
+            self.assertEqual(sum(trend['total_tasks'] for trend in trends), 1 if period == 'week' else 0)
+
+    def test_query_count_independent_of_task_count(self):
+        """测试各趋势接口的查询数量不随任务数量增长"""
+        urls = ['/api/tasks/stats/', '/api/tasks/status-distribution/',
+                '/api/tasks/priority-distribution/', '/api/tasks/tag-distribution/']
+
+        self._create_tasks(3)
+        small = {}
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url, {'period': 'week'})
+            small[url] = len(queries)
+
+        self._create_tasks(30)
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url, {'period': 'week'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(queries), small[url], url)
@@ -0,0 +1,114 @@
+"""
+缓存计数器测试
+测试速率限制与登录锁定使用的原子递增计数器，以及登录锁定的缓存键
+"""
+import hashlib
+import threading
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.test import TestCase, RequestFactory
+
+from LingTaskFlow.serializers import UserLoginSerializer
+from LingTaskFlow.utils import increment_counter, rate_limit
+
+
+class IncrementCounterTest(TestCase):
+    """原子递增计数器测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        cache.clear()
+
+    def tearDown(self):
+        """清理测试环境"""
+        cache.clear()
+
+    def test_concurrent_increments_are_not_lost(self):
+        """测试并发递增不丢失计数"""
+        def worker():
+            for _ in range(50):
+                increment_counter('counter_test', 60)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(cache.get('counter_test'), 400)
+
+    def test_increment_does_not_extend_window(self):
+        """测试递增不延长过期时间，窗口从第一次计数开始"""
+        self.assertEqual(increment_counter('window_test', 1), 1)
+        time.sleep(0.6)
+        self.assertEqual(increment_counter('window_test', 1), 2)
+        time.sleep(0.6)
+        self.assertEqual(increment_counter('window_test', 1), 1)
+
+    def test_rate_limit_counts_failed_responses(self):
+        """测试速率限制只对失败响应计数"""
+        request = RequestFactory().post('/')
+        request.META['REMOTE_ADDR'] = '10.0.0.8'
+        status_codes = iter([200, 400, 400, 200])
+
+        @rate_limit(max_attempts=2, time_window=60)
+        def limited_view(request):
+            return JsonResponse({}, status=next(status_codes))
+
+        # 固定限流器的时钟，保证所有计数落在同一个窗口
+        now = time.time()
+        with patch('LingTaskFlow.rate_limiter.time') as mock_time:
+            mock_time.time.return_value = now
+            self.assertEqual([limited_view(request).status_code for _ in range(4)], [200, 400, 400, 429])
+        # 只有两次失败响应计入当前窗口，被拒绝的请求不计数
+        window_key = f'ratelimit:sliding:limited_view:ip:10.0.0.8:{int(now // 60)}'
+        self.assertEqual(cache.get(window_key), 2)
+
+
+class LoginLockoutCacheTest(TestCase):
+    """登录锁定缓存测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='lockuser',
+            email='lock@example.com',
+            password='testpass123'
+        )
+        digest = hashlib.md5('lockuser'.encode()).hexdigest()
+        self.attempt_key = f'login_attempts_{digest}'
+        self.lock_key = f'account_locked_{digest}'
+
+    def tearDown(self):
+        """清理测试环境"""
+        cache.clear()
+
+    def _login(self, password):
+        serializer = UserLoginSerializer(data={'username': 'lockuser', 'password': password})
+        return serializer.is_valid(), serializer.errors
+
+    def test_lockout_after_max_attempts(self):
+        """测试连续失败后锁定，锁定键保存锁定时间戳"""
+        for _ in range(5):
+            self.assertFalse(self._login('wrong')[0])
+
+        self.assertEqual(cache.get(self.attempt_key), 5)
+        self.assertIsInstance(cache.get(self.lock_key), float)
+
+        valid, errors = self._login('testpass123')
+        self.assertFalse(valid)
+        self.assertIn('账户已被暂时锁定', str(errors))
+
+    def test_success_clears_counters(self):
+        """测试登录成功清除失败计数"""
+        self._login('wrong')
+        self.assertEqual(cache.get(self.attempt_key), 1)
+
+        self.assertTrue(self._login('testpass123')[0])
+        self.assertIsNone(cache.get(self.attempt_key))
+        self.assertIsNone(cache.get(self.lock_key))
@@ -0,0 +1,95 @@
+"""
+登录历史缓冲写入测试
+测试登录事件的异步批量写入、队列满时的同步回退，以及登录接口的新设备检测
+"""
+import time
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from LingTaskFlow.audit import LoginHistoryWriter
+from LingTaskFlow.models import LoginHistory
+
+
+def _entry(index=0):
+    return LoginHistory(
+        username_attempted=f'user{index}',
+        status='failed',
+        ip_address='127.0.0.1',
+        user_agent='test-agent',
+        failure_reason='测试'
+    )
+
+
+class LoginHistoryWriterTest(TestCase):
+    """登录历史缓冲写入器测试"""
+
+    def test_async_writes_are_batched(self):
+        """测试异步模式下写入不执行查询，刷新时按批 bulk_create"""
+        writer = LoginHistoryWriter(asynchronous=True, batch_size=50)
+        with patch.object(writer, '_ensure_worker'):
+            with self.assertNumQueries(0):
+                for index in range(120):
+                    writer.write(_entry(index))
+
+            with self.assertNumQueries(3):
+                self.assertEqual(writer.flush(), 120)
+        self.assertEqual(LoginHistory.objects.count(), 120)
+
+    def test_full_queue_falls_back_to_sync(self):
+        """测试队列已满时同步写入而不丢弃记录"""
+        writer = LoginHistoryWriter(asynchronous=True, max_queue_size=1)
+        with patch.object(writer, '_ensure_worker'), self.assertLogs('LingTaskFlow.audit', 'WARNING'):
+            writer.write(_entry(1))
+            writer.write(_entry(2))
+        self.assertEqual(LoginHistory.objects.count(), 1)
+        writer.flush()
+        self.assertEqual(LoginHistory.objects.count(), 2)
+
+    def test_background_worker_flushes(self):
+        """测试后台线程在攒批等待后写入"""
+        writer = LoginHistoryWriter(asynchronous=True, batch_size=100, flush_interval=0.05)
+        batches = []
+        with patch.object(writer, '_save', side_effect=batches.append):
+            for index in range(5):
+                writer.write(_entry(index))
+            deadline = time.monotonic() + 5
+            while sum(map(len, batches)) < 5 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(sum(map(len, batches)), 5)
+        self.assertTrue(writer._worker.is_alive())
+
+
+class LoginSuspiciousDeviceTest(TestCase):
+    """登录接口新设备检测测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        cache.clear()
+        self.client = APIClient()
+        User.objects.create_user(
+            username='deviceuser',
+            email='device@example.com',
+            password='testpass123'
+        )
+
+    def tearDown(self):
+        """清理测试环境"""
+        cache.clear()
+
+    def _login(self, user_agent):
+        response = self.client.post('/api/auth/login/', {
+            'username': 'deviceuser', 'password': 'testpass123'
+        }, format='json', HTTP_USER_AGENT=user_agent)
+        self.assertEqual(response.status_code, 200)
+        return response.json().get('security_info', {})
+
+    def test_new_device_is_flagged(self):
+        """测试首次出现的设备被标记为可疑，已知设备不再提醒"""
+        self.assertTrue(self._login('browser-a').get('suspicious_login'))
+        self.assertFalse(self._login('browser-a').get('suspicious_login', False))
+        self.assertTrue(self._login('browser-b').get('suspicious_login'))
+        self.assertEqual(LoginHistory.objects.filter(status='success').count(), 3)
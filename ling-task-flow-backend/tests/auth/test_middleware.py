@@ -429,3 +429,19 @@ class MiddlewareConfigurationTest(TestCase):
 
         # 验证审计日志设置
         self.assertTrue(hasattr(settings, 'AUDIT_LOG_ENABLED'))
+
+    def test_production_flags_default_on_and_disabled_in_tests(self):
+        """测试生产开关默认开启（可由环境变量关闭），测试运行器中关闭"""
+        from django.conf import settings
+        from ling_task_flow_backend.settings import env_flag
+
+        with patch.dict('os.environ', {}, clear=True):
+            self.assertTrue(env_flag('RATE_LIMIT_ENABLED', True))
+        with patch.dict('os.environ', {'RATE_LIMIT_ENABLED': 'false'}):
+            self.assertFalse(env_flag('RATE_LIMIT_ENABLED', True))
+        with patch.dict('os.environ', {'TASK_IMPORT_WORKER': 'Yes'}):
+            self.assertTrue(env_flag('TASK_IMPORT_WORKER', False))
+
+        self.assertFalse(settings.RATE_LIMIT_ENABLED)
+        self.assertFalse(settings.LOGIN_HISTORY_ASYNC)
+        self.assertNotIn('LingTaskFlow.middleware.RateLimitMiddleware', settings.MIDDLEWARE)
@@ -0,0 +1,165 @@
+"""
+速率限制模块测试
+测试固定窗口与滑动窗口限流算法、视图装饰器、DRF节流类与基准命令
+"""
+import threading
+import time
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import JsonResponse
+from django.test import TestCase, RequestFactory
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from LingTaskFlow.rate_limiter import (
+    FixedWindowRateLimiter,
+    SlidingWindowRateLimiter,
+    SlidingWindowThrottle,
+    rate_limited,
+)
+
+
+class LimitedThrottle(SlidingWindowThrottle):
+    """测试用节流类"""
+    scope = 'test_limited'
+    rate = '2/min'
+
+
+class ThrottledView(APIView):
+    """测试用节流视图"""
+    throttle_classes = [LimitedThrottle]
+
+    def get(self, request):
+        return Response({'success': True})
+
+
+class RateLimiterAlgorithmTest(TestCase):
+    """限流算法测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        cache.clear()
+
+    def tearDown(self):
+        """清理测试环境"""
+        cache.clear()
+
+    def test_fixed_window(self):
+        """测试固定窗口在窗口边界重置"""
+        limiter = FixedWindowRateLimiter(2, 60)
+        self.assertEqual([limiter.hit('k', now=100).allowed for _ in range(3)], [True, True, False])
+        self.assertEqual(limiter.hit('k', now=110).retry_after, 10)
+        self.assertTrue(limiter.hit('k', now=120).allowed)
+
+    def test_sliding_window_weights_previous_window(self):
+        """测试滑动窗口按比例计入上一窗口，避免窗口边界突发"""
+        limiter = SlidingWindowRateLimiter(4, 60)
+        for _ in range(4):
+            self.assertTrue(limiter.hit('k', now=110).allowed)
+
+        # 新窗口开始 15 秒时上一窗口仍计入 3/4：4 × 3/4 + 1 = 4 放行，再次请求超出
+        self.assertTrue(limiter.hit('k', now=135).allowed)
+        result = limiter.hit('k', now=135)
+        self.assertFalse(result.allowed)
+        self.assertEqual(result.retry_after, 15)
+
+        # 上一窗口权重衰减后再次放行：4 × 1/6 + 3 < 4
+        self.assertTrue(limiter.hit('k', now=170).allowed)
+
+    def test_peek_does_not_count(self):
+        """测试 peek 只读取不计数，达到限额时不放行"""
+        limiter = SlidingWindowRateLimiter(1, 60)
+        self.assertTrue(limiter.peek('k', now=10).allowed)
+        self.assertTrue(limiter.peek('k', now=10).allowed)
+        limiter.hit('k', now=10)
+        self.assertFalse(limiter.peek('k', now=10).allowed)
+
+
+class RateLimitedDecoratorTest(TestCase):
+    """限流装饰器与DRF节流类测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='limituser',
+            email='limit@example.com',
+            password='testpass123'
+        )
+
+    def tearDown(self):
+        """清理测试环境"""
+        cache.clear()
+
+    def test_decorator_keys_by_user_or_ip(self):
+        """测试已认证用户按用户限流，匿名请求按IP限流"""
+        @rate_limited(1, 60)
+        def limited_view(request):
+            return JsonResponse({'success': True})
+
+        factory = RequestFactory()
+        anonymous = factory.get('/', REMOTE_ADDR='10.0.0.1')
+        authenticated = factory.get('/', REMOTE_ADDR='10.0.0.1')
+        authenticated.user = self.user
+
+        self.assertEqual(limited_view(anonymous).status_code, 200)
+        response = limited_view(anonymous)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(limited_view(authenticated).status_code, 200)
+        self.assertEqual(limited_view(factory.get('/', REMOTE_ADDR='10.0.0.2')).status_code, 200)
+
+    def test_failures_only_bounded_under_concurrency(self):
+        """测试只计失败响应时，并发的失败请求也不会超过限额进入视图"""
+        entered = []
+        barrier = threading.Barrier(8)
+
+        @rate_limited(2, 60, failures_only=True)
+        def login_view(request):
+            entered.append(1)
+            time.sleep(0.1)  # 在计数之前让其他请求完成检查
+            return JsonResponse({'success': False}, status=400)
+
+        def attempt():
+            barrier.wait()
+            login_view(RequestFactory().post('/', REMOTE_ADDR='10.0.0.9'))
+
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(len(entered), 2)
+
+    def test_failures_only_refunds_successful_responses(self):
+        """测试成功响应不占用限额"""
+        @rate_limited(1, 60, failures_only=True)
+        def login_view(request):
+            return JsonResponse({'success': True})
+
+        request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.10')
+        self.assertEqual([login_view(request).status_code for _ in range(3)], [200, 200, 200])
+
+    def test_drf_throttle(self):
+        """测试DRF节流类按用户限流并返回等待时间"""
+        factory = APIRequestFactory()
+        view = ThrottledView.as_view()
+
+        def request():
+            api_request = factory.get('/')
+            force_authenticate(api_request, user=self.user)
+            return view(api_request)
+
+        self.assertEqual([request().status_code for _ in range(3)], [200, 200, 429])
+        self.assertIn('Retry-After', request())
+
+    def test_benchmark_command(self):
+        """测试基准命令在并发下计数无丢失"""
+        out = StringIO()
+        call_command('benchmark_rate_limiter', '--threads', '4', '--checks', '50', stdout=out)
+        self.assertIn('计数 200/200', out.getvalue())
+        self.assertNotIn('计数丢失', out.getvalue())
@@ -0,0 +1,15 @@
+"""
+pytest 配置
+与 manage.py test 的测试运行器一致，测试期间关闭速率限制与登录历史异步写入
+"""
+import pytest
+from django.test.utils import override_settings
+
+from LingTaskFlow.test_runner import build_test_settings
+
+
+@pytest.fixture(autouse=True, scope='session')
+def lingtaskflow_test_settings():
+    """整个测试会话期间应用测试覆盖设置"""
+    with override_settings(**build_test_settings()):
+        yield
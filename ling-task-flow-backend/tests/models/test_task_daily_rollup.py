@@ -0,0 +1,181 @@
+"""
+TaskDailyRollup模型单元测试
+测试任务每日汇总的增量维护、重建命令，以及趋势统计改读汇总后结果不变
+"""
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task, TaskDailyRollup
+
+
+def _stored_rows(user_ids=None):
+    """读取当前存储的汇总行"""
+    rows = TaskDailyRollup.objects.all()
+    if user_ids is not None:
+        rows = rows.filter(user_id__in=user_ids)
+    return {
+        (row.user_id, row.day, row.status, row.priority, row.category):
+            [row.task_count, row.estimated_hours, row.actual_hours]
+        for row in rows
+    }
+
+
+class TaskDailyRollupTestCase(TestCase):
+    """任务每日汇总增量维护测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='rollupuser',
+            email='rollup@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='rollupother',
+            email='rollupother@example.com',
+            password='testpass123'
+        )
+
+    def assertMatchesRebuild(self):
+        self.assertEqual(_stored_rows(), TaskDailyRollup.compute_rows())
+
+    def test_create_and_update(self):
+        """测试创建任务与状态、工时变更的增量更新"""
+        task = Task.objects.create(title='汇总任务', owner=self.user, priority='HIGH',
+                                   category='开发', estimated_hours=Decimal('2.50'))
+        day = task.created_at.astimezone(TaskDailyRollup.TIMEZONE).date()
+        row = TaskDailyRollup.objects.get(user=self.user)
+        self.assertEqual((row.day, row.status, row.priority, row.category), (day, 'PENDING', 'HIGH', '开发'))
+        self.assertEqual(row.task_count, 1)
+        self.assertEqual(row.estimated_hours, Decimal('2.50'))
+
+        task.status = 'COMPLETED'
+        task.actual_hours = Decimal('3.00')
+        task.save()
+        row = TaskDailyRollup.objects.get(user=self.user)
+        self.assertEqual(row.status, 'COMPLETED')
+        self.assertEqual(row.actual_hours, Decimal('3.00'))
+        self.assertMatchesRebuild()
+
+    def test_assignment_counts_for_both_users(self):
+        """测试任务同时计入所有者与执行者的汇总"""
+        task = Task.objects.create(title='分配任务', owner=self.user, assigned_to=self.other)
+        self.assertEqual(TaskDailyRollup.objects.filter(user=self.other).count(), 1)
+
+        task.assigned_to = self.user
+        task.save()
+        self.assertFalse(TaskDailyRollup.objects.filter(user=self.other).exists())
+        self.assertEqual(TaskDailyRollup.objects.get(user=self.user).task_count, 1)
+        self.assertMatchesRebuild()
+
+    def test_soft_delete_restore_and_hard_delete(self):
+        """测试软删除、恢复与永久删除"""
+        task = Task.objects.create(title='删除任务', owner=self.user)
+        Task.objects.create(title='保留任务', owner=self.user)
+
+        task.soft_delete(user=self.user)
+        self.assertEqual(TaskDailyRollup.objects.get(user=self.user).task_count, 1)
+
+        task.restore(user=self.user)
+        self.assertEqual(TaskDailyRollup.objects.get(user=self.user).task_count, 2)
+
+        task.hard_delete()
+        self.assertEqual(TaskDailyRollup.objects.get(user=self.user).task_count, 1)
+        self.assertMatchesRebuild()
+
+    def test_existing_row_from_concurrent_insert(self):
+        """测试汇总行已被并发写入插入时累加到该行而不是违反唯一约束"""
+        day = timezone.now().astimezone(TaskDailyRollup.TIMEZONE).date()
+        TaskDailyRollup.objects.create(user=self.user, day=day, status='PENDING', priority='MEDIUM')
+
+        Task.objects.create(title='并发创建任务', owner=self.user)
+        row = TaskDailyRollup.objects.get(user=self.user)
+        self.assertEqual(row.task_count, 1)
+        self.assertMatchesRebuild()
+
+    def test_missing_row_on_decrement_rebuilds(self):
+        """测试扣减时汇总行缺失则重建该用户的汇总"""
+        task = Task.objects.create(title='缺失汇总任务', owner=self.user)
+        Task.objects.create(title='其他待处理任务', owner=self.user)
+        TaskDailyRollup.objects.filter(user=self.user, status='PENDING').delete()
+
+        task.status = 'IN_PROGRESS'
+        task.save()
+        counts = dict(TaskDailyRollup.objects.filter(user=self.user).values_list('status', 'task_count'))
+        self.assertEqual(counts, {'PENDING': 1, 'IN_PROGRESS': 1})
+        self.assertMatchesRebuild()
+
+    def test_rebuild_command(self):
+        """测试重建命令修复被篡改的汇总"""
+        Task.objects.create(title='任务1', owner=self.user)
+        Task.objects.create(title='任务2', owner=self.other, status='COMPLETED')
+        TaskDailyRollup.objects.filter(user=self.user).update(task_count=99)
+        TaskDailyRollup.objects.filter(user=self.other).delete()
+
+        out = StringIO()
+        call_command('rebuild_task_rollups', '--user', 'rollupuser', stdout=out)
+        self.assertIn('已重建 1 条', out.getvalue())
+        self.assertEqual(TaskDailyRollup.objects.get(user=self.user).task_count, 1)
+        self.assertFalse(TaskDailyRollup.objects.filter(user=self.other).exists())
+
+        call_command('rebuild_task_rollups', stdout=StringIO())
+        self.assertMatchesRebuild()
+
+
+class RollupTrendsTestCase(TestCase):
+    """趋势统计改读每日汇总测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='rolluptrend',
+            email='rolluptrend@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        now = timezone.now()
+        for index in range(12):
+            task = Task.objects.create(title=f'趋势任务{index}', owner=self.user,
+                                       status='COMPLETED' if index % 3 else 'PENDING',
+                                       priority=['LOW', 'MEDIUM', 'HIGH'][index % 3])
+            Task.objects.filter(pk=task.pk).update(created_at=now - timedelta(days=index * 4))
+        TaskDailyRollup.rebuild()
+
+    def _get(self, url, period, **params):
+        response = self.client.get(url, {'period': period, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_rollup_matches_task_table(self):
+        """测试汇总与任务表得到相同的趋势结果"""
+        for period in ('week', 'month', 'all'):
+            from_rollup = self._get('/api/tasks/stats/', period)['time_trends']
+            from_tasks = self._get('/api/tasks/stats/', period, include_deleted='true')['time_trends']
+            self.assertEqual(from_rollup, from_tasks, period)
+
+        for url, key in (('/api/tasks/status-distribution/', 'status_trends'),
+                         ('/api/tasks/priority-distribution/', 'priority_trends')):
+            for period in ('week', 'month'):
+                self.assertEqual(self._get(url, period)[key],
+                                 self._get(url, period, include_deleted='true')[key], (url, period))
+
+    def test_trends_read_rollup(self):
+        """测试趋势结果来自汇总表"""
+        TaskDailyRollup.objects.all().delete()
+        self.assertEqual(self._get('/api/tasks/stats/', 'all')['time_trends'],
+                         {'trend_data': [], 'trend_summary': {}})
+
+        # 非 UTC 时区与 date_field 不为 created_at 时仍查询任务表
+        trends = self._get('/api/tasks/stats/', 'all', timezone='Asia/Shanghai')['time_trends']
+        self.assertEqual(sum(count for _, count in trends['trend_data']), 12)
+        trends = self._get('/api/tasks/stats/', 'all', date_field='updated_at')['time_trends']
+        self.assertEqual(sum(count for _, count in trends['trend_data']), 12)
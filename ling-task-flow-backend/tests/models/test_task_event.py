@@ -0,0 +1,147 @@
+"""
+TaskEvent模型单元测试
+测试任务事件在更新、状态变更、批量操作与删除/恢复时的写入，以及基于事件的状态分析
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.analytics import status_durations, status_transition_counts, task_events
+from LingTaskFlow.models import Task, TaskEvent
+
+
+class TaskEventTestCase(TestCase):
+    """任务事件写入测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='eventuser',
+            email='event@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='eventother',
+            email='eventother@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _events(self, task=None):
+        events = TaskEvent.objects.order_by('id')
+        if task is not None:
+            events = events.filter(task=task)
+        return list(events.values_list('event_type', 'from_value', 'to_value'))
+
+    def test_update_records_changes(self):
+        """测试任务更新记录状态、优先级与分配变更"""
+        task = Task.objects.create(title='事件任务', owner=self.user, priority='LOW')
+
+        response = self.client.patch(f'/api/tasks/{task.id}/', {
+            'status': 'IN_PROGRESS', 'priority': 'HIGH', 'assigned_to': self.other.id, 'title': '新标题'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._events(task), [
+            ('STATUS', 'PENDING', 'IN_PROGRESS'),
+            ('PRIORITY', 'LOW', 'HIGH'),
+            ('ASSIGN', '', str(self.other.id)),
+        ])
+        self.assertTrue(all(event.actor_id == self.user.id for event in TaskEvent.objects.all()))
+
+        response = self.client.patch(f'/api/tasks/{task.id}/update_status/', {'status': 'COMPLETED'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._events(task)[-1], ('STATUS', 'IN_PROGRESS', 'COMPLETED'))
+
+        # 不涉及跟踪字段的更新不记录事件
+        self.client.patch(f'/api/tasks/{task.id}/', {'title': '再次修改'}, format='json')
+        self.assertEqual(TaskEvent.objects.count(), 4)
+
+    def test_soft_delete_and_restore(self):
+        """测试软删除与恢复记录事件"""
+        task = Task.objects.create(title='删除任务', owner=self.user)
+
+        self.client.delete(f'/api/tasks/{task.id}/')
+        self.client.post(f'/api/tasks/{task.id}/restore/')
+        self.assertEqual(self._events(task), [('DELETE', '', ''), ('RESTORE', '', '')])
+
+    def test_bulk_action_batches_inserts(self):
+        """测试批量操作的事件以单条批量 INSERT 写入"""
+        task_ids = [str(Task.objects.create(title=f'批量事件{index}', owner=self.user).id) for index in range(30)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/tasks/bulk_action/', {
+                'action': 'update_status', 'task_ids': task_ids, 'status': 'IN_PROGRESS'
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(TaskEvent.objects.filter(event_type='STATUS', to_value='IN_PROGRESS').count(), 30)
+        inserts = [query for query in queries.captured_queries
+                   if query['sql'].startswith('INSERT INTO "task_events"')]
+        self.assertEqual(len(inserts), 1)
+
+        self.client.post('/api/tasks/bulk_action/', {'action': 'delete', 'task_ids': task_ids}, format='json')
+        self.assertEqual(TaskEvent.objects.filter(event_type='DELETE').count(), 30)
+
+
+class TaskEventAnalyticsTestCase(TestCase):
+    """基于任务事件的状态分析测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='eventstats',
+            email='eventstats@example.com',
+            password='testpass123'
+        )
+        self.now = timezone.now()
+        self.task = Task.objects.create(title='分析任务', owner=self.user, status='COMPLETED')
+        Task.objects.filter(pk=self.task.pk).update(created_at=self.now - timedelta(hours=10))
+        TaskEvent.objects.bulk_create([
+            TaskEvent(task=self.task, event_type='STATUS', from_value='PENDING', to_value='IN_PROGRESS',
+                      created_at=self.now - timedelta(hours=8)),
+            TaskEvent(task=self.task, event_type='STATUS', from_value='IN_PROGRESS', to_value='COMPLETED',
+                      created_at=self.now - timedelta(hours=2)),
+        ])
+
+        self.open_task = Task.objects.create(title='进行中任务', owner=self.user)
+        Task.objects.filter(pk=self.open_task.pk).update(created_at=self.now - timedelta(hours=4))
+
+    def test_transition_counts(self):
+        """测试状态转换矩阵"""
+        counts = status_transition_counts(task_events(Task.objects.visible_to(self.user)))
+        self.assertEqual(counts, {('PENDING', 'IN_PROGRESS'): 1, ('IN_PROGRESS', 'COMPLETED'): 1})
+
+    def test_status_durations(self):
+        """测试状态停留时长（已结束停留、当前停留与终态耗时）"""
+        durations = status_durations(Task.objects.visible_to(self.user), now=self.now)
+
+        self.assertEqual(durations['IN_PROGRESS']['avg'], timedelta(hours=6))
+        pending = durations['PENDING']
+        self.assertEqual((pending['stay_count'], pending['open_count']), (2, 1))
+        self.assertEqual(pending['avg'], timedelta(hours=3))
+        self.assertEqual((pending['min'], pending['max']), (timedelta(hours=2), timedelta(hours=4)))
+        # 终态按创建到进入终态的耗时统计
+        self.assertEqual(durations['COMPLETED']['avg'], timedelta(hours=8))
+        self.assertEqual(durations['COMPLETED']['open_count'], 1)
+
+    def test_status_distribution_api(self):
+        """测试状态分布API返回基于事件的转换与停留分析"""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.get('/api/tasks/status-distribution/')
+        self.assertEqual(response.status_code, 200)
+
+        data = response.json()['data']
+        transitions = data['transition_analysis']
+        self.assertEqual(transitions['transition_matrix']['PENDING']['IN_PROGRESS'], 1)
+        self.assertEqual(transitions['status_transitions']['IN_PROGRESS']['net_change'], 0)
+        self.assertEqual(transitions['transition_summary']['total_transitions'], 2)
+        self.assertEqual(data['duration_analysis']['IN_PROGRESS']['average_duration_hours'], 6.0)
+        self.assertEqual(data['duration_analysis']['COMPLETED']['task_count'], 1)
+        self.assertEqual(transitions['status_transitions']['COMPLETED']['estimated_inflow'], 1)
+        self.assertEqual(transitions['transition_summary']['total_active_transitions'], 4)
@@ -0,0 +1,145 @@
+"""
+规范化标签单元测试
+测试 Tag / TaskTag 与 Task.tags 字符串的同步、按标签过滤与标签统计
+"""
+import importlib
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task, Tag, TaskTag
+
+
+class TaskTagSyncTestCase(TestCase):
+    """标签同步测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='taguser',
+            email='tag@example.com',
+            password='testpass123'
+        )
+
+    def _tag_names(self, task):
+        return sorted(task.tag_set.values_list('name', flat=True))
+
+    def test_create_and_update_tags(self):
+        """测试创建与修改标签字符串后同步关联"""
+        task = Task.objects.create(title='标签任务', owner=self.user, tags='开发, 后端 ,开发,')
+        self.assertEqual(self._tag_names(task), ['后端', '开发'])
+
+        task.tags = '后端, 测试'
+        task.save()
+        self.assertEqual(self._tag_names(task), ['后端', '测试'])
+        self.assertEqual(Tag.objects.filter(name='开发').count(), 1)  # 标签本身保留
+
+    def test_add_and_remove_tag(self):
+        """测试 add_tag / remove_tag 保持可用"""
+        task = Task.objects.create(title='标签任务', owner=self.user, tags='开发')
+        task.add_tag('紧急')
+        task.remove_tag('开发')
+        task.save()
+
+        self.assertEqual(task.tags_list, ['紧急'])
+        self.assertEqual(self._tag_names(task), ['紧急'])
+
+    def test_save_without_tag_change_skips_sync(self):
+        """测试标签未变化的保存不访问标签表"""
+        task = Task.objects.create(title='标签任务', owner=self.user, tags='开发')
+        task = Task.objects.get(pk=task.pk)
+        task.progress = 50
+
+        with CaptureQueriesContext(connection) as context:
+            task.save()
+        self.assertFalse(any('task_tags' in query['sql'] for query in context.captured_queries))
+
+    def test_hard_delete_removes_links(self):
+        """测试永久删除任务后关联被级联删除"""
+        task = Task.objects.create(title='标签任务', owner=self.user, tags='开发')
+        task.hard_delete()
+        self.assertFalse(TaskTag.objects.exists())
+
+    def test_populate_migration(self):
+        """测试数据迁移从现有标签字符串建立关联"""
+        first = Task.objects.create(title='任务一', owner=self.user, tags='开发, 后端')
+        second = Task.objects.create(title='任务二', owner=self.user, tags='开发')
+        TaskTag.objects.all().delete()
+        Tag.objects.all().delete()
+
+        migration = importlib.import_module('LingTaskFlow.migrations.0013_task_tags')
+        migration.populate_task_tags(apps, None)
+
+        self.assertEqual(self._tag_names(first), ['后端', '开发'])
+        self.assertEqual(self._tag_names(second), ['开发'])
+
+
+class TaskTagQueryTestCase(TestCase):
+    """按标签过滤与统计测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='tagqueryuser',
+            email='tagquery@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.backend = Task.objects.create(title='后端任务', owner=self.user, tags='开发, 后端')
+        self.frontend = Task.objects.create(title='前端任务', owner=self.user, tags='开发, 前端')
+        self.docs = Task.objects.create(title='文档任务', owner=self.user, tags='文档')
+
+    def test_tagged_uses_exact_names(self):
+        """测试按标签过滤为精确匹配的索引子查询"""
+        queryset = Task.objects.tagged(['后端', '文档'])
+        self.assertEqual(set(queryset), {self.backend, self.docs})
+        self.assertIn('task_tags', str(queryset.query))
+        self.assertNotIn('LIKE', str(queryset.query).upper())
+
+        self.assertFalse(Task.objects.tagged(['后']).exists())
+
+    def test_tag_filters_in_api(self):
+        """测试列表与高级搜索的标签过滤"""
+        response = self.client.get('/api/tasks/', {'tags': '开发'})
+        self.assertEqual(
+            {item['id'] for item in response.data['data']},
+            {str(self.backend.pk), str(self.frontend.pk)}
+        )
+
+        response = self.client.get('/api/tasks/search/', {'tags': '前端,文档'})
+        self.assertEqual(response.data['data']['stats']['total_found'], 2)
+        self.assertEqual(response.data['data']['search_params']['tags'], ['前端', '文档'])
+
+    def test_tag_filter_ignores_case(self):
+        """测试按标签过滤不区分大小写"""
+        bug = Task.objects.create(title='缺陷任务', owner=self.user, tags='Bug')
+        self.assertEqual(list(Task.objects.tagged(['bug'])), [bug])
+
+        response = self.client.get('/api/tasks/', {'tags': 'BUG'})
+        self.assertEqual([item['id'] for item in response.data['data']], [str(bug.pk)])
+
+    def test_tag_counts(self):
+        """测试标签分组统计"""
+        counts = list(TaskTag.tag_counts(Task.objects.filter(owner=self.user)))
+        self.assertEqual(counts[0], {'name': '开发', 'count': 2})
+        self.assertEqual(len(counts), 4)
+
+    def test_bulk_writes_sync_tags(self):
+        """测试批量创建与批量更新同步标签关联"""
+        self.client.post('/api/tasks/', [
+            {'title': '批量一', 'tags': '批量, 导入'},
+            {'title': '批量二', 'tags': '批量'},
+        ], format='json')
+        self.assertEqual(Task.objects.tagged(['批量']).count(), 2)
+
+        response = self.client.patch('/api/tasks/bulk_update/', {
+            'updates': [{'id': str(self.docs.pk), 'tags': '文档, 批量'}]
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.tagged(['批量']).count(), 3)
@@ -0,0 +1,97 @@
+"""
+任务可见性查询测试
+验证 Task.objects.visible_to() 的结果正确性与 UNION 访问路径的执行计划
+"""
+import unittest
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from LingTaskFlow.models import Task
+
+
+class TaskVisibilityTestCase(TestCase):
+    """任务可见性结果测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='visibleuser',
+            email='visible@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com',
+            password='testpass123'
+        )
+
+        self.owned = Task.objects.create(title='自己的任务', owner=self.user)
+        self.self_assigned = Task.objects.create(title='分配给自己', owner=self.user, assigned_to=self.user)
+        self.assigned = Task.objects.create(title='被分配的任务', owner=self.other, assigned_to=self.user)
+        self.hidden = Task.objects.create(title='他人的任务', owner=self.other)
+        self.deleted = Task.objects.create(title='已删除任务', owner=self.user)
+        self.deleted.soft_delete(user=self.user)
+
+    def test_visible_tasks(self):
+        """测试拥有与被分配的任务均可见，且不重复"""
+        tasks = list(Task.objects.visible_to(self.user))
+
+        self.assertEqual(len(tasks), 3)
+        self.assertEqual(
+            {task.pk for task in tasks},
+            {self.owned.pk, self.self_assigned.pk, self.assigned.pk}
+        )
+
+    def test_visible_tasks_include_deleted(self):
+        """测试包含软删除记录的管理器"""
+        pks = set(Task.all_objects.visible_to(self.user).values_list('pk', flat=True))
+        self.assertIn(self.deleted.pk, pks)
+        self.assertNotIn(self.hidden.pk, pks)
+
+    def test_visible_tasks_chainable(self):
+        """测试可见性过滤可与其他条件、聚合组合"""
+        queryset = Task.objects.visible_to(self.user).filter(assigned_to=self.user)
+        self.assertEqual(queryset.count(), 2)
+        self.assertEqual(Task.objects.filter(status='PENDING').visible_to(self.other).count(), 2)
+
+    def test_query_uses_union_without_distinct(self):
+        """测试生成的SQL使用 UNION 子查询且不含 DISTINCT"""
+        sql = str(Task.objects.visible_to(self.user).query).upper()
+        self.assertIn('UNION', sql)
+        self.assertNotIn('DISTINCT', sql)
+        self.assertNotIn(' OR ', sql)
+
+
+class TaskVisibilityExplainTestCase(TestCase):
+    """任务可见性执行计划测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='explainuser',
+            email='explain@example.com',
+            password='testpass123'
+        )
+        Task.objects.create(title='执行计划任务', owner=self.user, assigned_to=self.user)
+
+    @unittest.skipUnless(connection.vendor == 'sqlite', '仅适用于SQLite')
+    def test_sqlite_plan_uses_indexes(self):
+        """测试SQLite执行计划：两个分支分别走 owner / assigned_to 索引，无 DISTINCT 排序"""
+        plan = Task.objects.visible_to(self.user).order_by('-created_at').explain()
+
+        self.assertRegex(plan, r'SEARCH U0 USING (COVERING )?INDEX task_\w+ \(owner_id=\?')
+        self.assertRegex(plan, r'SEARCH U0 USING (COVERING )?INDEX task_\w+ \(assigned_to_id=\?')
+        self.assertNotIn('FOR DISTINCT', plan)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', '仅适用于PostgreSQL')
+    def test_postgresql_plan_uses_indexes(self):
+        """测试PostgreSQL执行计划：分支走索引扫描，无全表去重"""
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = Task.objects.visible_to(self.user).order_by('-created_at').explain()
+
+        self.assertIn('Append', plan)
+        self.assertRegex(plan, r'Index (Only )?Scan using task_\w+')
+        self.assertNotIn('Seq Scan on tasks', plan)
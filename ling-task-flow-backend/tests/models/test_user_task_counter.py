@@ -0,0 +1,203 @@
+"""
+UserTaskCounter模型单元测试
+测试用户任务计数器的增量维护与对账命令
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from LingTaskFlow.bulk import TaskBulkExecutor
+from LingTaskFlow.models import Task, UserTaskCounter
+
+
+class UserTaskCounterTestCase(TestCase):
+    """用户任务计数器增量维护测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='counteruser',
+            email='counter@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='counterother',
+            email='counterother@example.com',
+            password='testpass123'
+        )
+
+    def _counter(self, user=None):
+        return UserTaskCounter.objects.get(user=user or self.user)
+
+    def test_counter_created_with_user(self):
+        """测试创建用户时自动创建计数器"""
+        counter = self._counter()
+        self.assertEqual(counter.total_count, 0)
+        self.assertEqual(counter.overdue_count, 0)
+
+    def test_create_and_status_transition(self):
+        """测试创建任务与状态变更的增量更新"""
+        task = Task.objects.create(title='计数任务', owner=self.user, priority='HIGH')
+        counter = self._counter()
+        self.assertEqual(counter.total_count, 1)
+        self.assertEqual(counter.pending_count, 1)
+        self.assertEqual(counter.high_priority_count, 1)
+
+        task.status = 'COMPLETED'
+        task.priority = 'LOW'
+        task.save()
+        counter = self._counter()
+        self.assertEqual(counter.pending_count, 0)
+        self.assertEqual(counter.completed_count, 1)
+        self.assertEqual(counter.high_priority_count, 0)
+        self.assertEqual(counter.low_priority_count, 1)
+
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.task_count, 1)
+        self.assertEqual(self.user.profile.completed_task_count, 1)
+
+    @override_settings(TASK_SEARCH_BACKEND='basic')  # 排除搜索索引同步的查询
+    def test_save_without_counter_changes_skips_counter_queries(self):
+        """测试未改变计数字段的保存不更新计数器"""
+        task = Task.objects.create(title='计数任务', owner=self.user)
+        task = Task.objects.get(pk=task.pk)
+        task.title = '新标题'
+        with self.assertNumQueries(4):  # SAVEPOINT + 锁定读取保存前状态 + UPDATE + RELEASE
+            task.save()
+
+    def test_stale_instances_do_not_drift_counters(self):
+        """测试以过期实例保存时按数据库中的当前状态计算增量"""
+        task = Task.objects.create(title='并发任务', owner=self.user)
+        first = Task.objects.get(pk=task.pk)
+        second = Task.objects.get(pk=task.pk)
+
+        # 两个过期实例先后把同一任务从待处理改为已完成
+        for instance in (first, second):
+            instance.status = 'COMPLETED'
+            instance.save()
+        counter = self._counter()
+        self.assertEqual((counter.pending_count, counter.completed_count), (0, 1))
+
+        # refresh_from_db 之后的写入以刷新后的状态为起点
+        task.status = 'IN_PROGRESS'
+        task.save()
+        first.refresh_from_db()
+        self.assertEqual(first._counter_state, first._get_counter_state())
+        first.status = 'PENDING'
+        first.save()
+        counter = self._counter()
+        self.assertEqual(
+            (counter.pending_count, counter.in_progress_count, counter.completed_count), (1, 0, 0)
+        )
+
+    def test_bulk_executor_uses_current_state(self):
+        """测试批量写入按锁定读取的当前状态计算增量"""
+        task = Task.objects.create(title='批量并发任务', owner=self.user)
+        stale = Task.objects.get(pk=task.pk)
+        task.status = 'COMPLETED'
+        task.save()
+
+        stale.status = 'IN_PROGRESS'
+        stale.sync_completion_fields()
+        TaskBulkExecutor(self.user).save([stale], ['status', 'completed_at'])
+        counter = self._counter()
+        self.assertEqual(
+            (counter.pending_count, counter.in_progress_count, counter.completed_count), (0, 1, 0)
+        )
+
+    def test_soft_delete_restore_and_hard_delete(self):
+        """测试软删除、恢复与硬删除的计数变化"""
+        task = Task.objects.create(title='计数任务', owner=self.user)
+        task.soft_delete(user=self.user)
+        self.assertEqual(self._counter().total_count, 0)
+
+        task.restore(user=self.user)
+        self.assertEqual(self._counter().total_count, 1)
+
+        task.hard_delete()
+        counter = self._counter()
+        self.assertEqual(counter.total_count, 0)
+        self.assertEqual(counter.pending_count, 0)
+
+    def test_owner_change_moves_counts(self):
+        """测试变更所有者时计数转移"""
+        task = Task.objects.create(title='计数任务', owner=self.user)
+        task.owner = self.other
+        task.save()
+        self.assertEqual(self._counter().total_count, 0)
+        self.assertEqual(self._counter(self.other).total_count, 1)
+
+    def test_overdue_not_maintained_on_write(self):
+        """测试逾期数不随写入增减：任务自然逾期后完成不会扣成负数，重建时按当前时间计算"""
+        task = Task.objects.create(
+            title='即将到期任务',
+            owner=self.user,
+            due_date=timezone.now() + timedelta(hours=1)
+        )
+        Task.objects.create(
+            title='已逾期任务',
+            owner=self.user,
+            due_date=timezone.now() - timedelta(days=1)
+        )
+        self.assertEqual(self._counter().overdue_count, 0)
+
+        # 两天后完成（此时任务已自然逾期，但从未计入逾期数）
+        with patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(days=2)):
+            task = Task.objects.get(pk=task.pk)
+            task.status = 'COMPLETED'
+            task.save()
+        self.assertEqual(self._counter().overdue_count, 0)
+
+        UserTaskCounter.rebuild(user_ids=[self.user.id])
+        self.assertEqual(self._counter().overdue_count, 1)
+
+    def test_missing_counter_is_rebuilt(self):
+        """测试计数器缺失时自动重建"""
+        Task.objects.create(title='任务一', owner=self.user)
+        UserTaskCounter.objects.filter(user=self.user).delete()
+        Task.objects.create(title='任务二', owner=self.user)
+        self.assertEqual(self._counter().total_count, 2)
+
+
+class ReconcileTaskCountersCommandTestCase(TestCase):
+    """计数器对账命令测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='reconcileuser',
+            email='reconcile@example.com',
+            password='testpass123'
+        )
+        Task.objects.create(title='任务一', owner=self.user, status='COMPLETED')
+        Task.objects.create(title='任务二', owner=self.user)
+
+    def test_no_drift(self):
+        """测试计数一致时无偏差"""
+        out = StringIO()
+        call_command('reconcile_task_counters', stdout=out)
+        self.assertIn('无偏差', out.getvalue())
+
+    def test_reports_and_fixes_drift(self):
+        """测试报告并修复偏差"""
+        # 绕过 save() 直接修改任务，制造偏差
+        Task.objects.filter(title='任务二').update(status='COMPLETED')
+
+        out = StringIO()
+        call_command('reconcile_task_counters', '--dry-run', stdout=out)
+        self.assertIn('completed_count: 1 -> 2', out.getvalue())
+        self.assertEqual(UserTaskCounter.objects.get(user=self.user).completed_count, 1)
+
+        out = StringIO()
+        call_command('reconcile_task_counters', '--user', 'reconcileuser', stdout=out)
+        self.assertIn('已修复 1 个用户', out.getvalue())
+        counter = UserTaskCounter.objects.get(user=self.user)
+        self.assertEqual(counter.completed_count, 2)
+        self.assertEqual(counter.pending_count, 0)
+        self.user.profile.refresh_from_db()
+        self.assertEqual(self.user.profile.completed_task_count, 2)
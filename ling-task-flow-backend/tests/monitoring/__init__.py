@@ -0,0 +1,5 @@
+"""
+监控测试模块
+
+包含请求性能采集、指标输出等运维监控相关功能的测试
+"""
@@ -0,0 +1,101 @@
+"""
+请求性能采集测试
+测试 Server-Timing 响应头中的查询数与耗时、按路由聚合的分位数，以及 /api/health/metrics/ 接口
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from LingTaskFlow.middleware import RouteMetrics, route_metrics
+from LingTaskFlow.models import Task
+
+
+def _server_timing(response):
+    """解析 Server-Timing 响应头为 {名称: (耗时, 描述)}"""
+    timings = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        values = dict(param.split('=', 1) for param in params)
+        timings[name] = (float(values['dur']), values.get('desc', '').strip('"'))
+    return timings
+
+
+class PerformanceMiddlewareTest(TestCase):
+    """请求性能采集中间件测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        route_metrics.reset()
+        self.user = User.objects.create_user(
+            username='perfuser',
+            email='perf@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for index in range(3):
+            Task.objects.create(title=f'性能任务{index}', owner=self.user)
+
+    def tearDown(self):
+        """清理测试环境"""
+        route_metrics.reset()
+
+    def test_server_timing_header(self):
+        """测试 Server-Timing 中的查询数与实际执行的查询数一致"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/tasks/')
+        timings = _server_timing(response)
+
+        self.assertEqual(set(timings), {'db', 'serialize', 'app', 'total'})
+        self.assertEqual(timings['db'][1], f'{len(queries)} queries')
+        self.assertGreater(timings['serialize'][0], 0)
+        self.assertGreaterEqual(timings['total'][0], timings['db'][0] + timings['serialize'][0])
+
+    def test_metrics_aggregated_per_route(self):
+        """测试按方法与路由名称聚合，不同任务ID的详情请求归入同一路由"""
+        for task in Task.objects.all():
+            self.client.get(f'/api/tasks/{task.id}/')
+        self.client.get('/api/tasks/')
+        self.client.get('/api/not-a-route/')
+
+        snapshot = route_metrics.snapshot()
+        self.assertEqual(snapshot['GET LingTaskFlow:task-detail']['count'], 3)
+        self.assertEqual(snapshot['GET LingTaskFlow:task-list']['count'], 1)
+        # 未匹配路由的请求不单独聚合，避免任意路径撑大统计表
+        self.assertEqual(len(snapshot), 2)
+
+    def test_metrics_endpoint_requires_admin(self):
+        """测试性能指标接口仅管理员可访问"""
+        self.assertEqual(self.client.get('/api/health/metrics/').status_code, 403)
+
+        admin = User.objects.create_superuser(username='perfadmin', password='testpass123')
+        self.client.force_authenticate(user=admin)
+        self.client.get('/api/tasks/')
+        response = self.client.get('/api/health/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        routes = response.json()['data']['routes']
+        self.assertIn('GET LingTaskFlow:task-list', routes)
+        self.assertIn('p95_ms', routes['GET LingTaskFlow:task-list'])
+
+
+class RouteMetricsTest(TestCase):
+    """路由性能聚合测试"""
+
+    def test_percentiles(self):
+        """测试分位数按最近秩法计算，且只保留最近的样本"""
+        metrics = RouteMetrics(sample_size=100)
+        for value in range(1, 201):
+            metrics.record('GET route', 500 if value == 200 else 200, value, value / 10, value % 5, 0.5)
+
+        stats = metrics.snapshot()['GET route']
+        self.assertEqual(stats['count'], 200)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['samples'], 100)
+        self.assertEqual(stats['p50_ms'], 150)
+        self.assertEqual(stats['p99_ms'], 199)
+        self.assertEqual(stats['max_ms'], 200)
+        self.assertEqual(stats['avg_queries'], 2)
+        self.assertEqual(stats['avg_serialize_ms'], 0.5)
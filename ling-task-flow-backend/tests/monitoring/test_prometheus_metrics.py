@@ -0,0 +1,196 @@
+"""
+Prometheus 指标测试
+测试文本格式导出、多进程快照合并，以及请求、缓存、登录与批量操作指标的采集
+"""
+import tempfile
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from LingTaskFlow import metrics
+from LingTaskFlow.metrics import MetricsRegistry
+from LingTaskFlow.models import Task
+
+
+def _sample(metric, **labels):
+    """读取全局注册表中某组标签的当前值（直方图返回观测次数）"""
+    value = metrics.registry.collect()[metric.name].get(metric._key(labels), 0)
+    return sum(value[:-1]) if isinstance(value, list) else value
+
+
+class MetricsRegistryTest(TestCase):
+    """指标注册表测试"""
+
+    def _registry(self, directory=None):
+        registry = MetricsRegistry(multiprocess_dir=directory)
+        counter = registry.counter('test_requests_total', '请求数', ('path',))
+        histogram = registry.histogram('test_duration_seconds', '耗时', ('path',), buckets=(0.1, 1))
+        return registry, counter, histogram
+
+    def test_text_format(self):
+        """测试计数器与累计分桶的文本格式，以及标签值转义"""
+        registry, counter, histogram = self._registry()
+        counter.inc(path='/a')
+        counter.inc(2, path='/a')
+        counter.inc(path='say "hi"\n')
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value, path='/a')
+
+        text = registry.render()
+        self.assertIn('# TYPE test_requests_total counter', text)
+        self.assertIn('test_requests_total{path="/a"} 3.0', text)
+        self.assertIn('test_requests_total{path="say \\"hi\\"\\n"} 1.0', text)
+        self.assertIn('# TYPE test_duration_seconds histogram', text)
+        self.assertIn('test_duration_seconds_bucket{path="/a",le="0.1"} 1.0', text)
+        self.assertIn('test_duration_seconds_bucket{path="/a",le="1.0"} 2.0', text)
+        self.assertIn('test_duration_seconds_bucket{path="/a",le="+Inf"} 3.0', text)
+        self.assertIn('test_duration_seconds_sum{path="/a"} 5.55', text)
+        self.assertIn('test_duration_seconds_count{path="/a"} 3.0', text)
+
+    def test_missing_label_rejected(self):
+        """测试缺少标签时报错而不是写入空标签"""
+        registry, counter, _ = self._registry()
+        with self.assertRaises(ValueError):
+            counter.inc()
+
+    def test_multiprocess_snapshots_are_merged(self):
+        """测试合并其他 worker 的快照，当前进程使用内存中的最新值"""
+        with tempfile.TemporaryDirectory() as directory:
+            worker, worker_counter, worker_histogram = self._registry(directory)
+            worker.pid = 99999
+            worker_counter.inc(5, path='/a')
+            worker_histogram.observe(0.5, path='/a')
+            worker.flush()
+
+            current, counter, histogram = self._registry(directory)
+            counter.inc(path='/a')
+            counter.inc(path='/b')
+            histogram.observe(2, path='/a')
+            current.flush()
+            counter.inc(path='/a')
+
+            text = current.render()
+        self.assertIn('test_requests_total{path="/a"} 7.0', text)
+        self.assertIn('test_requests_total{path="/b"} 1.0', text)
+        self.assertIn('test_duration_seconds_bucket{path="/a",le="1.0"} 1.0', text)
+        self.assertIn('test_duration_seconds_count{path="/a"} 2.0', text)
+
+    def test_flusher_writes_without_further_requests(self):
+        """测试定时写入线程在没有后续请求时也会写入快照，且每个进程只启动一个线程"""
+        with tempfile.TemporaryDirectory() as directory:
+            registry = MetricsRegistry(multiprocess_dir=directory, flush_interval=0.05)
+            counter = registry.counter('test_requests_total', '请求数', ('path',))
+            registry.start_flusher()
+            flusher = registry._flusher
+            registry.start_flusher()
+            self.assertIs(registry._flusher, flusher)
+
+            counter.inc(3, path='/a')
+            reader = MetricsRegistry(multiprocess_dir=directory)
+            reader.counter('test_requests_total', '请求数', ('path',))
+            flushed = None
+            deadline = time.monotonic() + 5
+            while flushed != 3 and time.monotonic() < deadline:
+                time.sleep(0.02)
+                flushed = reader.collect()['test_requests_total'].get(('/a',))
+            registry.reset()  # 更换随机串，旧的定时写入线程随之退出
+        self.assertEqual(flushed, 3)
+
+    def test_reused_pid_does_not_overwrite_snapshot(self):
+        """测试进程号相同的两个进程写入不同的快照文件"""
+        with tempfile.TemporaryDirectory() as directory:
+            dead, dead_counter, _ = self._registry(directory)
+            dead_counter.inc(5, path='/a')
+            dead.flush()
+
+            reused, reused_counter, _ = self._registry(directory)
+            self.assertEqual(reused.pid, dead.pid)
+            reused_counter.inc(path='/a')
+            reused.flush()
+
+            reader, _, _ = self._registry(directory)
+            self.assertIn('test_requests_total{path="/a"} 6.0', reader.render())
+
+    def test_reset_after_fork(self):
+        """测试重置后从零计数并使用新的进程号"""
+        registry, counter, _ = self._registry()
+        counter.inc(path='/a')
+        registry.pid = 1
+        registry.reset()
+        self.assertNotEqual(registry.pid, 1)
+        self.assertEqual(registry.collect()['test_requests_total'], {})
+
+
+class PrometheusEndpointTest(TestCase):
+    """指标采集与导出接口测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='metricsuser',
+            email='metrics@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+
+    def tearDown(self):
+        """清理测试环境"""
+        cache.clear()
+
+    def test_request_metrics_labelled_by_action(self):
+        """测试请求指标按视图与 DRF 操作打标签"""
+        self.client.force_authenticate(user=self.user)
+        labels = {'view': 'TaskViewSet', 'action': 'list', 'method': 'GET'}
+        before = _sample(metrics.HTTP_REQUESTS, status='200', **labels)
+        before_queries = _sample(metrics.DB_QUERIES, view='TaskViewSet', action='list')
+
+        self.client.get('/api/tasks/')
+        self.client.get('/api/tasks/')
+
+        self.assertEqual(_sample(metrics.HTTP_REQUESTS, status='200', **labels), before + 2)
+        self.assertEqual(_sample(metrics.DB_QUERIES, view='TaskViewSet', action='list'), before_queries + 2)
+
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn(
+            'lingtaskflow_http_request_duration_seconds_count'
+            '{view="TaskViewSet",action="list",method="GET"}',
+            response.content.decode()
+        )
+
+    def test_login_cache_and_bulk_metrics(self):
+        """测试登录结果、统计缓存命中与批量操作规模"""
+        success = _sample(metrics.LOGIN_ATTEMPTS, type='login', status='success')
+        failed = _sample(metrics.LOGIN_ATTEMPTS, type='login', status='failed')
+        self.client.post('/api/auth/login/', {'username': 'metricsuser', 'password': 'testpass123'}, format='json')
+        self.client.post('/api/auth/login/', {'username': 'metricsuser', 'password': 'wrong'}, format='json')
+        self.assertEqual(_sample(metrics.LOGIN_ATTEMPTS, type='login', status='success'), success + 1)
+        self.assertEqual(_sample(metrics.LOGIN_ATTEMPTS, type='login', status='failed'), failed + 1)
+
+        self.client.force_authenticate(user=self.user)
+        hits = _sample(metrics.CACHE_REQUESTS, cache='analytics', result='hit')
+        misses = _sample(metrics.CACHE_REQUESTS, cache='analytics', result='miss')
+        self.client.get('/api/tasks/stats/')
+        self.client.get('/api/tasks/stats/')
+        self.assertEqual(_sample(metrics.CACHE_REQUESTS, cache='analytics', result='miss'), misses + 1)
+        self.assertEqual(_sample(metrics.CACHE_REQUESTS, cache='analytics', result='hit'), hits + 1)
+
+        tasks = [Task.objects.create(title=f'指标任务{index}', owner=self.user) for index in range(3)]
+        bulk = _sample(metrics.BULK_OPERATION_SIZE, operation='complete')
+        bulk_state = metrics.registry.collect()[metrics.BULK_OPERATION_SIZE.name].get(('complete',), [0])
+        self.client.post('/api/tasks/bulk_action/', {
+            'action': 'complete', 'task_ids': [str(task.id) for task in tasks]
+        }, format='json')
+        self.assertEqual(_sample(metrics.BULK_OPERATION_SIZE, operation='complete'), bulk + 1)
+        state = metrics.registry.collect()[metrics.BULK_OPERATION_SIZE.name][('complete',)]
+        self.assertEqual(state[-1], bulk_state[-1] + 3)
+
+    def test_non_local_scrape_forbidden(self):
+        """测试非本地地址不能抓取指标"""
+        response = self.client.get('/api/metrics/', REMOTE_ADDR='203.0.113.10')
+        self.assertEqual(response.status_code, 403)
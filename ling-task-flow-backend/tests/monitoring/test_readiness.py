@@ -0,0 +1,118 @@
+"""
+就绪检查测试
+测试依赖探测的成功、失败与超时结果，探测结果缓存，以及 /api/health/ready/ 接口
+"""
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from LingTaskFlow.health import ReadinessChecker, readiness_checker
+
+
+class ReadinessCheckerTest(TestCase):
+    """就绪检查器测试"""
+
+    def test_failed_and_timed_out_probes(self):
+        """测试探测异常与超时分别报告，且不影响其他探测"""
+        release = threading.Event()
+
+        def broken():
+            raise ConnectionError('连接池已耗尽')
+
+        checker = ReadinessChecker(probes={
+            'ok': lambda: None,
+            'broken': broken,
+            'hanging': lambda: release.wait(5),
+        }, timeout=0.2, ttl=0)
+        with self.assertLogs('LingTaskFlow.health', 'WARNING'):
+            ready, result = checker.check()
+        release.set()
+
+        checks = result['checks']
+        self.assertFalse(ready)
+        self.assertEqual(checks['ok']['status'], 'ok')
+        self.assertEqual(checks['broken']['status'], 'error')
+        self.assertIn('连接池已耗尽', checks['broken']['error'])
+        self.assertEqual(checks['hanging']['status'], 'timeout')
+
+    def test_hanging_probe_not_restarted(self):
+        """测试上一次探测仍未结束时报告超时且不启动新的探测线程"""
+        release = threading.Event()
+        calls = []
+
+        def hanging():
+            calls.append(1)
+            release.wait(5)
+
+        checker = ReadinessChecker(probes={'hanging': hanging}, timeout=0.1, ttl=0)
+        with self.assertLogs('LingTaskFlow.health', 'WARNING'):
+            checker.check()
+            ready, result = checker.check()
+        self.assertFalse(ready)
+        self.assertEqual(result['checks']['hanging']['status'], 'timeout')
+        self.assertEqual(len(calls), 1)
+
+        release.set()
+        checker._pending['hanging'].result(timeout=5)
+        ready, _ = checker.check()
+        self.assertTrue(ready)
+        self.assertEqual(len(calls), 2)
+
+    def test_result_cached_for_ttl(self):
+        """测试缓存时间内不重复探测"""
+        calls = []
+        checker = ReadinessChecker(probes={'probe': lambda: calls.append(1)}, ttl=60)
+
+        self.assertFalse(checker.check()[1]['cached'])
+        self.assertTrue(checker.check()[1]['cached'])
+        self.assertEqual(len(calls), 1)
+
+        checker.check(force=True)
+        self.assertEqual(len(calls), 2)
+
+
+class ReadinessEndpointTest(TestCase):
+    """就绪检查接口测试"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.media_root = tempfile.TemporaryDirectory()
+        readiness_checker.reset()
+
+    def tearDown(self):
+        """清理测试环境"""
+        readiness_checker.reset()
+        self.media_root.cleanup()
+
+    def test_all_dependencies_ready(self):
+        """测试数据库、缓存与存储均可用时返回 200 与各依赖耗时，且不残留探测文件"""
+        with override_settings(MEDIA_ROOT=self.media_root.name):
+            response = self.client.get('/api/health/ready/')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['status'], 'ok')
+        self.assertFalse(data['cached'])
+        self.assertEqual(set(data['checks']), {'database', 'cache', 'storage'})
+        for check in data['checks'].values():
+            self.assertEqual(check['status'], 'ok')
+            self.assertGreaterEqual(check['latency_ms'], 0)
+        self.assertEqual(os.listdir(os.path.join(self.media_root.name, '.health')), [])
+
+        self.assertTrue(self.client.get('/api/health/ready/').json()['cached'])
+
+    def test_unavailable_dependency(self):
+        """测试依赖不可用时返回 503"""
+        with patch('django.core.cache.backends.locmem.LocMemCache.set', side_effect=ConnectionError('缓存不可用')), \
+                override_settings(MEDIA_ROOT=self.media_root.name), \
+                self.assertLogs('LingTaskFlow.health', 'WARNING'):
+            response = self.client.get('/api/health/ready/')
+
+        self.assertEqual(response.status_code, 503)
+        data = response.json()
+        self.assertEqual(data['status'], 'unavailable')
+        self.assertEqual(data['checks']['cache']['status'], 'error')
+        self.assertEqual(data['checks']['database']['status'], 'ok')
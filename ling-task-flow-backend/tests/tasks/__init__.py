@@ -0,0 +1,5 @@
+"""
+任务管理测试模块
+
+包含任务API（批量操作等）的测试
+"""
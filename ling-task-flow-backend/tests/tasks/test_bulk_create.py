@@ -0,0 +1,89 @@
+"""
+任务批量创建API测试
+验证批量创建的部分成功格式、智能默认值、顺序号与查询数量
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task, UserTaskCounter
+
+
+class TaskBulkCreateTestCase(TestCase):
+    """批量创建API测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='bulkcreateuser',
+            email='bulkcreate@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _post(self, payload):
+        return self.client.post('/api/tasks/', payload, format='json')
+
+    def test_bulk_create_with_partial_failure(self):
+        """测试部分数据无效时返回207并创建有效任务"""
+        response = self._post([
+            {'title': '开发登录功能', 'priority': 'HIGH'},
+            {'title': '   '},
+            {'title': '编写测试用例', 'progress': 150},
+            {'title': '整理会议纪要', 'status': 'COMPLETED'},
+        ])
+
+        self.assertEqual(response.status_code, 207)
+        data = response.data['data']
+        self.assertEqual(data['summary'], {'total': 4, 'created': 2, 'failed': 2})
+        self.assertEqual([item['index'] for item in data['failed_tasks']], [1, 2])
+
+        task = Task.objects.get(title='开发登录功能')
+        self.assertEqual(task.category, '开发')
+        self.assertEqual(task.tags, '重要, 开发')
+        self.assertEqual(float(task.estimated_hours), 4.0)
+        self.assertIsNotNone(task.start_date)
+
+        completed = Task.objects.get(title='整理会议纪要')
+        self.assertIsNotNone(completed.completed_at)
+        self.assertEqual(completed.progress, 100)
+
+    def test_bulk_create_order_and_counters(self):
+        """测试顺序号连续递增且计数器只更新一次后一致"""
+        Task.objects.create(title='已有任务', owner=self.user, order=10)
+        response = self._post([{'title': f'任务{i}'} for i in range(5)])
+
+        self.assertEqual(response.status_code, 201)
+        orders = list(Task.objects.filter(title__startswith='任务').order_by('order').values_list('order', flat=True))
+        self.assertEqual(orders, [11, 12, 13, 14, 15])
+
+        counter = UserTaskCounter.objects.get(user=self.user)
+        self.assertEqual(counter.total_count, 6)
+        self.assertEqual(counter.pending_count, 6)
+        self.assertEqual(response.data['user_stats']['total_tasks'], 6)
+        self.assertEqual(UserTaskCounter.rebuild(user_ids=[self.user.id], dry_run=True), {})
+
+    def test_bulk_create_beyond_previous_limit(self):
+        """测试批量创建超过原50个上限的任务"""
+        response = self._post([{'title': f'导入任务{i}'} for i in range(300)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 300)
+
+    def test_bulk_create_query_count_is_constant(self):
+        """测试除分批 INSERT 外，批量创建的查询数量不随任务数量增长"""
+
+        def non_insert_queries(context):
+            return [query for query in context.captured_queries if not query['sql'].startswith('INSERT')]
+
+        # 预热：首次出现的自动标签需要额外建立标签记录
+        self._post([{'title': '预热任务'}])
+
+        with CaptureQueriesContext(connection) as small:
+            self._post([{'title': f'小批量{i}'} for i in range(5)])
+        with CaptureQueriesContext(connection) as large:
+            self._post([{'title': f'大批量{i}'} for i in range(200)])
+
+        self.assertEqual(len(non_insert_queries(small)), len(non_insert_queries(large)))
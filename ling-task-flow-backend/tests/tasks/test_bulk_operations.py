@@ -0,0 +1,217 @@
+"""
+任务批量操作API测试
+验证基于集合的批量更新/操作/删除/恢复的结果格式、计数器一致性与查询数量
+"""
+import uuid
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task, TaskDailyRollup, TaskEvent, UserTaskCounter
+
+
+class TaskBulkOperationsTestCase(TestCase):
+    """批量操作API测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='bulkuser',
+            email='bulk@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='bulkother',
+            email='bulkother@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _create_tasks(self, count, owner=None, **kwargs):
+        """创建测试任务并重建计数器与每日汇总"""
+        owner = owner or self.user
+        tasks = Task.objects.bulk_create([
+            Task(title=f'批量任务{i}', owner=owner, **kwargs) for i in range(count)
+        ])
+        UserTaskCounter.rebuild(user_ids=[owner.id])
+        TaskDailyRollup.rebuild(user_ids=[owner.id])
+        return [str(task.id) for task in tasks]
+
+    def _counter(self, user=None):
+        return UserTaskCounter.objects.get(user=user or self.user)
+
+    def test_bulk_delete_beyond_previous_limit(self):
+        """测试批量删除超过原50个上限的任务"""
+        task_ids = self._create_tasks(120)
+        response = self.client.post('/api/tasks/bulk_delete/', {'task_ids': task_ids}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['stats']['successful_deletes'], 120)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 0)
+        self.assertEqual(self._counter().total_count, 0)
+
+    def test_bulk_delete_partial_failure_format(self):
+        """测试部分失败时返回207及逐项错误"""
+        own_ids = self._create_tasks(2)
+        other_ids = self._create_tasks(1, owner=self.other)
+        task_ids = own_ids + other_ids + [str(uuid.uuid4()), 'not-a-uuid']
+
+        response = self.client.post('/api/tasks/bulk_delete/', {'task_ids': task_ids}, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        data = response.data['data']
+        self.assertEqual(data['stats']['successful_deletes'], 2)
+        self.assertEqual(data['stats']['failed_deletes'], 3)
+        failed = {item['id']: item['error'] for item in data['failed_deletes']}
+        self.assertEqual(failed[other_ids[0]], '任务不存在或已被删除')
+        self.assertEqual(failed['not-a-uuid'], '无效的任务ID')
+        self.assertEqual(Task.objects.filter(owner=self.other).count(), 1)
+
+    def test_bulk_delete_query_count_is_constant(self):
+        """测试批量删除的查询数量不随任务数量增长"""
+        small_ids = self._create_tasks(5)
+        # 任务事件按批 bulk_create，SQLite 单条语句的参数上限使每批最多约 160 行
+        large_ids = self._create_tasks(150)
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post('/api/tasks/bulk_delete/', {'task_ids': small_ids}, format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post('/api/tasks/bulk_delete/', {'task_ids': large_ids}, format='json')
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_bulk_restore(self):
+        """测试批量恢复"""
+        task_ids = self._create_tasks(3)
+        self.client.post('/api/tasks/bulk_delete/', {'task_ids': task_ids}, format='json')
+
+        response = self.client.post('/api/tasks/bulk_restore/', {'task_ids': task_ids + [task_ids[0]]},
+                                    format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['data']['stats']['successful_restores'], 3)
+        self.assertEqual(response.data['data']['failed_restores'][0]['error'], '任务不存在或未被删除')
+        self.assertEqual(self._counter().total_count, 3)
+
+    def test_bulk_action_update_priority_and_assign(self):
+        """测试批量修改优先级与分配"""
+        task_ids = self._create_tasks(60, priority='LOW')
+
+        response = self.client.post('/api/tasks/bulk_action/', {
+            'action': 'update_priority', 'task_ids': task_ids, 'priority': 'URGENT'
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.filter(priority='URGENT').count(), 60)
+        counter = self._counter()
+        self.assertEqual(counter.urgent_priority_count, 60)
+        self.assertEqual(counter.low_priority_count, 0)
+
+        response = self.client.post('/api/tasks/bulk_action/', {
+            'action': 'assign', 'task_ids': task_ids, 'assigned_to': self.other.id
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Task.objects.filter(assigned_to=self.other).count(), 60)
+
+    def test_bulk_action_update_status(self):
+        """测试批量更新状态（含非法状态转换）"""
+        task_ids = self._create_tasks(2, status='IN_PROGRESS')
+        pending_ids = self._create_tasks(1, status='PENDING')
+
+        response = self.client.post('/api/tasks/bulk_action/', {
+            'action': 'update_status', 'task_ids': task_ids + pending_ids, 'status': 'COMPLETED'
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        completed = Task.objects.filter(status='COMPLETED')
+        self.assertEqual(completed.count(), 3)
+        self.assertTrue(all(task.completed_at and task.progress == 100 for task in completed))
+        self.assertEqual(self._counter().completed_count, 3)
+        self.assertEqual(response.data['data']['successful_items'][0]['data']['status'], 'COMPLETED')
+
+    def test_bulk_action_delete_checks_delete_permission(self):
+        """测试批量操作的删除使用删除权限检查"""
+        task_ids = self._create_tasks(2)
+        with patch.object(Task, 'can_delete', return_value=False), \
+                patch.object(Task, 'can_edit', return_value=True):
+            response = self.client.post('/api/tasks/bulk_action/', {
+                'action': 'delete', 'task_ids': task_ids
+            }, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['data']['stats']['failed'], 2)
+        self.assertEqual(response.data['data']['failed_items'][0]['error'], '没有权限删除此任务')
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 2)
+
+    def test_bulk_update(self):
+        """测试批量更新（含状态转换校验失败）"""
+        task_ids = self._create_tasks(3, status='PENDING')
+        updates = [
+            {'id': task_ids[0], 'title': '新标题', 'priority': 'HIGH'},
+            {'id': task_ids[1], 'status': 'IN_PROGRESS', 'progress': 30},
+            {'id': task_ids[2], 'status': 'COMPLETED'},  # 待处理不能直接完成
+            {'title': '缺少ID'},
+        ]
+
+        response = self.client.patch('/api/tasks/bulk_update/', {'updates': updates}, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        data = response.data['data']
+        self.assertEqual(data['stats']['successful_updates'], 2)
+        self.assertEqual(data['stats']['failed_updates'], 2)
+        self.assertEqual(Task.objects.get(id=task_ids[0]).title, '新标题')
+        self.assertEqual(Task.objects.get(id=task_ids[1]).progress, 30)
+        counter = self._counter()
+        self.assertEqual(counter.high_priority_count, 1)
+        self.assertEqual(counter.in_progress_count, 1)
+        self.assertEqual(counter.pending_count, 2)
+
+
+class TaskAdminActionsTestCase(TestCase):
+    """后台批量状态操作测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.admin = User.objects.create_superuser(
+            username='adminuser',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.user = User.objects.create_user(
+            username='adminowner',
+            email='adminowner@example.com',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+
+    def _run_action(self, action, tasks):
+        return self.client.post('/admin/LingTaskFlow/task/', {
+            'action': action, '_selected_action': [str(task.id) for task in tasks]
+        })
+
+    def test_status_actions_maintain_counters_and_events(self):
+        """测试后台标记完成/待处理同步维护计数器、完成字段与任务事件"""
+        tasks = [Task.objects.create(title=f'后台任务{i}', owner=self.user, status='IN_PROGRESS')
+                 for i in range(2)]
+
+        response = self._run_action('mark_as_completed', tasks)
+        self.assertEqual(response.status_code, 302)
+        counter = UserTaskCounter.objects.get(user=self.user)
+        self.assertEqual(counter.completed_count, 2)
+        self.assertEqual(counter.in_progress_count, 0)
+        for task in Task.objects.filter(owner=self.user):
+            self.assertEqual(task.progress, 100)
+            self.assertIsNotNone(task.completed_at)
+        events = TaskEvent.objects.filter(event_type=TaskEvent.STATUS_CHANGED, to_value='COMPLETED')
+        self.assertEqual(events.count(), 2)
+        self.assertTrue(all(event.actor_id == self.admin.id for event in events))
+
+        self._run_action('mark_as_pending', tasks)
+        counter = UserTaskCounter.objects.get(user=self.user)
+        self.assertEqual(counter.completed_count, 0)
+        self.assertEqual(counter.pending_count, 2)
+        self.assertFalse(Task.objects.filter(owner=self.user, completed_at__isnull=False).exists())
@@ -0,0 +1,145 @@
+"""
+任务游标分页测试
+验证列表、回收站与高级搜索的 ?pagination=cursor 模式
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task
+
+
+class TaskCursorPaginationTestCase(TestCase):
+    """任务游标分页测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='cursoruser',
+            email='cursor@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        base = timezone.now() - timedelta(days=1)
+        self.tasks = []
+        for i in range(25):
+            task = Task.objects.create(title=f'游标任务{i:02d}', owner=self.user)
+            self.tasks.append(task)
+        # 两两共享创建时间，验证相同排序值时翻页不重复、不遗漏
+        for i, task in enumerate(self.tasks):
+            Task.all_objects.filter(pk=task.pk).update(created_at=base + timedelta(minutes=i // 2))
+
+    def _collect(self, url):
+        """沿 next_cursor 翻完所有页，返回任务ID列表"""
+        ids, cursor = [], None
+        while True:
+            response = self.client.get(url, {'cursor': cursor} if cursor else {})
+            self.assertEqual(response.status_code, 200)
+            pagination = response.data['meta']['pagination']
+            self.assertEqual(pagination['mode'], 'cursor')
+            self.assertNotIn('total_count', pagination)
+            ids.extend(item['id'] for item in response.data['data'])
+            cursor = pagination['next_cursor']
+            if not pagination['has_next']:
+                self.assertIsNone(cursor)
+                return ids
+
+    def test_list_cursor_pages(self):
+        """测试游标翻页覆盖全部任务且顺序与 -created_at 一致"""
+        ids = self._collect('/api/tasks/?pagination=cursor&page_size=4')
+
+        expected = [
+            str(pk) for pk in Task.objects.filter(owner=self.user).order_by('-created_at', '-pk').values_list('pk', flat=True)
+        ]
+        self.assertEqual(ids, expected)
+
+    def test_list_cursor_previous(self):
+        """测试通过 previous_cursor 返回上一页"""
+        first = self.client.get('/api/tasks/?pagination=cursor&page_size=5')
+        second = self.client.get('/api/tasks/', {
+            'cursor': first.data['meta']['pagination']['next_cursor'], 'page_size': 5
+        })
+        self.assertTrue(second.data['meta']['pagination']['has_previous'])
+
+        back = self.client.get('/api/tasks/', {
+            'cursor': second.data['meta']['pagination']['previous_cursor'], 'page_size': 5
+        })
+        self.assertEqual(
+            [item['id'] for item in back.data['data']],
+            [item['id'] for item in first.data['data']]
+        )
+
+    def test_list_cursor_avoids_count_and_offset(self):
+        """测试游标分页查询不包含 OFFSET，分页本身不执行 COUNT"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/tasks/?pagination=cursor&page_size=5')
+        self.assertEqual(response.status_code, 200)
+
+        page_queries = [q['sql'] for q in context.captured_queries if 'LIMIT' in q['sql'].upper()]
+        self.assertTrue(page_queries)
+        for sql in page_queries:
+            self.assertNotIn('OFFSET', sql.upper())
+
+    def test_cursor_ordering_on_indexed_column(self):
+        """测试游标模式仅允许按索引列排序"""
+        response = self.client.get('/api/tasks/?pagination=cursor&ordering=updated_at')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['meta']['pagination']['ordering'], 'updated_at')
+
+        response = self.client.get('/api/tasks/?pagination=cursor&ordering=title')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.data['success'])
+
+    def test_page_number_mode_unchanged(self):
+        """测试默认仍为页码分页"""
+        response = self.client.get('/api/tasks/?page_size=10')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['meta']['pagination']['total_count'], 25)
+
+    def test_trash_cursor_pages(self):
+        """测试回收站游标分页按删除时间排序"""
+        for task in self.tasks[:7]:
+            task.soft_delete(user=self.user)
+
+        ids, cursor = [], None
+        while True:
+            params = {'pagination': 'cursor', 'page_size': 3}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get('/api/tasks/trash/', params)
+            self.assertEqual(response.status_code, 200)
+            pagination = response.data['data']['meta']['pagination']
+            self.assertEqual(pagination['ordering'], '-deleted_at')
+            ids.extend(item['id'] for item in response.data['data']['data'])
+            cursor = pagination['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(sorted(ids), sorted(str(task.pk) for task in self.tasks[:7]))
+
+    def test_advanced_search_cursor_pages(self):
+        """测试高级搜索游标分页，统计只在首页计算"""
+        first = self.client.get('/api/tasks/search/', {'pagination': 'cursor', 'page_size': 20, 'q': '游标'})
+        self.assertEqual(first.status_code, 200)
+        data = first.data['data']
+        self.assertEqual(len(data['results']), 20)
+        self.assertEqual(data['stats']['total_found'], 25)
+
+        second = self.client.get('/api/tasks/search/', {
+            'pagination': 'cursor', 'page_size': 20, 'q': '游标',
+            'cursor': data['pagination']['next_cursor']
+        })
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.data['data']['results']), 5)
+        self.assertIsNone(second.data['data']['stats'])
+        self.assertFalse(second.data['data']['pagination']['has_next'])
+
+        response = self.client.get('/api/tasks/search/', {'pagination': 'cursor', 'sort': 'title'})
+        self.assertEqual(response.status_code, 400)
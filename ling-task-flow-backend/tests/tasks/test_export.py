@@ -0,0 +1,82 @@
+"""
+任务流式导出API测试
+验证 CSV / NDJSON 导出内容、过滤参数与流式响应
+"""
+import csv
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task
+
+
+class TaskExportTestCase(TestCase):
+    """任务导出API测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='exportuser',
+            email='export@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='exportother',
+            email='exportother@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        Task.objects.create(title='导出任务, 含逗号', owner=self.user, status='PENDING', priority='HIGH',
+                            tags='后端, 导出')
+        Task.objects.create(title='已完成任务', owner=self.user, status='COMPLETED')
+        Task.objects.create(title='分配给我的任务', owner=self.other, assigned_to=self.user)
+        Task.objects.create(title='他人任务', owner=self.other)
+
+    def _content(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_csv(self):
+        """测试导出CSV"""
+        response = self.client.get('/api/tasks/export/', {'format': 'csv'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment; filename="tasks-', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(io.StringIO(self._content(response).lstrip('\ufeff'))))
+        self.assertEqual(len(rows), 3)
+        titles = {row['title'] for row in rows}
+        self.assertIn('导出任务, 含逗号', titles)
+        self.assertNotIn('他人任务', titles)
+        assigned = next(row for row in rows if row['title'] == '分配给我的任务')
+        self.assertEqual(assigned['owner'], 'exportother')
+        self.assertEqual(assigned['assigned_to'], 'exportuser')
+
+    def test_export_ndjson_with_filter(self):
+        """测试导出NDJSON并应用过滤参数"""
+        response = self.client.get('/api/tasks/export/', {'format': 'ndjson', 'status': 'COMPLETED'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['title'], '已完成任务')
+        self.assertEqual(rows[0]['status'], 'COMPLETED')
+
+    def test_export_invalid_format(self):
+        """测试不支持的导出格式"""
+        response = self.client.get('/api/tasks/export/', {'format': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'invalid_format')
+
+    def test_export_requires_authentication(self):
+        """测试未认证用户无法导出"""
+        self.client.force_authenticate(user=None)
+        response = self.client.get('/api/tasks/export/', {'format': 'csv'})
+        self.assertEqual(response.status_code, 401)
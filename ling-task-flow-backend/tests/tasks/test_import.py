@@ -0,0 +1,178 @@
+"""
+任务流式导入API测试
+验证 CSV / NDJSON 导入、逐行验证错误、分块写入与作业状态查询
+"""
+import json
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.imports import TaskImporter
+from LingTaskFlow.models import Task, TaskImportJob, UserTaskCounter
+
+TEMP_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(TASK_IMPORT_ASYNC=False, MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class TaskImportTestCase(TestCase):
+    """任务导入API测试"""
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='importuser',
+            email='import@example.com',
+            password='testpass123'
+        )
+        self.assignee = User.objects.create_user(
+            username='importassignee',
+            email='importassignee@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _upload(self, name, content, **extra):
+        upload = SimpleUploadedFile(name, content.encode('utf-8'))
+        return self.client.post('/api/tasks/import/', {'file': upload, **extra}, format='multipart')
+
+    def test_import_csv(self):
+        """测试导入CSV（含导出文件中的多余列与用户名形式的执行者）"""
+        content = (
+            '\ufeffid,title,status,priority,progress,assigned_to,owner\n'
+            'x,开发导入功能,PENDING,HIGH,10,importassignee,someone\n'
+            'x,,PENDING,LOW,0,,\n'
+            'x,编写导入文档,,,,,\n'
+        )
+        response = self._upload('tasks.csv', content)
+
+        self.assertEqual(response.status_code, 202)
+        data = response.data['data']
+        self.assertEqual(data['status'], 'COMPLETED')
+        self.assertEqual(data['rows_processed'], 3)
+        self.assertEqual(data['rows_created'], 2)
+        self.assertEqual(data['rows_failed'], 1)
+        self.assertEqual(data['errors'][0]['row'], 3)
+
+        task = Task.objects.get(title='开发导入功能')
+        self.assertEqual(task.owner, self.user)
+        self.assertEqual(task.assigned_to, self.assignee)
+        self.assertEqual(task.priority, 'HIGH')
+        self.assertEqual(Task.objects.get(title='编写导入文档').category, '文档')
+        self.assertEqual(UserTaskCounter.objects.get(user=self.user).total_count, 2)
+
+    def test_import_ndjson_and_status(self):
+        """测试导入NDJSON并查询作业状态"""
+        lines = [json.dumps({'title': f'导入任务{i}', 'progress': 5}) for i in range(7)]
+        lines.insert(3, '{invalid json')
+        response = self._upload('tasks.ndjson', '\n'.join(lines) + '\n')
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.data['data']['id']
+
+        response = self.client.get(f'/api/tasks/import/{job_id}/')
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(data['rows_created'], 7)
+        self.assertEqual(data['rows_failed'], 1)
+        self.assertIn('JSON解析失败', data['errors'][0]['error'])
+
+    def test_import_writes_in_chunks(self):
+        """测试按块写入时作业进度累加正确"""
+        content = 'title\n' + ''.join(f'分块任务{i}\n' for i in range(25))
+        job = TaskImportJob.objects.create(
+            user=self.user,
+            file=SimpleUploadedFile('chunks.csv', content.encode('utf-8')),
+            file_name='chunks.csv',
+            file_format='csv'
+        )
+        job = TaskImporter(job, chunk_size=10).run()
+
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertEqual(job.rows_processed, 25)
+        self.assertEqual(job.rows_created, 25)
+        orders = sorted(Task.objects.filter(owner=self.user).values_list('order', flat=True))
+        self.assertEqual(orders, list(range(1, 26)))
+
+    def test_import_invalid_requests(self):
+        """测试缺少文件与不支持的格式"""
+        response = self.client.post('/api/tasks/import/', {}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'missing_file')
+
+        response = self._upload('tasks.xlsx', 'title\n')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'invalid_format')
+
+    def test_import_status_of_other_user(self):
+        """测试无法查询他人的导入作业"""
+        job = TaskImportJob.objects.create(
+            user=self.assignee,
+            file=SimpleUploadedFile('other.csv', b'title\n'),
+            file_name='other.csv',
+            file_format='csv'
+        )
+        response = self.client.get(f'/api/tasks/import/{job.id}/')
+        self.assertEqual(response.status_code, 404)
+
+    def _create_job(self, name, content):
+        return TaskImportJob.objects.create(
+            user=self.user,
+            file=SimpleUploadedFile(name, content.encode('utf-8')),
+            file_name=name,
+            file_format='csv'
+        )
+
+    def test_import_file_deleted_and_job_run_once(self):
+        """测试作业结束后删除上传文件，且已结束的作业不会被重复执行"""
+        job = self._create_job('once.csv', 'title\n单次任务\n')
+        path = job.file.path
+        self.assertTrue(os.path.exists(path))
+
+        job = TaskImporter(job).run()
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(job.file)
+
+        TaskImporter(job).run()
+        self.assertEqual(Task.objects.filter(title='单次任务').count(), 1)
+
+    def test_stale_running_job_marked_failed(self):
+        """测试执行进程中断（长时间没有进度）的作业在查询状态时标记为失败"""
+        job = self._create_job('stale.csv', 'title\n中断任务\n')
+        path = job.file.path
+        started = timezone.now() - timedelta(hours=1)
+        TaskImportJob.objects.filter(pk=job.pk).update(status='RUNNING', started_at=started, progress_at=started)
+
+        response = self.client.get(f'/api/tasks/import/{job.id}/')
+        self.assertEqual(response.data['data']['status'], 'FAILED')
+        self.assertIn('导入进程中断', response.data['data']['error_message'])
+        self.assertFalse(os.path.exists(path))
+
+    @override_settings(TASK_IMPORT_WORKER=True)
+    def test_worker_command_runs_pending_jobs(self):
+        """测试 worker 模式下作业保持等待中，由 run_import_jobs 命令领取执行"""
+        response = self._upload('worker.csv', 'title\n队列任务\n')
+        self.assertEqual(response.data['data']['status'], 'PENDING')
+
+        out = StringIO()
+        call_command('run_import_jobs', '--once', stdout=out)
+        self.assertIn('已执行 1 个导入作业', out.getvalue())
+        job = TaskImportJob.objects.get(pk=response.data['data']['id'])
+        self.assertEqual(job.status, 'COMPLETED')
+        self.assertTrue(Task.objects.filter(title='队列任务').exists())
+
@@ -0,0 +1,87 @@
+"""
+任务列表快速路径测试
+验证 values() 投影渲染的数据与 TaskListSerializer 完全一致，且查询数与页大小无关
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task
+from LingTaskFlow.serializers import TaskListSerializer
+
+
+class TaskListFastPathTestCase(TestCase):
+    """任务列表 values() 快速路径测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='fastuser',
+            email='fast@example.com',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='fastother',
+            email='fastother@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        now = timezone.now()
+        Task.objects.create(title='未分配无截止', owner=self.user, description='')
+        Task.objects.create(title='已分配将到期', owner=self.user, assigned_to=self.other,
+                            priority='URGENT', due_date=now + timedelta(days=2, hours=3))
+        Task.objects.create(title='即将到期', owner=self.user, due_date=now + timedelta(minutes=45),
+                            tags='前端, 测试', category='开发')
+        Task.objects.create(title='已逾期', owner=self.user, status='IN_PROGRESS',
+                            due_date=now - timedelta(days=1))
+        Task.objects.create(title='已完成逾期', owner=self.user, status='COMPLETED',
+                            due_date=now - timedelta(days=1))
+        Task.objects.create(title='他人分配给我', owner=self.other, assigned_to=self.user, priority='HIGH')
+        deleted = Task.objects.create(title='已删除', owner=self.user)
+        deleted.soft_delete(user=self.user)
+
+    def test_identical_output(self):
+        """测试快速路径与序列化器输出的 JSON 完全一致（含字段顺序）"""
+        queryset = Task.all_objects.visible_to(self.user).order_by('-created_at')
+        frozen_now = timezone.now()
+        with patch('django.utils.timezone.now', return_value=frozen_now):
+            expected = JSONRenderer().render(TaskListSerializer(queryset, many=True).data)
+            actual = JSONRenderer().render(
+                TaskListSerializer.render_values(TaskListSerializer.values_queryset(queryset))
+            )
+        self.assertEqual(len(json.loads(actual)), 7)
+        self.assertEqual(actual, expected)
+
+    def test_list_query_count_independent_of_page_size(self):
+        """测试列表接口的查询数不随页大小增长"""
+        for index in range(30):
+            Task.objects.create(title=f'批量任务{index}', owner=self.user, assigned_to=self.other)
+
+        def count_queries(page_size):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/tasks/', {'page_size': page_size, 'stats': 'none'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['data']), min(page_size, 36))
+            return len(queries)
+
+        self.assertEqual(count_queries(5), count_queries(50))
+
+    def test_benchmark_command(self):
+        """测试基准命令输出各页大小的吞吐对比"""
+        out = StringIO()
+        call_command('benchmark_task_list', '--page-sizes', '5,20', '--repeat', '1', stdout=out)
+        self.assertIn('每页     5', out.getvalue())
+        self.assertIn('每页    20', out.getvalue())
+        self.assertEqual(Task.all_objects.count(), 7)
@@ -0,0 +1,108 @@
+"""
+任务列表统计测试
+验证 stats=none|summary|full 参数、单查询统计与翻页时的统计缓存
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task
+
+
+class TaskListStatsTestCase(TestCase):
+    """任务列表统计测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='liststatsuser',
+            email='liststats@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        for i in range(6):
+            Task.objects.create(title=f'待处理{i}', owner=self.user, priority='HIGH', category='开发')
+        for i in range(3):
+            Task.objects.create(title=f'已完成{i}', owner=self.user, status='COMPLETED', category='测试')
+        Task.objects.create(
+            title='逾期任务', owner=self.user, status='IN_PROGRESS',
+            due_date=timezone.now() - timedelta(days=2)
+        )
+
+    def _query_count(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response
+
+    def test_full_stats(self):
+        """测试默认完整统计与原有结构一致"""
+        response = self.client.get('/api/tasks/')
+        stats = response.data['stats']
+
+        self.assertEqual(stats['total'], 10)
+        self.assertEqual(stats['by_status'], {'PENDING': 6, 'COMPLETED': 3, 'IN_PROGRESS': 1})
+        self.assertEqual(stats['by_priority'], {'HIGH': 6, 'MEDIUM': 4})
+        self.assertEqual(stats['overdue_count'], 1)
+        self.assertEqual(stats['completed_count'], 3)
+
+    def test_summary_and_none(self):
+        """测试汇总统计与不计算统计"""
+        response = self.client.get('/api/tasks/?stats=summary&category=测试')
+        self.assertEqual(response.data['stats'], {'total': 3, 'overdue_count': 0, 'completed_count': 3})
+
+        response = self.client.get('/api/tasks/?stats=none')
+        self.assertNotIn('stats', response.data)
+        self.assertEqual(len(response.data['data']), 10)
+
+    def test_stats_use_single_query(self):
+        """测试 summary 与 full 统计各只增加一条查询"""
+        base, _ = self._query_count('/api/tasks/?stats=none')
+        summary, _ = self._query_count('/api/tasks/?stats=summary')
+        full, _ = self._query_count('/api/tasks/?stats=full')
+
+        self.assertEqual(summary - base, 1)
+        self.assertEqual(full - base, 1)
+
+    def test_later_pages_reuse_first_page_stats(self):
+        """测试同一过滤条件翻页时复用第一页的统计"""
+        self.client.get('/api/tasks/?page_size=4&category=开发')
+
+        base, _ = self._query_count('/api/tasks/?stats=none&page=2&page_size=4&category=开发')
+        queries, response = self._query_count('/api/tasks/?page=2&page_size=4&category=开发')
+        self.assertEqual(queries, base)
+        self.assertEqual(response.data['stats']['total'], 6)
+
+        # 不同过滤条件不共享缓存
+        response = self.client.get('/api/tasks/?page=2&page_size=2&category=测试')
+        self.assertEqual(response.data['stats']['total'], 3)
+
+    def test_later_pages_recompute_after_write(self):
+        """测试任务写入后翻页不再复用写入前的统计"""
+        self.client.get('/api/tasks/?page_size=4&category=开发')
+        Task.objects.create(title='新增任务', owner=self.user, category='开发')
+
+        base, _ = self._query_count('/api/tasks/?stats=none&page=2&page_size=4&category=开发')
+        queries, response = self._query_count('/api/tasks/?page=2&page_size=4&category=开发')
+        self.assertEqual(queries, base + 1)
+        self.assertEqual(response.data['stats']['total'], 7)
+
+        # 重新计算的结果供后续翻页复用
+        queries, response = self._query_count('/api/tasks/?page=2&page_size=4&category=开发')
+        self.assertEqual(queries, base)
+        self.assertEqual(response.data['stats']['total'], 7)
+
+    def test_invalid_stats_level(self):
+        """测试不支持的统计级别"""
+        response = self.client.get('/api/tasks/?stats=all')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'invalid_stats')
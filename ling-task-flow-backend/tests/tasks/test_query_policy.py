@@ -0,0 +1,97 @@
+"""
+任务接口查询优化测试
+验证各操作的 select_related / defer 策略，并以 N+1 检测断言查询数不随数据规模增长
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task
+from tests.utils.test_helpers import QueryCountGuardMixin
+
+
+class TaskQueryPolicyTestCase(QueryCountGuardMixin, TestCase):
+    """任务接口 N+1 检测"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='policyuser',
+            email='policy@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        # 每个任务分配给不同的用户，逐行加载关联用户时查询数会随页大小增长
+        self.tasks = []
+        for index in range(12):
+            assignee = User.objects.create_user(username=f'policy_assignee{index}')
+            self.tasks.append(Task.objects.create(
+                title=f'策略任务{index}', owner=self.user, assigned_to=assignee, notes='备注'
+            ))
+
+    def _get(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content[:300])
+        return response
+
+    def test_list_endpoints(self):
+        """测试列表、高级搜索（页码与游标分页）的查询数与页大小无关"""
+        self.assertQueryCountConstant(lambda size: self._get('/api/tasks/', page_size=size))
+        self.assertQueryCountConstant(lambda size: self._get('/api/tasks/search/', page_size=size))
+        self.assertQueryCountConstant(
+            lambda size: self._get('/api/tasks/search/', page_size=size, pagination='cursor')
+        )
+
+    def test_trash(self):
+        """测试回收站的查询数与页大小无关"""
+        for task in self.tasks:
+            task.soft_delete(user=self.user)
+
+        self.assertQueryCountConstant(lambda size: self._get('/api/tasks/trash/', page_size=size))
+        self.assertQueryCountConstant(
+            lambda size: self._get('/api/tasks/trash/', page_size=size, pagination='cursor')
+        )
+
+    def test_bulk_update(self):
+        """测试批量更新的查询数与任务数量无关"""
+        def bulk_update(size):
+            response = self.client.patch('/api/tasks/bulk_update/', {
+                'updates': [{'id': str(task.id), 'progress': size} for task in self.tasks[:size]]
+            }, format='json')
+            self.assertEqual(response.status_code, 200)
+
+        self.assertQueryCountConstant(bulk_update)
+
+    def test_detail_does_not_load_users_separately(self):
+        """测试详情、更新与恢复在同一查询中取出所有者与执行者"""
+        task = self.tasks[0]
+
+        def user_queries(method, url, data=None):
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(self.client, method)(url, data, format='json')
+            self.assertLess(response.status_code, 300)
+            return [query['sql'] for query in queries.captured_queries
+                    if query['sql'].startswith('SELECT') and 'FROM "auth_user"' in query['sql']]
+
+        self.assertEqual(user_queries('get', f'/api/tasks/{task.id}/'), [])
+        self.assertEqual(user_queries('patch', f'/api/tasks/{task.id}/', {'title': '新标题'}), [])
+
+        task.soft_delete(user=self.user)
+        self.assertEqual(user_queries('post', f'/api/tasks/{task.id}/restore/'), [])
+
+    def test_list_policy_defers_unused_fields(self):
+        """测试列表类操作跳过序列化器不输出的大字段"""
+        for task in self.tasks:
+            task.soft_delete(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self._get('/api/tasks/trash/')
+        task_selects = [query['sql'] for query in queries.captured_queries
+                        if query['sql'].startswith('SELECT') and 'FROM "tasks"' in query['sql']
+                        and '"auth_user"' in query['sql']]
+        self.assertTrue(task_selects)
+        self.assertTrue(all('"tasks"."notes"' not in sql for sql in task_selects))
@@ -0,0 +1,133 @@
+"""
+任务全文搜索测试
+验证 SQLite FTS5 搜索后端的排序、高亮、索引同步，以及 /api/tasks/search/ 响应
+"""
+import unittest
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from LingTaskFlow.models import Task
+from LingTaskFlow.search import get_search_backend
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', '仅适用于SQLite')
+class SqliteFTSSearchTestCase(TestCase):
+    """SQLite FTS5 搜索后端测试"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.user = User.objects.create_user(
+            username='searchuser',
+            email='search@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.title_match = Task.objects.create(
+            title='实现数据导入功能', description='支持CSV文件', owner=self.user, category='开发'
+        )
+        self.description_match = Task.objects.create(
+            title='整理需求', description='梳理数据导入功能的边界条件和错误处理', owner=self.user
+        )
+        self.unrelated = Task.objects.create(title='部署服务', description='上线前检查', owner=self.user)
+
+    def _search(self, **params):
+        response = self.client.get('/api/tasks/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_backend_selected(self):
+        """测试SQLite下自动选择FTS5后端"""
+        self.assertEqual(get_search_backend().name, 'sqlite_fts')
+
+    def test_ranked_results_with_highlights(self):
+        """测试按相关度排序（标题命中优先）并返回高亮片段"""
+        data = self._search(q='导入功能')
+
+        ids = [item['id'] for item in data['results']]
+        self.assertEqual(ids, [str(self.title_match.pk), str(self.description_match.pk)])
+        self.assertEqual(data['search_params']['sort'], 'relevance')
+        self.assertEqual(data['stats']['total_found'], 2)
+
+        first, second = data['results']
+        self.assertGreater(first['search_rank'], second['search_rank'])
+        self.assertEqual(first['highlight']['title'], '实现数据<mark>导入功能</mark>')
+        self.assertIn('<mark>导入功能</mark>', second['highlight']['description'])
+
+    def test_multiple_terms_and_short_terms(self):
+        """测试多个关键词需全部匹配，短于3个字符的词项回退为 icontains"""
+        data = self._search(q='导入功能 边界条件')
+        self.assertEqual([item['id'] for item in data['results']], [str(self.description_match.pk)])
+
+        data = self._search(q='部署')
+        self.assertEqual([item['id'] for item in data['results']], [str(self.unrelated.pk)])
+        self.assertEqual(data['results'][0]['highlight']['title'], '<mark>部署</mark>服务')
+
+    def test_highlight_escapes_html(self):
+        """测试高亮片段对任务内容进行HTML转义"""
+        Task.objects.create(title='<script>导入功能</script>', owner=self.user)
+        data = self._search(q='导入功能', sort='created_at')
+
+        self.assertEqual(
+            data['results'][0]['highlight']['title'],
+            '&lt;script&gt;<mark>导入功能</mark>&lt;/script&gt;'
+        )
+
+    def test_index_follows_writes(self):
+        """测试保存、批量创建、批量更新与永久删除后索引保持同步"""
+        self.unrelated.title = '部署导入服务'
+        self.unrelated.save()
+        self.assertEqual(self._search(q='部署导入服务')['stats']['total_found'], 1)
+
+        self.client.post('/api/tasks/', [{'title': '批量导入任务一'}, {'title': '批量导入任务二'}], format='json')
+        self.assertEqual(self._search(q='批量导入')['stats']['total_found'], 2)
+
+        response = self.client.patch('/api/tasks/bulk_update/', {
+            'updates': [{'id': str(self.title_match.pk), 'category': '迁移工具'}]
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._search(q='迁移工具')['stats']['total_found'], 1)
+
+        self.description_match.hard_delete()
+        self.assertEqual(self._search(q='边界条件')['stats']['total_found'], 0)
+
+    def test_list_search_uses_backend(self):
+        """测试任务列表的 search 参数使用搜索后端"""
+        response = self.client.get('/api/tasks/', {'search': '导入功能 CSV'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['id'] for item in response.data['data']], [str(self.title_match.pk)])
+
+    def test_include_deleted_keeps_filters(self):
+        """测试包含已删除任务时仍应用搜索条件"""
+        self.description_match.soft_delete(user=self.user)
+
+        self.assertEqual(self._search(q='导入功能')['stats']['total_found'], 1)
+        data = self._search(q='导入功能', include_deleted='true')
+        self.assertEqual(data['stats']['total_found'], 2)
+
+    def test_rebuild_command(self):
+        """测试重建搜索索引命令"""
+        with connection.cursor() as cursor:
+            cursor.execute('DELETE FROM task_search_fts')
+        self.assertEqual(self._search(q='导入功能')['stats']['total_found'], 0)
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('共 3 个任务', out.getvalue())
+        self.assertEqual(self._search(q='导入功能')['stats']['total_found'], 2)
+
+    @override_settings(TASK_SEARCH_BACKEND='basic')
+    def test_basic_backend(self):
+        """测试 icontains 回退后端返回相同的响应结构"""
+        data = self._search(q='导入功能')
+
+        self.assertEqual(data['stats']['total_found'], 2)
+        self.assertEqual(data['results'][0]['search_rank'], 0.0)
+        titles = {item['highlight']['title'] for item in data['results']}
+        self.assertIn('实现数据<mark>导入功能</mark>', titles)
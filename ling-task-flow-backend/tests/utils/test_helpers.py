@@ -4,11 +4,15 @@
 提供测试中常用的辅助函数和工具类
 """
 import os
+import re
 import sys
+from collections import Counter
 
 import django
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase, APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
@@ -178,6 +182,44 @@ class BaseAPITestCase(APITestCase):
         )
 
 
+class QueryCountGuardMixin:
+    """
+    N+1 查询检测
+
+    以不同的数据规模（页大小、批量条数等）各执行一次请求，断言查询数不随规模增长；
+    失败时列出重复次数最多的 SQL 模板，便于定位逐行加载的关联对象
+    """
+
+    @staticmethod
+    def _normalize_sql(sql):
+        """去掉 SQL 中的字面量，只保留查询模板"""
+        sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+        return re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+
+    def assertQueryCountConstant(self, request_for_size, sizes=(2, 10)):
+        """
+        断言查询数与数据规模无关
+
+        Args:
+            request_for_size: 接收规模参数并执行一次请求的函数
+            sizes: 依次尝试的规模（数据需足够覆盖最大规模）
+        """
+        counts = {}
+        templates = {}
+        for size in sizes:
+            with CaptureQueriesContext(connection) as queries:
+                request_for_size(size)
+            counts[size] = len(queries)
+            templates[size] = Counter(self._normalize_sql(query['sql']) for query in queries.captured_queries)
+
+        if len(set(counts.values())) > 1:
+            largest = max(sizes)
+            repeated = '\n'.join(
+                f'  {count}x {sql[:200]}' for sql, count in templates[largest].most_common(3)
+            )
+            self.fail(f'查询数随规模增长（疑似 N+1）: {counts}\n重复最多的查询:\n{repeated}')
+
+
 class TestDataFactory:
     """测试数据工厂类"""
 